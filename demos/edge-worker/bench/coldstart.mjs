@@ -0,0 +1,63 @@
+// Cold-start benchmark for the edge worker bundle.
+//
+// Usage: node bench/coldstart.mjs [dist/worker.js] [runs]
+//
+// Each run imports a fresh copy of the bundle (a new query string makes
+// node parse and evaluate it again), then handles a first request with a
+// fake Request, the way the runtime does after spinning up an isolate.
+
+import { readFileSync } from "node:fs";
+import { resolve } from "node:path";
+import { pathToFileURL } from "node:url";
+import { performance } from "node:perf_hooks";
+
+const path = resolve(process.argv[2] ?? "dist/worker.js");
+const runs = Number(process.argv[3] ?? 50);
+const url = pathToFileURL(path).href;
+
+function median(values) {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = sorted.length >> 1;
+  return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+}
+
+function fakeRequest() {
+  return new Request("https://example.com/api/data", {
+    headers: {
+      "User-Agent": "Mozilla/5.0 (bench)",
+      "CF-Connecting-IP": "203.0.113.7",
+    },
+  });
+}
+
+const env = {};
+const ctx = { waitUntil() {}, passThroughOnException() {} };
+// Keep the first request from reaching the network
+globalThis.fetch = async () => new Response("origin", { status: 200 });
+// ...and the worker's logging from the timings
+const log = console.log;
+console.log = () => {};
+
+const loads = [];
+const firsts = [];
+for (let i = 0; i < runs; i++) {
+  let start = performance.now();
+  const worker = (await import(`${url}?run=${i}`)).default;
+  loads.push(performance.now() - start);
+
+  start = performance.now();
+  const response = await worker.fetch(fakeRequest(), env, ctx);
+  firsts.push(performance.now() - start);
+  if (i === 0 && !(response instanceof Response)) {
+    throw new Error(`fetch() returned ${response}, not a Response`);
+  }
+}
+console.log = log;
+
+const size = readFileSync(path).length;
+console.log(`${path}: ${(size / 1024).toFixed(1)} kB, ${runs} runs`);
+console.log(`  load (parse + top level): ${median(loads).toFixed(2)} ms median`);
+console.log(`  first request:            ${median(firsts).toFixed(2)} ms median`);
+console.log(
+  `  cold start:               ${median(loads.map((t, i) => t + firsts[i])).toFixed(2)} ms median`,
+);
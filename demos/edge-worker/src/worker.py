@@ -12,6 +12,8 @@ This worker demonstrates common edge computing patterns:
 
 from __future__ import annotations
 
+import re
+
 import js
 
 # ============================================================================
@@ -21,16 +23,10 @@ import js
 # Blocked countries (ISO codes)
 BLOCKED_COUNTRIES = ["XX", "YY"]  # Example placeholder codes
 
-# Bot user agent patterns
-BOT_PATTERNS = [
-    "bot",
-    "crawler",
-    "spider",
-    "scraper",
-    "curl",
-    "wget",
-    "python-requests",
-]
+# Bot user agent patterns (compiled once, to a JS regex literal)
+BOT_PATTERN = re.compile(
+    r"bot|crawler|spider|scraper|curl|wget|python-requests", re.IGNORECASE
+)
 
 # Rate limit: requests per minute per IP
 RATE_LIMIT = 60
@@ -53,11 +49,7 @@ def is_bot(user_agent: str) -> bool:
     if not user_agent:
         return True  # No user agent is suspicious
 
-    ua_lower = user_agent.lower()
-    for pattern in BOT_PATTERNS:
-        if pattern in ua_lower:
-            return True
-    return False
+    return BOT_PATTERN.search(user_agent) is not None
 
 
 def get_country(request) -> str:
@@ -287,11 +279,9 @@ async def handle_request(request):
 # ============================================================================
 
 
-def handle_fetch(event):
-    """Fetch event handler - Cloudflare Worker entry point."""
-    event.respondWith(handle_request(event.request))
-
+def fetch(request, env, ctx):
+    """Module worker entry point, exported as `export default { fetch }`.
 
-# Register the fetch handler
-# In Cloudflare Workers: addEventListener('fetch', handleFetch)
-js.self_.addEventListener("fetch", handle_fetch)
+    Returns the promise of the response.
+    """
+    return handle_request(request)
@@ -0,0 +1,130 @@
+# Attribute and method types of user-defined classes
+from dataclasses import dataclass
+
+
+class Point:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def get(self, axis):
+        return self.x if axis == "x" else self.y
+
+    def moved(self, dx: int):
+        return Point(self.x + dx, self.y)
+
+    @property
+    def norm1(self):
+        return abs(self.x) + abs(self.y)
+
+
+class Inventory:
+    total = 0
+
+    def __init__(self):
+        self.count = 0
+        self.items = []
+
+    def add(self, item):
+        self.count += 1
+        self.items.append(item)
+        return self
+
+    def update(self, other):
+        for item in other.items:
+            self.add(item)
+
+
+class Base:
+    def __init__(self):
+        self.value = 1
+
+    def label(self):
+        return "base"
+
+
+class Derived(Base):
+    def __init__(self):
+        super().__init__()
+        self.value = "one"
+
+    def label(self):
+        return 2
+
+
+class Node:
+    def __init__(self, value: int, link: "Node | None" = None):
+        self.value = value
+        self.link = link
+
+
+@dataclass
+class Item:
+    name: str
+    price: float
+    qty: int = 1
+
+    def cost(self):
+        return self.price * self.qty
+
+
+class Named:
+    def __init__(self):
+        self.name = "x"
+
+
+def show(obj: Base):
+    return f"{obj.value}-{obj.label()}"
+
+
+def total(node: Node | None) -> int:
+    result = 0
+    while node is not None:
+        result += node.value
+        node = node.link
+    return result
+
+
+def rename(thing, name):
+    thing.name = name
+
+
+def describe(obj):
+    if isinstance(obj, Point):
+        return obj.x + obj.y
+    if isinstance(obj, str):
+        return obj.upper()
+    return None
+
+
+def main():
+    p = Point(1, -2)
+    q = p.moved(3)
+    print(q.x + q.y, p.get("x"), p.get("y"), p.norm1 + 1)
+
+    inventory = Inventory()
+    inventory.add("a").add("b")
+    other = Inventory()
+    other.add("c")
+    inventory.update(other)
+    print(inventory.count, inventory.items, Inventory.total)
+
+    print(show(Base()), show(Derived()))
+    print(total(Node(1, Node(2, Node(3)))))
+
+    item = Item("pen", 1.25, 3)
+    print(item.cost(), item.name.upper())
+
+    n = Named()
+    rename(n, 41)
+    print(n.name + 1)
+
+    print(describe(Point(2, 3)), describe("abc"), describe(1))
+    for obj in [Base(), Derived()]:
+        if isinstance(obj, Derived):
+            print("derived", obj.label())
+        else:
+            print("base", obj.label())
+
+
+main()
@@ -0,0 +1,74 @@
+"""Test collections.Counter, defaultdict and OrderedDict."""
+from __future__ import annotations
+
+from collections import Counter, OrderedDict, defaultdict
+
+words = "the cat and the dog and the bird saw the cat".split()
+
+counts = Counter(words)
+print(repr(counts))
+print(counts["the"], counts["zebra"], len(counts))
+print(repr(counts.most_common(2)))
+print(repr(counts.most_common()))
+
+tally = {}
+for w in words:
+    tally[w] = tally.get(w, 0) + 1
+print(repr(tally))
+
+hits = Counter()
+for w in words:
+    hits[w] += 1
+print(repr(hits))
+print(hits == counts)
+
+hits.update(["cat", "fish"])
+hits.update({"dog": 3})
+print(repr(hits))
+hits.subtract(["the", "the"])
+print(hits["the"], hits.total())
+print(repr(list(sorted(Counter("abracadabra").elements()))))
+
+a = Counter("aabbbc")
+b = Counter("abccdd")
+print(repr(a + b))
+print(repr(a - b))
+print(repr(a | b))
+print(repr(a & b))
+
+groups = defaultdict(list)
+for w in words:
+    groups[w[0]].append(w)
+print(repr(groups["t"]), len(groups))
+print(repr(dict(groups)))
+
+lengths = defaultdict(int)
+for w in words:
+    lengths[w] += len(w)
+print(repr(lengths))
+print(repr(lengths["missing"]), "missing" in lengths)
+
+nested = defaultdict(lambda: defaultdict(int))
+nested["x"]["y"] += 2
+nested["x"]["z"] -= 1
+print(repr(dict(nested["x"])))
+
+od = OrderedDict()
+od["b"] = 1
+od["a"] = 2
+od["c"] = 3
+od.move_to_end("b")
+print(repr(list(od.keys())))
+od.move_to_end("c", False)
+print(repr(list(od.items())))
+
+xs = [1, 2, 3]
+xs[-1] += 10
+xs[0] += 5
+print(repr(xs))
+
+try:
+    plain = {}
+    plain["k"] += 1
+except KeyError:
+    print("KeyError")
@@ -0,0 +1,92 @@
+# Constant variables, propagated and folded when optimizing
+
+DEBUG = False
+N = 64
+SIZE = N * N
+NAME = "prescrypt"
+LIMIT = None
+
+
+def log(msg):
+    if DEBUG:
+        print("debug:", msg)
+    return msg
+
+
+def area():
+    side = N // 2
+    unused = side * 3
+    return side * side
+
+
+def first_positive(xs):
+    for x in xs:
+        if x > 0:
+            return x
+            print("unreachable")
+    return LIMIT
+
+
+print(SIZE, NAME.upper(), log("hello"), area(), first_positive([-1, 0, 5]))
+
+# Rebound by a function declaring it global
+LEVEL = 1
+
+
+def raise_level():
+    global LEVEL
+    LEVEL = 2
+
+
+raise_level()
+print(LEVEL)
+
+# Rebound by a match pattern
+value = 10
+match [3]:
+    case [value]:
+        pass
+print(value)
+
+# Loops that never run
+while DEBUG:
+    print("never")
+else:
+    print("while else")
+
+if N > 100:
+    print("big")
+elif N > 10:
+    print("medium")
+else:
+    print("small")
+
+
+def counter():
+    count = 0
+
+    def inc():
+        nonlocal count
+        count += 1
+        return count
+
+    inc()
+    return inc()
+
+
+print(counter())
+
+
+def shadow(N):
+    return N + 1
+
+
+print(shadow(1), [N for N in range(3)], N)
+
+
+class Config:
+    RETRIES = 3
+    TOTAL = RETRIES * 2
+
+
+print(Config.TOTAL)
@@ -0,0 +1,86 @@
+# Flow-sensitive type inference: reassignments, branches and loops
+
+
+def triangle(n):
+    total = 0
+    for i in range(n):
+        total = total + i
+    return total
+
+
+def mean(values):
+    total = 0.0
+    count = 0
+    for v in values:
+        total = total + v
+        count = count + 1
+    return total / count if count else None
+
+
+def collatz(n):
+    steps = 0
+    while n != 1:
+        if n % 2 == 0:
+            n = n // 2
+        else:
+            n = 3 * n + 1
+        steps = steps + 1
+    return steps
+
+
+def grow():
+    # Becomes a list half way through the loop
+    x = 0
+    seen = []
+    for item in ["a", "b", "c"]:
+        seen.append(x + x)
+        x = [item]
+    return seen
+
+
+def label(n):
+    result = None
+    if n > 0:
+        result = "positive"
+    elif n < 0:
+        result = n
+    return result
+
+
+print(triangle(10))
+print(mean([1, 2, 3, 4]), mean([]))
+print(collatz(27))
+print(grow())
+print(label(3), label(-2), label(0))
+
+# Reassignment to another type
+value = 1
+value = value + 1
+value = str(value) + "!"
+print(value)
+
+# Loop variable keeps the last item after the loop
+for word in "hello world".split():
+    pass
+print(word + "?")
+
+# Early exits
+pairs = []
+for i in range(10):
+    if i % 3 == 0:
+        continue
+    if i > 7:
+        break
+    pairs.append([i, i * i])
+print(pairs)
+
+n = 1
+try:
+    n = 2
+    n = int("x")
+except ValueError:
+    print("ValueError", n + 1)
+try:
+    max([])
+except ValueError:
+    print("ValueError")
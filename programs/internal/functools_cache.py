@@ -0,0 +1,78 @@
+"""Test functools.cache and functools.lru_cache."""
+from __future__ import annotations
+
+import functools
+from functools import lru_cache, cache
+
+
+@lru_cache(maxsize=None)
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+
+print(fib(60))
+print(fib.cache_info())
+
+
+@cache
+def binom(n, k):
+    if k == 0 or k == n:
+        return 1
+    return binom(n - 1, k - 1) + binom(n - 1, k)
+
+
+print(binom(30, 15), binom.cache_info().hits > 0)
+
+
+@functools.lru_cache(maxsize=2)
+def sq(x):
+    print("compute", x)
+    return x * x
+
+
+sq(1); sq(2); sq(1); sq(3); sq(2); sq(1)
+info = sq.cache_info()
+print(info.hits, info.misses, info.maxsize, info.currsize)
+hits, misses, maxsize, currsize = info
+print(hits, misses)
+sq.cache_clear()
+print(sq.cache_info())
+
+
+@lru_cache
+def greet(name, punct="!"):
+    print("greeting", name)
+    return "hi " + name + punct
+
+
+print(greet("a"), greet("a"), greet("a", "?"), greet(name="b"))
+
+
+class Grid:
+    def __init__(self, w):
+        self.w = w
+
+    @functools.lru_cache(maxsize=16)
+    def paths(self, r, c):
+        if r == 0 or c == 0:
+            return 1
+        return self.paths(r - 1, c) + self.paths(r, c - 1)
+
+
+g = Grid(3)
+print(g.paths(10, 10), Grid(4).paths(3, 3))
+print(g.paths.cache_info().currsize <= 16)
+
+
+@cache
+def tuple_key(t):
+    return sum(t)
+
+
+print(tuple_key((1, 2, 3)), tuple_key((1, 2, 3)), tuple_key.cache_info().hits)
+try:
+    tuple_key([1, 2])
+except TypeError:
+    print("TypeError")
@@ -0,0 +1,80 @@
+"""Test the heapq module (heap operations on plain lists)."""
+from __future__ import annotations
+
+import heapq
+from heapq import heapify, heappop, heappush
+
+
+# heappush / heappop with numbers
+h = []
+for x in [5, 3, 8, 1, 9, 2, 7]:
+    heappush(h, x)
+print(h[0])  # 1
+print([heappop(h) for _ in range(len(h))])  # [1, 2, 3, 5, 7, 8, 9]
+
+# heapify in place
+data = [9, 4, 7, 1, 8, 2, 2, 6]
+heapify(data)
+print(data[0], len(data))  # 1 8
+print([heapq.heappop(data) for _ in range(len(data))])
+
+# Tuples are compared lexicographically
+tasks = [(3, "write"), (1, "plan"), (2, "code"), (1, "coffee")]
+heapify(tasks)
+order = []
+while tasks:
+    prio, name = heappop(tasks)
+    order.append(name)
+print(order)  # ['coffee', 'plan', 'code', 'write']
+
+# Strings
+words = []
+for w in ["pear", "apple", "fig", "banana"]:
+    heapq.heappush(words, w)
+print(heapq.heappop(words), heapq.heappop(words))  # apple banana
+
+# heappushpop / heapreplace
+h = [1, 4, 6]
+print(heapq.heappushpop(h, 0))  # 0 (smaller than the top)
+print(heapq.heappushpop(h, 5))  # 1
+print(heapq.heapreplace(h, 10))  # 4
+print(sorted(h))  # [5, 6, 10]
+
+# nlargest / nsmallest
+nums = [4, 1, 7, 3, 7, 2, 9, 0]
+print(heapq.nlargest(3, nums))  # [9, 7, 7]
+print(heapq.nsmallest(3, nums))  # [0, 1, 2]
+print(heapq.nsmallest(10, nums))  # all, sorted
+print(heapq.nlargest(0, nums))  # []
+print(heapq.nlargest(2, ["aa", "b", "cc", "d"], key=len))  # ['aa', 'cc']
+print(heapq.nsmallest(2, ["pear", "fig", "kiwi", "apple"], key=len))  # ['fig', 'pear']
+print(heapq.nsmallest(2, (x * x for x in [3, -1, 2])))  # [1, 4]
+
+# Function references
+push = heapq.heappush
+q = []
+push(q, 3)
+push(q, 1)
+print(heappop(q))  # 1
+
+# Popping from an empty heap
+try:
+    heappop([])
+except IndexError:
+    print("IndexError")
+
+# Heap-based Dijkstra
+graph = {"a": [("b", 7), ("c", 9), ("f", 14)], "b": [("c", 10), ("d", 15)],
+         "c": [("d", 11), ("f", 2)], "d": [("e", 6)], "e": [], "f": [("e", 9)]}
+dist = {"a": 0}
+pq = [(0, "a")]
+while pq:
+    d, u = heappop(pq)
+    if d > dist[u]:
+        continue
+    for v, w in graph[u]:
+        if v not in dist or d + w < dist[v]:
+            dist[v] = d + w
+            heappush(pq, (d + w, v))
+print(sorted(dist.items()) == [("a", 0), ("b", 7), ("c", 9), ("d", 20), ("e", 20), ("f", 11)])
+print(dist["e"], dist["d"])  # 20 20
@@ -0,0 +1,58 @@
+# Calls to small functions, inlined when optimizing
+
+
+def square(x):
+    return x * x
+
+
+def sub(a, b):
+    return a - b
+
+
+def clamp(x, lo, hi):
+    """Clamp x between lo and hi."""
+    return lo if x < lo else hi if x > hi else x
+
+
+def area(w: float, h: float) -> float:
+    return w * h
+
+
+def fact(n):
+    return 1 if n <= 1 else n * fact(n - 1)
+
+
+log = []
+
+
+def record(x):
+    log.append(x)
+    return x
+
+
+scale = 3
+
+
+def scaled(x):
+    return x * scale
+
+
+print(square(7), sub(10, 4), clamp(15, 0, 10), clamp(-2, 0, 10))
+print(area(2.5, 3.0), fact(6))
+
+# Arguments are evaluated once, in order
+print(sub(record(1), record(2)), square(record(3)), log)
+
+# Globals are read when the call runs
+print(scaled(2))
+scale = 5
+print(scaled(2))
+
+
+def outer(scale):
+    return scaled(scale)
+
+
+print(outer(10))
+print([square(i) for i in range(5)])
+print(square(True) == 1, sub(True, True) == 0)
@@ -0,0 +1,86 @@
+"""Test the itertools module (lazy iterators)."""
+from __future__ import annotations
+
+import itertools
+from itertools import (
+    accumulate,
+    chain,
+    combinations,
+    count,
+    groupby,
+    islice,
+    permutations,
+    product,
+    takewhile,
+)
+
+
+# count() is infinite: only usable lazily
+print(list(islice(count(), 5)))  # [0, 1, 2, 3, 4]
+print(list(islice(count(10, 5), 3)))  # [10, 15, 20]
+for x in count(1):
+    if x > 3:
+        break
+    print("count", x)
+
+# islice over arrays, strings and iterators
+print(list(islice([1, 2, 3, 4, 5, 6], 1, 5, 2)))  # [2, 4]
+print(list(islice("abcdefg", 2, None, 2)))  # ['c', 'e', 'g']
+it = iter([1, 2, 3, 4, 5, 6])
+print(list(islice(it, 2)), next(it))  # [1, 2] 3
+
+# Breaking out of a loop over islice() leaves the source iterator usable
+it = iter(range(10))
+for n in islice(it, 5):
+    if n > 1:
+        break
+print(next(it))  # 3
+
+# chain / chain.from_iterable
+print(list(chain([1, 2], (3, 4), "ab")))
+print(list(chain.from_iterable([[1], [2, 3]])))
+print(list(itertools.chain.from_iterable(["ab", "c"])))
+print(list(chain()))  # []
+
+# Combinatorics (tuples shown with repr)
+print(repr(list(product("ab", repeat=2))))
+print(repr(list(product([1, 2], [3, 4]))))
+print(len(list(product(range(3), range(4), range(2)))))  # 24
+print(repr(list(product([1, 2], []))))  # []
+print(len(list(permutations(range(4)))))  # 24
+print(repr(list(permutations("abc", 2))))
+print(repr(list(combinations([1, 2, 3, 4], 2))))
+print(repr(list(combinations("abc", r=0))))  # [()]
+print(repr(list(combinations("ab", 3))))  # []
+
+# accumulate
+print(list(accumulate([1, 2, 3, 4])))  # [1, 3, 6, 10]
+print(list(accumulate([1, 2, 3], lambda a, b: a * b)))  # [1, 2, 6]
+print(list(accumulate([1, 2], initial=100)))  # [100, 101, 103]
+print(list(accumulate(["a", "b", "c"])))  # ['a', 'ab', 'abc']
+
+# groupby: groups share the underlying iterator
+for k, g in groupby("aaabbcdd"):
+    print(k, list(g))
+print(repr([(k, len(list(g))) for k, g in groupby([1, 1, 2, 3, 3, 3], key=lambda v: v % 2)]))
+print([k for k, g in groupby([])])  # []
+
+# takewhile
+print(list(takewhile(lambda v: v < 4, [1, 3, 5, 2])))  # [1, 3]
+print(list(takewhile(lambda v: v < 4, count())))  # [0, 1, 2, 3]
+
+# Comprehensions over lazy iterators
+print(sorted({x for x in islice(count(), 4)}))  # [0, 1, 2, 3]
+print([x * 2 for x in itertools.islice(count(), 3)])  # [0, 2, 4]
+print({k: len(list(g)) for k, g in groupby("xxyzz")})
+
+# for/else with a lazy iterator
+total = 0
+for v in itertools.accumulate(range(5)):
+    total += v
+else:
+    print("done", total)  # done 20
+
+# Enumerating a lazy iterator
+for i, a in enumerate(islice(count(5), 2)):
+    print(i, a)
@@ -0,0 +1,46 @@
+"""Test methods of str, list and dict receivers with known types."""
+from __future__ import annotations
+
+
+# str methods
+s = "  Hello, World  "
+t = s.strip()
+print(t.upper())  # HELLO, WORLD
+print(t.lower())  # hello, world
+print(t.startswith("Hell"), t.endswith("World"))  # True True
+print(t.find("o"), t.rfind("o"), t.find("z"))  # 4 8 -1
+print(t.split(", "))  # ['Hello', 'World']
+print(t.replace("l", "$&"))  # He$&$&o, Wor$&d
+print("-".join(t.split(", ")))  # Hello-World
+print("[" + s.lstrip() + "]", "[" + s.rstrip() + "]")
+
+
+# list methods
+xs = [3, 1, 2]
+xs.append(4)
+xs.insert(0, 0)
+xs.insert(-1, 9)
+xs.insert(100, 7)
+xs.extend([5, 6])
+xs.extend("ab")
+print(xs)  # [0, 3, 1, 2, 9, 4, 7, 5, 6, 'a', 'b']
+ys = xs.copy()
+ys.reverse()
+print(ys[0], len(ys))  # b 11
+xs.clear()
+print(xs, len(ys))  # [] 11
+
+
+# dict methods
+counts = {"a": 1, "b": 2}
+print(counts.get("a"), counts.get("z"), counts.get("z", 0))  # 1 None 0
+print(list(counts.keys()), list(counts.values()))  # ['a', 'b'] [1, 2]
+for key, value in counts.items():
+    print(key, value)
+optional = {"a": None}
+print(optional.get("a", 5))  # None
+
+
+# Results of methods returning None
+zs = [1]
+print(zs.append(2), zs)  # None [1, 2]
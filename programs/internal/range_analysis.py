@@ -0,0 +1,67 @@
+"""Test indexing, modulo and floor division on bounded and unbounded ints."""
+from __future__ import annotations
+
+MOD = 10**9 + 7
+
+
+def checksum(xs: list[int]) -> int:
+    total = 0
+    for i in range(len(xs)):
+        total = (total * 31 + xs[i]) % MOD
+    return total
+
+
+print(checksum([3, -1, 4, -1, 5]))
+
+
+def mods(xs: list[int], m: int) -> list[int]:
+    out = []
+    for i in range(len(xs)):
+        out.append(xs[i] % m)
+        out.append(i % m)
+    return out
+
+
+print(mods([7, -7, 0, -1], 3))  # [1, 0, 2, 1, 0, 2, 2, 0]
+print(mods([7, -7], -3))  # [-2, 0, -1, -2]
+
+
+def middle(xs: list[int]) -> int:
+    return xs[len(xs) // 2]
+
+
+print(middle([1, 2, 3]), middle([4, 5, 6, 7]))  # 2 6
+
+
+def halves(n: int) -> list[int]:
+    return [i // 2 for i in range(-n, n)]
+
+
+print(halves(3))  # [-2, -1, -1, 0, 0, 1]
+
+
+def last(xs: list[int], i: int) -> int:
+    if 0 <= i < len(xs):
+        return xs[i]
+    return xs[i]  # negative indexes count from the end
+
+
+print(last([1, 2, 3], 1), last([1, 2, 3], -1))  # 2 3
+
+
+def countdown(s: str) -> str:
+    out = ""
+    i = len(s) - 1
+    while i >= 0:
+        out += s[i]
+        i -= 1
+    return out
+
+
+print(countdown("abc"))  # cba
+
+for k, c in enumerate("xyz", 1):
+    print(k % 2, k // 2, c)
+
+a = -5
+print(a % 3, a // 3, a % -3, 5 % -3)  # 1 -2 -2 -1
@@ -0,0 +1,64 @@
+"""Test the re module (Python regular expressions on JS RegExp)."""
+from __future__ import annotations
+
+import re
+from re import findall, sub
+
+DATE = re.compile(r"(?P<year>\d{4})-(?P<month>\d\d)-(?P<day>\d\d)")
+WORD = re.compile(r"\w+", re.IGNORECASE)
+SLUG = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+EMAIL = re.compile(r"""
+    ^[\w.+-]+        # local part
+    @[\w-]+          # domain
+    (\.[\w-]+)+$     # tld
+""", re.VERBOSE)
+
+m = DATE.search("released on 2024-03-15, patched 2024-04-01")
+print(m.group(), m.group("year"), m.group(2), repr(m.groups()))
+print(repr(m.groupdict()))
+print(m.start(), m.end(), repr(m.span("day")), m["month"])
+print(repr(DATE.findall("2024-03-15 and 2023-12-31")))
+print(repr([x.group(0) for x in DATE.finditer("a 2020-01-02 b 2021-02-03")]))
+print(DATE.groups, repr(dict(DATE.groupindex)), WORD.flags, DATE.flags)
+
+print(repr(WORD.findall("Hello, World! It's 42")))
+print(bool(SLUG.match("my-post-1")), bool(SLUG.match("My Post")))
+print(SLUG.match("trailing\n") is not None, SLUG.fullmatch("trailing\n") is None)
+print(bool(EMAIL.match("a.b+c@example.co.uk")), bool(EMAIL.match("nope@")))
+
+print(re.match(r"\d+", "123abc").group())
+print(re.match(r"\d+", "abc123"))
+print(re.search(r"\d+", "abc123").group())
+print(re.fullmatch(r"a|ab", "ab").group())
+print(repr(re.findall(r"(\w)=(\d)", "a=1, b=2")))
+print(repr(re.findall(r"x*", "axbc")))
+print(re.sub(r"(\w+)@(\w+)", r"\2 at \1", "me@home you@work"))
+print(re.sub(r"(?P<n>\d+)", r"<\g<n>>", "a1b22"))
+print(re.sub(r"\d", lambda m: str(int(m.group()) * 2), "a1b2c3", 2))
+print(repr(re.subn(r"o", "0", "foo boo")))
+print(repr(re.split(r"[,;]\s*", "a, b;c,  d")))
+print(repr(re.split(r"(,)", "a,b,c", 1)))
+print(repr(re.split(r"x*", "axbc")))
+print(re.escape("a.b*c?(d)"))
+print(repr(findall(r"\bcat\b", "cat concat cat")))
+print(sub(r"\s+", " ", "a   b \t c"))
+print(re.search(r"\Aab", "ab") is not None, re.search(r"b\Z", "ab\n") is None)
+print(re.search(r"^b", "a\nb", re.M).group(), re.search(r"a.b", "a\nb", re.S) is not None)
+print(repr(re.findall(r"(?i)ab", "AB ab aB")))
+print(repr(re.match(r"(a)(b)?", "a").groups()))
+print(repr(re.match(r"(a)(b)?", "a").groups("-")))
+print(repr(re.search(r"(?P<q>['\"]).*?(?P=q)", "say 'hi' now").group()))
+print(repr(re.compile("x{,2}").findall("xxxxx")))
+
+
+def check(text):
+    return [w.lower() for w in re.findall(r"[A-Z]\w+", text)]
+
+
+for line in ["Alpha beta Gamma", "no caps", "Delta"]:
+    print(repr(check(line)))
+
+
+WORDS = re.compile(r"\s*,\s*")
+print(repr(WORDS.split("a , b,c")))
+print(repr(WORDS))
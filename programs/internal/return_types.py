@@ -0,0 +1,62 @@
+# Return types inferred from function bodies
+
+
+def main():
+    print(dist(1, 4) + dist(2.5, 1))
+    print(area(2, 3) + 0.5)
+    print(depth(5) + 1)
+    print(greet("World") + "!")
+    print(find([3, 4, 5], 5), find([3, 4, 5], 9))
+    print(sign(-3), sign(0), sign(7))
+    print(list(countdown(3)))
+    print(fib(20) + fib(10))
+
+
+def dist(a, b):
+    return abs(a - b)
+
+
+def area(w, h):
+    return scale(w) * scale(h)
+
+
+def scale(x):
+    return float(x) * 2
+
+
+def depth(n):
+    if n == 0:
+        return 0
+    return depth(n - 1) + 1
+
+
+def greet(name):
+    return "Hello, " + str(name)
+
+
+def find(items, x):
+    for i in range(len(items)):
+        if items[i] == x:
+            return i
+
+
+def sign(n):
+    if n < 0:
+        return "negative"
+    elif n == 0:
+        return 0
+    return n > 0
+
+
+def countdown(n):
+    while n > 0:
+        yield n
+        n = n - 1
+    return "done"
+
+
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+main()
@@ -0,0 +1,68 @@
+# Parameterized types: list[int], dict[str, float], tuple[int, str]
+from typing import Optional
+
+
+def total(xs: list[int]) -> int:
+    result = 0
+    for x in xs:
+        result = result + x
+    return result
+
+
+def average(scores: dict[str, float]) -> float:
+    result = 0.0
+    for name, score in scores.items():
+        result = result + score
+    return result / len(scores)
+
+
+def describe(pair: tuple[int, str]) -> str:
+    n, label = pair
+    return label + ": " + str(n + 1)
+
+
+def first_or_none(xs: list[str]) -> Optional[str]:
+    return xs[0] if xs else None
+
+
+print(total([1, 2, 3]))
+print(total([]))
+print(average({"alice": 1.5, "bob": 2.0}))
+print(describe((41, "answer")))
+print(first_or_none(["a", "b"]), first_or_none([]))
+
+# Element access
+matrix = [[1, 2], [3, 4]]
+print(matrix[1][0] + matrix[0][1])
+words = "the quick brown fox".split()
+print(words[1] + words[2], words[-1] == "fox")
+lengths = {w: len(w) for w in words}
+print(lengths["quick"] + 1, lengths.get("slow", 0) + 1)
+
+# Lists grown with append
+squares = []
+for i in range(5):
+    squares.append(i * i)
+print(squares[2] + squares[3], squares)
+
+# Mixed lists keep Python semantics
+mixed = [1, "a", [2]]
+print(mixed[2] + [3], mixed[1] * 2)
+
+# Unpacking and enumerate
+for i, word in enumerate(words):
+    print(i + 1, word + "!")
+head, *rest = [10, 20, 30]
+print(head + 1, rest + [40])
+
+# Comprehensions
+doubled = [x * 2 for x in [1, 2, 3]]
+print(doubled[0] + doubled[-1])
+x = "outer"
+ys = [x for x in [1, 2]]
+print(x + "!", ys)
+
+# f-strings with typed items
+a, b = 1, 2
+flag = True
+print(f"{a}{b}", f"{doubled[1]}", f"flag={flag}")
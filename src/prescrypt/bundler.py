@@ -1,24 +1,85 @@
 """Module bundling for Prescrypt.
 
 Bundles multiple Python modules into a single JavaScript file with combined
-tree-shaking.
+tree-shaking, of the stdlib and of the definitions of the bundled modules.
+
+Several entry files can be bundled at once: each module is compiled once,
+and each entry file gets a bundle of the modules it imports. With
+``shared``, the modules that several entry files import go to a shared
+chunk instead, and the bundles are ES modules that import it.
+
+The bundle is scope-hoisted: the stdlib and the modules run in a single
+function scope, where the module-level names of the modules are local
+variables. Clashing names are renamed, and imported names refer to the
+bindings of their modules directly (``front.passes.scope_hoisting``).
+
+With ``split``, the imports in ``async def`` functions are split points: a
+module only imported there (and the modules only it imports) goes to a
+separate chunk, an ES module loaded on first use with ``import()``. The
+modules several chunks need go to common chunks, and each chunk defines the
+stdlib functions it needs that the chunks loaded before it don't.
+
+With ``lazy_init``, the top-level code of the modules besides the entry
+files runs the first time another module uses one of their names, in an
+init function (``front.passes.lazy_init``). The modules that only define
+functions, classes and constants don't need one.
+
+The ``edge`` target builds an ES module worker for edge runtimes, where
+every cold start parses the script and runs its top level: the entry file
+exports its handlers (``export default { fetch }``), the definitions and
+stdlib functions they can't reach are removed, the constant tables are
+computed at compile time (``front.passes.precompute``), and the imported
+modules are initialized lazily. The top level of the entry file may only
+define functions, classes and constants.
 """
 
 from __future__ import annotations
 
+from ast import iter_child_nodes, walk
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from itertools import count
 from pathlib import Path
-
-from .codegen import CodeGen
-from .compiler import Compiler, get_stdlib_js
-from .front import ast
+from typing import TYPE_CHECKING
+
+from .codegen import JSON_THRESHOLD, CodeGen
+from .compiler import Compiler, get_stdlib_js, short_prefixes
+from .constants import escape_js_name
+from .exceptions import SemanticError
+from .front import Scope, ast
+from .front.passes.base import walk_scopes
 from .front.passes.binder import Binder
 from .front.passes.constant_folder import fold_constants
+from .front.passes.constant_propagator import propagate_constants
 from .front.passes.desugar import desugar
+from .front.passes.inliner import Inliner
+from .front.passes.lazy_init import (
+    add_init_calls,
+    is_definition,
+    is_side_effect_free,
+)
+from .front.passes.mangler import mangle_locals
+from .front.passes.precompute import precompute_constants
+from .front.passes.ranges import RangeAnalysis
+from .front.passes.reachability import eliminate_dead_code, exported_names
 from .front.passes.resolver import ModuleResolver, ResolvedModule
+from .front.passes.scope_hoisting import Hoister, hoist_names
 from .front.passes.type_inference import TypeInference
+from .minify import minify_js
 from .stdlib_js import FUNCTION_PREFIX, METHOD_PREFIX
 
+# File name of the chunk of the modules shared by several entry files
+SHARED_CHUNK = "shared.js"
+
+# Output profiles (``target``)
+TARGETS = ("edge",)
+
+# The handlers of an edge worker module, exported by the entry file
+EDGE_HANDLERS = ("fetch", "scheduled", "queue")
+
+if TYPE_CHECKING:
+    from .codegen.profile import Profile
+
 
 @dataclass
 class ParsedModule:
@@ -42,6 +103,70 @@ class ParsedModule:
     # Set of stdlib methods used
     used_std_methods: set[str] = field(default_factory=set)
 
+    # Inferred types of module-level names (functions: their return type)
+    types: dict[str, type] = field(default_factory=dict)
+
+    # Names of the module-level bindings in the bundle, by name
+    bindings: dict[str, str] = field(default_factory=dict)
+
+    # Names imported from bundled modules: (module path, name), by local name
+    imported: dict[str, tuple[Path, str]] = field(default_factory=dict)
+
+    # Imported bundled modules, by name as bound (``utils``, ``pkg.sub``)
+    module_aliases: dict[str, Path] = field(default_factory=dict)
+
+    # Modules imported at split points (see ``_import_statements()``)
+    lazy_imports: list[Path] = field(default_factory=list)
+
+    # Imports in functions and class bodies
+    local_imports: list[LocalImport] = field(default_factory=list)
+
+
+@dataclass
+class LocalImport:
+    """An import statement in a function or a class body."""
+
+    node: ast.Import | ast.ImportFrom
+
+    # The scope of the function or class
+    scope: Scope
+
+    # Whether the statement is a split point
+    lazy: bool
+
+    # Names imported from bundled modules: (module path, name), by local name
+    imported: dict[str, tuple[Path, str]] = field(default_factory=dict)
+
+    # Imported bundled modules, by name as bound
+    module_aliases: dict[str, Path] = field(default_factory=dict)
+
+
+@dataclass
+class Chunk:
+    """A file of a split bundle: modules loaded together."""
+
+    # File name, next to the entry chunk
+    name: str
+
+    # The module ``import()`` loads (None for the entry and common chunks)
+    root: Path | None = None
+
+    # Modules, in dependency order
+    modules: list[ParsedModule] = field(default_factory=list)
+
+    # Chunks loaded before this one runs (their modules are imported by it)
+    requires: list[Chunk] = field(default_factory=list)
+
+    # Stdlib functions and methods defined in the chunk
+    std_functions: set[str] = field(default_factory=set)
+    std_methods: set[str] = field(default_factory=set)
+
+    # Names imported from other chunks, by chunk name
+    imports: dict[str, set[str]] = field(default_factory=dict)
+
+    # Exported names: local name, by exported name
+    exports: dict[str, str] = field(default_factory=dict)
+
 
 class Bundler:
     """Bundles multiple Python modules into a single JavaScript file.
@@ -50,49 +175,162 @@ class Bundler:
     - Recursive import resolution
     - Topological sorting by dependencies
     - Combined tree-shaking across all modules
+    - Removal of the functions, classes and methods the program can't reach
+    - Scope hoisting: all modules run in a single function scope
+    - Code splitting into chunks loaded on demand (``split``)
+    - Several entry files, with a chunk of their shared modules (``shared``)
+    - ES module workers for edge runtimes (``target="edge"``)
     """
 
     def __init__(
         self,
-        entry_file: Path,
+        entry_file: Path | list[Path],
         module_paths: list[Path] | None = None,
         function_prefix: str = FUNCTION_PREFIX,
         method_prefix: str = METHOD_PREFIX,
         optimize: bool = True,
         verbosity: int = 0,
+        fast_paths: bool = False,
+        instrument: bool = False,
+        profile: Profile | None = None,
+        tree_shake: bool = True,
+        keep: list[str] | None = None,
+        minify: bool = False,
+        split: bool = False,
+        output_name: str | None = None,
+        shared: bool = False,
+        json_threshold: int | None = JSON_THRESHOLD,
+        lazy_init: bool = False,
+        release: bool = False,
+        target: str | None = None,
     ):
         """Initialize the bundler.
 
         Args:
-            entry_file: The main entry point Python file
+            entry_file: The main entry point Python file, or several
             module_paths: Additional directories to search for modules
             function_prefix: Prefix for stdlib functions
             method_prefix: Prefix for stdlib methods
             optimize: Whether to apply compile-time optimizations
             verbosity: Verbosity level for output
+            fast_paths: Whether to inline type-guarded native operators
+            instrument: Whether to record the types seen at generic sites
+            profile: Types recorded by an instrumented build
+            tree_shake: Whether to only include the used stdlib functions
+                and module definitions
+            keep: Definitions to keep even if unused (``name`` or
+                ``Class.method``)
+            minify: Whether to minify the output
+            split: Whether to split the imports in ``async def`` functions
+                into chunks loaded on demand
+            output_name: File name of the entry chunk, the other chunks are
+                named after it (default: the entry file's, ``main.js``). The
+                bundles of the other entry files are named after them.
+            shared: Whether to move the modules several entry files import to
+                a shared chunk (``shared.js``)
+            json_threshold: Size (in bytes of JSON) from which module-level
+                constant literals are emitted as ``JSON.parse('...')``, or
+                None to always emit literals
+            lazy_init: Whether to run the top-level code of the modules
+                besides the entry files when their names are first used
+            release: Whether to remove ``assert`` statements and
+                ``if __debug__:`` blocks, and strip the debug-only checks of the
+                stdlib functions
+            target: Output profile: ``"edge"`` for an ES module worker
+                exporting the handlers of the entry file (implies
+                ``lazy_init``)
         """
-        self.entry_file = entry_file.resolve()
+        entry_files = [entry_file] if isinstance(entry_file, Path) else entry_file
+        self.entry_files = list(dict.fromkeys(path.resolve() for path in entry_files))
+        self.entry_file = self.entry_files[0]
         self.module_paths = [p.resolve() for p in (module_paths or [])]
         self.function_prefix = function_prefix
         self.method_prefix = method_prefix
         self.optimize = optimize
         self.verbosity = verbosity
+        self.fast_paths = fast_paths
+        self.instrument = instrument
+        self.profile = profile
+        self.tree_shake = tree_shake
+        self.keep = keep or []
+        self.minify = minify
+        self.split = split
+        self.shared = shared
+        self.json_threshold = json_threshold
+        self.lazy_init = lazy_init or target == "edge"
+        self.release = release
+        self.target = target
+        self.output_name = output_name or self.entry_file.stem + ".js"
+        if split and len(self.entry_files) > 1:
+            msg = "Code splitting supports a single entry file"
+            raise ValueError(msg)
+        if target is not None and target not in TARGETS:
+            msg = f"Unknown target: {target}"
+            raise ValueError(msg)
+        if target == "edge" and (split or len(self.entry_files) > 1):
+            msg = "The edge target bundles a single entry file"
+            raise ValueError(msg)
+        if minify:
+            self.function_prefix, self.method_prefix = short_prefixes(
+                function_prefix, method_prefix
+            )
+
+        # Unused definitions removed from the modules (``module: name``)
+        self.removed: list[str] = []
+
+        # Code of the chunks besides the entry chunk, by file name (``split``,
+        # and the bundles of the other entry files)
+        self.chunks: dict[str, str] = {}
+
+        # The file of each entry file, and the chunks it imports (in load
+        # order), by entry file
+        self.manifest: dict[str, dict[str, str | list[str]]] = {}
+
+        # File names of the bundles, by entry file
+        self._output_names = {self.entry_file: self.output_name}
+        for path in self.entry_files[1:]:
+            self._output_names[path] = path.stem + ".js"
+        names = [*self._output_names.values(), *([SHARED_CHUNK] if shared else [])]
+        for name in names:
+            if names.count(name) > 1:
+                msg = f"Several bundles would be named {name}"
+                raise ValueError(msg)
 
         # Parsed modules by absolute path
         self._modules: dict[Path, ParsedModule] = {}
 
-        # Track all used stdlib items across modules
-        self._all_used_functions: set[str] = set()
-        self._all_used_methods: set[str] = set()
+        # The names in the `__all__` of the entry files, by entry file
+        self._exports: dict[Path, list[str]] = {}
+
+        # Temporaries named so far (they share the scope of the bundle)
+        self._dummy_count = 0
+
+        # Chunks of a split bundle, the chunks they import first
+        self._chunks: list[Chunk] = []
+        self._chunk_of: dict[Path, Chunk] = {}
+
+        # Modules a module imports, directly or not, outside of split points
+        self._closures: dict[Path, set[Path]] = {}
+
+        # Init functions of the lazily initialized modules, by path, and of
+        # their names, by bundle name
+        self._inits: dict[Path, str] = {}
+        self._name_inits: dict[str, str] = {}
+
+        # The handlers the entry file exports (edge target)
+        self._handlers: list[str] = []
 
     def bundle(self) -> str:
         """Bundle the entry file and all its dependencies.
 
         Returns:
-            Complete JavaScript code with stdlib preamble
+            Complete JavaScript code with stdlib preamble (with ``split``, or
+            several entry files: the code of the first entry file, the other
+            files are in ``chunks``)
         """
-        # Phase 1: Parse entry file and collect all dependencies
-        self._parse_recursive(self.entry_file)
+        # Phase 1: Parse entry files and collect all dependencies
+        for entry_file in self.entry_files:
+            self._parse_recursive(entry_file)
 
         # Phase 2: Topologically sort modules by dependencies
         sorted_modules = self._topological_sort()
@@ -102,25 +340,70 @@ class Bundler:
             for mod in sorted_modules:
                 print(f"  - {mod.source_path}")
 
-        # Phase 3: Generate code for each module (in dependency order)
-        for module in sorted_modules:
-            self._generate_module_code(module)
+        if self.target == "edge":
+            self._prepare_edge(sorted_modules)
 
-        # Phase 4: Combine all module code
-        code_parts = []
-        for module in sorted_modules:
-            # Add a comment header for each module
-            rel_path = self._get_relative_path(module.source_path)
-            code_parts.append(f"// === Module: {rel_path} ===\n")
-            code_parts.append(module.js_code)
-            code_parts.append("\n")
+        chunked = self.split or (self.shared and len(self.entry_files) > 1)
+        if chunked:
+            self._layout_chunks(sorted_modules)
 
-        combined_code = "".join(code_parts)
+        # Phase 3: Remove the definitions the program doesn't use
+        if self.tree_shake:
+            self._eliminate_dead_code()
 
-        # Phase 5: Generate combined tree-shaken stdlib
-        preamble = self._generate_stdlib_preamble()
+        # Phase 4: Bind the names of each module, and name the module-level
+        # bindings in the scope of the bundle
+        for module in sorted_modules:
+            self._bind_module(module)
+        for entry_file in self.entry_files:
+            self._exports[entry_file] = exported_names(self._modules[entry_file].tree)
+        self._assign_bundle_names(sorted_modules)
+        if self.lazy_init:
+            self._name_init_functions(sorted_modules)
+
+        # Phase 5: Generate code for each module (in dependency order)
+        for module in sorted_modules:
+            self._generate_module_code(module)
 
-        return preamble + "\n" + combined_code
+        if chunked:
+            return self._split_bundle()
+
+        codes = {}
+        for entry_file in self.entry_files:
+            closure = self._closure(entry_file)
+            modules = [m for m in sorted_modules if m.source_path in closure]
+
+            # Phase 6: Combine the code of the modules of the entry file
+            combined_code = self._combine(modules)
+
+            # Phase 7: Generate combined tree-shaken stdlib
+            preamble = self._generate_stdlib_preamble(modules)
+
+            if self.target == "edge":
+                # A module scope, and the handlers as default export
+                bundled_code = f"{preamble}\n{combined_code}{self._edge_export()}"
+            else:
+                # A single function scope for the stdlib and all the modules
+                bundled_code = f"(function () {{\n{preamble}\n{combined_code}}})();\n"
+            name = self._output_names[entry_file]
+            codes[name] = minify_js(bundled_code) if self.minify else bundled_code
+            self.manifest[self._get_relative_path(entry_file)] = {
+                "file": name,
+                "imports": [],
+            }
+        return self._outputs(codes)
+
+    def _outputs(self, codes: dict[str, str]) -> str:
+        """Keep the code of the other files in ``chunks``, and return the code
+        of the first entry file.
+
+        Args:
+            codes: The code of the files, by file name
+        """
+        self.chunks = {
+            name: code for name, code in codes.items() if name != self.output_name
+        }
+        return codes[self.output_name]
 
     def _parse_recursive(self, file_path: Path) -> ParsedModule:
         """Parse a module and recursively parse its imports.
@@ -149,24 +432,40 @@ class Bundler:
         self._modules[file_path] = module
 
         # Extract and resolve imports
-        imports = self._extract_imports(tree, file_path.parent)
-        for imp_path in imports:
-            if imp_path is not None and imp_path.exists():
-                module.imports.append(imp_path)
+        imports = self._resolve_imports(tree, file_path.parent, lazy=False)
+        module.imports = [path for path in imports.values() if path.exists()]
+
+        # The modules the names imported at split points are bound to
+        imports = self._resolve_imports(tree, file_path.parent, lazy=True)
+        for node, lazy in _import_statements(tree, self.split):
+            if lazy:
+                imported, aliases = {}, {}
+                self._bind_import(node, imports, imported, aliases)
+                module.lazy_imports += aliases.values()
+                module.lazy_imports += (path for path, _ in imported.values())
+        module.lazy_imports = list(dict.fromkeys(module.lazy_imports))
+
+        for imp_path in [*module.imports, *module.lazy_imports]:
+            if imp_path.exists():
                 # Recursively parse imported module
                 self._parse_recursive(imp_path)
 
         return module
 
-    def _extract_imports(self, tree: ast.Module, source_dir: Path) -> list[Path | None]:
+    def _resolve_imports(
+        self, tree: ast.Module, source_dir: Path, lazy: bool | None = None
+    ) -> dict[str, Path]:
         """Extract import statements and resolve to file paths.
 
         Args:
             tree: The AST of the module
             source_dir: Directory containing the source file
+            lazy: Only the imports at split points (True), or only the
+                others (False)
 
         Returns:
-            List of resolved absolute paths (None for unresolvable imports)
+            Resolved absolute paths, by module name as written in the import
+            statement (``geometry``, ``.utils``, ``..``)
         """
         resolver = ModuleResolver(
             source_dir=source_dir,
@@ -174,17 +473,19 @@ class Bundler:
             verify_exists=True,
         )
 
-        imports: list[Path | None] = []
+        imports: dict[str, Path] = {}
 
-        # Walk through all statements in the module
-        for node in tree.body:
+        # Walk through all import statements, in functions too
+        for node, is_lazy in _import_statements(tree, self.split):
+            if lazy is not None and is_lazy != lazy:
+                continue
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     if alias.name == "js":
                         continue  # Skip JS FFI imports
                     result = resolver.resolve(alias.name)
                     if result.found and result.source_path:
-                        imports.append(result.source_path.resolve())
+                        imports[alias.name] = result.source_path.resolve()
 
             elif isinstance(node, ast.ImportFrom):
                 if node.module == "js" or node.module == "__future__":
@@ -196,13 +497,21 @@ class Bundler:
                 if module:
                     result = resolver.resolve(module, level)
                     if result.found and result.source_path:
-                        imports.append(result.source_path.resolve())
+                        key = "." * level + module
+                        imports[key] = result.source_path.resolve()
+                    # 'from pkg import sub' - names may be submodules
+                    for alias in node.names:
+                        name = f"{module}.{alias.name}"
+                        result = resolver.resolve(name, level)
+                        if alias.name != "*" and result.found and result.source_path:
+                            imports["." * level + name] = result.source_path.resolve()
                 else:
                     # 'from . import name' - each name is a separate module
                     for alias in node.names:
                         result = resolver.resolve_import_name(alias.name, level)
                         if result.found and result.source_path:
-                            imports.append(result.source_path.resolve())
+                            key = "." * level + alias.name
+                            imports[key] = result.source_path.resolve()
 
         return imports
 
@@ -240,22 +549,339 @@ class Bundler:
 
         return sorted_list
 
+    def _eliminate_dead_code(self) -> None:
+        """Remove the functions, classes and methods no module can reach."""
+        trees = {
+            self._get_relative_path(path): module.tree
+            for path, module in self._modules.items()
+        }
+        entries = [self._get_relative_path(path) for path in self.entry_files]
+        self.removed = eliminate_dead_code(
+            trees, entries, [*self.keep, *self._handlers]
+        )
+
+        if self.verbosity >= 1:
+            print(f"Removed {len(self.removed)} unused definitions:")
+            for name in self.removed:
+                print(f"  - {name}")
+
+    def _prepare_edge(self, modules: list[ParsedModule]) -> None:
+        """Compute the constant tables of the modules, and check that the
+        top level of the entry file only defines its handlers, functions,
+        classes and constants.
+        """
+        for module in modules:
+            precompute_constants(module.tree)
+
+        entry = self._modules[self.entry_file]
+        rel_path = self._get_relative_path(self.entry_file)
+        defined = {
+            stmt.name
+            for stmt in entry.tree.body
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef))
+        }
+        self._handlers = [name for name in EDGE_HANDLERS if name in defined]
+        if not self._handlers:
+            msg = f"{rel_path} defines no handler for the edge target"
+            raise SemanticError(
+                msg, hint="Define `def fetch(request, env, ctx)` at module level"
+            )
+        for stmt in entry.tree.body:
+            if not is_definition(stmt) and not _is_regex(stmt):
+                msg = f"{rel_path}: top-level code would run on every cold start"
+                raise SemanticError(
+                    msg,
+                    node=stmt,
+                    hint="Move it into a function, or compute the value from "
+                    "constants so it can be computed at compile time",
+                )
+
+    def _edge_export(self) -> str:
+        """Export the handlers of the entry file, for the edge runtime."""
+        handlers = []
+        for name in self._handlers:
+            bundle_name = escape_js_name(self._bundle_name(self.entry_file, name))
+            handlers.append(name if bundle_name == name else f"{name}: {bundle_name}")
+        return f"export default {{ {', '.join(handlers)} }};\n"
+
+    def _bind_module(self, module: ParsedModule) -> None:
+        """Run the passes up to the Binder on a module, and record its names.
+
+        Args:
+            module: The parsed module
+        """
+        tree = desugar(module.tree, self.release)
+        if self.optimize:
+            tree = fold_constants(tree)
+        Binder().visit(tree)
+        module.tree = tree
+
+        scope = tree._scope
+        module.bindings = {
+            name: name for name, var in scope.vars.items() if var.type != "module"
+        }
+        # Names declared global in functions, but not assigned at module level
+        for node in walk(tree):
+            if isinstance(node, ast.Global):
+                module.bindings.update((name, name) for name in node.names)
+
+        imports = self._resolve_imports(tree, module.source_path.parent)
+        lazy = {
+            id(node): is_lazy for node, is_lazy in _import_statements(tree, self.split)
+        }
+        for node, node_scope in walk_scopes(tree, scope):
+            if not isinstance(node, (ast.Import, ast.ImportFrom)):
+                continue
+            if node_scope is scope:
+                self._bind_import(node, imports, module.imported, module.module_aliases)
+            else:
+                local = LocalImport(node, node_scope, lazy[id(node)])
+                self._bind_import(node, imports, local.imported, local.module_aliases)
+                module.local_imports.append(local)
+
+    def _bind_import(
+        self,
+        node: ast.Import | ast.ImportFrom,
+        imports: dict[str, Path],
+        imported: dict[str, tuple[Path, str]],
+        module_aliases: dict[str, Path],
+    ) -> None:
+        """Record the names an import statement binds to bundled modules.
+
+        Args:
+            node: The import statement
+            imports: Resolved paths, by module name (see ``_resolve_imports()``)
+            imported: Names imported from bundled modules, updated
+            module_aliases: Imported bundled modules, updated
+        """
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in imports:
+                    local_name = alias.asname or alias.name
+                    module_aliases[local_name] = imports[alias.name]
+            return
+
+        prefix = "." * node.level
+        if not node.module:
+            # 'from . import name' - each name is a module
+            for alias in node.names:
+                path = imports.get(prefix + alias.name)
+                if path is not None:
+                    module_aliases[alias.asname or alias.name] = path
+            return
+        path = imports.get(prefix + node.module)
+        for alias in node.names:
+            local_name = alias.asname or alias.name
+            submodule = imports.get(f"{prefix}{node.module}.{alias.name}")
+            if submodule is not None:
+                module_aliases[local_name] = submodule
+            elif path is None:
+                continue
+            elif alias.name == "*":
+                for name in self._public_names(path):
+                    imported.setdefault(name, (path, name))
+            else:
+                imported[local_name] = (path, alias.name)
+
+    def _public_names(self, path: Path) -> list[str]:
+        """Return the names a module exports to ``from module import *``."""
+        tree = self._modules[path].tree
+        names = exported_names(tree)
+        if names or not hasattr(tree, "_scope"):
+            return names
+        return [name for name in tree._scope.vars if not name.startswith("_")]
+
+    def _assign_bundle_names(self, modules: list[ParsedModule]) -> None:
+        """Name the module-level bindings of the modules in the bundle.
+
+        The first binding of a name keeps it (dependencies come first), the
+        next ones get ``name$1``, ``name$2``... So do the bindings that would
+        be shadowed by a local variable where they're imported. With the
+        edge target, the handlers are renamed too: the bundle is an ES module,
+        where ``fetch`` would hide the global function.
+        """
+        reserved = set(EDGE_HANDLERS) if self.target == "edge" else set()
+        renamed: set[tuple[Path, str]] = set()
+        while True:
+            taken: set[str] = set(reserved)
+            for module in modules:
+                for name in module.bindings:
+                    bundle_name = name
+                    if name in taken or (module.source_path, name) in renamed:
+                        bundle_name = next(
+                            new_name
+                            for i in count(1)
+                            if (new_name := f"{name}${i}") not in taken
+                        )
+                    taken.add(bundle_name)
+                    module.bindings[name] = bundle_name
+
+            shadowed: set[str] = set()
+            for module in modules:
+                hoister = Hoister(module.tree, *self._hoisted_names(module))
+                shadowed |= hoister.shadowed()
+            new = {
+                (module.source_path, name)
+                for module in modules
+                for name, bundle_name in module.bindings.items()
+                if bundle_name in shadowed
+            } - renamed
+            if not new:
+                return
+            renamed |= new
+
+    def _name_init_functions(self, modules: list[ParsedModule]) -> None:
+        """Choose the lazily initialized modules, and name their init functions.
+
+        The entry files run when the bundle loads, and so do the modules
+        ``import()`` loads (their names are read right away). So do the
+        modules without side effects, which is cheap.
+        """
+        eager = {*self.entry_files, *(chunk.root for chunk in self._chunks)}
+        taken = {name for module in modules for name in module.bindings.values()}
+        for module in modules:
+            path = module.source_path
+            if path in eager or is_side_effect_free(module.tree):
+                continue
+            init = "init$" + self._module_name(path).replace(".", "$")
+            if init in taken:
+                init = next(
+                    new_name
+                    for i in count(1)
+                    if (new_name := f"{init}${i}") not in taken
+                )
+            taken.add(init)
+            self._inits[path] = init
+            for bundle_name in module.bindings.values():
+                self._name_inits[bundle_name] = init
+
+    def _bundle_name(
+        self, path: Path, name: str, seen: frozenset = frozenset()
+    ) -> str | None:
+        """Return the name in the bundle of a module-level name of a module.
+
+        Follows imports (``from utils import helper`` in the module).
+        """
+        module = self._modules.get(path)
+        if module is None:
+            return None
+        if name in module.bindings:
+            return module.bindings[name]
+        target = module.imported.get(name)
+        if target is None or target in seen:
+            return None
+        return self._bundle_name(*target, seen | {target})
+
+    def _hoisted_names(
+        self, module: ParsedModule
+    ) -> tuple[
+        dict[str, str],
+        dict[str, dict[str, str]],
+        dict[int, tuple[dict[str, str], dict[str, dict[str, str]]]],
+    ]:
+        """Return the renamed names of a module, of the modules it imports,
+        and of the imports in its functions.
+
+        See ``hoist_names()``. The names imported at split points from
+        modules that aren't loaded yet are left alone.
+        """
+        names = {
+            name: bundle_name
+            for name, bundle_name in module.bindings.items()
+            if bundle_name != name
+        }
+        imported_names, modules = self._imported_names(
+            module.imported, module.module_aliases
+        )
+        names.update(imported_names)
+
+        local = {}
+        for imp in module.local_imports:
+            local_names, local_modules = local.setdefault(id(imp.scope), ({}, {}))
+            imported_names, imported_modules = self._imported_names(
+                {
+                    local_name: target
+                    for local_name, target in imp.imported.items()
+                    if not imp.lazy or self._is_loaded(module, target[0])
+                },
+                {
+                    local_name: path
+                    for local_name, path in imp.module_aliases.items()
+                    if not imp.lazy or self._is_loaded(module, path)
+                },
+            )
+            local_names.update(imported_names)
+            local_modules.update(imported_modules)
+        return names, modules, local
+
+    def _imported_names(
+        self,
+        imported: dict[str, tuple[Path, str]],
+        module_aliases: dict[str, Path],
+    ) -> tuple[dict[str, str], dict[str, dict[str, str]]]:
+        """Return the renamed imported names, and the names of the imported
+        modules (see ``hoist_names()``)."""
+        names = {}
+        for local_name, (path, name) in imported.items():
+            bundle_name = self._bundle_name(path, name)
+            if bundle_name is not None and bundle_name != local_name:
+                names[local_name] = bundle_name
+
+        modules = {}
+        for local_name, path in module_aliases.items():
+            modules[local_name] = {
+                name: bundle_name
+                for name in self._module_names(path)
+                if (bundle_name := self._bundle_name(path, name)) is not None
+            }
+        return names, modules
+
+    def _module_names(self, path: Path) -> list[str]:
+        """Return the module-level names of a module: its attributes."""
+        module = self._modules[path]
+        return [*module.bindings, *module.imported]
+
     def _generate_module_code(self, module: ParsedModule) -> None:
         """Generate JavaScript code for a module.
 
         This compiles the module without stdlib, collecting used stdlib items.
+        The module must have been through ``_bind_module()``.
 
         Args:
             module: The parsed module to compile
         """
         tree = module.tree
 
-        # Apply compiler passes
-        tree = desugar(tree)
+        # Dependencies come first, so their types are already inferred
+        imported_types = {
+            key: self._modules[path].types
+            for key, path in self._resolve_imports(
+                tree, module.source_path.parent
+            ).items()
+            if path in self._modules
+        }
+        inferer = TypeInference(imported_types)
+        inferer.visit(tree)
         if self.optimize:
-            tree = fold_constants(tree)
-        Binder().visit(tree)
-        TypeInference().visit(tree)
+            inliner = Inliner()
+            inliner.visit(tree)
+            changed = propagate_constants(tree)
+            if inliner.inlined_calls or changed:
+                inferer = TypeInference(imported_types)
+                inferer.visit(tree)
+        module.types = inferer.module_types
+        RangeAnalysis().visit(tree)
+        hoist_names(tree, *self._hoisted_names(module))
+        if self.split:
+            self._mark_split_points(module)
+        own = set(module.bindings.values())
+        inits = {
+            name: init for name, init in self._name_inits.items() if name not in own
+        }
+        if inits:
+            add_init_calls(tree, inits)
+        if self.minify:
+            mangle_locals(tree)
 
         # Generate code with bundling mode (imports become comments)
         codegen = CodeGen(
@@ -267,31 +893,362 @@ class Bundler:
             module_paths=self.module_paths,
             source_map=None,
             bundle_mode=True,  # New flag to suppress import output
+            fast_paths=self.fast_paths,
+            instrument=self.instrument,
+            profile=self.profile,
+            source_name=self._get_relative_path(module.source_path),
+            short_names=self.minify,
+            dummy_offset=self._dummy_count,
+            json_threshold=self.json_threshold,
+            declared=own if module.source_path in self._inits else None,
         )
         module.js_code = codegen.gen()
+        self._dummy_count = codegen.dummy_count
 
         # Collect used stdlib items
         module.used_std_functions = codegen.used_std_functions.copy()
         module.used_std_methods = codegen.used_std_methods.copy()
 
-        # Accumulate across all modules
-        self._all_used_functions.update(module.used_std_functions)
-        self._all_used_methods.update(module.used_std_methods)
+    def _combine(self, modules: list[ParsedModule]) -> str:
+        """Combine the code of modules, with the globals of the entry files.
+
+        Args:
+            modules: The modules, in dependency order
+        """
+        code_parts = []
+        for module in modules:
+            # Add a comment header for each module
+            rel_path = self._get_relative_path(module.source_path)
+            code_parts.append(f"// === Module: {rel_path} ===\n")
+            init = self._inits.get(module.source_path)
+            if init is None:
+                code_parts.append(module.js_code)
+            else:
+                code_parts.append(self._lazy_module_code(module, init))
+            code_parts.append("\n")
 
-    def _generate_stdlib_preamble(self) -> str:
-        """Generate tree-shaken stdlib for all bundled modules.
+        # The names in the entry files' `__all__` are made global
+        for module in modules:
+            for name in self._exports.get(module.source_path, []):
+                bundle_name = self._bundle_name(module.source_path, name)
+                if bundle_name is None:
+                    continue
+                if bundle_name in self._name_inits:
+                    code_parts.append(f"{self._name_inits[bundle_name]}();\n")
+                code_parts.append(f"globalThis.{name} = {bundle_name};\n")
+
+        return "".join(code_parts)
+
+    def _lazy_module_code(self, module: ParsedModule, init: str) -> str:
+        """Wrap the code of a module in its init function, which replaces
+        itself with an empty function when called.
+
+        Its names are declared outside, in the scope of the bundle.
+        """
+        names = ", ".join(escape_js_name(name) for name in module.bindings.values())
+        declaration = f"var {names};\n" if names else ""
+        return (
+            f"{declaration}var {init} = function () {{\n"
+            f"{init} = function () {{}};\n{module.js_code}\n}};\n"
+        )
+
+    def _generate_stdlib_preamble(self, modules: list[ParsedModule]) -> str:
+        """Generate tree-shaken stdlib for bundled modules.
 
         Returns:
             JavaScript stdlib code with only the functions used by any module
         """
         compiler = Compiler()
+        if not self.tree_shake:
+            return compiler.get_full_preamble(
+                self.function_prefix, self.method_prefix, self.release
+            )
         return compiler.get_partial_preamble(
-            self._all_used_functions,
-            self._all_used_methods,
+            {name for module in modules for name in module.used_std_functions},
+            {name for module in modules for name in module.used_std_methods},
             self.function_prefix,
             self.method_prefix,
+            self.release,
         )
 
+    def _layout_chunks(self, modules: list[ParsedModule]) -> None:
+        """Sort the modules into the chunks of a split bundle.
+
+        The entry chunk has the modules the entry file imports outside of
+        split points. A module imported at a split point where it isn't
+        loaded yet gets a chunk, with the modules it imports that aren't in
+        the entry chunk, unless other such modules import them too: those go
+        to a common chunk, one per set of modules that share them.
+
+        With several entry files, each has a chunk, and the modules several
+        of them import go to the shared chunk.
+
+        Args:
+            modules: The modules, in dependency order
+        """
+        order = {module.source_path: i for i, module in enumerate(modules)}
+        closures = {path: self._closure(path) for path in self.entry_files}
+        entry = set().union(*closures.values())
+
+        # Modules loaded with `import()`, and the ones that need each module
+        roots: list[Path] = []
+        owners: dict[Path, set[Path]] = {}
+        queue = [path for path in order if path in entry]
+        for path in queue:
+            for target in self._modules[path].lazy_imports:
+                if target in entry or target in self._closure(path):
+                    continue
+                if target in roots:
+                    continue
+                roots.append(target)
+                for dep in sorted(self._closure(target) - entry, key=order.get):
+                    if dep not in owners:
+                        queue.append(dep)
+                    owners.setdefault(dep, set()).add(target)
+
+        stem = Path(self.output_name).stem
+        entry_chunks = {
+            path: Chunk(self._output_names[path]) for path in self.entry_files
+        }
+        shared_chunk = Chunk(SHARED_CHUNK)
+        lazy_chunks = {
+            root: Chunk(f"{stem}.{self._module_name(root)}.js", root=root)
+            for root in roots
+        }
+        common_chunks: dict[frozenset[Path], Chunk] = {}
+        for module in modules:
+            path = module.source_path
+            users = [file for file, closure in closures.items() if path in closure]
+            if len(users) > 1:
+                chunk = shared_chunk
+            elif users:
+                chunk = entry_chunks[users[0]]
+            elif len(owners[path]) == 1:
+                chunk = lazy_chunks[next(iter(owners[path]))]
+            else:
+                key = frozenset(owners[path])
+                if key not in common_chunks:
+                    name = f"{stem}.common-{len(common_chunks) + 1}.js"
+                    common_chunks[key] = Chunk(name)
+                chunk = common_chunks[key]
+            chunk.modules.append(module)
+            self._chunk_of[path] = chunk
+
+        # The chunks a chunk needs come first (common chunks: the ones with
+        # more owners)
+        commons = sorted(common_chunks.items(), key=lambda item: -len(item[0]))
+        self._chunks = [shared_chunk] if shared_chunk.modules else []
+        self._chunks += entry_chunks.values()
+        self._chunks += [chunk for _, chunk in commons]
+        self._chunks += lazy_chunks.values()
+        for chunk in self._chunks:
+            deps = [dep for module in chunk.modules for dep in module.imports]
+            if chunk.root is not None:
+                deps.append(chunk.root)
+            for dep in deps:
+                required = self._chunk_of[dep]
+                if required is not chunk and required not in chunk.requires:
+                    chunk.requires.append(required)
+
+        if self.verbosity >= 1:
+            print(f"Split into {len(self._chunks)} chunks:")
+            for chunk in self._chunks:
+                print(f"  - {chunk.name}: {len(chunk.modules)} modules")
+
+    def _closure(self, path: Path) -> set[Path]:
+        """Return the modules a module imports outside of split points,
+        directly or not, and the module."""
+        if path not in self._closures:
+            closure = {path}
+            pending = [path]
+            while pending:
+                for dep in self._modules[pending.pop()].imports:
+                    if dep not in closure:
+                        closure.add(dep)
+                        pending.append(dep)
+            self._closures[path] = closure
+        return self._closures[path]
+
+    def _is_loaded(self, module: ParsedModule, path: Path) -> bool:
+        """Check whether a module is loaded when a module of a split bundle
+        runs."""
+        return path in self._closure(self.entry_file) or path in self._closure(
+            module.source_path
+        )
+
+    def _module_name(self, path: Path) -> str:
+        """Return the dotted name of a module (``pkg.charts``)."""
+        for root in [self.entry_file.parent, *self.module_paths]:
+            if path.is_relative_to(root):
+                parts = path.relative_to(root).with_suffix("").parts
+                break
+        else:
+            parts = (path.stem,)
+        if parts[-1] == "__init__" and len(parts) > 1:
+            parts = parts[:-1]
+        return ".".join(parts)
+
+    def _mark_split_points(self, module: ParsedModule) -> None:
+        """Mark the names imported at split points from modules that aren't
+        loaded yet, for the code generator.
+
+        Their aliases get ``_chunk``: (path of the chunk to load, name of the
+        imported name in it, or None for the module).
+        """
+        lazy_chunks = {chunk.root: chunk for chunk in self._chunks if chunk.root}
+        for imp in module.local_imports:
+            if not imp.lazy:
+                continue
+            for alias in imp.node.names:
+                local_name = alias.asname or alias.name
+                if local_name in imp.module_aliases:
+                    path, name = imp.module_aliases[local_name], None
+                elif local_name in imp.imported:
+                    path, name = imp.imported[local_name]
+                else:
+                    continue
+                if not self._is_loaded(module, path):
+                    alias._chunk = ("./" + lazy_chunks[path].name, name)
+
+    def _split_bundle(self) -> str:
+        """Link the chunks of a split bundle, and generate their code.
+
+        Returns:
+            The code of the entry chunk (the others go to ``chunks``)
+        """
+        stdlib = get_stdlib_js(self.function_prefix, self.method_prefix, self.release)
+
+        # The chunks that define each module-level and stdlib name
+        providers: dict[str, list[Chunk]] = {}
+        for chunk in self._chunks:
+            for module in chunk.modules:
+                for bundle_name in module.bindings.values():
+                    providers.setdefault(bundle_name, []).append(chunk)
+                if module.source_path in self._inits:
+                    init = self._inits[module.source_path]
+                    providers.setdefault(init, []).append(chunk)
+
+        for chunk in self._chunks:
+            loaded = self._loaded_chunks(chunk)
+            for required in chunk.requires:
+                chunk.imports.setdefault(required.name, set())
+
+            # The stdlib the chunk needs, that the chunks it loads don't define
+            if not self.tree_shake and not loaded:
+                functions, methods = set(stdlib.functions), set(stdlib.methods)
+            else:
+                functions, methods = stdlib.resolve_dependencies(
+                    {name for m in chunk.modules for name in m.used_std_functions},
+                    {name for m in chunk.modules for name in m.used_std_methods},
+                )
+            for prefix, names, defined in [
+                (self.function_prefix, functions, chunk.std_functions),
+                (self.method_prefix, methods, chunk.std_methods),
+            ]:
+                for name in sorted(names):
+                    provider = next(
+                        (p for p in providers.get(prefix + name, []) if p in loaded),
+                        None,
+                    )
+                    if provider is not None:
+                        self._link(chunk, provider, prefix + name)
+                    else:
+                        defined.add(name)
+                        providers.setdefault(prefix + name, []).append(chunk)
+
+            # The module-level names of the other chunks its modules use
+            for name in sorted(self._referenced_names(chunk)):
+                for provider in providers.get(name, []):
+                    if provider is not chunk and provider in loaded:
+                        self._link(chunk, provider, name)
+                        break
+
+            # A chunk loaded with `import()` exports the names of its module
+            if chunk.root is not None:
+                for name in self._module_names(chunk.root):
+                    bundle_name = self._bundle_name(chunk.root, name)
+                    if bundle_name is None:
+                        continue
+                    for provider in providers.get(bundle_name, []):
+                        if provider is not chunk:
+                            self._link(chunk, provider, bundle_name)
+                        break
+                    chunk.exports[name] = bundle_name
+
+        for entry_file in self.entry_files:
+            chunk = self._chunk_of[entry_file]
+            self.manifest[self._get_relative_path(entry_file)] = {
+                "file": chunk.name,
+                "imports": [required.name for required in self._required_chunks(chunk)],
+            }
+
+        codes = {chunk.name: self._chunk_code(chunk) for chunk in self._chunks}
+        if self.minify:
+            codes = {name: minify_js(code) for name, code in codes.items()}
+        return self._outputs(codes)
+
+    def _required_chunks(self, chunk: Chunk) -> list[Chunk]:
+        """Return the chunks a chunk imports, directly or not, in load order."""
+        required_chunks = []
+        for required in chunk.requires:
+            for dep in [*self._required_chunks(required), required]:
+                if dep not in required_chunks:
+                    required_chunks.append(dep)
+        return required_chunks
+
+    def _loaded_chunks(self, chunk: Chunk) -> list[Chunk]:
+        """Return the chunks loaded when a chunk runs: the chunks it imports,
+        and the entry chunk of a split bundle (it runs the ``import()``)."""
+        loaded = self._required_chunks(chunk)
+        entry_chunk = self._chunk_of[self.entry_file]
+        if self.split and chunk is not entry_chunk and entry_chunk not in loaded:
+            loaded.append(entry_chunk)
+        return loaded
+
+    def _referenced_names(self, chunk: Chunk) -> set[str]:
+        """Return the names the modules of a chunk use (and local ones)."""
+        names = set()
+        for module in chunk.modules:
+            for node in walk(module.tree):
+                if isinstance(node, ast.Name):
+                    names.add(node.id)
+                elif isinstance(node, ast.Global):
+                    names.update(node.names)
+        return names
+
+    def _link(self, chunk: Chunk, provider: Chunk, name: str) -> None:
+        """Import a name of a chunk in another one."""
+        chunk.imports.setdefault(provider.name, set()).add(name)
+        provider.exports[name] = name
+
+    def _chunk_code(self, chunk: Chunk) -> str:
+        """Generate the code of a chunk: an ES module."""
+        code_parts = []
+        for name, names in chunk.imports.items():
+            if names:
+                imported = ", ".join(sorted(escape_js_name(n) for n in names))
+                code_parts.append(f"import {{ {imported} }} from './{name}';\n")
+            else:
+                code_parts.append(f"import './{name}';\n")
+
+        stdlib = get_stdlib_js(self.function_prefix, self.method_prefix, self.release)
+        if chunk.std_functions or chunk.std_methods:
+            code_parts.append(
+                stdlib.get_partial_std_lib(chunk.std_functions, chunk.std_methods)
+            )
+            code_parts.append("\n")
+        code_parts.append(self._combine(chunk.modules))
+
+        if chunk.exports:
+            names = []
+            for name, local_name in sorted(chunk.exports.items()):
+                local_name = escape_js_name(local_name)
+                names.append(
+                    local_name if local_name == name else f"{local_name} as {name}"
+                )
+            code_parts.append(f"export {{ {', '.join(names)} }};\n")
+        return "".join(code_parts)
+
     def _get_relative_path(self, path: Path) -> str:
         """Get a relative path for display purposes."""
         try:
@@ -300,6 +1257,60 @@ class Bundler:
             return str(path)
 
 
+def _is_regex(stmt: ast.stmt) -> bool:
+    """Check whether a statement compiles a constant regular expression
+    (a regex literal in JS)."""
+    match stmt:
+        case ast.Assign(
+            targets=[ast.Name()],
+            value=ast.Call(
+                func=ast.Attribute(value=ast.Name(id="re"), attr="compile"),
+                args=args,
+                keywords=[],
+            ),
+        ):
+            return (
+                bool(args)
+                and isinstance(args[0], ast.Constant)
+                and all(map(_is_regex_flag, args[1:]))
+            )
+    return False
+
+
+def _is_regex_flag(node: ast.expr) -> bool:
+    """Check whether an expression is a combination of ``re`` flags."""
+    match node:
+        case ast.Attribute(value=ast.Name(id="re")):
+            return True
+        case ast.BinOp(left=left, op=ast.BitOr(), right=right):
+            return _is_regex_flag(left) and _is_regex_flag(right)
+    return False
+
+
+def _import_statements(
+    node: ast.AST, split: bool, lazy: bool = False
+) -> Iterator[tuple[ast.Import | ast.ImportFrom, bool]]:
+    """Yield the import statements of a tree, and whether they're split points.
+
+    With ``split``, the imports in ``async def`` functions are split points:
+    they can load their module with ``import()``. Not ``import a.b``, which
+    binds ``a``.
+    """
+    for child in iter_child_nodes(node):
+        match child:
+            case ast.Import(names=aliases):
+                dotted = any("." in a.name and not a.asname for a in aliases)
+                yield child, lazy and not dotted
+            case ast.ImportFrom():
+                yield child, lazy
+            case ast.AsyncFunctionDef():
+                yield from _import_statements(child, split, split)
+            case ast.FunctionDef() | ast.ClassDef():
+                yield from _import_statements(child, split)
+            case _:
+                yield from _import_statements(child, split, lazy)
+
+
 def bundle_files(
     entry_file: Path,
     module_paths: list[Path] | None = None,
@@ -307,6 +1318,15 @@ def bundle_files(
     method_prefix: str = METHOD_PREFIX,
     optimize: bool = True,
     verbosity: int = 0,
+    fast_paths: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
+    tree_shake: bool = True,
+    keep: list[str] | None = None,
+    minify: bool = False,
+    lazy_init: bool = False,
+    release: bool = False,
+    target: str | None = None,
 ) -> str:
     """Bundle a Python entry file and all its dependencies.
 
@@ -317,6 +1337,17 @@ def bundle_files(
         method_prefix: Prefix for stdlib methods
         optimize: Whether to apply compile-time optimizations
         verbosity: Verbosity level
+        fast_paths: Whether to inline type-guarded native operators
+        instrument: Whether to record the types seen at generic sites
+        profile: Types recorded by an instrumented build
+        tree_shake: Whether to only include the used stdlib functions and
+            module definitions
+        keep: Definitions to keep even if unused (``name`` or ``Class.method``)
+        minify: Whether to minify the output
+        lazy_init: Whether to run the top-level code of the modules besides
+            the entry file when their names are first used
+        release: Whether to strip asserts and debug-only runtime work
+        target: Output profile (``"edge"``: an ES module worker)
 
     Returns:
         Bundled JavaScript code with tree-shaken stdlib
@@ -328,5 +1359,14 @@ def bundle_files(
         method_prefix=method_prefix,
         optimize=optimize,
         verbosity=verbosity,
+        fast_paths=fast_paths,
+        instrument=instrument,
+        profile=profile,
+        tree_shake=tree_shake,
+        keep=keep,
+        minify=minify,
+        lazy_init=lazy_init,
+        release=release,
+        target=target,
     )
     return bundler.bundle()
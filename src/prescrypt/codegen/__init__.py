@@ -1,5 +1,5 @@
 from __future__ import annotations
 
-from .main import CodeGen
+from .main import JSON_THRESHOLD, CodeGen
 
-__all__ = ["CodeGen"]
+__all__ = ["JSON_THRESHOLD", "CodeGen"]
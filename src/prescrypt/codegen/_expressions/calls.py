@@ -2,11 +2,20 @@ from __future__ import annotations
 
 from attr import define
 
+from prescrypt.codegen.fast_paths import guarded
 from prescrypt.codegen.main import CodeGen, gen_expr
 from prescrypt.codegen.stdlib_py import stdlib
+from prescrypt.codegen.stdlib_py.modules import (
+    get_function_attribute,
+    get_module_function,
+    resolve_stdlib_function,
+)
+from prescrypt.codegen.stdlib_py.specialized import get_specialization
+from prescrypt.codegen.type_utils import get_type, is_user_method
 from prescrypt.codegen.utils import flatten
+from prescrypt.exceptions import JSError
 from prescrypt.front import ast
-from prescrypt.front.passes.types import JSObject
+from prescrypt.front.passes.types import Dict, JSObject, List, String
 from prescrypt.stdlib_js import StdlibJs
 
 
@@ -62,6 +71,10 @@ class FuncCall:
         stdlib_py = stdlib
         stdlib_js = StdlibJs()
 
+        # Names imported from JS-backed stdlib modules ('from heapq import ...')
+        if std_name := self.codegen.get_stdlib_import(func_name):
+            func_name = std_name
+
         if builtin_func := stdlib_py.get_function(func_name):
             if res := builtin_func(self.codegen, args, keywords):
                 return res
@@ -111,6 +124,42 @@ class FuncCall:
             # All other methods: pass through directly to JS
             return f"{self.gen_func()}{self.gen_args()}"
 
+        # Calls through a JS-backed stdlib module: heapq.heappush(h, x)
+        if isinstance(value, ast.Name) and (
+            module := self.codegen.get_stdlib_module(value.id)
+        ):
+            std_name = get_module_function(module, method_name)
+            if std_name is None:
+                msg = f"Module {module!r} has no supported attribute {method_name!r}"
+                raise JSError(msg)
+            return self.gen_call_named(std_name, args, keywords)
+
+        # Attributes of stdlib functions: chain.from_iterable(x)
+        if (base_name := resolve_stdlib_function(value, self.codegen)) and (
+            std_name := get_function_attribute(base_name, method_name)
+        ):
+            return self.gen_call_named(std_name, args, keywords)
+
+        # Methods of user-defined classes don't need the runtime dispatch
+        # of _pymeth_* functions: p.get(k) -> p.get(k)
+        value_type = get_type(value)
+        if is_user_method(value_type, method_name):
+            self.codegen.specialized_method_calls.add(self.node)
+            return f"{self.gen_func()}{self.gen_args()}"
+
+        # Methods of str, list and dict receivers: xs.append(x) -> xs.push(x)
+        if not keywords and (
+            spec := get_specialization(
+                value,
+                value_type,
+                method_name,
+                args,
+                discarded=getattr(self.node, "_discarded", False),
+            )
+        ):
+            self.codegen.specialized_method_calls.add(self.node)
+            return spec.gen(self.codegen, value, args)
+
         # For class methods like int.from_bytes, pass the original name
         # so the method handler can recognize it
         if isinstance(value, ast.Name):
@@ -122,14 +171,52 @@ class FuncCall:
 
         if builtin_meth := stdlib_py.get_method(method_name):
             if res := builtin_meth(self.codegen, obj_for_handler, args, keywords):
+                self.codegen.generic_method_calls.add(self.node)
                 return res
 
         if method_name in stdlib_js.methods:
             # Use codegen.call_std_method for usage tracking
-            return self.codegen.call_std_method(obj_js, method_name, args)
+            code = self.codegen.call_std_method_site(
+                self.node, obj_js, method_name, args
+            )
+            if not keywords and (fast := self.gen_profiled_method(value, code)):
+                self.codegen.specialized_method_calls.add(self.node)
+                return fast
+            self.codegen.generic_method_calls.add(self.node)
+            return code
 
         return f"{self.gen_func()}{self.gen_args()}"
 
+    def gen_profiled_method(self, value, generic: str) -> str | None:
+        """Guard the native method for the receiver type seen in a profile.
+
+        xs.append(x) -> (Array.isArray(xs) ? xs.push(x) : _pymeth_append...)
+        """
+        method_name, args = self.node.func.attr, self.node.args
+        observed = self.codegen.observed_types(self.node, method_name)
+        if observed is None or not isinstance(value, ast.Name):
+            return None
+        obj_js = self.codegen.gen_expr_unified(value)
+        match observed:
+            case ("list",):
+                receiver_type, guard = List, f"Array.isArray({obj_js})"
+            case ("string",):
+                receiver_type, guard = String, f'typeof {obj_js} === "string"'
+            case ("dict",):
+                receiver_type, guard = Dict, f"{obj_js}.constructor === Object"
+            case _:
+                return None
+        spec = get_specialization(
+            value,
+            receiver_type,
+            method_name,
+            args,
+            discarded=getattr(self.node, "_discarded", False),
+        )
+        if spec is None:
+            return None
+        return guarded(spec.gen(self.codegen, value, args), generic, [guard])
+
     def gen_func(self):
         return self.gen_expr(self.node.func)
 
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
 from prescrypt.codegen.main import CodeGen, gen_expr
+from prescrypt.codegen.stdlib_py.modules import is_lazy_iterable
 from prescrypt.front import ast
 
+# Materialize a comprehension's iterable: iterators, generators and sets are
+# spread into an array, plain objects (dicts) iterate over their keys.
+_ITER_TO_ARRAY = (
+    'if ((typeof iter# === "object") && !Array.isArray(iter#)) {'
+    'iter# = (typeof iter#[Symbol.iterator] === "function") '
+    "? [...iter#] : Object.keys(iter#);}"
+)
+
 
 @gen_expr.register
 def gen_list_comp(node: ast.ListComp, codegen: CodeGen) -> list[str]:
@@ -30,12 +39,13 @@ def gen_list_comp(node: ast.ListComp, codegen: CodeGen) -> list[str]:
         if iter > 0:  # first one is passed to function as an arg
             cc.append(f"let iter# = {codegen.gen_expr_str(comprehension.iter)};")
 
-        cc.append(
-            'if ((typeof iter# === "object") && '
-            "!Array.isArray(iter#)) {iter# = Object.keys(iter#);}"
-        )
-        cc.append("for (let i#=0; i#<iter#.length; i#++) {")
-        cc.append(_iterator_assign("iter#[i#]", *target))
+        if is_lazy_iterable(comprehension.iter, codegen):
+            cc.append("for (let i#=iter#.next(); !i#.done; i#=iter#.next()) {")
+            cc.append(_iterator_assign("i#.value", *target))
+        else:
+            cc.append(_ITER_TO_ARRAY)
+            cc.append("for (let i#=0; i#<iter#.length; i#++) {")
+            cc.append(_iterator_assign("iter#[i#]", *target))
 
         # Ifs
         if_nodes = comprehension.ifs
@@ -171,12 +181,13 @@ def gen_set_comp(node: ast.SetComp, codegen: CodeGen) -> list[str]:
         if iter > 0:  # first one is passed to function as an arg
             cc.append(f"let iter# = {codegen.gen_expr_str(comprehension.iter)};")
 
-        cc.append(
-            'if ((typeof iter# === "object") && '
-            "!Array.isArray(iter#)) {iter# = Object.keys(iter#);}"
-        )
-        cc.append("for (let i#=0; i#<iter#.length; i#++) {")
-        cc.append(_iterator_assign("iter#[i#]", *target))
+        if is_lazy_iterable(comprehension.iter, codegen):
+            cc.append("for (let i#=iter#.next(); !i#.done; i#=iter#.next()) {")
+            cc.append(_iterator_assign("i#.value", *target))
+        else:
+            cc.append(_ITER_TO_ARRAY)
+            cc.append("for (let i#=0; i#<iter#.length; i#++) {")
+            cc.append(_iterator_assign("iter#[i#]", *target))
 
         # Ifs
         if_nodes = comprehension.ifs
@@ -233,12 +244,13 @@ def gen_dict_comp(node: ast.DictComp, codegen: CodeGen) -> list[str]:
         if iter > 0:  # first one is passed to function as an arg
             cc.append(f"let iter# = {codegen.gen_expr_str(comprehension.iter)};")
 
-        cc.append(
-            'if ((typeof iter# === "object") && '
-            "!Array.isArray(iter#)) {iter# = Object.keys(iter#);}"
-        )
-        cc.append("for (let i#=0; i#<iter#.length; i#++) {")
-        cc.append(_iterator_assign("iter#[i#]", *target))
+        if is_lazy_iterable(comprehension.iter, codegen):
+            cc.append("for (let i#=iter#.next(); !i#.done; i#=iter#.next()) {")
+            cc.append(_iterator_assign("i#.value", *target))
+        else:
+            cc.append(_ITER_TO_ARRAY)
+            cc.append("for (let i#=0; i#<iter#.length; i#++) {")
+            cc.append(_iterator_assign("iter#[i#]", *target))
 
         # Ifs
         if_nodes = comprehension.ifs
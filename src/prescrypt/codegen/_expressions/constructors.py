@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import json
+import math
+from collections.abc import Iterator
+
 from prescrypt.codegen.main import CodeGen, gen_expr
 from prescrypt.exceptions import JSError
 from prescrypt.front import ast
+from prescrypt.front.passes.constant_folder import _NOT_EXTRACTABLE, _extract
 
 
 @gen_expr.register
@@ -11,6 +16,8 @@ def gen_list(node: ast.List, codegen: CodeGen):
 
     Lists display as [1, 2, 3] while tuples display as (1, 2, 3).
     """
+    if json_code := _gen_json_literal(node, codegen):
+        return json_code
     elements = [codegen.gen_expr_str(el) for el in node.elts]
     array_code = "[" + ", ".join(elements) + "]"
     # Mark as list so repr() uses [] instead of ()
@@ -19,6 +26,8 @@ def gen_list(node: ast.List, codegen: CodeGen):
 
 @gen_expr.register
 def gen_tuple(node: ast.Tuple, codegen: CodeGen):
+    if json_code := _gen_json_literal(node, codegen):
+        return json_code
     elements = [codegen.gen_expr_str(el) for el in node.elts]
     return "[" + ", ".join(elements) + "]"
 
@@ -36,6 +45,8 @@ def gen_dict(node: ast.Dict, codegen: CodeGen):
     has_unpacking = any(key is None for key in node.keys)
     if has_unpacking:
         return _gen_dict_with_unpacking(codegen, node.keys, node.values)
+    if json_code := _gen_json_literal(node, codegen):
+        return json_code
     return _gen_dict_fallback(codegen, node.keys, node.values)
 
 
@@ -89,3 +100,74 @@ def _gen_dict_fallback(
         ]
     # Use call_std_function for usage tracking
     return codegen.call_std_function("create_dict", func_args)
+
+
+def _gen_json_literal(
+    node: ast.List | ast.Tuple | ast.Dict, codegen: CodeGen
+) -> str | None:
+    """Generate a big constant literal as ``JSON.parse('...')``.
+
+    Engines parse JSON much faster than the equivalent JS literal, which
+    matters for the lookup tables of a module (evaluated once: in functions,
+    literals are copied from a boilerplate, faster than parsing JSON again).
+    Returns None for literals under ``codegen.json_threshold``, and for those
+    JSON can't represent. JSON.parse makes arrays, so lists are marked with
+    ``_pyfunc_mark_lists`` (if all the arrays are lists) or ``_is_list``.
+    """
+    if codegen.json_threshold is None or not codegen.is_module_level():
+        return None
+    value = _extract(node)
+    if value is _NOT_EXTRACTABLE or not _is_json(value):
+        return None
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    if len(text.encode()) < codegen.json_threshold:
+        return None
+
+    nested = list(_nested_sequences(node))
+    has_lists = any(isinstance(seq, ast.List) for seq in nested)
+    has_tuples = isinstance(node, ast.Tuple) or any(
+        isinstance(seq, ast.Tuple) for seq in nested
+    )
+    if has_lists and has_tuples:
+        return None
+
+    quoted = text.replace("\\", "\\\\").replace("'", "\\'")
+    code = f"JSON.parse('{quoted}')"
+    if has_lists:
+        return codegen.call_std_function("mark_lists", [code])
+    if isinstance(node, ast.List):
+        return f"Object.assign({code}, {{_is_list: true}})"
+    return code
+
+
+def _is_json(value) -> bool:
+    """Whether JSON.parse of the JSON of a constant gives its JS value.
+
+    Dict keys must be strings or ints, which JS objects convert to the same
+    strings (``create_dict`` does the same).
+    """
+    match value:
+        case bool() | str() | None:
+            return True
+        case int():
+            return True
+        case float():
+            return math.isfinite(value)
+        case list():
+            return all(_is_json(item) for item in value)
+        case dict():
+            return all(
+                isinstance(key, str) or type(key) is int for key in value
+            ) and all(_is_json(item) for item in value.values())
+        case _:
+            return False
+
+
+def _nested_sequences(node: ast.expr) -> Iterator[ast.List | ast.Tuple]:
+    """The lists and tuples in a constant literal (dict keys are scalars)."""
+    children = node.values if isinstance(node, ast.Dict) else node.elts
+    for child in children:
+        if isinstance(child, (ast.List, ast.Tuple)):
+            yield child
+        if isinstance(child, (ast.List, ast.Tuple, ast.Dict)):
+            yield from _nested_sequences(child)
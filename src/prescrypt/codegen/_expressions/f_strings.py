@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from prescrypt.codegen.main import CodeGen, gen_expr
-from prescrypt.codegen.type_utils import get_type, is_primitive
+from prescrypt.codegen.type_utils import get_type, is_primitive, is_string
 from prescrypt.codegen.utils import js_repr
 from prescrypt.exceptions import JSError
 from prescrypt.front import ast
+from prescrypt.front.passes.types import Bool, union_members
 
 
 @gen_expr.register
@@ -76,8 +77,15 @@ def _try_optimize_fstring(node: ast.JoinedStr, codegen: CodeGen) -> str | None:
                 if not is_primitive(val_type):
                     return None
 
-                # Generate the value expression
+                # Generate the value expression, starting from a string so
+                # numbers are concatenated rather than added
                 js_value = codegen.gen_expr_unified(value)
+                if val_type is Bool:
+                    js_value = f"({js_value} ? 'True' : 'False')"
+                elif Bool in union_members(val_type):
+                    return None
+                if not parts and not is_string(val_type):
+                    parts.append("''")
                 parts.append(js_value)
 
             case _:
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+from prescrypt.codegen.fast_paths import guarded, index_guards, primitive_guards
 from prescrypt.codegen.main import CodeGen, gen_expr
+from prescrypt.codegen.stdlib_py.modules import get_module_function
 from prescrypt.codegen.type_utils import (
     can_use_native_add,
     can_use_native_compare,
+    can_use_strict_equals,
     get_mult_strategy,
+    get_range,
     get_type,
+    is_dict,
+    is_non_negative,
     is_numeric,
     is_string,
 )
 from prescrypt.codegen.utils import flatten, unify
 from prescrypt.constants import ATTRIBUTE_MAP, BINARY_OP, BOOL_OP, COMP_OP, UNARY_OP
+from prescrypt.exceptions import JSError
 from prescrypt.front import ast
+from prescrypt.front.passes.types import Int, List, String, Tuple, base_type
+
+# Operators that dict-like operands (Counter, dict | dict) overload
+DICT_OPS = {ast.Sub: "op_sub", ast.BitOr: "op_or", ast.BitAnd: "op_and"}
+
+# Largest number that `>>> 0` leaves unchanged (once truncated)
+MAX_UINT32 = 2**32 - 1
 
 
 @gen_expr.register
@@ -28,6 +42,13 @@ def gen_attribute(node: ast.Attribute, codegen: CodeGen) -> str:
         if codegen.is_js_ffi_global(name):
             # Direct global from 'from js import X': document.body -> document.body
             return f"{name}.{attr}"
+        # Stdlib module attribute: heapq.heappush -> _pyfunc_heapq_heappush
+        if module := codegen.get_stdlib_module(name):
+            if std_name := get_module_function(module, attr):
+                codegen._used_std_functions.add(std_name)
+                return codegen.function_prefix + std_name
+            msg = f"Module {module!r} has no supported attribute {attr!r}"
+            raise JSError(msg)
 
     # Check for chained JS FFI access: js.console.log -> console.log
     if codegen.is_js_ffi_chain(value_node):
@@ -74,9 +95,36 @@ def gen_subscript(node: ast.Subscript, codegen: CodeGen):
         # For Store context, return the raw subscript expression
         # The assignment handler will use op_setitem
         return f"{js_value}[{js_slice}]"
+    elif isinstance(node.ctx, ast.Load) and _is_native_index(value, slice_node):
+        # No negative index to count from the end, nor __getitem__ to call
+        return f"{js_value}[{js_slice}]"
     else:
         # For Load (and Del) context, use op_getitem for __getitem__ support
-        return codegen.call_std_function("op_getitem", [js_value, js_slice])
+        code = codegen.call_std_site(node, "op_getitem", [js_value, js_slice])
+        if not isinstance(node.ctx, ast.Load) or codegen.instrument:
+            return code
+        observed = codegen.observed_types(node, "op_getitem")
+        if observed is not None:
+            receiver, index = observed
+            if receiver not in ("list", "string") or index != "number":
+                return code
+        elif codegen.fast_paths:
+            receiver = "list"
+        else:
+            return code
+        guards = index_guards(value, js_value, slice_node, js_slice, receiver)
+        if guards is None:
+            return code
+        return guarded(f"{js_value}[{js_slice}]", code, guards)
+
+
+def _is_native_index(value: ast.expr, index: ast.expr) -> bool:
+    """Check whether an index into a list, tuple or str is a plain JS lookup."""
+    return (
+        base_type(get_type(value)) in (List, Tuple, String)
+        and get_type(index) is Int
+        and is_non_negative(index)
+    )
 
 
 def gen_slice_expr(js_value: str, slice_node: ast.Slice, codegen: CodeGen) -> str:
@@ -157,13 +205,19 @@ def gen_bin_op(node: ast.BinOp, codegen: CodeGen) -> str | list:
     right_type = get_type(right_node)
 
     # Handle % operator with possible string formatting
-    # If left type is known string, or if left type is unknown but could be string,
-    # use runtime op_mod which handles both string formatting and numeric modulo
+    # If an operand is a string or of unknown type, use runtime op_mod which
+    # handles both string formatting and numeric modulo
     if isinstance(op, ast.Mod):
-        if is_string(left_type) or not is_numeric(left_type):
-            js_left = codegen.gen_expr_unified(left_node)
-            js_right = codegen.gen_expr_unified(right_node)
+        js_left = codegen.gen_expr_unified(left_node)
+        js_right = codegen.gen_expr_unified(right_node)
+        if not (is_numeric(left_type) and is_numeric(right_type)):
             return codegen.call_std_function("op_mod", [js_left, js_right])
+        if is_non_negative(left_node) and is_non_negative(right_node):
+            return [js_left, " % ", js_right]
+        if isinstance(right_node, (ast.Constant, ast.Name)):
+            # The result of Python's % has the sign of the divisor
+            return ["((", js_left, " % ", js_right, ") + ", js_right, ") % ", js_right]
+        return codegen.call_std_function("op_mod", [js_left, js_right])
 
     js_left = codegen.gen_expr_unified(left_node)
     js_right = codegen.gen_expr_unified(right_node)
@@ -175,7 +229,13 @@ def gen_bin_op(node: ast.BinOp, codegen: CodeGen) -> str | list:
                 return f"({js_left} + {js_right})"
             else:
                 # Unknown or mixed types: use helper for Python semantics
-                return codegen.call_std_function("op_add", [js_left, js_right])
+                code = codegen.call_std_site(node, "op_add", [js_left, js_right])
+                operands = [
+                    (left_node, js_left, left_type),
+                    (right_node, js_right, right_type),
+                ]
+                fast = f"({js_left} + {js_right})"
+                return _fast_path(codegen, node, "op_add", fast, code, operands)
 
         case ast.Mult():
             # Optimize based on operand types
@@ -195,12 +255,29 @@ def gen_bin_op(node: ast.BinOp, codegen: CodeGen) -> str | list:
             return ["Math.pow(", js_left, ", ", js_right, ")"]
 
         case ast.FloorDiv():
+            left_range, right_range = get_range(left_node), get_range(right_node)
+            if (
+                left_range.non_negative
+                and left_range.hi is not None
+                and left_range.hi <= MAX_UINT32
+                and right_range.lo is not None
+                and right_range.lo >= 1
+            ):
+                # The quotient is a non-negative uint32: truncating floors it
+                return [js_left, " / ", js_right, " >>> 0"]
             return ["Math.floor(", js_left, "/", js_right, ")"]
 
         case ast.MatMult():
             # Matrix multiplication operator @
             return codegen.call_std_function("op_matmul", [js_left, js_right])
 
+        case ast.Sub() | ast.BitOr() | ast.BitAnd() if is_dict(left_type) or is_dict(
+            right_type
+        ):
+            # Counter arithmetic, dict merge
+            std_name = DICT_OPS[type(op)]
+            return codegen.call_std_function(std_name, [js_left, js_right])
+
         case _:
             # Default
             js_op = f" {BINARY_OP[op]} "
@@ -221,20 +298,27 @@ def gen_compare(node: ast.Compare, codegen: CodeGen) -> str | list:
     # We've desugar'd chained comparisons, so we only have one op
     assert len(ops) == 1
     op = ops[0]
+    operands = [
+        (left_node, js_left, left_type),
+        (comparator_nodes[0], js_right, right_type),
+    ]
 
     if type(op) in (ast.Eq, ast.NotEq):
         # Optimize when both types are primitives: use === instead of helper
-        if can_use_native_compare(left_type, right_type):
+        if can_use_strict_equals(left_type, right_type):
             if type(op) == ast.NotEq:
                 return f"({js_left} !== {js_right})"
             else:
                 return f"({js_left} === {js_right})"
         else:
             # Unknown or non-primitive types: use helper for deep comparison
-            code = codegen.call_std_function("op_equals", [js_left, js_right])
+            code = codegen.call_std_site(node, "op_equals", [js_left, js_right])
+            js_op = "==="
             if type(op) == ast.NotEq:
                 code = "!" + code
-            return code
+                js_op = "!=="
+            fast = f"({js_left} {js_op} {js_right})"
+            return _fast_path(codegen, node, "op_equals", fast, code, operands)
 
     elif type(op) in (ast.In, ast.NotIn):
         codegen.call_std_function("op_equals", [])  # trigger use of equals
@@ -256,8 +340,32 @@ def gen_compare(node: ast.Compare, codegen: CodeGen) -> str | list:
                 ast.LtE: "op_le",
                 ast.GtE: "op_ge",
             }
-            return codegen.call_std_function(op_map[type(op)], [js_left, js_right])
+            std_name = op_map[type(op)]
+            code = codegen.call_std_site(node, std_name, [js_left, js_right])
+            fast = f"{js_left} {COMP_OP[op]} {js_right}"
+            return _fast_path(codegen, node, std_name, fast, code, operands)
 
     else:
         js_op = COMP_OP[op]
         return f"{js_left} {js_op} {js_right}"
+
+
+def _fast_path(
+    codegen: CodeGen, node: ast.expr, name: str, fast: str, slow: str, operands: list
+) -> str:
+    """Guard a native operator with typeof checks.
+
+    Used at sites where a profile saw only numbers or only strings, and at
+    other sites if fast paths are enabled.
+    """
+    if codegen.instrument:
+        return slow
+    if (observed := codegen.observed_types(node, name)) is not None:
+        if len(set(observed)) != 1 or observed[0] not in ("number", "string"):
+            return slow
+        guards = primitive_guards(operands, observed[0])
+    elif codegen.fast_paths:
+        guards = primitive_guards(operands)
+    else:
+        return slow
+    return slow if guards is None else guarded(fast, slow, guards)
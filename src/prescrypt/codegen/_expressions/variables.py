@@ -96,6 +96,11 @@ def gen_name(node: ast.Name, codegen: CodeGen) -> str:
         codegen._used_std_functions.add(stdlib_name)
         return codegen.function_prefix + stdlib_name
 
+    # Handle names imported from JS-backed stdlib modules (from heapq import ...)
+    if stdlib_name := codegen.get_stdlib_import(name):
+        codegen._used_std_functions.add(stdlib_name)
+        return codegen.function_prefix + stdlib_name
+
     # Auto-rename JavaScript reserved words by appending underscore
     if name in JS_RESERVED_NAMES:
         return escape_js_name(name)
@@ -39,6 +39,15 @@ def gen_assign(node: ast.Assign, codegen: CodeGen):
 
     target_nodes, value_node = node.targets, node.value
 
+    # Augmented item assignment: d[k] += v
+    match target_nodes, value_node:
+        case [ast.Subscript(value, slice_node)], ast.BinOp(
+            op=ast.Add(), right=increment
+        ) if getattr(node, "_augmented", False) and not isinstance(
+            slice_node, ast.Slice
+        ):
+            return gen_item_increment(value, slice_node, increment, codegen)
+
     js_value = codegen.gen_expr_str(value_node)
 
     # Multiple targets: a = b = c = 3
@@ -101,6 +110,22 @@ def gen_assign(node: ast.Assign, codegen: CodeGen):
             raise NotImplementedError(msg)
 
 
+def gen_item_increment(
+    value: ast.expr, slice_node: ast.expr, increment: ast.expr, codegen: CodeGen
+) -> str:
+    """Handle `d[k] += v` as a single get-or-default-and-set operation.
+
+    The container and key are evaluated once, and missing keys of Counters
+    and defaultdicts are filled in without a separate __getitem__ call.
+    """
+    js_obj = codegen.gen_expr_str(value)
+    js_key = codegen.gen_expr_str(slice_node)
+    js_increment = codegen.gen_expr_str(increment)
+    return (
+        f"{codegen.call_std_function('op_iadd_item', [js_obj, js_key, js_increment])};"
+    )
+
+
 def gen_multi_target_assign(
     targets: list[ast.expr], js_value: str, codegen: CodeGen
 ) -> str:
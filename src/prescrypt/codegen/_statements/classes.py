@@ -9,7 +9,7 @@ from prescrypt.exceptions import JSError
 from prescrypt.front import ast
 
 # Regex to match valid JavaScript identifier (allows underscores and dots for namespaced names)
-_VALID_BASE_CLASS_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_.]*$")
+_VALID_BASE_CLASS_RE = re.compile(r"^[a-zA-Z_$][a-zA-Z0-9_$.]*$")
 
 
 @dc_dataclass
@@ -169,6 +169,7 @@ def gen_classdef(node: ast.ClassDef, codegen: CodeGen):
             docstring,
             codegen.function_prefix,
             export=codegen.should_export(node.name),
+            declared=codegen.is_declared(node.name),
         )
     )
     codegen.call_std_function("op_instantiate", [])
@@ -282,10 +283,12 @@ def _make_property_definition(
         parts.append(f"    set: function({value_param}) {{ {setter_body} }},")
     elif "getter" in prop_info:
         # Read-only property: add a setter that throws AttributeError
-        parts.append(
-            f"    set: function(v) {{ throw _pyfunc_op_error('AttributeError', "
-            f"\"property '{prop_name}' has no setter\"); }},"
+        error = codegen.call_std_function(
+            "op_error",
+            [],
+            inline_args=f"'AttributeError', \"property '{prop_name}' has no setter\"",
         )
+        parts.append(f"    set: function(v) {{ throw {error}; }},")
 
     parts.append("    configurable: true")
     parts.append("});")
@@ -326,8 +329,22 @@ def _gen_property_function_body(node: ast.FunctionDef, codegen) -> str:
     return " ".join(flatten(body_parts).split())
 
 
+def _python_name(name: str) -> str:
+    """Return the Python name of a class, from its JS name.
+
+    Nested classes are named ``A.B``, and clashing classes of bundled
+    modules ``A$1`` (see ``front.passes.scope_hoisting``).
+    """
+    return name.rsplit(".", maxsplit=1)[-1].split("$", maxsplit=1)[0]
+
+
 def make_class_definition(
-    name, base="Object", docstring="", function_prefix="_pyfunc_", export=False
+    name,
+    base="Object",
+    docstring="",
+    function_prefix="_pyfunc_",
+    export=False,
+    declared=False,
 ):
     """Get a list of lines that defines a class in JS.
 
@@ -336,7 +353,8 @@ def make_class_definition(
     # Create constructor that works with or without 'new' keyword
     # ES6 export requires 'const' keyword: export const X = ...
     # Non-exported classes need 'var' to avoid strict mode errors
-    decl = "export const " if export else "var "
+    # A declared name (see CodeGen.declared) is only assigned
+    decl = "export const " if export else "" if declared else "var "
     lines = [f"{decl}{name} = function () {{"]
     # Auto-instantiate if called without 'new'
     lines.append(f"    if (!(this instanceof {name})) {{")
@@ -350,7 +368,7 @@ def make_class_definition(
     if base != "Object":
         lines.append(f"{name}.prototype = Object.create({base});")
     lines.append(f"{name}.prototype._base_class = {base};")
-    lines.append(f"{name}.prototype.__name__ = {js_repr(name.split('.')[-1])};")
+    lines.append(f"{name}.prototype.__name__ = {js_repr(_python_name(name))};")
 
     lines.append("")
     return "\n".join(lines)
@@ -397,7 +415,10 @@ def gen_dataclass(node: ast.ClassDef, codegen: CodeGen) -> list[str]:
     params_str = ", ".join(params)
 
     # Generate constructor
-    decl = "export const " if codegen.should_export(name) else "var "
+    if codegen.should_export(name):
+        decl = "export const "
+    else:
+        decl = "" if codegen.is_declared(name) else "var "
     code.append(f"{decl}{name} = function ({params_str}) {{")
     code.append(f"    if (!(this instanceof {name})) {{")
     code.append(f"        return new {name}(...arguments);")
@@ -417,18 +438,19 @@ def gen_dataclass(node: ast.ClassDef, codegen: CodeGen) -> list[str]:
     if base_class != "Object":
         code.append(f"{name}.prototype = Object.create({base_class});")
     code.append(f"{name}.prototype._base_class = {base_class};")
-    code.append(f"{name}.prototype.__name__ = {js_repr(name)};")
+    code.append(f"{name}.prototype.__name__ = {js_repr(_python_name(name))};")
 
     # Generate __repr__
     if options.get("repr", True):
         field_reprs = []
+        repr_name = codegen.function_prefix + "repr"
         for field in fields:
-            field_reprs.append(f"'{field.name}=' + _pyfunc_repr(this.{field.name})")
+            field_reprs.append(f"'{field.name}=' + {repr_name}(this.{field.name})")
         if field_reprs:
             separator = ' + ", " + '
-            repr_body = f"'{name}(' + {separator.join(field_reprs)} + ')'"
+            repr_body = f"'{_python_name(name)}(' + {separator.join(field_reprs)} + ')'"
         else:
-            repr_body = f"'{name}()'"
+            repr_body = f"'{_python_name(name)}()'"
         code.append(
             f"{name}.prototype.__repr__ = function() {{ return {repr_body}; }};"
         )
@@ -439,7 +461,8 @@ def gen_dataclass(node: ast.ClassDef, codegen: CodeGen) -> list[str]:
         eq_checks = [f"other instanceof {name}"]
         for field in fields:
             eq_checks.append(
-                f"_pyfunc_op_equals(this.{field.name}, other.{field.name})"
+                f"{codegen.function_prefix}op_equals"
+                f"(this.{field.name}, other.{field.name})"
             )
         eq_body = " && ".join(eq_checks)
         code.append(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from prescrypt.codegen.main import CodeGen, gen_stmt
+from prescrypt.codegen.stdlib_py.modules import is_lazy_iterable
 from prescrypt.codegen.utils import flatten
 from prescrypt.exceptions import JSError
 from prescrypt.front import ast
@@ -292,24 +293,50 @@ def gen_for(node: ast.For, codegen: CodeGen):
         else_dummy = codegen.dummy("els")
         code.append(codegen.lf(f"let {else_dummy} = true;"))
 
-    # Ensure our iterable is indeed iterable
-    code.append(_make_iterable(codegen, js_iter, d_seq))
-
-    # The loop
-    code.append(
-        codegen.lf(
-            f"for (let {d_iter} = 0; {d_iter} < {d_seq}.length; {d_iter} += 1) {{"
+    if is_lazy_iterable(iter_node, codegen):
+        # Iterators are pulled one item at a time: they may be infinite, and
+        # Python leaves them usable after a break, so neither spread nor
+        # for-of (which closes the iterator on early exit) is appropriate.
+        # Known lazy iterators (itertools, generator expressions, iter())
+        # don't need the array check below.
+        d_next = codegen.dummy("nxt")
+        code.append(codegen.lf(f"let {d_iter} = {js_iter};"))
+        code.append(
+            codegen.lf(
+                f"for (let {d_next} = {d_iter}.next(); !{d_next}.done; "
+                f"{d_next} = {d_iter}.next()) {{"
+            )
         )
-    )
+        js_item = f"{d_next}.value"
+    else:
+        # Arrays are indexed, any other iterable (a generator stored in a
+        # variable, a set, a dict...) is pulled through its iterator
+        d_index = codegen.dummy("idx")
+        d_next = codegen.dummy("nxt")
+        js_iter_call = codegen.call_std_function("iter", [d_seq])
+        code.append(codegen.lf(f"let {d_seq} = {js_iter};"))
+        code.append(
+            codegen.lf(
+                f"let {d_iter} = Array.isArray({d_seq}) ? null : {js_iter_call};"
+            )
+        )
+        code.append(
+            codegen.lf(
+                f"for (let {d_index} = 0, {d_next}; {d_iter} === null ? "
+                f"{d_index} < {d_seq}.length : !({d_next} = {d_iter}.next()).done; "
+                f"{d_index} += 1) {{"
+            )
+        )
+        js_item = f"({d_iter} === null ? {d_seq}[{d_index}] : {d_next}.value)"
     codegen.indent()
 
     # Assign loop variable(s) - no declaration needed, already declared above
     if len(target_names) == 1:
-        code.append(codegen.lf(f"{target_names[0]} = {d_seq}[{d_iter}];"))
+        code.append(codegen.lf(f"{target_names[0]} = {js_item};"))
     else:
         # Tuple unpacking
         d_target = codegen.dummy("tgt")
-        code.append(codegen.lf(f"let {d_target} = {d_seq}[{d_iter}];"))
+        code.append(codegen.lf(f"let {d_target} = {js_item};"))
         for i, name in enumerate(target_names):
             code.append(codegen.lf(f"{name} = {d_target}[{i}];"))
 
@@ -336,41 +363,6 @@ def gen_for(node: ast.For, codegen: CodeGen):
     return flatten(code)
 
 
-def _make_iterable(codegen: CodeGen, name1, name2, newlines=True):
-    """Convert an expression to an iterable array.
-
-    Handles:
-    - Arrays: passed through
-    - Plain objects: converted to Object.keys()
-    - Iterators/generators: converted to array using spread
-    """
-    code = []
-    lf = codegen.lf
-    if not newlines:  # pragma: no cover
-        lf = lambda x: x  # noqa
-
-    if name1 != name2:
-        code.append(lf(f"let {name2} = {name1};"))
-
-    # Handle iterators/generators first (they have Symbol.iterator but not length)
-    code.append(
-        lf(
-            f"if (!Array.isArray({name2}) && typeof {name2}[Symbol.iterator] === 'function') {{"
-        )
-    )
-    code.append(f" {name2} = [...{name2}];")
-    code.append("}")
-
-    # Handle plain objects (convert to keys)
-    code.append(
-        lf(f'else if ((typeof {name2} === "object") && (!Array.isArray({name2}))) {{')
-    )
-    code.append(f" {name2} = Object.keys({name2});")
-    code.append("}")
-
-    return "".join(code)
-
-
 @gen_stmt.register
 def gen_while(node: ast.While, codegen: CodeGen):
     """Generate a while loop with Python-like scoping.
@@ -3,6 +3,7 @@ from __future__ import annotations
 from textwrap import dedent
 
 from prescrypt.codegen.main import CodeGen, gen_stmt
+from prescrypt.codegen.stdlib_py.modules import resolve_stdlib_function
 from prescrypt.codegen.utils import flatten
 from prescrypt.constants import escape_js_name
 from prescrypt.front import ast
@@ -52,6 +53,13 @@ def gen_asyncfunctiondef(node: ast.AsyncFunctionDef, codegen: CodeGen):
     return fun_def.gen()
 
 
+def _is_stdlib_decorator(node: ast.expr, codegen: CodeGen) -> bool:
+    """Check for decorators from JS-backed stdlib modules (@cache, @lru_cache(...))."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    return resolve_stdlib_function(node, codegen) is not None
+
+
 class BaseFunDef:
     _async = ""
 
@@ -129,13 +137,19 @@ class BaseFunDef:
             js_args = self.gen_args()
             js_body = self.gen_body()
             full_name = self.codegen.with_prefix(name)
-            return dedent(
+            code = dedent(
                 f"""
                 {full_name} = {_func} ({js_args}) {{
                 {js_body}
                 }};
                 """
             )
+            # Stdlib decorators (functools.cache, lru_cache) wrap the method
+            for dec in reversed(self.node.decorator_list):
+                if _is_stdlib_decorator(dec, self.codegen):
+                    dec_name = self.codegen.gen_expr_str(dec)
+                    code += f"{full_name} = {dec_name}({full_name});\n"
+            return code
 
     def _gen_nested_function(self, name: str, _func: str):
         """Generate a nested function inside another function."""
@@ -190,18 +204,31 @@ class BaseFunDef:
         # Use let for module mode (export separately), var for regular mode
         if self.codegen.should_export(name):
             # ES6 module mode: declare and export separately
-            decl_keyword = "let"
+            decl_keyword = "let "
             export_stmt = f"\nexport {{ {name} }};"
         else:
             # Regular mode: use var for compatibility
-            decl_keyword = "var"
+            decl_keyword = "" if self.codegen.is_declared(name) else "var "
             export_stmt = ""
 
+        # Apply decorators (in reverse order, innermost first)
+        # Filter out staticmethod/classmethod which are only for class methods
+        decorators = getattr(self.node, "decorator_list", [])
+        applicable = [
+            d
+            for d in decorators
+            if not (isinstance(d, ast.Name) and d.id in ("staticmethod", "classmethod"))
+        ]
+
         # Generate function expression (not declaration) to prevent hoisting
-        # The function name after 'function' is for stack traces/recursion
+        # The function name after 'function' is for stack traces/recursion.
+        # Decorated functions stay anonymous: as in Python, recursive calls
+        # must go through the (decorated) module-level name, e.g. to hit an
+        # lru_cache.
+        expr_name = "" if applicable else f" {name}"
         func_def = dedent(
             f"""
-            {decl_keyword} {name} = {_func} {name}({js_args}) {{
+            {decl_keyword}{name} = {_func}{expr_name}({js_args}) {{
             {js_body}
             }};{export_stmt}
             """
@@ -212,24 +239,13 @@ class BaseFunDef:
         if args_metadata:
             func_def += f"\n{name}.__args__ = {args_metadata};"
 
-        # Apply decorators (in reverse order, innermost first)
-        decorators = getattr(self.node, "decorator_list", [])
-        if decorators:
-            # Filter out staticmethod/classmethod which are only for class methods
-            applicable = [
-                d
-                for d in decorators
-                if not (
-                    isinstance(d, ast.Name) and d.id in ("staticmethod", "classmethod")
-                )
-            ]
-            if applicable:
-                code = [func_def]
-                # Apply decorators in reverse order
-                for dec in reversed(applicable):
-                    dec_name = self.codegen.gen_expr_str(dec)
-                    code.append(f"{name} = {dec_name}({name});\n")
-                return "".join(code)
+        if applicable:
+            code = [func_def]
+            # Apply decorators in reverse order
+            for dec in reversed(applicable):
+                dec_name = self.codegen.gen_expr_str(dec)
+                code.append(f"{name} = {dec_name}({name});\n")
+            return "".join(code)
 
         return func_def
 
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
 from prescrypt.codegen.main import CodeGen, gen_stmt
+from prescrypt.codegen.stdlib_py.modules import (
+    STDLIB_MODULES,
+    get_module_function,
+    is_stdlib_module,
+)
+from prescrypt.codegen.utils import js_repr
+from prescrypt.exceptions import JSError
 from prescrypt.front import ast
 
 
@@ -11,6 +18,8 @@ def _gen_pass(node: ast.Pass, codegen: CodeGen):
 
 @gen_stmt.register
 def _gen_expr(node: ast.Expr, codegen: CodeGen):
+    # The result is unused: some method calls have cheaper native forms
+    node.value._discarded = True
     js_expr = codegen.gen_expr_str(node.value)
     # Flush any pending declarations (e.g., from walrus operator)
     pending_decls = codegen.flush_pending_declarations()
@@ -59,11 +68,29 @@ def _gen_import_from(node: ast.ImportFrom, codegen: CodeGen):
             codegen.add_js_ffi_global(local_name)
         return ""  # No output needed - names are used directly as JS globals
 
+    # Handle "from heapq import heappush" - stdlib modules implemented in JS.
+    # Imported names resolve to stdlib functions at their use sites, so there
+    # is nothing to import at runtime (in any mode).
+    if node.level == 0 and is_stdlib_module(node.module):
+        for alias in node.names:
+            if alias.name == "*":
+                for name, std_name in STDLIB_MODULES[node.module].items():
+                    codegen.add_stdlib_import(name, std_name)
+                continue
+            std_name = get_module_function(node.module, alias.name)
+            if std_name is None:
+                msg = f"Cannot import {alias.name!r} from {node.module!r}"
+                raise JSError(msg)
+            codegen.add_stdlib_import(alias.asname or alias.name, std_name)
+        names = ", ".join(alias.name for alias in node.names)
+        return f"/* from {node.module} import {names} */\n"
+
     # Bundle mode - imports are handled externally, emit a comment
     if codegen.bundle_mode:
         names = ", ".join(alias.name for alias in node.names)
         module_str = node.module or "."
-        return f"/* bundled: from {module_str} import {names} */\n"
+        chunks = _gen_chunk_imports(node.names, codegen)
+        return f"/* bundled: from {module_str} import {names} */\n" + chunks
 
     # In module mode, generate ES6 imports
     if codegen.module_mode:
@@ -115,7 +142,12 @@ def _gen_import(node: ast.Import, codegen: CodeGen):
     # This is a magic import that allows access to JavaScript globals
     # We suppress output and mark the module as FFI
     js_imports = [alias for alias in node.names if alias.name == "js"]
-    other_imports = [alias for alias in node.names if alias.name != "js"]
+    std_imports = [alias for alias in node.names if is_stdlib_module(alias.name)]
+    other_imports = [
+        alias
+        for alias in node.names
+        if alias.name != "js" and not is_stdlib_module(alias.name)
+    ]
 
     if js_imports:
         # Mark 'js' (or its alias) as an FFI module
@@ -123,14 +155,23 @@ def _gen_import(node: ast.Import, codegen: CodeGen):
             local_name = alias.asname or "js"
             codegen.add_js_ffi_name(local_name)
 
-    # If only js imports, return empty
+    # Stdlib modules implemented in JS: 'heapq.heappush(...)' becomes a
+    # direct stdlib call, so no runtime module object is imported
+    for alias in std_imports:
+        codegen.add_stdlib_module(alias.asname or alias.name, alias.name)
+
+    # If only js / stdlib imports, return empty (or a comment)
     if not other_imports:
+        if std_imports:
+            names = ", ".join(alias.name for alias in std_imports)
+            return f"/* import {names} */\n"
         return ""
 
     # Bundle mode - imports are handled externally, emit a comment
     if codegen.bundle_mode:
         names = ", ".join(alias.name for alias in other_imports)
-        return f"/* bundled: import {names} */\n"
+        chunks = _gen_chunk_imports(other_imports, codegen)
+        return f"/* bundled: import {names} */\n" + chunks
 
     # In module mode, generate ES6 imports for non-js imports
     if codegen.module_mode:
@@ -150,3 +191,35 @@ def _gen_import(node: ast.Import, codegen: CodeGen):
     # Non-module mode: emit a comment
     names = ", ".join(alias.name for alias in other_imports)
     return f"/* import {names} */\n"
+
+
+def _gen_chunk_imports(aliases: list[ast.alias], codegen: CodeGen) -> str:
+    """Load the chunks of a split bundle that imported names are in.
+
+    The bundler marks the aliases of the names whose chunk isn't loaded yet
+    with ``_chunk``: (path of the chunk, name in it or None for the module).
+    """
+    code = []
+    namespaces: dict[str, str] = {}
+    for alias in aliases:
+        chunk = getattr(alias, "_chunk", None)
+        if chunk is None:
+            continue
+        path, name = chunk
+        value = f"await import({js_repr(path)})"
+        if name is not None:
+            if path not in namespaces:
+                namespaces[path] = codegen.dummy("chunk")
+                code.append(f"const {namespaces[path]} = {value};\n")
+            value = f"{namespaces[path]}.{name}"
+
+        local_name = alias.asname or alias.name
+        decl = ""
+        if not codegen.ns.is_known(local_name):
+            codegen.add_var(local_name)
+            decl = codegen.get_declaration_kind(local_name)
+        target = codegen.with_prefix(local_name)
+        if decl:
+            target = f"{decl} {target}"
+        code.append(f"{target} = {value};\n")
+    return "".join(code)
@@ -0,0 +1,123 @@
+"""Guarded fast paths for operators on values of unknown type.
+
+Without type information, ``a + b``, ``a == b``, ``a < b`` and ``x[i]``
+call runtime helpers (``op_add``, ``op_equals``, ``op_lt``,
+``op_getitem``) that implement the Python semantics for every type. With
+fast paths enabled, these sites check the types of the operands inline
+and use the native operator when the check passes:
+
+    ((typeof a === "number" && typeof b === "number") ? (a + b)
+        : _pyfunc_op_add(a, b))
+
+This makes the output larger, so it is opt-in (``--fast-paths``). Sites
+where a profile saw a single type (see ``profile.py``) get the same
+checks, for the observed type. Since the operands appear twice, only
+variables are checked; other operands of unknown type keep the helper
+call.
+"""
+
+from __future__ import annotations
+
+from prescrypt.codegen.type_utils import get_type, is_non_negative
+from prescrypt.front import ast
+from prescrypt.front.passes.types import (
+    Float,
+    Int,
+    List,
+    String,
+    Tuple,
+    Unknown,
+    base_type,
+    union_members,
+)
+
+# typeof of the values of each primitive type
+JS_TYPES = {Int: "number", Float: "number", String: "string"}
+
+
+def guarded(fast: str, slow: str, guards: list[str]) -> str:
+    """Return code using ``fast`` when all guards hold, else ``slow``."""
+    if not guards:
+        return fast
+    if len(guards) > 1:
+        condition = "(" + " && ".join(guards) + ")"
+    else:
+        condition = guards[0]
+    return f"({condition} ? {fast} : {slow})"
+
+
+def primitive_guards(
+    operands: list[tuple[ast.expr, str, object]], kind: str | None = None
+) -> list | None:
+    """Return the typeof checks that make a native operator safe, or None.
+
+    ``operands`` holds the node, JS code and type of each operand. The type
+    to check for (``kind``, "number" or "string") is the one seen in a
+    profile, or comes from the operands with (partially) known types: a
+    str operand makes the others checked for strings, an int or float one
+    for numbers. Without hints, numbers are the most likely.
+    """
+    if kind is None:
+        kinds = {
+            JS_TYPES[member]
+            for _node, _js, t in operands
+            for member in union_members(t)
+            if member in JS_TYPES
+        }
+        kind = "string" if kinds == {"string"} else "number"
+
+    guards = []
+    for node, js, t in operands:
+        members = union_members(t)
+        if all(JS_TYPES.get(member) == kind for member in members):
+            continue
+        if t is not Unknown and not any(
+            JS_TYPES.get(member) == kind for member in members
+        ):
+            # A list, a str among numbers...: the guard would always fail
+            return None
+        if not isinstance(node, ast.Name):
+            return None
+        guards.append(f'typeof {js} === "{kind}"')
+    return guards
+
+
+def index_guards(
+    value: ast.expr,
+    js_value: str,
+    index: ast.expr,
+    js_index: str,
+    receiver: str = "list",
+) -> list | None:
+    """Return the checks that make ``value[index]`` a plain JS lookup, or None.
+
+    The value must be an array or a string (no ``__getitem__``) and the
+    index a non-negative integer (negative ones count from the end).
+    ``receiver`` tells which of "list" or "string" to check for when the
+    type of the value is unknown.
+    """
+    guards = []
+    value_type = base_type(get_type(value))
+    if value_type not in (List, Tuple, String):
+        if value_type is not Unknown or not isinstance(value, ast.Name):
+            return None
+        if receiver == "string":
+            guards.append(f'typeof {js_value} === "string"')
+        else:
+            guards.append(f"Array.isArray({js_value})")
+
+    index_type = get_type(index)
+    if isinstance(index, ast.Constant):
+        if type(index.value) is not int or index.value < 0:
+            return None
+    elif not isinstance(index, ast.Name):
+        return None
+    elif index_type is Int:
+        if not is_non_negative(index):
+            guards.append(f"{js_index} >= 0")
+    elif index_type is Unknown:
+        # A non-negative integer (the unsigned shift truncates anything else)
+        guards.append(f"({js_index} >>> 0) === {js_index}")
+    else:
+        return None
+    return guards
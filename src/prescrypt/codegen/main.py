@@ -6,17 +6,24 @@ from functools import singledispatch
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from prescrypt.constants import RETURNING_BOOL
+from prescrypt.constants import returning_bool
 from prescrypt.exceptions import JSError
 from prescrypt.front import Scope, ast
 from prescrypt.front.passes.resolver import ModuleResolver
 from prescrypt.stdlib_js import FUNCTION_PREFIX, METHOD_PREFIX
 
+from .profile import site_key
 from .utils import flatten, unify
 
 if TYPE_CHECKING:
     from prescrypt.sourcemap import SourceMapGenerator
 
+    from .profile import Profile
+
+# Size (in bytes of JSON) from which module-level constant literals are
+# emitted as ``JSON.parse('...')``: engines parse JSON faster than JS literals
+JSON_THRESHOLD = 10 * 1024
+
 
 @singledispatch
 def gen_expr(node: ast.expr, gen: CodeGen) -> str | None:
@@ -53,6 +60,23 @@ class CodeGen:
         method_prefix: Prefix for stdlib method names (default: "_pymeth_").
         module_mode: If True, emit ES6 exports for module-level definitions.
         bundle_mode: If True, suppress import statements (for bundling).
+        fast_paths: If True, guard native operators with inline type checks
+            where types are unknown (faster, larger output).
+        instrument: If True, record the types seen at generic operator and
+            method call sites at runtime, for profile-guided optimization.
+        profile: Types recorded by an instrumented build, used to guard
+            native operators and methods at sites that saw one type.
+        short_names: If True, name temporaries ``$1``, ``$2``... (for
+            minified output).
+        dummy_offset: Number of temporaries named before. The modules of a
+            bundle share a scope, so their temporaries are numbered in
+            sequence (see ``dummy_count``).
+        json_threshold: Size (in bytes of JSON) from which module-level
+            constant lists, tuples and dicts are emitted as
+            ``JSON.parse('...')``, or None to always emit literals.
+        declared: Module-level names declared by the enclosing code, assigned
+            without a declaration (a lazily initialized module of a bundle
+            runs in a function, its names are variables of the bundle).
     """
 
     module: ast.Module
@@ -68,6 +92,14 @@ class CodeGen:
         module_paths: list[Path] | None = None,
         source_map: SourceMapGenerator | None = None,
         bundle_mode: bool = False,
+        fast_paths: bool = False,
+        instrument: bool = False,
+        profile: Profile | None = None,
+        source_name: str = "",
+        short_names: bool = False,
+        dummy_offset: int = 0,
+        json_threshold: int | None = JSON_THRESHOLD,
+        declared: set[str] | None = None,
     ):
         self.module = module
         self._stack = []
@@ -76,7 +108,12 @@ class CodeGen:
         assert isinstance(self.module, ast.Module)
 
         self._indent = 0
-        self._dummy_counter = 0
+        self._dummy_counter = dummy_offset
+        self.short_names = short_names
+        self.json_threshold = json_threshold
+        self.declared = declared or set()
+        for name in self.declared:
+            self.ns.add(name)
 
         self._methods = {}
         self._functions = {}
@@ -84,6 +121,7 @@ class CodeGen:
         # Configurable namespace prefixes
         self.function_prefix = function_prefix
         self.method_prefix = method_prefix
+        self._returning_bool = returning_bool(function_prefix, method_prefix)
 
         # ES6 module mode - emit exports for module-level definitions
         self.module_mode = module_mode
@@ -102,6 +140,11 @@ class CodeGen:
         self._seen_class_names = set()
         self._std_methods = set()
 
+        # Method call sites compiled to native JS or to _pymeth_* calls, for
+        # stats (sets, as some expressions are generated more than once)
+        self.specialized_method_calls: set[ast.Call] = set()
+        self.generic_method_calls: set[ast.Call] = set()
+
         # Track binding scope from Binder (if available)
         self._binding_scope: Scope | None = getattr(module, "_scope", None)
 
@@ -113,6 +156,12 @@ class CodeGen:
         # These are actual JS globals that should NOT be stripped: document -> document
         self._js_ffi_globals: set[str] = set()
 
+        # Python stdlib modules implemented by the JS stdlib (heapq, bisect...)
+        # Module aliases: local name -> module name ('import heapq as hq')
+        self._stdlib_modules: dict[str, str] = {}
+        # Imported names: local name -> stdlib function ('from heapq import heappush')
+        self._stdlib_imports: dict[str, str] = {}
+
         # Source map generation
         self._source_map = source_map
         self._output_line = 0  # Current line in generated output (0-indexed)
@@ -126,6 +175,19 @@ class CodeGen:
         # Bundle mode - suppress import statements (they're bundled)
         self.bundle_mode = bundle_mode
 
+        # Inline guarded fast paths at operators on values of unknown type
+        self.fast_paths = fast_paths
+
+        # Profile-guided optimization: record the types seen at generic
+        # operator and method sites, or use the types recorded in a profile.
+        # Sites are keyed by source_name and position (see profile.py).
+        self.instrument = instrument
+        self.profile = profile
+        self.source_name = source_name
+        if instrument:
+            # Write a profile even if no site is reached
+            self._used_std_functions.add("pgo_sites")
+
         # Cached module resolver (created lazily)
         self._resolver: ModuleResolver | None = None
 
@@ -136,6 +198,11 @@ class CodeGen:
         """Get the current binding scope from the Binder pass."""
         return self._binding_scope
 
+    @property
+    def dummy_count(self) -> int:
+        """Get the number of temporaries named so far (see ``dummy()``)."""
+        return self._dummy_counter
+
     @property
     def used_std_functions(self) -> set[str]:
         """Get the set of stdlib functions used during code generation."""
@@ -285,6 +352,25 @@ class CodeGen:
             case _:
                 return ""
 
+    #
+    # Python stdlib modules
+    #
+    def add_stdlib_module(self, local_name: str, module: str) -> None:
+        """Register 'import module [as local_name]' for a JS-backed stdlib module."""
+        self._stdlib_modules[local_name] = module
+
+    def get_stdlib_module(self, name: str) -> str | None:
+        """Return the stdlib module a local name refers to, if any."""
+        return self._stdlib_modules.get(name)
+
+    def add_stdlib_import(self, local_name: str, std_name: str) -> None:
+        """Register 'from module import name [as local_name]'."""
+        self._stdlib_imports[local_name] = std_name
+
+    def get_stdlib_import(self, name: str) -> str | None:
+        """Return the stdlib function a local name was imported as, if any."""
+        return self._stdlib_imports.get(name)
+
     #
     # Module Resolution
     #
@@ -439,6 +525,38 @@ class CodeGen:
         js_args = list(self.gen_js_args(args))
         return f"{mangled_name}({', '.join(js_args)})"
 
+    def call_std_site(self, node: ast.AST, name: str, args: list) -> str:
+        """Generate a call of a stdlib operator helper (op_add, op_getitem...).
+
+        Instrumented builds record the types of the operands.
+        """
+        if self.instrument and (key := site_key(node, name, self.source_name)):
+            self._used_std_functions.add(name)
+            func = self.function_prefix + name
+            return self.call_std_function("pgo_call", [repr(key), func, *args])
+        return self.call_std_function(name, args)
+
+    def call_std_method_site(
+        self, node: ast.AST, base: str, name: str, args: list
+    ) -> str:
+        """Generate a stdlib method call (see call_std_method).
+
+        Instrumented builds record the type of the receiver.
+        """
+        if self.instrument and (key := site_key(node, name, self.source_name)):
+            self._used_std_methods.add(name)
+            method = self.method_prefix + name
+            args = [repr(key), method, base, *args]
+            return self.call_std_function("pgo_method", args)
+        return self.call_std_method(base, name, args)
+
+    def observed_types(self, node: ast.AST, name: str) -> tuple[str, ...] | None:
+        """Return the types a profile saw at a site, if it saw one combination."""
+        if self.profile is None or self.instrument:
+            return None
+        key = site_key(node, name, self.source_name)
+        return None if key is None else self.profile.observed(key)
+
     def call_std_method(self, base, name: str, args: list) -> str:
         """Generate a method call from the Prescrypt standard library.
 
@@ -479,7 +597,7 @@ class CodeGen:
             or test.count(eq_name)
             or test == '"this_is_js()"'
             or test.startswith("Array.isArray(")
-            or (test.startswith(RETURNING_BOOL) and "||" not in test)
+            or (test.startswith(self._returning_bool) and "||" not in test)
         ):
             return unify(test)
         else:
@@ -515,7 +633,11 @@ class CodeGen:
         The name is added to vars.
         """
         self._dummy_counter += 1
-        name = f"_pytmp_{self._dummy_counter:d}_{name}"
+        if self.short_names:
+            # `$` can't be in Python names
+            name = f"${self._dummy_counter:d}"
+        else:
+            name = f"_pytmp_{self._dummy_counter:d}_{name}"
         self.add_var(name)
         return name
 
@@ -573,6 +695,10 @@ class CodeGen:
         """Check if we're currently at module level (not inside a function or class)."""
         return len(self._stack) == 1 and self._stack[0].type == "module"
 
+    def is_declared(self, name: str) -> bool:
+        """Check whether a module-level name is declared by the enclosing code."""
+        return self.is_module_level() and name in self.declared
+
     def should_export(self, name: str | None = None) -> bool:
         """Check if the current definition should be exported.
 
@@ -0,0 +1,61 @@
+"""Type profiles for profile-guided optimization.
+
+A program compiled with ``instrument=True`` (``py2js --instrument``)
+records the types of the operands of generic operator helpers
+(``op_add``, ``op_getitem``...) and the receivers of ``_pymeth_*`` calls
+at each site, and writes them as JSON when it exits::
+
+    {"version": 1, "sites": {"app.py:12:11:op_add": {"number,number": 940}}}
+
+Sites are keyed by source file, line, column and operator or method name.
+Compiling again with that profile (``py2js --profile-data``) gives the
+sites that only saw one combination of types a guarded native version,
+as with fast paths (see ``fast_paths.py``).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from prescrypt.exceptions import PrescryptError
+
+PROFILE_VERSION = 1
+
+
+class Profile:
+    """The types observed at the sites of an instrumented program."""
+
+    def __init__(self, sites: dict[str, dict[str, int]]):
+        self.sites = sites
+
+    @classmethod
+    def load(cls, path: Path) -> Profile:
+        """Read a profile written by an instrumented program."""
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError) as e:
+            msg = f"Cannot read profile {path}: {e}"
+            raise PrescryptError(msg) from e
+        if not isinstance(data, dict) or data.get("version") != PROFILE_VERSION:
+            msg = f"Unsupported profile format in {path}"
+            raise PrescryptError(msg)
+        return cls(data.get("sites", {}))
+
+    def observed(self, key: str) -> tuple[str, ...] | None:
+        """Return the types seen at a site, if it only saw one combination.
+
+        Returns None for sites that weren't reached or saw several types.
+        """
+        counts = self.sites.get(key)
+        if not counts or len(counts) != 1:
+            return None
+        return tuple(next(iter(counts)).split(","))
+
+
+def site_key(node, name: str, source_name: str = "") -> str | None:
+    """Return the profile key of a site: [file:]line:col:name."""
+    if not hasattr(node, "lineno"):
+        return None
+    key = f"{node.lineno}:{node.col_offset}:{name}"
+    return f"{source_name}:{key}" if source_name else key
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 from prescrypt.codegen.main import CodeGen
 from prescrypt.codegen.type_utils import get_type, is_primitive
 from prescrypt.codegen.utils import flatten, unify
@@ -8,6 +10,8 @@ from prescrypt.front import ast
 from prescrypt.front.passes.types import Bool
 
 from .constructors import function_str
+from .modules import PYTHON_NAMES, REGEX_FLAGS, resolve_stdlib_function
+from .regex import regex_literal
 
 
 #
@@ -282,6 +286,228 @@ def function_sorted(codegen: CodeGen, args, kwargs):
     return codegen.call_std_function("sorted", [args[0], key, reverse])
 
 
+#
+# Stdlib modules (heapq, itertools, functools): keyword arguments are passed
+# positionally
+#
+
+
+def function_heapq_nlargest(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "heapq_nlargest", args, kwargs, ["n", "iterable", "key"]
+    )
+
+
+def function_heapq_nsmallest(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "heapq_nsmallest", args, kwargs, ["n", "iterable", "key"]
+    )
+
+
+def function_itertools_count(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "itertools_count", args, kwargs, ["start", "step"]
+    )
+
+
+def function_itertools_accumulate(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "itertools_accumulate", args, kwargs, ["iterable", "func", "initial"]
+    )
+
+
+def function_itertools_groupby(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "itertools_groupby", args, kwargs, ["iterable", "key"]
+    )
+
+
+def function_itertools_permutations(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "itertools_permutations", args, kwargs, ["iterable", "r"]
+    )
+
+
+def function_itertools_combinations(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "itertools_combinations", args, kwargs, ["iterable", "r"]
+    )
+
+
+def function_functools_lru_cache(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "functools_lru_cache", args, kwargs, ["maxsize", "typed"]
+    )
+
+
+def function_itertools_product(codegen: CodeGen, args, kwargs):
+    # product(*iterables, repeat=1): repeat is passed as the first argument
+    repeat = ast.Constant(1)
+    for kw in kwargs:
+        if kw.arg == "repeat":
+            repeat = kw.value
+        else:
+            msg = f"Invalid keyword argument for product: {kw.arg!r}"
+            raise JSError(msg)
+    return codegen.call_std_function("itertools_product", [repeat, *args])
+
+
+def function_collections_Counter(codegen: CodeGen, args, kwargs):
+    # Counter(iterable, a=1, **counts): the keyword counts are passed as a dict
+    if not kwargs:
+        return None
+    counts = ast.Dict(
+        keys=[None if kw.arg is None else ast.Constant(kw.arg) for kw in kwargs],
+        values=[kw.value for kw in kwargs],
+    )
+    iterable = args[0] if args else "undefined"
+    return codegen.call_std_function("collections_Counter", [iterable, counts])
+
+
+def function_re_compile(codegen: CodeGen, args, kwargs):
+    # Module-level literal patterns become precompiled regex literals
+    if codegen.is_module_level() and (
+        pattern := _gen_regex_pattern(codegen, args, kwargs)
+    ):
+        return pattern
+    return _gen_kwargs_as_positional(
+        codegen, "re_compile", args, kwargs, ["pattern", "flags"]
+    )
+
+
+def function_re_search(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "re_search", args, kwargs, ["pattern", "string", "flags"]
+    )
+
+
+def function_re_match(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "re_match", args, kwargs, ["pattern", "string", "flags"]
+    )
+
+
+def function_re_fullmatch(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "re_fullmatch", args, kwargs, ["pattern", "string", "flags"]
+    )
+
+
+def function_re_findall(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "re_findall", args, kwargs, ["pattern", "string", "flags"]
+    )
+
+
+def function_re_finditer(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "re_finditer", args, kwargs, ["pattern", "string", "flags"]
+    )
+
+
+def function_re_sub(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen,
+        "re_sub",
+        args,
+        kwargs,
+        ["pattern", "repl", "string", "count", "flags"],
+    )
+
+
+def function_re_subn(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen,
+        "re_subn",
+        args,
+        kwargs,
+        ["pattern", "repl", "string", "count", "flags"],
+    )
+
+
+def function_re_split(codegen: CodeGen, args, kwargs):
+    return _gen_kwargs_as_positional(
+        codegen, "re_split", args, kwargs, ["pattern", "string", "maxsplit", "flags"]
+    )
+
+
+def _gen_regex_pattern(codegen: CodeGen, args, kwargs) -> str | None:
+    """Build a Pattern from a regex literal for re.compile("...", flags).
+
+    Returns None unless the pattern is a string literal and the flags are
+    known at compile time.
+    """
+    match args:
+        case [ast.Constant(value=str(pattern))]:
+            flags_node = next((kw.value for kw in kwargs if kw.arg == "flags"), None)
+        case [ast.Constant(value=str(pattern)), flags_node] if not kwargs:
+            pass
+        case _:
+            return None
+    flags = _static_regex_flags(codegen, flags_node)
+    if flags is None:
+        return None
+
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        msg = f"Invalid regular expression {pattern!r}: {e}"
+        raise JSError(msg) from e
+
+    if (literal := regex_literal(pattern, flags)) is None:
+        return None
+    js_regex, flags = literal
+    codegen._used_std_functions.add("re_Pattern")
+    js_pattern = codegen.gen_expr_str(args[0])
+    js_args = f"{js_regex}, {js_pattern}, {int(flags)}"
+    return f"new {codegen.function_prefix}re_Pattern({js_args})"
+
+
+def _static_regex_flags(codegen: CodeGen, node) -> int | None:
+    """Evaluate re flags known at compile time: re.I | re.M, 0, ..."""
+    match node:
+        case None:
+            return 0
+        case ast.Constant(value=int(value)) if not isinstance(value, bool):
+            return value
+        case ast.BinOp(left=left, op=ast.BitOr(), right=right):
+            left_flags = _static_regex_flags(codegen, left)
+            right_flags = _static_regex_flags(codegen, right)
+            if left_flags is None or right_flags is None:
+                return None
+            return left_flags | right_flags
+    std_name = resolve_stdlib_function(node, codegen)
+    if std_name and std_name.removeprefix("re_") in REGEX_FLAGS:
+        return int(getattr(re, std_name.removeprefix("re_")))
+    return None
+
+
+def _gen_kwargs_as_positional(
+    codegen: CodeGen, name: str, args, kwargs, params: list[str]
+):
+    """Call a stdlib function, mapping keyword arguments onto `params`.
+
+    Returns None when there are no keyword arguments, so the caller falls
+    back to a plain stdlib call.
+    """
+    if not kwargs:
+        return None
+
+    py_name = PYTHON_NAMES.get(name, name)
+    free_params = params[len(args) :]
+    by_name = {}
+    for kw in kwargs:
+        if kw.arg not in free_params:
+            msg = f"Invalid keyword argument for {py_name}: {kw.arg!r}"
+            raise JSError(msg)
+        by_name[kw.arg] = kw.value
+
+    values = list(args) + [by_name.get(param, "undefined") for param in free_params]
+    while values and values[-1] == "undefined":
+        values.pop()
+    return codegen.call_std_function(name, values)
+
+
 def function_super(codegen: CodeGen, args, kwargs):
     """Handle super() calls.
 
@@ -27,6 +27,27 @@ def method_sort(codegen: CodeGen, base, args, kwargs):
     return codegen.call_std_method(base, "sort", [key, reverse])
 
 
+def method_update(codegen: CodeGen, base, args, kwargs):
+    return _gen_counts_method(codegen, base, "update", args, kwargs)
+
+
+def method_subtract(codegen: CodeGen, base, args, kwargs):
+    return _gen_counts_method(codegen, base, "subtract", args, kwargs)
+
+
+def _gen_counts_method(codegen: CodeGen, base, name: str, args, kwargs):
+    """dict.update() / Counter.subtract(): keyword arguments are passed as a
+    dict, after the positional mapping or iterable."""
+    if not kwargs:
+        return None
+    mapping = ast.Dict(
+        keys=[None if kw.arg is None else ast.Constant(kw.arg) for kw in kwargs],
+        values=[kw.value for kw in kwargs],
+    )
+    other = args[0] if args else "undefined"
+    return codegen.call_std_method(base, name, [other, mapping])
+
+
 def method_format(codegen: CodeGen, base, args, kwargs):
     # Pass through to runtime - it handles both positional and keyword args
     return codegen.call_std_method(base, "format", args)
@@ -0,0 +1,170 @@
+"""Python standard library modules backed by the JS stdlib.
+
+Maps ``module -> {python name -> stdlib function name}``. Names imported
+from these modules (``from heapq import heappush``) or accessed through
+them (``import heapq; heapq.heappush(...)``) compile to direct calls to
+the corresponding ``_pyfunc_*`` function, so no runtime module object is
+needed and tree-shaking only pulls in what is actually used.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from prescrypt.front import ast
+
+if TYPE_CHECKING:
+    from prescrypt.codegen.main import CodeGen
+
+# re flags: long name -> short name
+REGEX_FLAGS = {
+    "ASCII": "A",
+    "DOTALL": "S",
+    "IGNORECASE": "I",
+    "MULTILINE": "M",
+    "UNICODE": "U",
+    "VERBOSE": "X",
+}
+
+STDLIB_MODULES: dict[str, dict[str, str]] = {
+    "bisect": {
+        name: name
+        for name in (
+            "bisect",
+            "bisect_left",
+            "bisect_right",
+            "insort",
+            "insort_left",
+            "insort_right",
+        )
+    },
+    "heapq": {
+        name: "heapq_" + name
+        for name in (
+            "heapify",
+            "heappush",
+            "heappop",
+            "heappushpop",
+            "heapreplace",
+            "nlargest",
+            "nsmallest",
+        )
+    },
+    "collections": {
+        name: "collections_" + name
+        for name in ("Counter", "OrderedDict", "defaultdict")
+    },
+    "functools": {
+        "cache": "functools_cache",
+        "lru_cache": "functools_lru_cache",
+    },
+    "itertools": {
+        name: "itertools_" + name
+        for name in (
+            "accumulate",
+            "chain",
+            "combinations",
+            "count",
+            "groupby",
+            "islice",
+            "permutations",
+            "product",
+            "takewhile",
+        )
+    },
+    "re": {
+        **{
+            name: "re_" + name
+            for name in (
+                "compile",
+                "escape",
+                "findall",
+                "finditer",
+                "fullmatch",
+                "match",
+                "purge",
+                "search",
+                "split",
+                "sub",
+                "subn",
+                "Match",
+                "Pattern",
+            )
+        },
+        **{
+            name: "re_" + flag
+            for flag, short in REGEX_FLAGS.items()
+            for name in (flag, short)
+        },
+    },
+}
+
+# Reverse mapping, for error messages: stdlib function -> python name
+PYTHON_NAMES: dict[str, str] = {
+    std_name: name
+    for functions in STDLIB_MODULES.values()
+    for name, std_name in functions.items()
+}
+
+# Attributes of stdlib functions: chain.from_iterable(...)
+FUNCTION_ATTRIBUTES: dict[str, dict[str, str]] = {
+    "itertools_chain": {"from_iterable": "itertools_chain_from_iterable"},
+}
+
+# Stdlib functions returning lazy iterators (JS generators). For-loops over
+# these pull items without checking for an array first.
+LAZY_ITERATORS = frozenset(
+    list(STDLIB_MODULES["itertools"].values())
+    + ["itertools_chain_from_iterable", "re_finditer"]
+)
+
+
+def is_stdlib_module(module: str | None) -> bool:
+    return module in STDLIB_MODULES
+
+
+def get_module_function(module: str, name: str) -> str | None:
+    """Return the stdlib function implementing ``module.name``, if any."""
+    return STDLIB_MODULES.get(module, {}).get(name)
+
+
+def get_function_attribute(std_name: str, attr: str) -> str | None:
+    """Return the stdlib function implementing ``std_name.attr``, if any."""
+    return FUNCTION_ATTRIBUTES.get(std_name, {}).get(attr)
+
+
+def resolve_stdlib_function(node: ast.expr, codegen: CodeGen) -> str | None:
+    """Return the stdlib function a name or module attribute refers to.
+
+    Handles ``heappush`` (after ``from heapq import heappush``),
+    ``heapq.heappush`` (after ``import heapq``) and attributes of stdlib
+    functions such as ``chain.from_iterable``.
+    """
+    match node:
+        case ast.Name(id=name):
+            return codegen.get_stdlib_import(name)
+        case ast.Attribute(value=ast.Name(id=name), attr=attr) if (
+            codegen.get_stdlib_module(name)
+        ):
+            return get_module_function(codegen.get_stdlib_module(name), attr)
+        case ast.Attribute(value=value, attr=attr):
+            if base_name := resolve_stdlib_function(value, codegen):
+                return get_function_attribute(base_name, attr)
+    return None
+
+
+def is_lazy_iterable(node: ast.expr, codegen: CodeGen) -> bool:
+    """Check whether an iterable expression is known to be a lazy iterator.
+
+    Loops over any iterable but an array pull one item at a time
+    (``it.next()``); for these, the code doesn't need to check for an array
+    at runtime.
+    """
+    match node:
+        case ast.GeneratorExp():
+            return True
+        case ast.Call(func=ast.Name(id="iter"), args=[_]):
+            return True
+        case ast.Call(func=func):
+            return resolve_stdlib_function(func, codegen) in LAZY_ITERATORS
+    return False
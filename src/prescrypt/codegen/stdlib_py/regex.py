@@ -0,0 +1,141 @@
+"""Translation of Python regular expressions to JS RegExp syntax.
+
+Mirrors ``re_translate`` in the JS stdlib, which handles patterns only
+known at runtime; the two must stay in sync. Patterns known at compile
+time are emitted as regex literals, so they cost nothing to compile at
+runtime.
+"""
+
+from __future__ import annotations
+
+import re
+
+# Flag letters of a leading inline group: (?i), (?ms), ...
+INLINE_FLAGS = {
+    "a": re.ASCII,
+    "i": re.IGNORECASE,
+    "L": re.LOCALE,
+    "m": re.MULTILINE,
+    "s": re.DOTALL,
+    "u": re.UNICODE,
+    "x": re.VERBOSE,
+}
+
+# Python syntax with no JS equivalent (scoped inline flags, atomic groups,
+# possessive quantifiers): such patterns are left to the runtime, which
+# reports the error when the pattern is used rather than when loading.
+_UNSUPPORTED = re.compile(r"\(\?[aiLmsux-]+:|\(\?>|[*+?}]\+")
+
+
+def translate_pattern(pattern: str, flags: int = 0) -> tuple[str, str, int]:
+    """Return the JS source and flags of a Python pattern, and its re flags."""
+    if inline := re.match(r"\(\?([aiLmsux]+)\)", pattern):
+        for c in inline.group(1):
+            flags |= INLINE_FLAGS[c]
+        pattern = pattern[inline.end() :]
+    verbose = bool(flags & re.VERBOSE)
+    multiline = bool(flags & re.MULTILINE)
+
+    res = []
+    in_class = False
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            next_c = pattern[i + 1 : i + 2]
+            if not in_class and next_c == "A":
+                res.append(r"(?<![\s\S])")
+            elif not in_class and next_c == "Z":
+                res.append(r"(?![\s\S])")
+            else:
+                res.append(pattern[i : i + 2])
+            i += 2
+        elif in_class:
+            if c == "]":
+                in_class = False
+            res.append(c)
+            i += 1
+        elif c == "[":
+            in_class = True
+            res.append(c)
+            i += 1
+            if pattern[i : i + 1] == "^":
+                res.append("^")
+                i += 1
+            if pattern[i : i + 1] == "]":
+                # A leading "]" is a literal in Python, an empty class in JS
+                res.append(r"\]")
+                i += 1
+        elif pattern.startswith("(?P<", i):
+            res.append("(?<")
+            i += 4
+        elif pattern.startswith("(?P=", i):
+            j = pattern.index(")", i)
+            res.append(r"\k<" + pattern[i + 4 : j] + ">")
+            i = j + 1
+        elif pattern.startswith("(?#", i):
+            i = pattern.index(")", i) + 1
+        elif c == "$" and not multiline:
+            res.append(r"(?=\n?(?![\s\S]))")
+            i += 1
+        elif c == "{" and re.match(r"\{,\d+\}", pattern[i:]):
+            res.append("{0,")
+            i += 2
+        elif verbose and c.isspace():
+            i += 1
+        elif verbose and c == "#":
+            j = pattern.find("\n", i)
+            i = n if j < 0 else j + 1
+        else:
+            res.append(c)
+            i += 1
+
+    if not flags & re.ASCII:
+        flags |= re.UNICODE  # Implied for str patterns
+    js_flags = "g"
+    if flags & re.IGNORECASE:
+        js_flags += "i"
+    if multiline:
+        js_flags += "m"
+    if flags & re.DOTALL:
+        js_flags += "s"
+    return "".join(res), js_flags, flags
+
+
+def regex_literal(pattern: str, flags: int = 0) -> tuple[str, int] | None:
+    """Return a JS regex literal for a Python pattern, and its re flags.
+
+    Returns None when the pattern can't be expressed as a JS literal.
+    """
+    source, js_flags, flags = translate_pattern(pattern, flags)
+    if _UNSUPPORTED.search(source):
+        return None
+
+    res = []
+    i = 0
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            escaped = source[i + 1 : i + 2]
+            res.append("\\" + _escape_literal_char(escaped).lstrip("\\"))
+            i += 2
+            continue
+        res.append(_escape_literal_char(c))
+        i += 1
+    return f"/{''.join(res) or '(?:)'}/{js_flags}", flags
+
+
+def _escape_literal_char(c: str) -> str:
+    """Escape characters that can't appear as-is in a JS regex literal."""
+    match c:
+        case "/":
+            return r"\/"
+        case "\n":
+            return r"\n"
+        case "\r":
+            return r"\r"
+        case "\u2028":
+            return r"\u2028"
+        case "\u2029":
+            return r"\u2029"
+    return c
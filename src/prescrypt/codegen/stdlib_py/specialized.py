@@ -0,0 +1,162 @@
+"""Native JS for the methods of str, list and dict receivers.
+
+Method calls normally go through the ``_pymeth_*`` functions of the JS
+stdlib, which check the type of the receiver on each call to choose
+between the Python method and a JS method of the same name. When type
+inference knows that the receiver is a str, a list or a dict, the calls
+listed here compile to the equivalent native JS instead:
+``xs.append(x)`` -> ``xs.push(x)``, ``s.upper()`` -> ``s.toUpperCase()``.
+
+Only calls with the same behaviour as the stdlib method are listed, for
+the argument types they accept; anything else keeps the generic call.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from prescrypt.codegen.type_utils import get_type
+from prescrypt.front import ast
+from prescrypt.front.passes.types import (
+    Dict,
+    List,
+    String,
+    Tuple,
+    Unknown,
+    Void,
+    base_type,
+    item_type,
+    union_members,
+)
+
+if TYPE_CHECKING:
+    from prescrypt.codegen import CodeGen
+
+
+@dataclass(frozen=True)
+class Specialization:
+    """The JS code of a method call, for a number of arguments.
+
+    ``template`` gets the receiver as ``{obj}`` and the arguments as
+    ``{0}``, ``{1}``...; each of them appears once, so that they are
+    evaluated once. ``args`` gives the kind of each argument (see
+    ``_accepts``). ``statement`` marks templates whose value differs from
+    the Python result (mostly None), used only when the result is unused.
+    ``reorder`` marks templates evaluating the arguments before the
+    receiver, used only for receivers without side effects.
+    """
+
+    template: str
+    args: tuple[str, ...] = ()
+    statement: bool = False
+    reorder: bool = False
+
+    def gen(self, codegen: CodeGen, receiver: ast.expr, args: list[ast.expr]) -> str:
+        """Fill in the template with the JS code of the receiver and args."""
+        obj_js = codegen.gen_expr_unified(receiver)
+        js_args = [
+            codegen.gen_expr_unified(arg)
+            if f"{{{i}}}." in self.template
+            else codegen.gen_expr_str(arg)
+            for i, arg in enumerate(args)
+        ]
+        return self.template.format(*js_args, obj=obj_js)
+
+
+# (receiver type, method name) -> specializations, by number of arguments
+SPECIALIZATIONS: dict[tuple[type, str], tuple[Specialization, ...]] = {
+    # str
+    (String, "upper"): (Specialization("{obj}.toUpperCase()"),),
+    (String, "lower"): (Specialization("{obj}.toLowerCase()"),),
+    (String, "strip"): (Specialization("{obj}.trim()"),),
+    (String, "lstrip"): (Specialization("{obj}.trimStart()"),),
+    (String, "rstrip"): (Specialization("{obj}.trimEnd()"),),
+    (String, "startswith"): (Specialization("{obj}.startsWith({0})", ("str",)),),
+    (String, "endswith"): (Specialization("{obj}.endsWith({0})", ("str",)),),
+    (String, "find"): (Specialization("{obj}.indexOf({0})", ("str",)),),
+    (String, "rfind"): (Specialization("{obj}.lastIndexOf({0})", ("str",)),),
+    (String, "split"): (Specialization("{obj}.split({0})", ("separator",)),),
+    (String, "replace"): (
+        Specialization("{obj}.split({0}).join({1})", ("separator", "str")),
+    ),
+    (String, "join"): (Specialization("{0}.join({obj})", ("array",), reorder=True),),
+    # list
+    (List, "append"): (Specialization("{obj}.push({0})", ("any",), statement=True),),
+    (List, "extend"): (
+        Specialization("{obj}.push(...{0})", ("iterable",), statement=True),
+    ),
+    (List, "insert"): (
+        Specialization("{obj}.splice({0}, 0, {1})", ("any", "any"), statement=True),
+    ),
+    (List, "reverse"): (Specialization("{obj}.reverse()", statement=True),),
+    (List, "clear"): (Specialization("{obj}.length = 0", statement=True),),
+    (List, "copy"): (Specialization("{obj}.slice()"),),
+    # dict
+    (Dict, "get"): (
+        Specialization("({obj}[{0}] ?? null)", ("any",)),
+        Specialization("({obj}[{0}] ?? {1})", ("any", "default")),
+    ),
+    (Dict, "keys"): (Specialization("Object.keys({obj})"),),
+    (Dict, "values"): (Specialization("Object.values({obj})"),),
+    (Dict, "items"): (Specialization("Object.entries({obj})"),),
+}
+
+
+def get_specialization(
+    receiver: ast.expr,
+    receiver_type,
+    method_name: str,
+    args: list[ast.expr],
+    discarded: bool = False,
+) -> Specialization | None:
+    """Return the native JS template for a method call, if there is one.
+
+    ``discarded`` tells whether the result of the call is unused.
+    """
+    base = base_type(receiver_type)
+    for spec in SPECIALIZATIONS.get((base, method_name), ()):
+        if len(spec.args) != len(args):
+            continue
+        if spec.statement and not discarded:
+            continue
+        if spec.reorder and not _is_pure(receiver):
+            continue
+        if all(
+            _accepts(kind, arg, receiver_type) for kind, arg in zip(spec.args, args)
+        ):
+            return spec
+    return None
+
+
+def _accepts(kind: str, arg: ast.expr, receiver_type) -> bool:
+    """Check whether an argument is of the kind expected by a template."""
+    arg_type = get_type(arg)
+    match kind:
+        case "any":
+            return not isinstance(arg, ast.Starred)
+        case "str":
+            return arg_type is String
+        case "separator":
+            # Python raises on empty separators, JS splits between chars
+            value = arg.value if isinstance(arg, ast.Constant) else None
+            return isinstance(value, str) and value != ""
+        case "array":
+            return base_type(arg_type) in (List, Tuple)
+        case "iterable":
+            return base_type(arg_type) in (List, Tuple, String)
+        case "default":
+            # `??` also replaces None values, and evaluates the default lazily
+            value_type = item_type(receiver_type)
+            return (
+                _is_pure(arg)
+                and value_type is not Unknown
+                and Void not in union_members(value_type)
+            )
+    msg = f"Unknown argument kind: {kind!r}"
+    raise ValueError(msg)
+
+
+def _is_pure(node: ast.expr) -> bool:
+    """Check whether evaluating an expression has no side effects."""
+    return isinstance(node, (ast.Constant, ast.Name))
@@ -6,7 +6,20 @@ Provides helper functions to check AST node types and make codegen decisions.
 from __future__ import annotations
 
 from prescrypt.front import ast
-from prescrypt.front.passes.types import Bool, Float, Int, List, String, Unknown
+from prescrypt.front.passes.ranges import UNBOUNDED, Range
+from prescrypt.front.passes.types import (
+    Bool,
+    ClassType,
+    Dict,
+    Float,
+    Int,
+    List,
+    String,
+    Unknown,
+    Void,
+    base_type,
+    union_members,
+)
 
 
 def get_type(node):
@@ -34,17 +47,34 @@ def get_type(node):
     return Unknown
 
 
+def get_range(node) -> Range:
+    """Get the range of values of a numeric AST node.
+
+    Returns UNBOUNDED if no range information is available.
+    """
+    if getattr(node, "_range", None) is not None:
+        return node._range
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return Range(node.value, node.value)
+    return UNBOUNDED
+
+
+def is_non_negative(node) -> bool:
+    """Check if a node is a number that is known to be >= 0."""
+    return get_range(node).non_negative
+
+
 def is_numeric(t) -> bool:
-    """Check if type is numeric (Int, Float, or Bool).
+    """Check if type is numeric (Int, Float, or Bool, or a union of them).
 
     Bool is included because JavaScript treats booleans as numeric in arithmetic.
     """
-    return t in (Int, Float, Bool)
+    return all(member in (Int, Float, Bool) for member in union_members(t))
 
 
 def is_primitive(t) -> bool:
     """Check if type is a primitive (can use === for comparison)."""
-    return t in (Int, Float, Bool, String)
+    return all(member in (Int, Float, Bool, String) for member in union_members(t))
 
 
 def is_string(t) -> bool:
@@ -53,8 +83,25 @@ def is_string(t) -> bool:
 
 
 def is_list(t) -> bool:
-    """Check if type is List."""
-    return t is List
+    """Check if type is List, with or without element type."""
+    return base_type(t) is List
+
+
+def is_dict(t) -> bool:
+    """Check if type is Dict, with or without key and value types."""
+    return base_type(t) is Dict
+
+
+def is_user_method(t, name: str) -> bool:
+    """Check if values of a type are instances of classes defining a method.
+
+    None is allowed in the type, as getting a method of None raises.
+    """
+    members = [member for member in union_members(t) if member is not Void]
+    return bool(members) and all(
+        isinstance(member, ClassType) and member.lookup_method(name) is not None
+        for member in members
+    )
 
 
 def is_known(t) -> bool:
@@ -102,3 +149,18 @@ def can_use_native_compare(left_type, right_type) -> bool:
     Native ===, !==, <, >, <=, >= are safe when both types are primitives.
     """
     return is_primitive(left_type) and is_primitive(right_type)
+
+
+def can_use_strict_equals(left_type, right_type) -> bool:
+    """Check if === and !== give the result of == and != in Python.
+
+    Bools are numbers in Python (``1 == True``), not in JS.
+    """
+    if not can_use_native_compare(left_type, right_type):
+        return False
+    numbers = (Int, Float)
+    left, right = union_members(left_type), union_members(right_type)
+    return not (
+        (Bool in left and any(t in numbers for t in right))
+        or (Bool in right and any(t in numbers for t in left))
+    )
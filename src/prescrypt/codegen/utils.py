@@ -9,18 +9,19 @@ def unify(x):
 
     Braces are placed around it if it's not alphanumerical
     """
-    # Note that r'[\.\w]' matches anyting in 'ab_01.äé'
+    # Note that r'[\.\w]' matches anyting in 'ab_01.äé' ('$' is in the
+    # generated names)
 
     if isinstance(x, (tuple, list)):
         x = "".join(x)
 
     if x[0] in "'\"" and x[0] == x[-1] and x.count(x[0]) == 2:
         return x  # string
-    elif re.match(r"^[.\w]*$", x, re.UNICODE):
+    elif re.match(r"^[.\w$]*$", x, re.UNICODE):
         return x  # words consisting of normal chars, numbers and dots
-    elif re.match(r"^[.\w]*\(.*\)$", x, re.UNICODE) and x.count(")") == 1:
+    elif re.match(r"^[.\w$]*\(.*\)$", x, re.UNICODE) and x.count(")") == 1:
         return x  # function calls (e.g. 'super()' or 'foo.bar(...)')
-    elif re.match(r"^[.\w]*\[.*]$", x, re.UNICODE) and x.count("]") == 1:
+    elif re.match(r"^[.\w$]*\[.*]$", x, re.UNICODE) and x.count("]") == 1:
         return x  # indexing
     elif re.match(r"^\{.*}$", x, re.UNICODE) and x.count("}") == 1:
         return x  # dicts
@@ -39,7 +40,7 @@ def flatten(js_code: list | str, sep="") -> str:
         case str(s):
             return s
         case [*x]:
-            assert x[0] != "\nA"
+            assert not x or x[0] != "\nA"
             return sep.join(flatten(s) for s in x)
         case _:
             msg = f"Unexpected type: {type(js_code)}"
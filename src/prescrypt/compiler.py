@@ -5,15 +5,27 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from .codegen import CodeGen
+from .codegen import JSON_THRESHOLD, CodeGen
 from .front import ast
 from .front.passes.binder import Binder
 from .front.passes.constant_folder import fold_constants
+from .front.passes.constant_propagator import propagate_constants
 from .front.passes.desugar import desugar
+from .front.passes.inliner import Inliner
+from .front.passes.mangler import mangle_locals
+from .front.passes.ranges import RangeAnalysis
 from .front.passes.type_inference import TypeInference
-from .stdlib_js import FUNCTION_PREFIX, METHOD_PREFIX, StdlibJs
+from .minify import minify_js
+from .stdlib_js import (
+    FUNCTION_PREFIX,
+    METHOD_PREFIX,
+    SHORT_FUNCTION_PREFIX,
+    SHORT_METHOD_PREFIX,
+    StdlibJs,
+)
 
 if TYPE_CHECKING:
+    from .codegen.profile import Profile
     from .sourcemap import SourceMapGenerator
 
 
@@ -27,22 +39,36 @@ def _format_time(seconds: float) -> str:
         return f"{seconds:.2f}s"
 
 
-# Cache stdlib instances by prefix combination
-_stdlib_cache: dict[tuple[str, str], StdlibJs] = {}
+# Cache stdlib instances by prefix combination (and build mode)
+_stdlib_cache: dict[tuple[str, str, bool], StdlibJs] = {}
 
 
 def get_stdlib_js(
     function_prefix: str = FUNCTION_PREFIX,
     method_prefix: str = METHOD_PREFIX,
+    release: bool = False,
 ) -> StdlibJs:
     """Get a StdlibJs instance for the given prefixes (cached)."""
-    key = (function_prefix, method_prefix)
+    key = (function_prefix, method_prefix, release)
     if key not in _stdlib_cache:
-        _stdlib_cache[key] = StdlibJs(function_prefix, method_prefix)
+        _stdlib_cache[key] = StdlibJs(function_prefix, method_prefix, release)
     return _stdlib_cache[key]
 
 
+def short_prefixes(function_prefix: str, method_prefix: str) -> tuple[str, str]:
+    """Return the prefixes of minified output: the default ones are shortened."""
+    if function_prefix == FUNCTION_PREFIX:
+        function_prefix = SHORT_FUNCTION_PREFIX
+    if method_prefix == METHOD_PREFIX:
+        method_prefix = SHORT_METHOD_PREFIX
+    return function_prefix, method_prefix
+
+
 class Compiler:
+    # The stdlib functions and methods used by the last compiled code
+    used_std_functions: set[str]
+    used_std_methods: set[str]
+
     def compile(
         self,
         source: str,
@@ -56,6 +82,14 @@ class Compiler:
         module_paths: list[Path] | None = None,
         source_map: SourceMapGenerator | None = None,
         verbosity: int = 0,
+        fast_paths: bool = False,
+        instrument: bool = False,
+        profile: Profile | None = None,
+        source_name: str = "",
+        minify: bool = False,
+        runtime_import: str | None = None,
+        json_threshold: int | None = JSON_THRESHOLD,
+        release: bool = False,
     ) -> str:
         """Compile Python source to JavaScript.
 
@@ -71,6 +105,25 @@ class Compiler:
             module_paths: Additional directories to search for modules
             source_map: Optional SourceMapGenerator to populate with mappings
             verbosity: Verbosity level (0=quiet, 1=stages, 2=AST, 3=debug)
+            fast_paths: Whether to inline type-guarded native operators where
+                types are unknown (faster but larger code, default False)
+            instrument: Whether to record the types seen at generic operator
+                and method sites, written to a profile when the program exits
+            profile: Types recorded by an instrumented build, to guard native
+                code at the sites that saw a single type
+            source_name: Name of the source file in profile site keys
+            minify: Whether to remove whitespace and comments, and shorten
+                local names, temporaries and (with the stdlib) the default
+                stdlib prefixes
+            runtime_import: Path of an ES module exporting the stdlib (a
+                shared runtime, e.g. ``./prescrypt_runtime.js``) to import
+                the used stdlib functions from, instead of including them
+            json_threshold: Size (in bytes of JSON) from which module-level
+                constant literals are emitted as ``JSON.parse('...')``, or
+                None to always emit literals
+            release: Whether to remove ``assert`` statements and
+                ``if __debug__:`` blocks, and strip the debug-only checks of the
+                stdlib functions (like ``python -O``)
 
         Returns:
             JavaScript code
@@ -93,7 +146,7 @@ class Compiler:
 
         # Stage 2: Desugar
         stage("desugar")
-        tree = desugar(tree)
+        tree = desugar(tree, release)
 
         if verbosity >= 2:
             print("=== After desugar ===", file=sys.stderr)
@@ -116,7 +169,27 @@ class Compiler:
         stage("infer")
         TypeInference().visit(tree)
 
-        # Stage 6: Code generation
+        # Stage 6: Inline small functions, propagate constants
+        inliner = Inliner()
+        if optimize:
+            stage("inline")
+            inliner.visit(tree)
+            stage("propagate")
+            changed = propagate_constants(tree)
+            if inliner.inlined_calls or changed:
+                # Types of the inlined and folded code
+                TypeInference().visit(tree)
+        RangeAnalysis().visit(tree)
+
+        if minify:
+            stage("mangle")
+            mangle_locals(tree)
+            if include_stdlib or runtime_import is not None:
+                function_prefix, method_prefix = short_prefixes(
+                    function_prefix, method_prefix
+                )
+
+        # Stage 7: Code generation
         stage("codegen")
         codegen = CodeGen(
             tree,
@@ -126,6 +199,12 @@ class Compiler:
             source_dir,
             module_paths,
             source_map,
+            fast_paths=fast_paths,
+            instrument=instrument,
+            profile=profile,
+            source_name=source_name,
+            short_names=minify,
+            json_threshold=json_threshold,
         )
         js_code = codegen.gen()
         stage("done")
@@ -140,28 +219,49 @@ class Compiler:
                 print(f"  {name:12} {_format_time(duration)}", file=sys.stderr)
             total_time = time.perf_counter() - total_start
             print(f"  {'total':12} {_format_time(total_time)}", file=sys.stderr)
+            print(
+                f"Method calls: {len(codegen.specialized_method_calls)} specialized, "
+                f"{len(codegen.generic_method_calls)} generic",
+                file=sys.stderr,
+            )
+            print(f"Inlined calls: {inliner.inlined_calls}", file=sys.stderr)
 
-        if not include_stdlib:
-            return js_code
+        # For shared runtimes (which have to include them)
+        self.used_std_functions = codegen.used_std_functions
+        self.used_std_methods = codegen.used_std_methods
 
-        if tree_shake:
+        if runtime_import is not None:
+            preamble = self.get_runtime_import(
+                runtime_import,
+                codegen.used_std_functions,
+                codegen.used_std_methods,
+                function_prefix,
+                method_prefix,
+            )
+        elif not include_stdlib:
+            return minify_js(js_code, source_map) if minify else js_code
+        elif tree_shake:
             # Generate only the used stdlib functions
             preamble = self.get_partial_preamble(
                 codegen.used_std_functions,
                 codegen.used_std_methods,
                 function_prefix,
                 method_prefix,
+                release,
             )
         else:
             # Include the full stdlib
-            preamble = self.get_full_preamble(function_prefix, method_prefix)
+            preamble = self.get_full_preamble(function_prefix, method_prefix, release)
+        if not preamble:
+            return minify_js(js_code, source_map) if minify else js_code
 
         # If source map is being generated, account for preamble lines
         if source_map is not None:
             preamble_lines = preamble.count("\n") + 1
             self._offset_source_map(source_map, preamble_lines)
 
-        return preamble + "\n" + js_code
+        js_code = preamble + "\n" + js_code
+        return minify_js(js_code, source_map) if minify else js_code
 
     def _offset_source_map(self, source_map: SourceMapGenerator, offset: int) -> None:
         """Offset all source map mappings by the given number of lines.
@@ -175,9 +275,10 @@ class Compiler:
         self,
         function_prefix: str = FUNCTION_PREFIX,
         method_prefix: str = METHOD_PREFIX,
+        release: bool = False,
     ) -> str:
         """Get the full stdlib preamble (all functions)."""
-        stdlib = get_stdlib_js(function_prefix, method_prefix)
+        stdlib = get_stdlib_js(function_prefix, method_prefix, release)
         return stdlib.get_full_std_lib()
 
     def get_partial_preamble(
@@ -186,9 +287,10 @@ class Compiler:
         used_methods: set[str],
         function_prefix: str = FUNCTION_PREFIX,
         method_prefix: str = METHOD_PREFIX,
+        release: bool = False,
     ) -> str:
         """Get a partial stdlib preamble with only the used functions and their dependencies."""
-        stdlib = get_stdlib_js(function_prefix, method_prefix)
+        stdlib = get_stdlib_js(function_prefix, method_prefix, release)
 
         # Resolve all dependencies
         all_funcs, all_methods = stdlib.resolve_dependencies(
@@ -198,6 +300,25 @@ class Compiler:
         # Generate the partial stdlib
         return stdlib.get_partial_std_lib(all_funcs, all_methods)
 
+    def get_runtime_import(
+        self,
+        runtime_import: str,
+        used_functions: set[str],
+        used_methods: set[str],
+        function_prefix: str = FUNCTION_PREFIX,
+        method_prefix: str = METHOD_PREFIX,
+    ) -> str:
+        """Get the import of the used stdlib functions from a shared runtime."""
+        stdlib = get_stdlib_js(function_prefix, method_prefix)
+        functions = sorted(used_functions & stdlib.functions.keys())
+        methods = sorted(used_methods & stdlib.methods.keys())
+        names = [function_prefix + name for name in functions] + [
+            method_prefix + name for name in methods
+        ]
+        if not names:
+            return ""
+        return f"import {{ {', '.join(names)} }} from '{runtime_import}';"
+
 
 def py2js(
     code: str,
@@ -211,6 +332,14 @@ def py2js(
     module_paths: list[Path] | None = None,
     source_map: SourceMapGenerator | None = None,
     verbosity: int = 0,
+    fast_paths: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
+    source_name: str = "",
+    minify: bool = False,
+    runtime_import: str | None = None,
+    json_threshold: int | None = JSON_THRESHOLD,
+    release: bool = False,
 ) -> str:
     """Compile Python code to JavaScript.
 
@@ -226,6 +355,17 @@ def py2js(
         module_paths: Additional directories to search for modules
         source_map: Optional SourceMapGenerator to populate with mappings
         verbosity: Verbosity level (0=quiet, 1=stages, 2=AST, 3=debug)
+        fast_paths: Whether to inline type-guarded native operators where
+            types are unknown (faster but larger code)
+        instrument: Whether to record the types seen at generic sites
+        profile: Types recorded by an instrumented build
+        source_name: Name of the source file in profile site keys
+        minify: Whether to minify the output
+        runtime_import: Path of a shared runtime ES module to import the
+            stdlib from, instead of including it
+        json_threshold: Size from which module-level constant literals are
+            emitted as ``JSON.parse('...')`` (None to disable)
+        release: Whether to strip asserts and debug-only runtime work
 
     Returns:
         JavaScript code
@@ -243,4 +383,12 @@ def py2js(
         module_paths=module_paths,
         source_map=source_map,
         verbosity=verbosity,
+        fast_paths=fast_paths,
+        instrument=instrument,
+        profile=profile,
+        source_name=source_name,
+        minify=minify,
+        runtime_import=runtime_import,
+        json_threshold=json_threshold,
+        release=release,
     )
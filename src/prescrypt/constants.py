@@ -156,7 +156,17 @@ _bool_meths = (
     "isupper",
     "startswith",
 )
-RETURNING_BOOL = tuple(
-    [stdlib_js.FUNCTION_PREFIX + x + "(" for x in _bool_funcs]
-    + [stdlib_js.METHOD_PREFIX + x + "." for x in _bool_meths]
-)
+
+
+def returning_bool(
+    function_prefix: str = stdlib_js.FUNCTION_PREFIX,
+    method_prefix: str = stdlib_js.METHOD_PREFIX,
+) -> tuple[str, ...]:
+    """Return the starts of the stdlib calls that return a bool."""
+    return tuple(
+        [function_prefix + x + "(" for x in _bool_funcs]
+        + [method_prefix + x + "." for x in _bool_meths]
+    )
+
+
+RETURNING_BOOL = returning_bool()
@@ -34,6 +34,29 @@ class Scope:
         else:
             return None
 
+    def resolve(self, name: str) -> Scope | None:
+        """Return the scope a name used in this scope refers to, or None.
+
+        Unlike ``search()``, follows Python's rules: the bodies of enclosing
+        classes are skipped, only this scope is searched if it's a class.
+        """
+        scope = self
+        while scope is not None:
+            if name in scope.vars and (scope is self or scope.type != "class"):
+                return scope
+            scope = scope.parent
+        return None
+
+    def frame(self) -> Scope:
+        """Return the function or module scope running this scope's code.
+
+        Class bodies and comprehensions run as part of the enclosing code.
+        """
+        scope = self
+        while scope.parent is not None and scope.type in ("class", "comprehension"):
+            scope = scope.parent
+        return scope
+
     def is_global(self) -> bool:
         """Returns True if this is the global (module) scope."""
         return self.parent is None
@@ -3,6 +3,7 @@ from __future__ import annotations
 from . import ast
 from .passes.binder import Binder
 from .passes.desugar import desugar
+from .passes.ranges import RangeAnalysis
 from .passes.type_inference import TypeInference
 
 
@@ -17,5 +18,6 @@ def to_ast(code: str) -> ast.Module:
     # Enables: native operators when types are known, === for primitives, etc.
     inferer = TypeInference()
     inferer.visit(tree)
+    RangeAnalysis().visit(tree)
 
     return tree
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from prescrypt.front import ast
+from ast import iter_child_nodes
+from collections.abc import Iterator
+
+from prescrypt.front import Scope, ast
+
+# Expressions with their own scope
+COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
 
 
 class Visitor(ast.NodeVisitor):
@@ -38,3 +44,47 @@ class Transformer(ast.NodeTransformer):
 
     def visit_list(self, node_list: list[ast.AST | ast.expr]):
         return [self.visit(node) for node in node_list]
+
+
+def walk_scopes(node: ast.AST, scope: Scope) -> Iterator[tuple[ast.AST, Scope]]:
+    """Yield the nodes of a tree, with the scope their names are looked up in.
+
+    Decorators, default values, base classes and the first iterable of a
+    comprehension belong to the enclosing scope. Annotations are skipped.
+    """
+    yield node, scope
+    inner = getattr(node, "_scope", None) or scope
+    match node:
+        case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.Lambda():
+            args = node.args
+            outer = [
+                *getattr(node, "decorator_list", []),
+                *args.defaults,
+                *[default for default in args.kw_defaults if default is not None],
+            ]
+            body = node.body if isinstance(node.body, list) else [node.body]
+            for child in outer:
+                yield from walk_scopes(child, scope)
+            for child in body:
+                yield from walk_scopes(child, inner)
+        case ast.ClassDef():
+            for child in [*node.decorator_list, *node.bases, *node.keywords]:
+                yield from walk_scopes(child, scope)
+            for child in node.body:
+                yield from walk_scopes(child, inner)
+        case _ if isinstance(node, COMPREHENSIONS):
+            first, *rest = node.generators
+            yield from walk_scopes(first.iter, scope)
+            yield from walk_scopes(first.target, inner)
+            for child in [*first.ifs, *rest]:
+                yield from walk_scopes(child, inner)
+            for field in ("elt", "key", "value"):
+                if hasattr(node, field):
+                    yield from walk_scopes(getattr(node, field), inner)
+        case ast.AnnAssign():
+            yield from walk_scopes(node.target, scope)
+            if node.value is not None:
+                yield from walk_scopes(node.value, scope)
+        case _:
+            for child in iter_child_nodes(node):
+                yield from walk_scopes(child, scope)
@@ -23,6 +23,8 @@ class Binder(Visitor):
         self.scope = Scope()
         # Loop we're currently in (needed for break and continue)
         self.loop = None
+        # Names declared global in functions
+        self.global_names: set[str] = set()
 
     # Scope management
     def push_scope(self, scope_type: str, node: ast.AST):
@@ -49,6 +51,12 @@ class Binder(Visitor):
         node._scope = self.scope
         self.visit_list(node.body)
 
+        # Functions declaring a global may run after any assignment to it,
+        # including those that come after the function
+        for name in self.global_names:
+            if name in self.scope.vars:
+                self.scope.vars[name].is_const = False
+
     #
     # Scope-creating nodes
     #
@@ -207,6 +215,7 @@ class Binder(Visitor):
             # Register in current scope as a marker
             # The actual variable lives in the module scope
             self.scope.vars[name] = Variable(name=name, type="global")
+            self.global_names.add(name)
 
             # Mark the module-level variable as mutable since it can be modified
             # via the global declaration
@@ -329,6 +338,28 @@ class Binder(Visitor):
                 self.visit(item.optional_vars)
         self.visit_list(node.body)
 
+    #
+    # Match statements
+    #
+    def visit_MatchAs(self, node: ast.MatchAs):
+        """Capture pattern (``case x``, ``case [1, _] as x``)."""
+        if node.pattern:
+            self.visit(node.pattern)
+        if node.name:
+            self.add_var(node.name)
+
+    def visit_MatchStar(self, node: ast.MatchStar):
+        """Star pattern (``case [first, *rest]``)."""
+        if node.name:
+            self.add_var(node.name)
+
+    def visit_MatchMapping(self, node: ast.MatchMapping):
+        """Mapping pattern, with an optional ``**rest``."""
+        self.visit_list(node.keys)
+        self.visit_list(node.patterns)
+        if node.rest:
+            self.add_var(node.rest)
+
     #
     # Comprehension generators
     #
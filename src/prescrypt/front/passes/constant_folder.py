@@ -47,6 +47,8 @@ def _extract(node: ast.expr) -> Any:
             extracted_vals = [_extract(val) for val in vals]
             if _NOT_EXTRACTABLE in extracted_keys or _NOT_EXTRACTABLE in extracted_vals:
                 return _NOT_EXTRACTABLE
+            if any(isinstance(key, list) for key in extracted_keys):
+                return _NOT_EXTRACTABLE  # Tuple keys (extracted as lists)
             return dict(zip(extracted_keys, extracted_vals))
         case _:
             return _NOT_EXTRACTABLE
@@ -0,0 +1,295 @@
+"""Constant propagation and dead code elimination.
+
+Constant folding (``constant_folder.py``) only sees literals. This pass,
+run after the Binder, also replaces the reads of variables assigned once
+with a constant (``is_const`` in the Binder's scopes), folds the resulting
+expressions, and removes the code that can't run or has no effect:
+
+    DEBUG = False
+    N = 64
+
+    def f(msg):
+        size = N * N        # removed: unused once propagated
+        if DEBUG:           # removed: the test folds to False
+            print(msg)
+        return size         # -> return 4096
+        print("unreachable")  # removed
+
+Removed are the branches of ``if`` statements with a constant test, ``while``
+loops with a false one, the statements after a ``return``, ``raise``,
+``break`` or ``continue``, and the assignments of constants, variables and
+literals of them to local variables that are never read. Module-level
+variables are kept, since other modules can import them.
+
+Only numbers, bools, None and short strings are propagated, so that the
+output doesn't grow.
+"""
+
+from __future__ import annotations
+
+import ast as _ast
+from ast import copy_location, iter_fields
+from collections import Counter
+
+from prescrypt.front import Scope, ast
+
+from .base import walk_scopes
+from .constant_folder import ConstantFolder
+
+# Maximum number of passes over the tree
+MAX_ROUNDS = 4
+
+# Longest string to copy to the reads of a variable
+MAX_STRING_LENGTH = 16
+
+# Statements after which the rest of a block doesn't run
+TERMINAL_STATEMENTS = (ast.Return, ast.Raise, ast.Break, ast.Continue)
+
+# Builtins that read variables by name
+DYNAMIC_BUILTINS = {"locals", "vars", "eval", "exec"}
+
+
+def propagate_constants(tree: ast.Module) -> bool:
+    """Propagate constants and remove dead code, in place.
+
+    Returns whether the tree changed. ``tree`` must have been through the
+    Binder.
+    """
+    changed = False
+    # Folded values are constants too, propagated in the next round
+    for _ in range(MAX_ROUNDS):
+        propagator = ConstantPropagator(_Bindings(tree))
+        propagator.visit(tree)
+        if not propagator.changed:
+            break
+        changed = True
+
+    _ast.fix_missing_locations(tree)
+    return changed
+
+
+class ConstantPropagator(ConstantFolder):
+    """Fold constants, with the values of constant variables, and drop dead code.
+
+    ``constants`` gives the values to substitute to names (by node id),
+    ``removed`` the assignments to drop.
+    """
+
+    def __init__(self, bindings: _Bindings):
+        self.constants = bindings.propagated_reads()
+        self.removed = bindings.unused_assignments()
+        self.changed = False
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        value = self.constants.get(id(node))
+        if value is None:
+            return node
+        return self._make_constant(value.value, node)
+
+    def visit_If(self, node: ast.If):
+        node.test = self.visit(node.test)
+        if isinstance(node.test, ast.Constant):
+            self.changed = True
+            return self._visit_block(node.body if node.test.value else node.orelse)
+        node.body = self._visit_block(node.body, required=True)
+        node.orelse = self._visit_block(node.orelse)
+        return node
+
+    def visit_While(self, node: ast.While):
+        node.test = self.visit(node.test)
+        if isinstance(node.test, ast.Constant) and not node.test.value:
+            self.changed = True
+            return self._visit_block(node.orelse)
+        node.body = self._visit_block(node.body, required=True)
+        node.orelse = self._visit_block(node.orelse)
+        return node
+
+    def visit_arg(self, node: ast.arg):
+        # Annotations aren't evaluated
+        return node
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        for field, old_value in iter_fields(node):
+            if field in ("annotation", "returns"):
+                continue
+            if isinstance(old_value, list):
+                if old_value and isinstance(old_value[0], ast.stmt):
+                    required = field != "orelse"
+                    setattr(node, field, self._visit_block(old_value, required))
+                    continue
+                new_values = []
+                for value in old_value:
+                    if isinstance(value, ast.AST):
+                        value = self.visit(value)
+                        if value is None:
+                            continue
+                    new_values.append(value)
+                old_value[:] = new_values
+            elif isinstance(old_value, ast.AST):
+                new_node = self.visit(old_value)
+                if new_node is None:
+                    delattr(node, field)
+                else:
+                    setattr(node, field, new_node)
+        return node
+
+    def _visit_block(self, stmts: list[ast.stmt], required: bool = False) -> list:
+        """Visit a list of statements, without the ones that can't run.
+
+        ``required`` tells whether the block can't be empty (gets a ``pass``).
+        """
+        block = []
+        for stmt in stmts:
+            if id(stmt) in self.removed:
+                self.changed = True
+                continue
+            new = self.visit(stmt)
+            block.extend(new if isinstance(new, list) else [new])
+            if block and isinstance(block[-1], TERMINAL_STATEMENTS):
+                if stmt is not stmts[-1]:
+                    self.changed = True
+                break
+        if required and not block and stmts:
+            block.append(copy_location(ast.Pass(), stmts[0]))
+        return block
+
+    def _make_constant(self, value, node: ast.AST) -> ast.Constant:
+        self.changed = True
+        return super()._make_constant(value, node)
+
+
+class _Bindings:
+    """The assignments and reads of the variables of a module."""
+
+    def __init__(self, tree: ast.Module):
+        # Single-target assignments, by variable
+        self.assignments: dict[int, list[tuple[ast.stmt, Scope]]] = {}
+        # Reads, with the scope they're in
+        self.reads: list[tuple[ast.Name, Scope]] = []
+        self.read_counts: Counter[int] = Counter()
+        # Names bound or unbound behind the Binder's back
+        self.unsafe: set[str] = set()
+        self.star_import = False
+        self.dynamic = False
+
+        for node, scope in walk_scopes(tree, tree._scope):
+            self._collect(node, scope)
+
+    def _collect(self, node: ast.AST, scope: Scope):
+        match node:
+            case ast.Name(id=name, ctx=ast.Load()):
+                self.reads.append((node, scope))
+                owner = scope.resolve(name)
+                if owner is not None:
+                    self.read_counts[id(owner.vars[name])] += 1
+                if name in DYNAMIC_BUILTINS:
+                    self.dynamic = True
+            case ast.Name(id=name, ctx=ast.Del()):
+                self.unsafe.add(name)
+            case (
+                ast.Assign(targets=[ast.Name(id=name)])
+                | ast.AnnAssign(target=ast.Name(id=name), value=ast.expr())
+            ):
+                variable = scope.vars.get(name)
+                if variable is not None:
+                    key = id(variable)
+                    self.assignments.setdefault(key, []).append((node, scope))
+            case ast.Global(names=names) | ast.Nonlocal(names=names):
+                self.unsafe.update(names)
+            case ast.ImportFrom(names=names) if any(a.name == "*" for a in names):
+                self.star_import = True
+
+    def _is_tracked(self, name: str, scope: Scope) -> bool:
+        """Check whether the Binder knows all the assignments to a variable."""
+        variable = scope.vars[name]
+        if variable.type != "variable" or name in self.unsafe:
+            return False
+        if scope.type == "global":
+            return not self.star_import
+        return scope.type == "function"
+
+    def propagated_reads(self) -> dict[int, ast.Constant]:
+        """Return the constant read by each read of a constant variable."""
+        result = {}
+        for node, scope in self.reads:
+            owner = scope.resolve(node.id)
+            if owner is None or not self._is_tracked(node.id, owner):
+                continue
+            variable = owner.vars[node.id]
+            assignments = self.assignments.get(id(variable), [])
+            if not variable.is_const or len(assignments) != 1:
+                continue
+            assignment, _ = assignments[0]
+            value = assignment.value
+            if not _is_propagated(value):
+                continue
+            # Reads that may run before the assignment
+            if scope.frame() is owner.frame() and not _is_after(node, assignment):
+                continue
+            result[id(node)] = value
+        return result
+
+    def unused_assignments(self) -> set[int]:
+        """Return the assignments to local variables that are never read."""
+        if self.dynamic:
+            return set()
+        result = set()
+        for key, assignments in self.assignments.items():
+            if self.read_counts[key]:
+                continue
+            for assignment, scope in assignments:
+                name = _target_name(assignment)
+                if (
+                    scope.type == "function"
+                    and self._is_tracked(name, scope)
+                    and scope.vars[name].is_const
+                    and _is_pure(assignment.value)
+                ):
+                    result.add(id(assignment))
+        return result
+
+
+def _is_propagated(value: ast.expr) -> bool:
+    """Check whether a value can be copied to the reads of its variable."""
+    if not isinstance(value, ast.Constant):
+        return False
+    match value.value:
+        case bool() | int() | float() | None:
+            return True
+        case str() as s:
+            return len(s) <= MAX_STRING_LENGTH
+    return False
+
+
+def _is_pure(value: ast.expr) -> bool:
+    """Check whether evaluating a value has no side effects."""
+    match value:
+        case ast.Constant() | ast.Name():
+            return True
+        case ast.List(elts=elts) | ast.Tuple(elts=elts) | ast.Set(elts=elts):
+            return all(_is_pure(elt) for elt in elts)
+        case ast.Dict(keys=keys, values=values):
+            return all(
+                key is not None and _is_pure(key) and _is_pure(value)
+                for key, value in zip(keys, values)
+            )
+    return False
+
+
+def _is_after(node: ast.AST, assignment: ast.stmt) -> bool:
+    """Check whether a node comes after an assignment in the source.
+
+    End positions aren't kept by the parser: the reads in the assigned
+    value are told apart by walking it.
+    """
+    if not hasattr(node, "lineno") or not hasattr(assignment, "lineno"):
+        return False
+    if (node.lineno, node.col_offset) <= (assignment.lineno, assignment.col_offset):
+        return False
+    return not any(child is node for child in _ast.walk(assignment.value))
+
+
+def _target_name(assignment: ast.Assign | ast.AnnAssign) -> str:
+    if isinstance(assignment, ast.Assign):
+        return assignment.targets[0].id
+    return assignment.target.id
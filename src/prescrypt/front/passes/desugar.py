@@ -6,12 +6,17 @@ from typing import cast
 from prescrypt.front import ast
 
 
-def desugar(tree: ast.Module) -> ast.Module:
-    return cast(ast.Module, _desugar(tree))
+def desugar(tree: ast.Module, release: bool = False) -> ast.Module:
+    """Lower constructs to simpler ones.
 
+    With ``release`` (like ``python -O``), ``assert`` statements are removed
+    and ``__debug__`` is False: ``if __debug__:`` blocks are removed.
+    """
+    return cast(ast.Module, _desugar(tree, release))
 
-def _desugar(tree: ast.AST) -> ast.AST:
-    return _ast.fix_missing_locations(Desugarer().visit(tree))
+
+def _desugar(tree: ast.AST, release: bool = False) -> ast.AST:
+    return _ast.fix_missing_locations(Desugarer(release).visit(tree))
 
 
 def rewriter(rewrite):
@@ -25,13 +30,38 @@ load, store = ast.Load(), ast.Store()
 
 
 class Desugarer(ast.NodeTransformer):
-    @rewriter
+    def __init__(self, release: bool = False):
+        self.release = release
+
     def visit_Assert(self, node: ast.Assert):
+        if self.release:
+            return _ast.copy_location(ast.Pass(), node)
+        return self._desugar_assert(node)
+
+    @rewriter
+    def _desugar_assert(self, node: ast.Assert):
         args = [] if node.msg is None else [node.msg]
         keywords = []
         call = ast.Call(ast.Name("AssertionError", load), args, keywords)
         return ast.If(node.test, [], [ast.Raise(call, None)])
 
+    def visit_If(self, node: ast.If):
+        """Keep the branch of `if __debug__:` that runs (statically)."""
+        match node.test:
+            case ast.Name(id="__debug__"):
+                branch = node.orelse if self.release else node.body
+                stmts = []
+                for stmt in branch:
+                    new = self.visit(stmt)
+                    stmts += new if isinstance(new, list) else [new]
+                return stmts or _ast.copy_location(ast.Pass(), node)
+        return self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if node.id == "__debug__":
+            return _ast.copy_location(ast.Constant(not self.release), node)
+        return node
+
     # -------------------------------------------------------------------------
     # DESIGN ALTERNATIVES (not implemented)
     # -------------------------------------------------------------------------
@@ -124,7 +154,7 @@ class Desugarer(ast.NodeTransformer):
 
         # Create a deep copy of target for use in the expression (with Load context)
         expr_target = copy_module.deepcopy(node.target)
-        if isinstance(expr_target, ast.Name):
+        if isinstance(expr_target, (ast.Name, ast.Subscript)):
             expr_target.ctx = ast.Load()
 
         # Create a deep copy of target for assignment (with Store context)
@@ -137,6 +167,8 @@ class Desugarer(ast.NodeTransformer):
             ast.BinOp(expr_target, node.op, node.value),
         )
         new_node.lineno = getattr(node, "lineno", 0)
+        # Lets codegen emit `d[k] += v` as a single read-modify-write
+        new_node._augmented = True
         return new_node
 
     @rewriter
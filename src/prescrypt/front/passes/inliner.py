@@ -0,0 +1,419 @@
+"""Inlining of small single-expression functions.
+
+A call to a function whose body is a single ``return`` is replaced by the
+returned expression, with the arguments in place of the parameters::
+
+    def square(x):
+        return x * x
+
+    y = square(n)  # -> y = n * n
+
+This saves a JS call per use for the small helpers that Python code
+tends to have. Runs after the Binder, whose scopes tell which function a
+call refers to, and after type inference (types are inferred again for
+the inlined code).
+
+A function is inlined when it:
+
+- is defined once, by a plain ``def`` at the top level of a module or
+  function body (not a method, not decorated, not async),
+- takes positional parameters only, without defaults,
+- returns an expression of at most ``MAX_SIZE`` nodes, with no nested
+  scopes, ``yield``, ``await`` or ``:=``, that doesn't call the function
+  itself, and only reads names bound the same way at the call site (no
+  reassigned variables of an enclosing function),
+- returns a type covered by its return annotation, if it has one.
+
+Calls are inlined when they pass one positional argument per parameter,
+with types covered by the parameter annotations. Constants and variables
+can be used any number of times. Other arguments must be used exactly
+once, unconditionally, in the order of the arguments and before anything
+with side effects, so that they are evaluated once and in the same order.
+"""
+
+from __future__ import annotations
+
+from ast import copy_location, iter_child_nodes, walk
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prescrypt.front import Scope, Variable, ast
+
+from .base import Transformer
+from .types import Unknown, join
+
+# Maximum number of AST nodes in the inlined expression
+MAX_SIZE = 24
+
+# Maximum nesting of inlined calls in the code of inlined calls
+MAX_DEPTH = 4
+
+# Nodes that can't be moved to another function
+UNSUPPORTED = (
+    ast.Lambda,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.NamedExpr,
+    ast.Yield,
+    ast.YieldFrom,
+    ast.Await,
+)
+
+# Builtins whose result depends on the calling function
+FRAME_BUILTINS = {"super", "locals", "vars", "eval", "exec"}
+
+# Nodes evaluated without side effects
+PURE_NODES = (ast.Constant, ast.Name, ast.List, ast.Tuple, ast.Set, ast.Dict)
+
+
+class Inliner(Transformer):
+    """Replace calls to small functions by the expression they return.
+
+    ``inlined_calls`` counts the calls that were replaced.
+    """
+
+    def __init__(self):
+        self.inlined_calls = 0
+        self.scope: Scope | None = None
+        # Candidate functions, by their variable
+        self._functions: dict[int, ast.FunctionDef] = {}
+        # Functions whose def was reached in its own scope
+        self._defined: set[ast.FunctionDef] = set()
+        # Names rebound by `global`, `nonlocal` or `:=`
+        self._volatile: set[str] = set()
+        self._depth = 0
+
+    def visit_Module(self, node: ast.Module):
+        self._volatile = _volatile_names(node)
+        for fdef in _top_level_defs(node):
+            if self._is_candidate(fdef):
+                variable = fdef._scope.parent.vars[fdef.name]
+                self._functions[id(variable)] = fdef
+        self.scope = node._scope
+        node.body = self.visit_list(node.body)
+        return node
+
+    #
+    # Scopes
+    #
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        # Decorators and defaults are evaluated in the enclosing scope
+        node.decorator_list = self.visit_list(node.decorator_list)
+        self._visit_defaults(node.args)
+        self._defined.add(node)
+        with self._inside(node):
+            node.body = self.visit_list(node.body)
+        return node
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        return self.visit_FunctionDef(node)
+
+    def visit_Lambda(self, node: ast.Lambda):
+        self._visit_defaults(node.args)
+        with self._inside(node):
+            node.body = self.visit(node.body)
+        return node
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        node.decorator_list = self.visit_list(node.decorator_list)
+        node.bases = self.visit_list(node.bases)
+        node.keywords = self.visit_list(node.keywords)
+        with self._inside(node):
+            node.body = self.visit_list(node.body)
+        return node
+
+    def visit_ListComp(self, node: ast.ListComp):
+        with self._inside(node):
+            return self.generic_visit(node)
+
+    visit_SetComp = visit_ListComp
+    visit_DictComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def _visit_defaults(self, node: ast.arguments):
+        node.defaults = self.visit_list(node.defaults)
+        node.kw_defaults = [
+            self.visit(default) if default is not None else None
+            for default in node.kw_defaults
+        ]
+
+    @contextmanager
+    def _inside(self, node: ast.AST):
+        """Use the scope of a node while visiting its body."""
+        outer = self.scope
+        self.scope = getattr(node, "_scope", None) or outer
+        try:
+            yield
+        finally:
+            self.scope = outer
+
+    #
+    # Calls
+    #
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+        fdef = self._target(node)
+        if fdef is None or self._depth >= MAX_DEPTH:
+            return node
+
+        params = [arg.arg for arg in fdef.args.args]
+        args = dict(zip(params, node.args))
+        if not all(
+            _accepts(param, args[param.arg]) for param in fdef.args.args
+        ) or not self._can_substitute(fdef, args):
+            return node
+
+        value = _function_value(fdef)
+        new_node = _substitute(value, args, node)
+        new_node._type = node._type
+        self.inlined_calls += 1
+
+        # Calls in the function's code
+        self._depth += 1
+        new_node = self.visit(new_node)
+        self._depth -= 1
+        return new_node
+
+    def _target(self, node: ast.Call) -> ast.FunctionDef | None:
+        """Return the definition of the inlinable function a call refers to."""
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            return None
+        _, variable = _lookup(self.scope, node.func.id)
+        fdef = self._functions.get(id(variable))
+        if fdef is None or len(node.args) != len(fdef.args.args):
+            return None
+        if any(isinstance(arg, UNSUPPORTED + (ast.Starred,)) for arg in node.args):
+            return None
+        # Not defined yet in code that runs before the def
+        frame = fdef._scope.parent.frame()
+        if fdef not in self._defined and self.scope.frame() is frame:
+            return None
+        # The names of the function must mean the same here
+        for name in _free_names(fdef):
+            if _lookup(self.scope, name)[1] is not _lookup(fdef._scope, name)[1]:
+                return None
+        return fdef
+
+    def _can_substitute(self, fdef: ast.FunctionDef, args: dict[str, ast.expr]) -> bool:
+        """Check that the arguments are evaluated as by a call.
+
+        Constants and variables that can't change while the call is
+        evaluated can be copied anywhere. The other arguments must be
+        evaluated once, in order, before anything with side effects.
+        """
+        complex_params = [
+            param for param, arg in args.items() if not self._is_stable(arg)
+        ]
+        if not complex_params:
+            return True
+
+        uses = []
+        effects = []
+        for position, (node, conditional) in enumerate(
+            _evaluation_order(_function_value(fdef))
+        ):
+            if isinstance(node, ast.Name) and node.id in args:
+                if node.id in complex_params:
+                    if conditional:
+                        return False
+                    uses.append((position, node.id))
+            elif not isinstance(node, PURE_NODES) or (
+                isinstance(node, ast.Name) and not self._is_stable_free(fdef, node)
+            ):
+                effects.append(position)
+
+        if [param for _, param in uses] != complex_params:
+            return False
+        last_use = uses[-1][0]
+        return all(position > last_use for position in effects)
+
+    def _is_stable(self, node: ast.expr) -> bool:
+        """Check whether an argument can be evaluated anywhere in the call."""
+        if isinstance(node, ast.Constant):
+            return True
+        return isinstance(node, ast.Name) and node.id not in self._volatile
+
+    def _is_stable_free(self, fdef: ast.FunctionDef, node: ast.Name) -> bool:
+        """Check whether a name read by a function can't change in a call."""
+        if node.id in self._volatile:
+            return False
+        _, variable = _lookup(fdef._scope, node.id)
+        return variable is None or variable.is_const
+
+    #
+    # Candidates
+    #
+    def _is_candidate(self, node: ast.FunctionDef) -> bool:
+        """Check whether calls to a function can be replaced by its value."""
+        scope = node._scope
+        if scope is None or scope.parent is None or scope.parent.type == "class":
+            return False
+        if node.decorator_list or node.name in self._volatile:
+            return False
+        variable = scope.parent.vars.get(node.name)
+        if variable is None or variable.type != "function" or not variable.is_const:
+            return False
+        args = node.args
+        if (
+            args.posonlyargs
+            or args.vararg
+            or args.kwonlyargs
+            or args.kwarg
+            or args.defaults
+        ):
+            return False
+
+        value = _function_value(node)
+        if value is None:
+            return False
+        nodes = list(walk(value))
+        if len(nodes) > MAX_SIZE or any(isinstance(n, UNSUPPORTED) for n in nodes):
+            return False
+
+        for name in _free_names(node):
+            if name in FRAME_BUILTINS or name == node.name:
+                return False
+            owner, variable = _lookup(scope, name)
+            # Captures a variable of an enclosing function that may change
+            if owner is not None and not owner.is_global() and not variable.is_const:
+                return False
+
+        if node.returns is not None:
+            # Calls have the annotated type, the inlined value its own type
+            value_type = getattr(value, "_type", None) or Unknown
+            return_type = getattr(node, "_type", None) or Unknown
+            if value_type is Unknown or join(value_type, return_type) != return_type:
+                return False
+        return True
+
+
+def _function_value(node: ast.FunctionDef) -> ast.expr | None:
+    """Return the expression returned by a function, if that's all it does."""
+    body = node.body
+    if (
+        len(body) == 2
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        # Docstring
+        body = body[1:]
+    if len(body) != 1 or not isinstance(body[0], ast.Return):
+        return None
+    return body[0].value
+
+
+def _top_level_defs(tree: ast.Module) -> Iterator[ast.FunctionDef]:
+    """Yield the defs in the bodies of the module and its functions."""
+    for node in walk(tree):
+        if isinstance(node, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef)):
+            for stmt in node.body:
+                if isinstance(stmt, ast.FunctionDef):
+                    yield stmt
+
+
+def _free_names(node: ast.FunctionDef) -> set[str]:
+    """Return the names read by a function's value, besides its parameters."""
+    params = {arg.arg for arg in node.args.args}
+    return {
+        n.id
+        for n in walk(_function_value(node))
+        if isinstance(n, ast.Name) and n.id not in params
+    }
+
+
+def _lookup(scope: Scope | None, name: str) -> tuple[Scope | None, Variable | None]:
+    """Find the variable a name refers to, and the scope it belongs to."""
+    owner = scope.resolve(name) if scope is not None else None
+    if owner is None:
+        return None, None
+    return owner, owner.vars[name]
+
+
+def _volatile_names(tree: ast.Module) -> set[str]:
+    """Return the names that may be rebound while an expression is evaluated."""
+    names = set()
+    for node in walk(tree):
+        match node:
+            case ast.Global(names=declared) | ast.Nonlocal(names=declared):
+                names.update(declared)
+            case ast.NamedExpr(target=ast.Name(id=name)):
+                names.add(name)
+    return names
+
+
+def _accepts(param: ast.arg, arg: ast.expr) -> bool:
+    """Check that an argument has the type the function was compiled for."""
+    param_type = getattr(param, "_type", None) or Unknown
+    if param_type is Unknown:
+        return True
+    arg_type = getattr(arg, "_type", None) or Unknown
+    return arg_type is not Unknown and join(arg_type, param_type) == param_type
+
+
+def _evaluation_order(
+    node: ast.AST, conditional: bool = False
+) -> Iterator[tuple[ast.AST, bool]]:
+    """Yield the nodes of an expression as they're evaluated.
+
+    Nodes come after their operands; ``conditional`` tells whether a node
+    may be skipped (right of ``and``/``or``, branches of ``if``/``else``).
+    """
+    match node:
+        case ast.BoolOp(values=[first, *rest]):
+            yield from _evaluation_order(first, conditional)
+            for value in rest:
+                yield from _evaluation_order(value, True)
+        case ast.IfExp(test=test, body=body, orelse=orelse):
+            yield from _evaluation_order(test, conditional)
+            yield from _evaluation_order(body, True)
+            yield from _evaluation_order(orelse, True)
+        case ast.Dict(keys=keys, values=values):
+            for key, value in zip(keys, values):
+                if key is not None:
+                    yield from _evaluation_order(key, conditional)
+                yield from _evaluation_order(value, conditional)
+        case _:
+            for child in iter_child_nodes(node):
+                if isinstance(child, (ast.expr, ast.keyword, ast.comprehension)):
+                    yield from _evaluation_order(child, conditional)
+    yield node, conditional
+
+
+def _substitute(value: ast.expr, args: dict[str, ast.expr], call: ast.Call) -> ast.expr:
+    """Return a copy of a function's value for a call, with its arguments.
+
+    Copied nodes get the location of the call; arguments keep theirs.
+    Arguments used once are moved, the others copied.
+    """
+    if isinstance(value, ast.Name) and value.id in args:
+        arg = args[value.id]
+        if isinstance(arg, (ast.Constant, ast.Name)):
+            return _copy(arg, arg)
+        return arg
+
+    fields = {}
+    for field in value._fields:
+        child = getattr(value, field, None)
+        if isinstance(child, list):
+            fields[field] = [
+                _substitute(item, args, call) if isinstance(item, ast.AST) else item
+                for item in child
+            ]
+        elif isinstance(child, ast.AST):
+            fields[field] = _substitute(child, args, call)
+        else:
+            fields[field] = child
+    return copy_location(type(value)(**fields), call)
+
+
+def _copy(node: ast.expr, location: ast.AST) -> ast.expr:
+    """Return a copy of a constant or a name."""
+    if isinstance(node, ast.Constant):
+        new = ast.Constant(value=node.value, kind=node.kind)
+    else:
+        new = ast.Name(id=node.id, ctx=ast.Load())
+    new._type = node._type
+    return copy_location(new, location)
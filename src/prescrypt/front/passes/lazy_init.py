@@ -0,0 +1,229 @@
+"""Lazily initialized modules, for bundles.
+
+A bundle runs the top-level code of its modules when it loads, though the
+program may only need some of them much later. With lazy initialization,
+the top-level code of a module runs in an init function instead, the first
+time another module uses one of its names::
+
+    # config.py                     # main.py
+    TABLE = build_table()           from config import TABLE
+                                    def lookup(key):
+                                        init$config()   # added
+                                        return TABLE[key]
+
+This pass adds the calls to the init functions, in the code of the modules
+that use the names of lazily initialized modules (their bundle names, see
+``scope_hoisting``):
+
+- at the start of a function, if it uses them (the call is cheap once the
+  module is initialized: the init function replaces itself with an empty
+  one),
+- before a statement of a module or class body that uses them.
+
+A module whose top level only defines functions, classes and constants
+(``is_side_effect_free()``) is cheap to run, so it doesn't need an init
+function.
+"""
+
+from __future__ import annotations
+
+from ast import copy_location, iter_child_nodes, walk
+from collections.abc import Iterator
+
+from prescrypt.front import Scope, ast
+
+from .base import walk_scopes
+from .constant_folder import _NOT_EXTRACTABLE, _extract
+from .reachability import _has_safe_decorators
+
+
+def is_side_effect_free(tree: ast.Module) -> bool:
+    """Check whether running the top level of a module has no side effects.
+
+    It may only import names, and define functions, classes and constants:
+    no decorators that may have side effects, and default values, base
+    classes and class attributes that are constants or names.
+    """
+    return all(is_definition(stmt) for stmt in tree.body)
+
+
+def is_definition(stmt: ast.stmt) -> bool:
+    """Check whether a statement only defines a function, class or constant."""
+    match stmt:
+        case ast.Import() | ast.ImportFrom() | ast.Pass():
+            return True
+        case ast.Expr(value=ast.Constant()):
+            return True  # Docstring
+        case ast.Assign(targets=targets, value=value):
+            return all(isinstance(t, ast.Name) for t in targets) and _is_constant(value)
+        case ast.AnnAssign(target=ast.Name(), value=value):
+            return value is None or _is_constant(value)
+        case ast.FunctionDef() | ast.AsyncFunctionDef():
+            args = stmt.args
+            defaults = [*args.defaults, *filter(None, args.kw_defaults)]
+            return _has_safe_decorators(stmt) and all(map(_is_constant, defaults))
+        case ast.ClassDef():
+            return (
+                _has_safe_decorators(stmt)
+                and not stmt.keywords
+                and all(_is_name(base) for base in stmt.bases)
+                and all(is_definition(child) for child in stmt.body)
+            )
+        case _:
+            return False
+
+
+def add_init_calls(tree: ast.Module, inits: dict[str, str]) -> int:
+    """Call the init functions of modules before their names are used, in place.
+
+    ``tree`` must have been through the Binder and ``hoist_names()``. Returns
+    the number of calls added.
+
+    Args:
+        tree: The module
+        inits: Names of the init functions, by bundle name of the names of
+            the lazily initialized modules (but the module's own)
+    """
+    calls = _InitCalls(inits)
+    tree.body = calls.run_once(tree.body, tree._scope)
+    return calls.count
+
+
+class _InitCalls:
+    def __init__(self, inits: dict[str, str]):
+        self.inits = inits
+        self.count = 0
+
+    def run_once(self, body: list[ast.stmt], scope: Scope) -> list[ast.stmt]:
+        """Add init calls before the statements of a module or class body."""
+        new_body = []
+        for stmt in body:
+            new_body += self._calls(self._header_inits(stmt, scope), stmt)
+            match stmt:
+                case ast.FunctionDef() | ast.AsyncFunctionDef():
+                    self._function(stmt)
+                case ast.ClassDef():
+                    stmt.body = self.run_once(stmt.body, stmt._scope)
+                case _:
+                    for owner, field in _bodies(stmt):
+                        body = self.run_once(getattr(owner, field), scope)
+                        setattr(owner, field, body)
+            new_body.append(stmt)
+        return new_body
+
+    def _function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        """Add the init calls of a function at its start."""
+        inits = list(self._body_inits(node.body, node._scope))
+        if not inits:
+            return
+        body = node.body
+        docstring = []
+        match body:
+            case [ast.Expr(value=ast.Constant()), *rest]:
+                docstring, body = body[:1], rest
+        node.body = [*docstring, *self._calls(inits, node), *body]
+
+    def _body_inits(self, body: list[ast.stmt], scope: Scope) -> Iterator[str]:
+        """Yield the init functions a function body needs (nested functions
+        get their own calls)."""
+        seen = set()
+        for stmt in body:
+            names = self._header_inits(stmt, scope)
+            match stmt:
+                case ast.FunctionDef() | ast.AsyncFunctionDef():
+                    self._function(stmt)
+                case ast.ClassDef():
+                    names += self._body_inits(stmt.body, stmt._scope)
+                case _:
+                    for owner, field in _bodies(stmt):
+                        names += self._body_inits(getattr(owner, field), scope)
+            for name in names:
+                if name not in seen:
+                    seen.add(name)
+                    yield name
+
+    def _header_inits(self, stmt: ast.stmt, scope: Scope) -> list[str]:
+        """Return the init functions the code of a statement needs, but the
+        statements in its body."""
+        match stmt:
+            case ast.FunctionDef() | ast.AsyncFunctionDef():
+                args = stmt.args
+                nodes = [
+                    *stmt.decorator_list,
+                    *args.defaults,
+                    *[default for default in args.kw_defaults if default is not None],
+                ]
+            case ast.ClassDef():
+                nodes = [*stmt.decorator_list, *stmt.bases, *stmt.keywords]
+            case ast.AnnAssign():
+                nodes = [stmt]
+            case _:
+                nodes = []
+                for child in iter_child_nodes(stmt):
+                    match child:
+                        case ast.stmt():
+                            pass
+                        case ast.ExceptHandler(type=type_):
+                            nodes += [type_] if type_ is not None else []
+                        case ast.match_case(pattern=pattern, guard=guard):
+                            nodes += [pattern] if guard is None else [pattern, guard]
+                        case _:
+                            nodes.append(child)
+
+        inits = []
+        for node in nodes:
+            for child, child_scope in walk_scopes(node, scope):
+                if (
+                    isinstance(child, ast.Name)
+                    and child.id in self.inits
+                    and _is_imported(child_scope, child.id)
+                    and self.inits[child.id] not in inits
+                ):
+                    inits.append(self.inits[child.id])
+        return inits
+
+    def _calls(self, inits: list[str], node: ast.AST) -> list[ast.stmt]:
+        """Return the statements calling init functions."""
+        self.count += len(inits)
+        return [
+            copy_location(
+                ast.Expr(
+                    value=ast.Call(
+                        func=ast.Name(id=init, ctx=ast.Load()), args=[], keywords=[]
+                    )
+                ),
+                node,
+            )
+            for init in inits
+        ]
+
+
+def _bodies(stmt: ast.stmt) -> Iterator[tuple[ast.AST, str]]:
+    """Yield the statement lists of a compound statement: (owner, field)."""
+    owners = [stmt, *getattr(stmt, "handlers", []), *getattr(stmt, "cases", [])]
+    for owner in owners:
+        for field in ("body", "orelse", "finalbody"):
+            if isinstance(getattr(owner, field, None), list):
+                yield owner, field
+
+
+def _is_imported(scope: Scope, name: str) -> bool:
+    """Check whether a name used in a scope refers to another module's name
+    (not to a local variable)."""
+    owner = scope.resolve(name)
+    return (
+        owner is None
+        or owner.parent is None
+        or owner.vars[name].type in ("module", "global")
+    )
+
+
+def _is_constant(node: ast.expr) -> bool:
+    return _extract(node) is not _NOT_EXTRACTABLE
+
+
+def _is_name(node: ast.expr) -> bool:
+    """Check whether an expression is a name or a dotted name."""
+    return all(
+        isinstance(child, (ast.Name, ast.Attribute, ast.Load)) for child in walk(node)
+    )
@@ -0,0 +1,212 @@
+"""Short names for local variables, for minified output.
+
+Renames the parameters and local variables of functions (and lambdas, and
+comprehensions inside functions) to the shortest names that can't clash:
+
+    def mean(values):           # kept: keyword arguments use the name
+        total = 0               # -> a
+        for value in values:    # -> b
+            total += value
+        return total / len(values)
+
+Uses the scopes of the Binder, so that a name refers to the same variable
+before and after renaming. New names are never used in the module (so a
+new name can't shadow a global or a JS FFI name), by an enclosing function,
+or by the generated code.
+
+Not renamed:
+
+- module-level and class-level names (imports and attribute lookups use
+  them), functions and classes (``__name__``),
+- the parameters of module-level functions: keyword arguments are matched
+  with their names at runtime (``__args__``),
+- ``self`` and ``cls``, which code generation treats specially,
+- anything in modules calling ``locals()``, ``vars()``, ``eval()`` or
+  ``exec()``.
+"""
+
+from __future__ import annotations
+
+from ast import walk
+from collections.abc import Iterator
+from itertools import count, product
+from string import ascii_letters
+
+from prescrypt.front import Scope, Variable, ast
+
+from .base import walk_scopes
+
+# Builtins that read variables by name
+DYNAMIC_BUILTINS = {"locals", "vars", "eval", "exec"}
+
+# Names with a special meaning in generated code
+KEPT_NAMES = {"self", "cls", "this"}
+
+# JS keywords and globals, and names of the generated code
+RESERVED = {
+    # Keywords
+    *("break", "case", "catch", "class", "const", "continue", "debugger"),
+    *("default", "delete", "do", "else", "enum", "export", "extends", "false"),
+    *("finally", "for", "function", "if", "import", "in", "instanceof", "let"),
+    *("new", "null", "return", "super", "switch", "this", "throw", "true"),
+    *("try", "typeof", "var", "void", "while", "with", "yield", "await"),
+    *("implements", "interface", "package", "private", "protected", "public"),
+    *("static", "of", "get", "set", "async"),
+    # Globals
+    *("arguments", "eval", "undefined", "NaN", "Infinity", "globalThis"),
+    *("Object", "Array", "Math", "JSON", "Number", "String", "Boolean"),
+    *("Symbol", "Map", "Set", "Date", "Error", "RegExp", "Promise", "BigInt"),
+    *("console", "window", "document", "require", "module", "exports"),
+    # Generated code
+    *("res", "cls", "self", "err", "args", "kwargs"),
+}
+
+
+def mangle_locals(tree: ast.Module) -> int:
+    """Rename the local variables of a module to short names, in place.
+
+    ``tree`` must have been through the Binder. Returns the number of renamed
+    variables.
+    """
+    if any(
+        isinstance(node, ast.Name) and node.id in DYNAMIC_BUILTINS
+        for node in walk(tree)
+    ):
+        return 0
+    return Mangler(tree).run()
+
+
+class Mangler:
+    """Assign short names to the local variables of a module, and use them."""
+
+    def __init__(self, tree: ast.Module):
+        self.tree = tree
+        self.taken = RESERVED | set(_identifiers(tree))
+        # New names, by variable id
+        self.names: dict[int, str] = {}
+
+    def run(self) -> int:
+        scopes = []
+        for node, _scope in walk_scopes(self.tree, self.tree._scope):
+            scope = getattr(node, "_scope", None)
+            if scope is None or scope.type == "class":
+                continue
+            if scope.frame().type != "function":
+                continue
+            self._assign_names(node, scope)
+            scopes.append(scope)
+
+        # Resolve everything before renaming
+        renames = list(self._renames())
+        variables = [self._new_vars(scope) for scope in scopes]
+        for node, field, name in renames:
+            setattr(node, field, name)
+        for scope, new_vars in zip(scopes, variables):
+            for name, var in new_vars.items():
+                var.name = name
+            scope.vars = new_vars
+        return len(self.names)
+
+    def _assign_names(self, node: ast.AST, scope: Scope):
+        """Pick new names for the variables of a function or comprehension."""
+        kept = set(KEPT_NAMES)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if scope.parent.type == "global":
+                kept.update(arg.arg for arg in _arguments(node.args))
+
+        # Names of the enclosing functions, visible here
+        used = set()
+        parent = scope.parent
+        while parent is not None:
+            used.update(self.names.get(id(var)) for var in parent.vars.values())
+            parent = parent.parent
+
+        names = (name for name in _short_names() if name not in self.taken)
+        for name, var in scope.vars.items():
+            if var.type != "variable" or name in kept:
+                continue
+            new_name = next(names)
+            while new_name in used:
+                new_name = next(names)
+            self.names[id(var)] = new_name
+
+    def _renames(self) -> Iterator[tuple[ast.AST, str, str]]:
+        """Yield the nodes to rename: (node, field, new name)."""
+        for node, scope in walk_scopes(self.tree, self.tree._scope):
+            match node:
+                case ast.Name(id=name):
+                    yield from self._rename(node, "id", scope, name)
+                case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.Lambda():
+                    for arg in _arguments(node.args):
+                        yield from self._rename(arg, "arg", node._scope, arg.arg)
+                case (
+                    ast.ExceptHandler(name=str(name))
+                    | ast.MatchAs(name=str(name))
+                    | ast.MatchStar(name=str(name))
+                ):
+                    yield from self._rename(node, "name", scope, name)
+                case ast.MatchMapping(rest=str(name)):
+                    yield from self._rename(node, "rest", scope, name)
+                case ast.Nonlocal(names=names):
+                    new_names = [
+                        self.names.get(id(_variable(scope.parent, name)), name)
+                        for name in names
+                    ]
+                    yield node, "names", new_names
+
+    def _rename(
+        self, node: ast.AST, field: str, scope: Scope, name: str
+    ) -> Iterator[tuple[ast.AST, str, str]]:
+        new_name = self.names.get(id(_variable(scope, name)))
+        if new_name is not None:
+            yield node, field, new_name
+
+    def _new_vars(self, scope: Scope) -> dict[str, Variable]:
+        """Return the variables of a scope, by new name."""
+        variables = {}
+        for name, var in scope.vars.items():
+            # A nonlocal declaration is renamed with the variable it refers to
+            target = var
+            if var.type == "nonlocal":
+                target = _variable(scope.parent, name) or var
+            variables[self.names.get(id(target), name)] = var
+        return variables
+
+
+def _variable(scope: Scope | None, name: str) -> Variable | None:
+    """Return the variable a name refers to, following ``nonlocal``."""
+    owner = scope.resolve(name) if scope is not None else None
+    while owner is not None and owner.vars[name].type == "nonlocal":
+        owner = owner.parent
+        while owner is not None and owner.type == "class":
+            owner = owner.parent
+        owner = owner.resolve(name) if owner is not None else None
+    return owner.vars[name] if owner is not None else None
+
+
+def _arguments(args: ast.arguments) -> list[ast.arg]:
+    return [
+        *args.posonlyargs,
+        *args.args,
+        *([args.vararg] if args.vararg else []),
+        *args.kwonlyargs,
+        *([args.kwarg] if args.kwarg else []),
+    ]
+
+
+def _identifiers(tree: ast.Module) -> Iterator[str]:
+    """Yield the names, attributes and keywords used in a module."""
+    for node in walk(tree):
+        for field in ("id", "arg", "attr", "name", "asname", "rest"):
+            value = getattr(node, field, None)
+            if isinstance(value, str):
+                yield value
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            yield from node.names
+
+
+def _short_names() -> Iterator[str]:
+    """Yield a, b... z, A... Z, aa, ab..."""
+    for length in count(1):
+        for letters in product(ascii_letters, repeat=length):
+            yield "".join(letters)
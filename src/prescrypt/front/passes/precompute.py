@@ -0,0 +1,433 @@
+"""Compile-time evaluation of module-level constant tables.
+
+A table computed by the top-level code of a module is computed again each
+time the program starts. When its value only depends on constants, this
+pass computes it once, at compile time, and replaces the code with the
+value::
+
+    SQUARES = [i * i for i in range(256)]   # -> SQUARES = [0, 1, 4, ...]
+    NAMES = {c: ord(c) for c in "abc"}      # -> NAMES = {'a': 97, ...}
+
+An expression is evaluated when it only uses literals, operators,
+comprehensions, the module-level names precomputed before it, and a few
+builtins and ``str``/``dict`` methods without side effects (``SAFE_BUILTINS``,
+``SAFE_METHODS``). Its value must be made of ``None``, booleans, numbers,
+strings, lists, tuples and dicts (with string or number keys): the values
+literals can express.
+
+A statement that may change a precomputed name (any other statement but a
+definition or an import) stops its propagation: later expressions using it
+aren't evaluated. So does a value that would share a list or dict with
+another name (``B = A``) or with itself (``[[0] * 3] * 2``), since the
+literals wouldn't be the same object.
+
+The work the evaluation of a module may take is bounded (``MAX_OPERATIONS``):
+comprehensions, operators, calls and formatting charge the items they go
+through and the size of the values they make, before making them. An
+expression that goes over the budget isn't evaluated, nor are the ones after
+it.
+"""
+
+from __future__ import annotations
+
+import ast as _ast
+import math
+import operator
+import re
+from collections.abc import Callable, Iterable, Iterator, Sized
+from typing import Any
+
+from prescrypt.front import ast
+
+from .lazy_init import is_definition
+
+# Longest range() evaluated at compile time
+MAX_RANGE = 1_000_000
+
+# Largest exponent of a ** evaluated at compile time
+MAX_EXPONENT = 1024
+
+# Work allowed for the evaluation of a module: items iterated, and sizes of
+# the values operated on and made
+MAX_OPERATIONS = 4_000_000
+
+SAFE_BUILTINS = {
+    "abs": abs,
+    "all": all,
+    "any": any,
+    "bin": bin,
+    "bool": bool,
+    "chr": chr,
+    "dict": dict,
+    "divmod": divmod,
+    "enumerate": enumerate,
+    "float": float,
+    "hex": hex,
+    "int": int,
+    "len": len,
+    "list": list,
+    "max": max,
+    "min": min,
+    "oct": oct,
+    "ord": ord,
+    "reversed": reversed,
+    "round": round,
+    "set": set,
+    "sorted": sorted,
+    "str": str,
+    "sum": sum,
+    "tuple": tuple,
+    "zip": zip,
+}
+
+# Methods of the values above (not `format`, which can read attributes)
+SAFE_METHODS = {
+    "capitalize",
+    "center",
+    "count",
+    "endswith",
+    "get",
+    "index",
+    "items",
+    "join",
+    "keys",
+    "ljust",
+    "lower",
+    "lstrip",
+    "replace",
+    "rjust",
+    "rstrip",
+    "split",
+    "startswith",
+    "strip",
+    "title",
+    "upper",
+    "values",
+    "zfill",
+}
+
+_SAFE_NODES = (
+    ast.Constant,
+    ast.Name,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.List,
+    ast.Tuple,
+    ast.Set,
+    ast.Dict,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.comprehension,
+    ast.Subscript,
+    ast.Slice,
+    ast.Call,
+    ast.Attribute,
+    ast.Starred,
+    ast.JoinedStr,
+    ast.FormattedValue,
+    ast.expr_context,
+    ast.operator,
+    ast.unaryop,
+    ast.boolop,
+    ast.cmpop,
+)
+
+# The operators of BinOp nodes, by node name
+_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "Add": operator.add,
+    "Sub": operator.sub,
+    "Mult": operator.mul,
+    "MatMult": operator.matmul,
+    "Div": operator.truediv,
+    "FloorDiv": operator.floordiv,
+    "Mod": operator.mod,
+    "Pow": operator.pow,
+    "LShift": operator.lshift,
+    "RShift": operator.rshift,
+    "BitOr": operator.or_,
+    "BitXor": operator.xor,
+    "BitAnd": operator.and_,
+}
+
+# str methods whose first argument is the length of the result
+_PADDING_METHODS = {"center", "ljust", "rjust", "zfill"}
+
+_NOT_COMPUTED = object()
+
+
+def precompute_constants(tree: ast.Module) -> int:
+    """Evaluate the module-level constant tables of a module, in place.
+
+    Returns the number of values computed.
+    """
+    known: dict[str, Any] = {}
+    budget = _Budget(MAX_OPERATIONS)
+    count = 0
+    for stmt in tree.body:
+        match stmt:
+            case (
+                ast.Assign(targets=[ast.Name(id=name)], value=value)
+                | ast.AnnAssign(target=ast.Name(id=name), value=ast.expr() as value)
+            ):
+                result = _evaluate(value, known, budget)
+                if result is _NOT_COMPUTED:
+                    known.pop(name, None)
+                    continue
+                if _extractable(value):
+                    known[name] = result  # Already a literal
+                    continue
+                stmt.value = _ast.copy_location(_to_node(result), value)
+                _ast.fix_missing_locations(stmt)
+                known[name] = result
+                count += 1
+            case (
+                ast.Import()
+                | ast.ImportFrom()
+                | ast.FunctionDef()
+                | ast.AsyncFunctionDef()
+                | ast.ClassDef()
+            ):
+                if is_definition(stmt):
+                    for name in _bound_names(stmt):
+                        known.pop(name, None)
+                else:
+                    known.clear()
+            case ast.Expr(value=ast.Constant()) | ast.Pass():
+                pass
+            case _:
+                known.clear()
+    return count
+
+
+def _evaluate(node: ast.expr, known: dict[str, Any], budget: _Budget) -> Any:
+    """Return the value of an expression, or _NOT_COMPUTED."""
+    if not all(_is_safe(child) for child in _ast.walk(node)):
+        return _NOT_COMPUTED
+    namespace = {
+        "__builtins__": {},
+        **SAFE_BUILTINS,
+        "range": _range,
+        **known,
+        # Not reachable from the expression: its names can't start with `__`
+        "__call": budget.call,
+        "__format": budget.format,
+        "__iterate": budget.iterate,
+        "__operate": budget.operate,
+    }
+    try:
+        tree = _Metered().visit(_ast.parse(_ast.unparse(node), mode="eval"))
+        code = compile(_ast.fix_missing_locations(tree), "<precompute>", "eval")
+        # Only the nodes _is_safe() accepts, without builtins but SAFE_BUILTINS,
+        # and with the work charged to the budget
+        value = eval(code, namespace)  # noqa: S307
+    except Exception:
+        return _NOT_COMPUTED
+    if not _is_literal(value):
+        return _NOT_COMPUTED
+    seen = {id(v) for v in _containers(known)}
+    for container in _containers(value):
+        if id(container) in seen:
+            return _NOT_COMPUTED
+        seen.add(id(container))
+    return value
+
+
+def _is_safe(node: ast.AST) -> bool:
+    """Check whether a node can be evaluated at compile time."""
+    match node:
+        case ast.Attribute(attr=attr):
+            return attr in SAFE_METHODS
+        case ast.BinOp(op=ast.Pow(), right=right):
+            return (
+                isinstance(right, ast.Constant)
+                and isinstance(right.value, int)
+                and abs(right.value) <= MAX_EXPONENT
+            )
+        case ast.Call(func=func):
+            return isinstance(func, (ast.Name, ast.Attribute))
+        case ast.Name(id=name):
+            return not name.startswith("__")
+    return isinstance(node, _SAFE_NODES)
+
+
+def _range(*args: int) -> range:
+    result = range(*args)
+    if len(result) > MAX_RANGE:
+        msg = "range too long to precompute"
+        raise ValueError(msg)
+    return result
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, (int, float)):  # Most operands: skip the ABC check
+        return 0
+    return len(value) if isinstance(value, Sized) else 0
+
+
+class _Budget:
+    """The work left for the evaluation of a module.
+
+    Each operation is charged before it runs, and raises ValueError when the
+    budget is spent.
+    """
+
+    def __init__(self, operations: int):
+        self.left = operations
+
+    def charge(self, operations: int) -> None:
+        self.left -= max(operations, 0)
+        if self.left < 0:
+            msg = "too much work to precompute"
+            raise ValueError(msg)
+
+    def iterate(self, iterable: Iterable) -> Iterator:
+        for item in iterable:
+            self.left -= 1
+            if self.left < 0:
+                self.charge(1)
+            yield item
+
+    def operate(self, name: str, left: Any, right: Any) -> Any:
+        op = _OPERATORS[name]
+        cost = 1 + _size(left) + _size(right)
+        if op is operator.mul and isinstance(left, int):
+            cost += _size(right) * left
+        elif op is operator.mul and isinstance(right, int):
+            cost += _size(left) * right
+        elif op is operator.lshift and isinstance(right, int):
+            cost += right
+        elif op is operator.pow and isinstance(left, int) and isinstance(right, int):
+            cost += left.bit_length() * right
+        self.charge(cost)
+        return op(left, right)
+
+    def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        self.charge(1 + sum(map(_size, args)) + sum(map(_size, kwargs.values())))
+        owner = getattr(func, "__self__", None)
+        if isinstance(owner, str):
+            self.charge(len(owner))
+            name = func.__name__
+            if name in _PADDING_METHODS and args and isinstance(args[0], int):
+                self.charge(args[0])
+            elif name == "join" and args:
+                items = list(args[0])
+                self.charge(sum(map(_size, items)) + len(owner) * len(items))
+                args = (items, *args[1:])
+            elif name == "replace" and len(args) > 1:
+                self.charge((len(owner) + 1) * _size(args[1]))
+        return func(*args, **kwargs)
+
+    def format(self, value: Any, conversion: int, spec: str) -> str:
+        if conversion != -1:
+            value = {ord("s"): str, ord("r"): repr, ord("a"): ascii}[conversion](value)
+        # Widths and precisions: the result may be as long as any of them
+        width = max(map(int, re.findall(r"\d+", spec)), default=0)
+        self.charge(1 + _size(value) + width)
+        return format(value, spec)
+
+
+class _Metered(_ast.NodeTransformer):
+    """Charge the work of an expression to a _Budget (see _evaluate())."""
+
+    def visit_comprehension(self, node: _ast.comprehension) -> _ast.comprehension:
+        self.generic_visit(node)
+        node.iter = _call("__iterate", node.iter)
+        return node
+
+    def visit_BinOp(self, node: _ast.BinOp) -> _ast.expr:
+        self.generic_visit(node)
+        name = _ast.Constant(type(node.op).__name__)
+        return _call("__operate", name, node.left, node.right)
+
+    def visit_Call(self, node: _ast.Call) -> _ast.expr:
+        self.generic_visit(node)
+        return _call("__call", node.func, *node.args, keywords=node.keywords)
+
+    def visit_FormattedValue(self, node: _ast.FormattedValue) -> _ast.expr:
+        self.generic_visit(node)
+        spec = node.format_spec or _ast.Constant("")
+        value = _call("__format", node.value, _ast.Constant(node.conversion), spec)
+        return _ast.FormattedValue(value, -1, None)
+
+
+def _call(name: str, *args: _ast.expr, keywords: list | None = None) -> _ast.Call:
+    return _ast.Call(_ast.Name(name, _ast.Load()), list(args), keywords or [])
+
+
+def _is_literal(value: Any) -> bool:
+    """Check whether a value can be written as a literal."""
+    match value:
+        case None | bool() | int() | str():
+            return True
+        case float():
+            return math.isfinite(value)
+        case list() | tuple():
+            return all(map(_is_literal, value))
+        case dict():
+            return all(
+                isinstance(key, (str, int)) and not isinstance(key, bool)
+                for key in value
+            ) and all(map(_is_literal, value.values()))
+    return False
+
+
+def _containers(value: Any) -> Iterator[list | dict]:
+    """Yield the lists and dicts a value is made of."""
+    match value:
+        case list():
+            yield value
+            for item in value:
+                yield from _containers(item)
+        case tuple():
+            for item in value:
+                yield from _containers(item)
+        case dict():
+            yield value
+            for item in value.values():
+                yield from _containers(item)
+
+
+def _extractable(node: ast.expr) -> bool:
+    """Check whether an expression is already a literal."""
+    match node:
+        case ast.Constant():
+            return True
+        case ast.List(elts=elts) | ast.Tuple(elts=elts):
+            return all(map(_extractable, elts))
+        case ast.Dict(keys=keys, values=values):
+            return all(k is not None and _extractable(k) for k in keys) and all(
+                map(_extractable, values)
+            )
+    return False
+
+
+def _to_node(value: Any) -> ast.expr:
+    """Return the literal of a value."""
+    match value:
+        case list():
+            return ast.List(elts=[_to_node(item) for item in value], ctx=ast.Load())
+        case tuple():
+            return ast.Tuple(elts=[_to_node(item) for item in value], ctx=ast.Load())
+        case dict():
+            return ast.Dict(
+                keys=[_to_node(key) for key in value],
+                values=[_to_node(item) for item in value.values()],
+            )
+    return ast.Constant(value)
+
+
+def _bound_names(stmt: ast.stmt) -> list[str]:
+    """Return the names an import or a definition binds."""
+    match stmt:
+        case ast.Import(names=names) | ast.ImportFrom(names=names):
+            return [(alias.asname or alias.name).split(".")[0] for alias in names]
+        case ast.FunctionDef(name=name) | ast.AsyncFunctionDef(name=name):
+            return [name]
+        case ast.ClassDef(name=name):
+            return [name]
+    return []
@@ -0,0 +1,743 @@
+"""Integer range analysis pass.
+
+Adds a `_range` attribute to expressions: the bounds of their value when
+it is a number, as a Range (UNBOUNDED when nothing is known, None for
+expressions that can't be reached or have no value yet). Codegen uses the
+ranges to drop the fixups needed for negative numbers: ``xs[i]`` with
+``i >= 0`` needs no wrap-around, nor ``a % b`` the Python sign rule.
+
+Ranges come from constants, ``range()`` and ``enumerate()`` loops,
+``len()``, ``abs()``, ``min()``/``max()`` and arithmetic on other ranges.
+Unlike types, the range of a variable holds for the whole scope: it is the
+join of all the values assigned to the variable, computed again until it
+no longer changes (widening bounds that keep moving). The comparisons of
+``if`` and ``while`` tests, conditional expressions, ``and``/``or`` and
+comprehension conditions narrow the variables they compare in the code
+they guard, unless that code assigns them.
+
+Parameters, names bound by imports, ``with``, ``except`` and ``match``,
+and names declared global or nonlocal anywhere are never bounded, other
+than by comparisons.
+"""
+
+from __future__ import annotations
+
+from ast import iter_child_nodes, walk
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from prescrypt.front import ast
+
+from .base import Visitor
+from .types import Int
+
+# Passes over a scope before widening the bounds that still change
+WIDEN_PASSES = 3
+
+# Passes over a scope before giving up on its ranges
+MAX_PASSES = 20
+
+# Length of the longest JS array (strings are shorter)
+MAX_LENGTH = 2**32 - 1
+
+# Largest operand of the JS bitwise operators that stays non-negative
+MAX_INT32 = 2**31 - 1
+
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+# `b op a` for `a op b`, and `not (a op b)`
+MIRRORED = {
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+}
+NEGATED = {
+    ast.Lt: ast.GtE,
+    ast.LtE: ast.Gt,
+    ast.Gt: ast.LtE,
+    ast.GtE: ast.Lt,
+    ast.Eq: ast.NotEq,
+    ast.NotEq: ast.Eq,
+}
+
+
+@dataclass(frozen=True)
+class Range:
+    """The bounds of a number, inclusive; None for no bound."""
+
+    lo: int | float | None = None
+    hi: int | float | None = None
+
+    @property
+    def non_negative(self) -> bool:
+        return self.lo is not None and self.lo >= 0
+
+    def join(self, other: Range | None) -> Range:
+        """Return the smallest range containing both ranges."""
+        if other is None:
+            return self
+        lo = None if self.lo is None or other.lo is None else min(self.lo, other.lo)
+        hi = None if self.hi is None or other.hi is None else max(self.hi, other.hi)
+        return Range(lo, hi)
+
+    def meet(self, other: Range) -> Range | None:
+        """Return the intersection of both ranges, None if empty."""
+        lo = _pick(max, self.lo, other.lo)
+        hi = _pick(min, self.hi, other.hi)
+        if lo is not None and hi is not None and lo > hi:
+            return None
+        return Range(lo, hi)
+
+
+UNBOUNDED = Range()
+
+
+def join(a: Range | None, b: Range | None) -> Range | None:
+    """Join two ranges, either of which may be None (no value)."""
+    return b if a is None else a.join(b)
+
+
+class _Frame:
+    """The variables of a scope being analyzed."""
+
+    def __init__(
+        self, kind: str, names: set[str], tracked: set[str], parent: _Frame | None
+    ):
+        self.kind = kind
+        # Names local to the scope, and those whose ranges are computed
+        self.names = names
+        self.tracked = tracked
+        self.parent = parent
+        # Ranges of the tracked names, used by the current pass
+        self.current: dict[str, Range | None] = {}
+        # Joined ranges of the values assigned during the current pass
+        self.assigned: dict[str, Range | None] = {}
+        # Nested scopes to analyze afterwards, with their enclosing frames
+        self.nested: list[tuple[ast.AST, _Frame]] = []
+
+    def resolve(self, name: str) -> _Frame | None:
+        """Return the frame of the scope where a name is bound, if any."""
+        frame = self
+        while frame is not None and name not in frame.names:
+            frame = frame.parent
+        return frame
+
+    def owner(self) -> _Frame:
+        """Return the frame of the scope owning comprehension variables."""
+        frame = self
+        while frame.kind == "comprehension":
+            frame = frame.parent
+        return frame
+
+
+class RangeAnalysis(Visitor):
+    """Visitor that attaches the ranges of numeric values to expressions."""
+
+    def __init__(self):
+        self._frame: _Frame | None = None
+        # Narrowed ranges of the variables compared by enclosing tests
+        self._refined: list[dict[tuple[_Frame, str], Range]] = []
+        # Ranges of the values bound to the Name targets being visited
+        self._target_ranges: dict[int, Range | None] = {}
+        # Names rebound by functions through global or nonlocal statements
+        self._volatile: set[str] = set()
+
+    def visit(self, node):
+        result = super().visit(node)
+        if isinstance(node, ast.expr):
+            node._range = self._expr_range(node)
+        return result
+
+    #
+    # Scopes
+    #
+    def visit_Module(self, node: ast.Module):
+        self._volatile = {
+            name
+            for stmt in walk(node)
+            if isinstance(stmt, (ast.Global, ast.Nonlocal))
+            for name in stmt.names
+        }
+        frame = self._new_frame("module", node.body, None)
+        self._analyze(frame, lambda: self.visit_list(node.body))
+
+    def _new_frame(
+        self,
+        kind: str,
+        body: list[ast.AST],
+        parent: _Frame | None,
+        args: ast.arguments | None = None,
+    ) -> _Frame:
+        """Create the frame of a scope, from the names bound in its body."""
+        stored, other = _bound_names(body)
+        declared = {
+            name
+            for node in _local_nodes(body)
+            if isinstance(node, (ast.Global, ast.Nonlocal))
+            for name in node.names
+        }
+        params = set()
+        if args is not None:
+            params = {
+                arg.arg
+                for arg in (
+                    *args.posonlyargs,
+                    *args.args,
+                    args.vararg,
+                    *args.kwonlyargs,
+                    args.kwarg,
+                )
+                if arg is not None
+            }
+        names = (stored | other | params) - declared
+        tracked = names - other - params - self._volatile
+        return _Frame(kind, names, tracked, parent)
+
+    def _analyze(self, frame: _Frame, visit_body: Callable[[], None]):
+        """Visit a scope until the ranges of its variables are stable."""
+        saved = self._frame, self._refined
+        self._frame, self._refined = frame, []
+
+        passes = 0
+        while True:
+            passes += 1
+            frame.assigned = {}
+            frame.nested = []
+            visit_body()
+            ranges = {name: frame.assigned.get(name) for name in frame.tracked}
+            if passes >= WIDEN_PASSES:
+                ranges = {
+                    name: _widen(frame.current.get(name), value)
+                    for name, value in ranges.items()
+                }
+            if ranges == frame.current:
+                break
+            if passes >= MAX_PASSES:
+                frame.current = dict.fromkeys(frame.tracked, UNBOUNDED)
+                visit_body()
+                break
+            frame.current = ranges
+
+        for node, parent in frame.nested:
+            self._analyze_nested(node, parent)
+        self._frame, self._refined = saved
+
+    def _analyze_nested(self, node: ast.AST, parent: _Frame):
+        """Analyze a function, lambda or class body."""
+        if isinstance(node, ast.ClassDef):
+            frame = self._new_frame("class", node.body, parent)
+            self._analyze(frame, lambda: self.visit_list(node.body))
+            return
+
+        # Functions don't see the names of enclosing class bodies
+        while parent.kind == "class":
+            parent = parent.parent
+        if isinstance(node, ast.Lambda):
+            frame = self._new_frame("function", [node.body], parent, node.args)
+            self._analyze(frame, lambda: self.visit(node.body))
+        else:
+            frame = self._new_frame("function", node.body, parent, node.args)
+            self._analyze(frame, lambda: self.visit_list(node.body))
+
+    def _defer(self, node: ast.AST):
+        """Analyze a nested scope once the current one is done."""
+        self._frame.owner().nested.append((node, self._frame))
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.visit_list(node.decorator_list)
+        self._visit_defaults(node.args)
+        self._defer(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self.visit_list(node.decorator_list)
+        self._visit_defaults(node.args)
+        self._defer(node)
+
+    def visit_Lambda(self, node: ast.Lambda):
+        self._visit_defaults(node.args)
+        self._defer(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.visit_list(node.decorator_list)
+        self.visit_list(node.bases)
+        for keyword in node.keywords:
+            self.visit(keyword.value)
+        self._defer(node)
+
+    def _visit_defaults(self, args: ast.arguments):
+        self.visit_list(args.defaults)
+        self.visit_list([default for default in args.kw_defaults if default])
+
+    #
+    # Assignments
+    #
+    def visit_Assign(self, node: ast.Assign):
+        self.visit(node.value)
+        for target in node.targets:
+            self._bind(target, node.value)
+            self.visit(target)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if node.value is None:
+            return
+        self.visit(node.value)
+        self._bind(node.target, node.value)
+        self.visit(node.target)
+
+    def visit_NamedExpr(self, node: ast.NamedExpr):
+        self.visit(node.value)
+        self._bind(node.target, node.value)
+        self.visit(node.target)
+
+    def visit_For(self, node: ast.For):
+        self.visit(node.iter)
+        for name, value in _loop_targets(node.target, node.iter, self._is_builtin):
+            self._target_ranges[id(name)] = value
+        self.visit(node.target)
+        self.visit_list(node.body)
+        self.visit_list(node.orelse)
+
+    def _bind(self, target: ast.expr, value: ast.expr):
+        """Record the ranges of the values bound to the names of a target."""
+        match target, value:
+            case ast.Name(), _:
+                self._target_ranges[id(target)] = value._range
+            case (
+                (ast.Tuple(elts=targets) | ast.List(elts=targets)),
+                (ast.Tuple(elts=values) | ast.List(elts=values)),
+            ) if len(targets) == len(values) and not any(
+                isinstance(elt, ast.Starred) for elt in (*targets, *values)
+            ):
+                for elt_target, elt_value in zip(targets, values):
+                    self._bind(elt_target, elt_value)
+
+    def visit_Name(self, node: ast.Name):
+        if not isinstance(node.ctx, ast.Store):
+            return
+        value = self._target_ranges.get(id(node), UNBOUNDED)
+        frame = self._frame.owner().resolve(node.id)
+        if frame is not None and node.id in frame.tracked:
+            frame.assigned[node.id] = join(frame.assigned.get(node.id), value)
+
+    #
+    # Guards
+    #
+    def visit_If(self, node: ast.If):
+        self.visit(node.test)
+        self._visit_guarded(node.test, True, node.body)
+        self._visit_guarded(node.test, False, node.orelse)
+
+    def visit_While(self, node: ast.While):
+        self.visit(node.test)
+        self._visit_guarded(node.test, True, node.body)
+        self._visit_guarded(node.test, False, node.orelse)
+
+    def visit_IfExp(self, node: ast.IfExp):
+        self.visit(node.test)
+        self._visit_guarded(node.test, True, [node.body])
+        self._visit_guarded(node.test, False, [node.orelse])
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        # Each value is evaluated when the previous ones are true (and) or
+        # false (or)
+        positive = isinstance(node.op, ast.And)
+        depth = len(self._refined)
+        for i, value in enumerate(node.values):
+            if i > 0:
+                previous = node.values[i - 1]
+                self._push_refinements(previous, positive, node.values[i:])
+            self.visit(value)
+        del self._refined[depth:]
+
+    def _visit_guarded(self, test: ast.expr, positive: bool, body: list[ast.AST]):
+        """Visit code run when a test is true (positive) or false."""
+        depth = len(self._refined)
+        self._push_refinements(test, positive, body)
+        self.visit_list(body)
+        del self._refined[depth:]
+
+    def _push_refinements(self, test: ast.expr, positive: bool, body: list[ast.AST]):
+        """Narrow the variables compared by a test in code that keeps them."""
+        stored, other = _bound_names(body)
+        self._refined.append(
+            {
+                key: value
+                for key, value in self._refinements(test, positive).items()
+                if key[1] not in stored and key[1] not in other
+            }
+        )
+
+    def _refinements(
+        self, test: ast.expr, positive: bool
+    ) -> dict[tuple[_Frame, str], Range]:
+        """Return the ranges a test gives to variables when true or false."""
+        match test:
+            case ast.UnaryOp(op=ast.Not(), operand=operand):
+                return self._refinements(operand, not positive)
+            case ast.BoolOp(op=op, values=values) if (
+                isinstance(op, ast.And) == positive
+            ):
+                result: dict[tuple[_Frame, str], Range] = {}
+                for value in values:
+                    for key, value_range in self._refinements(value, positive).items():
+                        previous = result.get(key)
+                        result[key] = (
+                            value_range
+                            if previous is None
+                            else previous.meet(value_range) or value_range
+                        )
+                return result
+            case ast.Compare(left=left, ops=[op], comparators=[right]) if (
+                type(op) in NEGATED
+            ):
+                op_type = type(op) if positive else NEGATED[type(op)]
+                result = {}
+                for name, other, name_op in (
+                    (left, right, op_type),
+                    (right, left, MIRRORED[op_type]),
+                ):
+                    if not isinstance(name, ast.Name) or name.id in self._volatile:
+                        continue
+                    frame = self._frame.resolve(name.id)
+                    bound = _comparison_bound(name_op, name, other)
+                    if frame is not None and bound is not None:
+                        result[frame, name.id] = bound
+                return result
+        return {}
+
+    #
+    # Comprehensions
+    #
+    def visit_ListComp(self, node: ast.ListComp):
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_SetComp(self, node: ast.SetComp):
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp):
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_DictComp(self, node: ast.DictComp):
+        self._visit_comprehension(node, [node.key, node.value])
+
+    def _visit_comprehension(self, node: ast.expr, elements: list[ast.expr]):
+        generators = node.generators
+        # The first iterable is evaluated in the enclosing scope
+        self.visit(generators[0].iter)
+
+        names = {
+            name.id
+            for generator in generators
+            for name in walk(generator.target)
+            if isinstance(name, ast.Name)
+        }
+        frame = _Frame("comprehension", names, names, self._frame)
+        saved = self._frame, self._refined
+        self._frame = frame
+        if isinstance(node, ast.GeneratorExp):
+            # Generators run later, when enclosing tests may no longer hold
+            self._refined = []
+        else:
+            self._refined = list(self._refined)
+
+        for i, generator in enumerate(generators):
+            if i > 0:
+                self.visit(generator.iter)
+            for name in walk(generator.target):
+                if isinstance(name, ast.Name):
+                    frame.current[name.id] = UNBOUNDED
+            targets = _loop_targets(generator.target, generator.iter, self._is_builtin)
+            for name, value in targets:
+                frame.current[name.id] = value
+            for j, condition in enumerate(generator.ifs):
+                self.visit(condition)
+                rest = [*generator.ifs[j + 1 :], *generators[i + 1 :], *elements]
+                self._push_refinements(condition, True, rest)
+        self.visit_list(elements)
+
+        self._frame, self._refined = saved
+
+    #
+    # Expressions
+    #
+    def _is_builtin(self, name: str) -> bool:
+        return self._frame.resolve(name) is None
+
+    def _lookup(self, name: str) -> Range | None:
+        """Return the range of a variable, narrowed by enclosing tests."""
+        frame = self._frame.resolve(name)
+        if frame is None:
+            return UNBOUNDED
+        value = frame.current.get(name) if name in frame.tracked else UNBOUNDED
+        for refinements in self._refined:
+            refinement = refinements.get((frame, name))
+            if refinement is not None and value is not None:
+                value = value.meet(refinement)
+        return value
+
+    def _expr_range(self, node: ast.expr) -> Range | None:
+        match node:
+            case ast.Constant(value=int() | float() as value):
+                return Range(value, value)
+            case ast.Name(ctx=ast.Load()):
+                return self._lookup(node.id)
+            case ast.BinOp(left=left, op=op, right=right):
+                return _binop_range(op, left._range, right._range)
+            case ast.UnaryOp(op=ast.Invert(), operand=operand):
+                # ~x == -x - 1
+                value = operand._range
+                if value is None:
+                    return None
+                return Range(_neg(value.hi, 1), _neg(value.lo, 1))
+            case ast.IfExp(body=body, orelse=orelse):
+                return join(body._range, orelse._range)
+            case ast.BoolOp(values=values):
+                result = None
+                for value in values:
+                    result = join(result, value._range)
+                return result
+            case ast.NamedExpr(value=value):
+                return value._range
+            case ast.Call():
+                return self._call_range(node)
+        return UNBOUNDED
+
+    def _call_range(self, node: ast.Call) -> Range | None:
+        match node:
+            case ast.Call(func=ast.Name(id=name), args=args, keywords=[]) if (
+                self._is_builtin(name)
+                and not any(isinstance(arg, ast.Starred) for arg in args)
+            ):
+                ranges = [arg._range for arg in args]
+            case _:
+                return UNBOUNDED
+
+        match name, ranges:
+            case "len", [_]:
+                return Range(0, MAX_LENGTH)
+            case "ord", [_]:
+                return Range(0, 0x10FFFF)
+            case _ if None in ranges:
+                return None
+            case "abs", [value]:
+                if value.non_negative:
+                    return value
+                if value.hi is not None and value.hi <= 0:
+                    return Range(_neg(value.hi), _neg(value.lo))
+                if value.lo is None or value.hi is None:
+                    return Range(0, None)
+                return Range(0, max(-value.lo, value.hi))
+            case "min", [_, _, *_]:
+                los = [value.lo for value in ranges]
+                his = [value.hi for value in ranges]
+                return Range(_all(min, los), _pick(min, *his))
+            case "max", [_, _, *_]:
+                los = [value.lo for value in ranges]
+                his = [value.hi for value in ranges]
+                return Range(_pick(max, *los), _all(max, his))
+        return UNBOUNDED
+
+
+#
+# Range arithmetic
+#
+def _pick(func: Callable, *bounds):
+    """Apply min or max to the given bounds, ignoring missing ones."""
+    known = [bound for bound in bounds if bound is not None]
+    return func(known) if known else None
+
+
+def _all(func: Callable, bounds: list):
+    """Apply min or max to bounds, which must all be known."""
+    return None if None in bounds else func(bounds)
+
+
+def _neg(bound, offset=0):
+    return None if bound is None else -bound - offset
+
+
+def _add(a, b):
+    return None if a is None or b is None else a + b
+
+
+def _sub(a, b):
+    return None if a is None or b is None else a - b
+
+
+def _mul(a, b):
+    return None if a is None or b is None else a * b
+
+
+def _binop_range(op: ast.operator, a: Range | None, b: Range | None) -> Range | None:
+    """Return the range of the result of an arithmetic operator."""
+    if a is None or b is None:
+        return None
+    match op:
+        case ast.Add():
+            return Range(_add(a.lo, b.lo), _add(a.hi, b.hi))
+        case ast.Sub():
+            return Range(_sub(a.lo, b.hi), _sub(a.hi, b.lo))
+        case ast.Mult():
+            if a.non_negative and b.non_negative:
+                return Range(a.lo * b.lo, _mul(a.hi, b.hi))
+            bounds = (a.lo, a.hi, b.lo, b.hi)
+            if None not in bounds:
+                products = [x * y for x in (a.lo, a.hi) for y in (b.lo, b.hi)]
+                return Range(min(products), max(products))
+        case ast.FloorDiv():
+            if a.non_negative and b.lo is not None and b.lo > 0:
+                lo = 0 if b.hi is None else a.lo // b.hi
+                return Range(lo, None if a.hi is None else a.hi // b.lo)
+        case ast.Div():
+            if a.non_negative and b.lo is not None and b.lo > 0:
+                return Range(0, None)
+        case ast.Pow():
+            if a.non_negative and b.non_negative:
+                lo = a.lo**b.lo if a.lo >= 1 else 0
+                small = a.hi is not None and b.hi is not None and b.hi <= 64
+                return Range(lo, a.hi**b.hi if small else None)
+        case ast.Mod():
+            # The result has the sign of the divisor, and is smaller
+            if b.lo is not None and b.lo > 0:
+                hi = _pick(min, a.hi, b.hi) if a.non_negative else b.hi
+                return Range(0, hi)
+            if b.hi is not None and b.hi < 0:
+                return Range(b.lo, 0)
+        case ast.BitAnd():
+            his = [
+                value.hi
+                for value in (a, b)
+                if value.non_negative and value.hi is not None and value.hi <= MAX_INT32
+            ]
+            if his:
+                return Range(0, min(his))
+        case ast.RShift():
+            if a.non_negative and a.hi is not None and a.hi <= MAX_INT32:
+                return Range(0, a.hi)
+    return UNBOUNDED
+
+
+def _widen(old: Range | None, new: Range | None) -> Range | None:
+    """Drop the bounds that changed since the previous pass."""
+    if old is None or new is None:
+        return new
+    lo_kept = old.lo is not None and new.lo is not None and new.lo >= old.lo
+    hi_kept = old.hi is not None and new.hi is not None and new.hi <= old.hi
+    return Range(old.lo if lo_kept else None, old.hi if hi_kept else None)
+
+
+def _comparison_bound(op: type, name: ast.Name, other: ast.expr) -> Range | None:
+    """Return the range `name op other` gives to the name, if any."""
+    value = other._range
+    if value is None:
+        return None
+    # Strict comparisons of ints exclude the bound
+    step = 1 if _is_int(name) and _is_int(other) else 0
+    if op is ast.Lt:
+        return Range(None, _sub(value.hi, step))
+    if op is ast.LtE:
+        return Range(None, value.hi)
+    if op is ast.Gt:
+        return Range(_add(value.lo, step), None)
+    if op is ast.GtE:
+        return Range(value.lo, None)
+    if op is ast.Eq:
+        return value
+    return None
+
+
+def _is_int(node: ast.expr) -> bool:
+    if isinstance(node, ast.Constant):
+        return type(node.value) is int
+    return getattr(node, "_type", None) is Int
+
+
+def _loop_targets(
+    target: ast.expr, iterable: ast.expr, is_builtin: Callable[[str], bool]
+) -> list[tuple[ast.Name, Range | None]]:
+    """Return the ranges of the names bound by `for target in iterable`."""
+    match target, iterable:
+        case ast.Name(), ast.Call(
+            func=ast.Name(id="range"), args=args, keywords=[]
+        ) if (
+            is_builtin("range")
+            and 1 <= len(args) <= 3
+            and not any(isinstance(arg, ast.Starred) for arg in args)
+        ):
+            return [(target, _range_values(args))]
+        case ast.Tuple(elts=[ast.Name() as index, _]), ast.Call(
+            func=ast.Name(id="enumerate"), args=[_, *start], keywords=[]
+        ) if is_builtin("enumerate") and len(start) <= 1:
+            match start:
+                case []:
+                    return [(index, Range(0, None))]
+                case [ast.Starred()]:
+                    return []
+                case [first] if first._range is None:
+                    return [(index, None)]
+                case [first]:
+                    return [(index, Range(first._range.lo, None))]
+    return []
+
+
+def _range_values(args: list[ast.expr]) -> Range | None:
+    """Return the range of the values of range(*args)."""
+    ranges = [arg._range for arg in args]
+    if None in ranges:
+        return None
+    if len(ranges) == 1:
+        start, stop, step = Range(0, 0), ranges[0], Range(1, 1)
+    elif len(ranges) == 2:
+        (start, stop), step = ranges, Range(1, 1)
+    else:
+        start, stop, step = ranges
+
+    if step.lo is not None and step.lo > 0:
+        value = Range(start.lo, _sub(stop.hi, 1))
+    elif step.hi is not None and step.hi < 0:
+        value = Range(_add(stop.lo, 1), start.hi)
+    else:
+        value = start.join(stop)
+    if value.lo is not None and value.hi is not None and value.lo > value.hi:
+        # Empty range: the loop variable is never bound
+        return None
+    return value
+
+
+def _local_nodes(nodes: Iterable[ast.AST]):
+    """Yield the nodes of a scope, without the bodies of nested scopes."""
+    for node in nodes:
+        yield node
+        if not isinstance(node, SCOPE_NODES):
+            yield from _local_nodes(iter_child_nodes(node))
+
+
+def _bound_names(nodes: Iterable[ast.AST]) -> tuple[set[str], set[str]]:
+    """Return the names assigned by some code, and those bound otherwise.
+
+    Assigned names are those of Name targets. Other names are deleted, or
+    bound by definitions, imports, ``except`` and ``match``.
+    """
+    stored: set[str] = set()
+    other: set[str] = set()
+    for node in _local_nodes(nodes):
+        match node:
+            case ast.Name(ctx=ast.Store()):
+                stored.add(node.id)
+            case ast.Name(ctx=ast.Del()):
+                other.add(node.id)
+            case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.ClassDef():
+                other.add(node.name)
+            case ast.Import() | ast.ImportFrom():
+                for alias in node.names:
+                    other.add(alias.asname or alias.name.split(".")[0])
+            case ast.ExceptHandler(name=str(name)):
+                other.add(name)
+            case ast.MatchAs(name=str(name)) | ast.MatchStar(name=str(name)):
+                other.add(name)
+            case ast.MatchMapping(rest=str(name)):
+                other.add(name)
+    return stored, other
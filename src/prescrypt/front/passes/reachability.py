@@ -0,0 +1,318 @@
+"""Whole-program dead code elimination for bundles.
+
+A bundle contains every module the entry file imports, though the program
+may only use a few of their functions and classes. This pass finds the
+definitions that can be reached from the code that runs, and removes the
+module-level functions and classes, and the methods, that can't::
+
+    # utils.py
+    def used(): ...
+    def unused(): ...     # removed
+
+    # main.py
+    from utils import used
+    used()
+
+The module bodies (everything but ``def`` and ``class`` statements) always
+run, so they are the roots, together with the names in the entry modules'
+``__all__`` and the names to keep (``--keep``). A function or class is
+reachable when its name is read by reachable code. Names are matched
+across modules (an imported name read under an alias counts too).
+
+A method of a reachable class is kept when its name is read as an
+attribute (``obj.name``, ``getattr(obj, "name")``) or a name by reachable
+code, since the class of ``obj`` isn't known. Dunder methods are called by
+the runtime, so they are always kept.
+
+Nothing is removed when reachable code calls ``globals()``, ``vars()``,
+``eval()`` or ``exec()``, or looks up an attribute of a module with a
+computed name. An attribute looked up on anything else with a computed
+name, or ``__dict__``, keeps all the methods. Definitions with decorators
+that may have side effects (registration...), classes with keywords
+(``metaclass=``) and, if any class defines ``__init_subclass__``, all
+classes are kept.
+"""
+
+from __future__ import annotations
+
+from ast import copy_location, walk
+from collections.abc import Iterable
+from pathlib import PurePath
+
+from prescrypt.front import ast
+
+# Decorators without side effects
+SAFE_DECORATORS = {
+    "property",
+    "staticmethod",
+    "classmethod",
+    "cache",
+    "lru_cache",
+    "cached_property",
+    "abstractmethod",
+    "dataclass",
+    "setter",
+    "getter",
+    "deleter",
+}
+
+# Builtins that read module-level names by name
+DYNAMIC_BUILTINS = {"globals", "vars", "eval", "exec"}
+
+# Builtins that take an attribute name as second argument
+ATTRIBUTE_BUILTINS = {"getattr", "hasattr", "setattr", "delattr"}
+
+FUNCTION_DEFS = (ast.FunctionDef, ast.AsyncFunctionDef)
+DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def eliminate_dead_code(
+    trees: dict[str, ast.Module],
+    entry: str | list[str],
+    keep: Iterable[str] = (),
+) -> list[str]:
+    """Remove the unreachable definitions of bundled modules, in place.
+
+    Args:
+        trees: The module trees, by module name (used in the report)
+        entry: The name of the entry module, or of the entry modules
+        keep: Names of functions and classes (``name``) or methods
+            (``Class.method``) to keep even if unreachable
+
+    Returns:
+        The removed definitions, as ``module: name`` or
+        ``module: Class.method``
+    """
+    reachability = Reachability(trees, entry, keep)
+    reachability.run()
+    return reachability.prune()
+
+
+class Reachability:
+    """The definitions reachable from the module bodies of a bundle."""
+
+    def __init__(
+        self,
+        trees: dict[str, ast.Module],
+        entry: str | list[str],
+        keep: Iterable[str],
+    ):
+        self.trees = trees
+        self.keep = set(keep)
+
+        # Names read by reachable code, and attributes (of modules)
+        self.names: set[str] = set()
+        self.attributes: set[str] = set()
+        self.module_attributes: set[str] = set()
+        # An attribute was looked up by a computed name: all the methods
+        # can be reached (all the definitions if on a module)
+        self.escaped = False
+        self.dynamic = False
+
+        # Reachable definitions, by node id
+        self.live: set[int] = set()
+        self._pending: list[ast.AST] = []
+
+        # Module-level definitions: (module, node)
+        self.definitions: list[tuple[str, ast.stmt]] = []
+        # `from m import name as alias`: the names by alias
+        self.aliases: dict[str, set[str]] = {}
+        # `import m`, `import m as alias`
+        self.module_names: set[str] = set()
+
+        # Names of the modules, to find `from pkg import module`
+        self.module_stems = {PurePath(module).stem for module in trees} | {
+            PurePath(module).parent.name for module in trees
+        }
+        for module, tree in trees.items():
+            self._collect(module, tree)
+        for module in [entry] if isinstance(entry, str) else entry:
+            self.keep.update(exported_names(trees.get(module)))
+        # Classes with methods to keep
+        owners = {name.split(".")[0] for name in self.keep if "." in name}
+
+        has_init_subclass = any(
+            method.name == "__init_subclass__"
+            for _, node in self.definitions
+            if isinstance(node, ast.ClassDef)
+            for method in _methods(node)
+        )
+        for _, node in self.definitions:
+            if (
+                node.name in self.keep
+                or node.name in owners
+                or not _has_safe_decorators(node)
+                or (
+                    isinstance(node, ast.ClassDef)
+                    and (node.keywords or has_init_subclass)
+                )
+            ):
+                self._reach(node)
+
+    def _collect(self, module: str, tree: ast.Module):
+        for stmt in tree.body:
+            if isinstance(stmt, DEFINITIONS):
+                self.definitions.append((module, stmt))
+            else:
+                # Module bodies run
+                self._pending.append(stmt)
+        for node in walk(tree):
+            match node:
+                case ast.ImportFrom(names=aliases):
+                    for alias in aliases:
+                        if alias.asname:
+                            names = self.aliases.setdefault(alias.asname, set())
+                            names.add(alias.name)
+                        if alias.name in self.module_stems:
+                            self.module_names.add(alias.asname or alias.name)
+                case ast.Import(names=aliases):
+                    for alias in aliases:
+                        self.module_names.add(alias.asname or alias.name.split(".")[0])
+
+    def run(self):
+        """Find the reachable definitions."""
+        progress = True
+        while progress and not self.dynamic:
+            while self._pending:
+                self._scan(self._pending.pop())
+            progress = False
+            for _, node in self.definitions:
+                if id(node) in self.live:
+                    if isinstance(node, ast.ClassDef):
+                        progress |= self._reach_methods(node)
+                elif node.name in self.names or node.name in self.module_attributes:
+                    self._reach(node)
+                    progress = True
+
+    def prune(self) -> list[str]:
+        """Remove the unreachable definitions, and return them."""
+        if self.dynamic:
+            return []
+        removed = []
+        for module, tree in self.trees.items():
+            body = []
+            for stmt in tree.body:
+                if not isinstance(stmt, DEFINITIONS):
+                    body.append(stmt)
+                elif id(stmt) not in self.live:
+                    removed.append(f"{module}: {stmt.name}")
+                else:
+                    if isinstance(stmt, ast.ClassDef):
+                        removed += self._prune_methods(module, stmt)
+                    body.append(stmt)
+            tree.body = body
+        return removed
+
+    def _prune_methods(self, module: str, node: ast.ClassDef) -> list[str]:
+        removed = []
+        body = []
+        for stmt in node.body:
+            if isinstance(stmt, FUNCTION_DEFS) and id(stmt) not in self.live:
+                removed.append(f"{module}: {node.name}.{stmt.name}")
+            else:
+                body.append(stmt)
+        node.body = body or [copy_location(ast.Pass(), node)]
+        return removed
+
+    def _reach(self, node: ast.stmt):
+        self.live.add(id(node))
+        if not isinstance(node, ast.ClassDef):
+            self._pending.append(node)
+            return
+        self._pending += [*node.decorator_list, *node.bases, *node.keywords]
+        self._pending += [
+            stmt for stmt in node.body if not isinstance(stmt, FUNCTION_DEFS)
+        ]
+
+    def _reach_methods(self, node: ast.ClassDef) -> bool:
+        """Mark the reachable methods of a reachable class."""
+        progress = False
+        for method in _methods(node):
+            if id(method) in self.live:
+                continue
+            name = method.name
+            if (
+                self.escaped
+                or (name.startswith("__") and name.endswith("__"))
+                or name in self.attributes
+                or name in self.names
+                or f"{node.name}.{name}" in self.keep
+                or not _has_safe_decorators(method)
+            ):
+                self.live.add(id(method))
+                self._pending.append(method)
+                progress = True
+        return progress
+
+    def _scan(self, root: ast.AST):
+        """Record the names and attributes read by a reachable node."""
+        for node in walk(root):
+            match node:
+                case ast.Name(id=name, ctx=ast.Load() | ast.Del()):
+                    self.names.add(name)
+                    self.names.update(self.aliases.get(name, ()))
+                    if name in DYNAMIC_BUILTINS:
+                        self.dynamic = True
+                case ast.Attribute(attr=attr):
+                    self.attributes.add(attr)
+                    if attr == "__dict__":
+                        self.escaped = True
+                    if _base_name(node) in self.module_names:
+                        self.module_attributes.add(attr)
+                case ast.Call(func=ast.Name(id=name), args=[obj, attr, *_]) if (
+                    name in ATTRIBUTE_BUILTINS
+                ):
+                    on_module = _base_name(obj) in self.module_names
+                    match attr:
+                        case ast.Constant(value=str(value)):
+                            self.attributes.add(value)
+                            if on_module:
+                                self.module_attributes.add(value)
+                        case _ if on_module:
+                            self.dynamic = True
+                        case _:
+                            self.escaped = True
+
+
+def _methods(node: ast.ClassDef) -> list[ast.stmt]:
+    return [stmt for stmt in node.body if isinstance(stmt, FUNCTION_DEFS)]
+
+
+def _has_safe_decorators(node: ast.stmt) -> bool:
+    """Check whether defining a function or class has no side effects."""
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        match decorator:
+            case ast.Name(id=name) | ast.Attribute(attr=name):
+                if name not in SAFE_DECORATORS:
+                    return False
+            case _:
+                return False
+    return True
+
+
+def _base_name(node: ast.expr) -> str | None:
+    """Return the name an attribute chain (``a.b.c``) starts with."""
+    while isinstance(node, ast.Attribute):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def exported_names(tree: ast.Module | None) -> list[str]:
+    """Return the names listed in the ``__all__`` of a module."""
+    if tree is None:
+        return []
+    names = []
+    for stmt in tree.body:
+        match stmt:
+            case ast.Assign(
+                targets=[ast.Name(id="__all__")],
+                value=ast.List(elts=elts) | ast.Tuple(elts=elts),
+            ):
+                names += [
+                    elt.value
+                    for elt in elts
+                    if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+                ]
+    return names
@@ -0,0 +1,197 @@
+"""Module-level names of bundled modules, for single-scope bundles.
+
+A bundle runs all its modules in a single function scope: the module-level
+names of each module become local variables of that function, which engines
+access faster than globals. This pass renames the module-level names of a
+module to their names in the bundle::
+
+    # utils.py                      # main.py
+    def helper(): ...               import utils
+                                    from utils import helper as h
+                                    def helper(): ...  # -> helper$1
+                                    h()                # -> helper()
+                                    utils.helper()     # -> helper()
+
+- A binding that clashes with a binding of another module gets a new name
+  (``name$1``: ``$`` can't be in a Python name, so it can't clash again),
+- an imported name refers to the binding of its module directly,
+- so does an attribute of an imported module (``utils.helper``), when read,
+- and so do the names imported in functions (``local``).
+
+Uses the scopes of the Binder: local variables with the same names are
+left alone.
+"""
+
+from __future__ import annotations
+
+from ast import copy_location, walk
+from collections.abc import Iterator
+
+from prescrypt.front import Scope, Variable, ast
+
+from .base import Transformer, walk_scopes
+
+# Attributes set on nodes by the analysis passes
+NODE_INFO = ("_type", "_range")
+
+
+def hoist_names(
+    tree: ast.Module,
+    names: dict[str, str],
+    modules: dict[str, dict[str, str]],
+    local: dict[int, tuple[dict[str, str], dict[str, dict[str, str]]]] | None = None,
+) -> int:
+    """Rename the module-level names of a module to their bundle names, in place.
+
+    ``tree`` must have been through the Binder. Returns the number of renamed
+    names and attributes.
+
+    Args:
+        tree: The module
+        names: Bundle names of the module-level names that are renamed
+            (bindings of the module and imported names), by name
+        modules: Bundle names of the module-level names of the imported
+            modules, by module name as bound in the module (``utils``,
+            ``pkg.sub``)
+        local: ``names`` and ``modules`` of the imports in functions, by id
+            of the scope of the function
+    """
+    return Hoister(tree, names, modules, local).run()
+
+
+class Hoister:
+    """Rename the module-level names of a module."""
+
+    def __init__(
+        self,
+        tree: ast.Module,
+        names: dict[str, str],
+        modules: dict[str, dict[str, str]],
+        local: dict[int, tuple[dict[str, str], dict[str, dict[str, str]]]]
+        | None = None,
+    ):
+        self.tree = tree
+        self.names = names
+        self.modules = modules
+        self.local = local or {}
+
+    def run(self) -> int:
+        renames = []
+        replacements: dict[int, ast.Name] = {}
+        for node, _scope, new_name in self._renames():
+            if isinstance(node, ast.Attribute):
+                name = ast.Name(id=new_name, ctx=node.ctx)
+                for info in NODE_INFO:
+                    if hasattr(node, info):
+                        setattr(name, info, getattr(node, info))
+                replacements[id(node)] = copy_location(name, node)
+            else:
+                renames.append((node, new_name))
+
+        for node, new_name in renames:
+            match node:
+                case ast.Name():
+                    node.id = new_name
+                case ast.Global():
+                    node.names = new_name
+                case _:
+                    node.name = new_name
+        _Replacer(replacements).visit(self.tree)
+
+        for node in walk(self.tree):
+            scope = getattr(node, "_scope", None)
+            if scope is not None:
+                scope.vars = self._new_vars(scope)
+        return len(renames) + len(replacements)
+
+    def shadowed(self) -> set[str]:
+        """Return the bundle names a local variable would shadow.
+
+        E.g. ``utils.helper`` can't become ``helper`` in a function with a
+        parameter named ``helper``.
+        """
+        shadowed = set()
+        for node, scope, new_name in self._renames():
+            if isinstance(node, (ast.Name, ast.Attribute)):
+                if not _is_module_level(scope, new_name):
+                    shadowed.add(new_name)
+        return shadowed
+
+    def _new_vars(self, scope: Scope) -> dict[str, Variable]:
+        """Return the variables of a scope, by new name."""
+        variables = {}
+        for name, var in scope.vars.items():
+            # Bindings of the module, and `global` declarations
+            if (scope.parent is None and var.type != "module") or var.type == "global":
+                name = var.name = self.names.get(name, name)
+            variables[name] = var
+        return variables
+
+    def _renames(self) -> Iterator[tuple[ast.AST, Scope, str | list[str]]]:
+        """Yield the nodes to rename: (node, scope, new name)."""
+        for node, scope in walk_scopes(self.tree, self.tree._scope):
+            match node:
+                case ast.Name(id=name):
+                    names, _ = self._imported(scope, name)
+                    if name in names:
+                        yield node, scope, names[name]
+                case ast.Attribute(ctx=ast.Load()):
+                    new_name = self._attribute(node, scope)
+                    if new_name is not None:
+                        yield node, scope, new_name
+                case ast.FunctionDef() | ast.AsyncFunctionDef() | ast.ClassDef():
+                    if node.name in self.names and _is_module_level(scope, node.name):
+                        yield node, scope, self.names[node.name]
+                case ast.Global(names=names):
+                    yield node, scope, [self.names.get(name, name) for name in names]
+
+    def _attribute(self, node: ast.Attribute, scope: Scope) -> str | None:
+        """Return the bundle name of an attribute of an imported module."""
+        module = _dotted_name(node.value)
+        if module is None:
+            return None
+        _, modules = self._imported(scope, module.split(".")[0])
+        if module not in modules:
+            return None
+        return modules[module].get(node.attr)
+
+    def _imported(
+        self, scope: Scope, name: str
+    ) -> tuple[dict[str, str], dict[str, dict[str, str]]]:
+        """Return the ``names`` and ``modules`` a name used in a scope is in."""
+        if _is_module_level(scope, name):
+            return self.names, self.modules
+        owner = scope.resolve(name)
+        if owner.vars[name].type == "module":
+            return self.local.get(id(owner), ({}, {}))
+        return {}, {}
+
+
+class _Replacer(Transformer):
+    """Replace nodes, by id."""
+
+    def __init__(self, replacements: dict[int, ast.AST]):
+        self.replacements = replacements
+
+    def visit(self, node):
+        if id(node) in self.replacements:
+            return self.replacements[id(node)]
+        return self.generic_visit(node)
+
+
+def _is_module_level(scope: Scope, name: str) -> bool:
+    """Check whether a name used in a scope refers to a module-level name."""
+    owner = scope.resolve(name)
+    return owner is None or owner.parent is None or owner.vars[name].type == "global"
+
+
+def _dotted_name(node: ast.expr) -> str | None:
+    """Return the dotted name of an attribute chain (``a.b.c``), if it is one."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
@@ -2,14 +2,59 @@
 
 Adds a `_type` attribute to AST nodes, using annotations and inference.
 This is a best-effort pass - when types cannot be determined, it assigns Unknown.
+
+Variable types are flow-sensitive within a scope: each branch of an `if`,
+`try` or `match` starts from the types before it and the branches are
+joined afterwards; loop bodies are visited until the types at the head of
+the loop no longer change (widening to Unknown if they keep changing).
+
+Functions without a return annotation get the join of the types they
+return. The module is visited until these return types no longer change,
+so callers see the types of functions defined after them and recursion
+settles. The final types of module-level names are available to importing
+modules in bundles.
+
+Each class gets a ClassType. Attribute types are the join of all the values
+assigned to the attribute, whatever the receiver (``self.x = ...`` in
+methods, ``p.x = ...`` elsewhere), unless annotated in the class body or as
+dataclass fields. Like return types, they are collected during a pass over
+the module and used by the next one. ``isinstance`` tests and ``is None``
+comparisons narrow the type of a variable in the branches they guard.
 """
 
 from __future__ import annotations
 
+import builtins
+from ast import iter_child_nodes, walk
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from prescrypt.front import ast
 
 from .base import Visitor
-from .types import Bool, Dict, Float, Int, JSObject, List, String, Tuple, Unknown, Void
+from .types import (
+    Bool,
+    ClassType,
+    Dict,
+    Float,
+    Int,
+    JSObject,
+    List,
+    Never,
+    String,
+    Tuple,
+    Unknown,
+    Void,
+    base_type,
+    dict_of,
+    element_type,
+    item_type,
+    join,
+    list_of,
+    tuple_of,
+    union_members,
+    union_of,
+)
 
 TYPE_MAP = {
     "int": Int,
@@ -24,6 +69,18 @@ TYPE_MAP = {
     "JSObject": JSObject,
 }
 
+# Generic annotations: list[int], Dict[str, float], Optional[str], ...
+GENERIC_ANNOTATIONS = {
+    "list": "list",
+    "List": "list",
+    "dict": "dict",
+    "Dict": "dict",
+    "tuple": "tuple",
+    "Tuple": "tuple",
+    "Optional": "optional",
+    "Union": "union",
+}
+
 # Return types for built-in functions
 BUILTIN_RETURN_TYPES = {
     # Type constructors
@@ -45,7 +102,7 @@ BUILTIN_RETURN_TYPES = {
     "oct": String,
     "bin": String,
     # Sequence functions
-    "range": List,
+    "range": list_of(Int),
     "enumerate": List,
     "zip": List,
     "map": List,
@@ -66,6 +123,13 @@ BUILTIN_RETURN_TYPES = {
     "id": Int,
 }
 
+# Return types of stdlib module functions, keyed by (module, name)
+STDLIB_RETURN_TYPES = {
+    ("collections", "Counter"): Dict,
+    ("collections", "OrderedDict"): Dict,
+    ("collections", "defaultdict"): Dict,
+}
+
 # Return types for methods based on receiver type
 # Key is (receiver_type, method_name)
 METHOD_RETURN_TYPES = {
@@ -77,9 +141,9 @@ METHOD_RETURN_TYPES = {
     (String, "strip"): String,
     (String, "lstrip"): String,
     (String, "rstrip"): String,
-    (String, "split"): List,
-    (String, "rsplit"): List,
-    (String, "splitlines"): List,
+    (String, "split"): list_of(String),
+    (String, "rsplit"): list_of(String),
+    (String, "splitlines"): list_of(String),
     (String, "join"): String,
     (String, "replace"): String,
     (String, "format"): String,
@@ -108,8 +172,8 @@ METHOD_RETURN_TYPES = {
     (String, "ljust"): String,
     (String, "rjust"): String,
     (String, "expandtabs"): String,
-    (String, "partition"): Tuple,
-    (String, "rpartition"): Tuple,
+    (String, "partition"): tuple_of(String, String, String),
+    (String, "rpartition"): tuple_of(String, String, String),
     (String, "swapcase"): String,
     (String, "casefold"): String,
     # List methods
@@ -127,25 +191,193 @@ METHOD_RETURN_TYPES = {
 }
 
 
-class TypeInference(Visitor):
-    """Visitor that infers and attaches types to AST nodes."""
+# Passes over a loop body before the types that still change are widened
+MAX_LOOP_PASSES = 4
+
+# Passes over a module before the return types that still change are widened
+MAX_MODULE_PASSES = 4
 
-    def __init__(self):
+# Decorators that keep the return type of the function they wrap (for
+# properties, the type of the attribute)
+TYPE_PRESERVING_DECORATORS = {
+    "cache",
+    "lru_cache",
+    "staticmethod",
+    "classmethod",
+    "property",
+}
+
+# Decorators that keep a class as it is, so its name still builds instances
+TYPE_PRESERVING_CLASS_DECORATORS = {"dataclass"}
+
+# Types that isinstance() checks against builtin types narrow to. Ints and
+# floats are both JS numbers, which isinstance() can't tell apart.
+ISINSTANCE_TYPES = {
+    "str": String,
+    "bool": Bool,
+    "int": Float,
+    "float": Float,
+    "list": List,
+}
+
+# Variable types at a point of a scope; None when the point is unreachable
+Env = dict[str, type] | None
+
+
+@dataclass
+class _Function:
+    """What is learned about a function while visiting its body."""
+
+    return_type: type = Never
+    is_generator: bool = False
+
+
+class TypeInference(Visitor):
+    """Visitor that infers and attaches types to AST nodes.
+
+    ``imported_types`` gives the types of the names of already processed
+    modules, by module name as written in import statements (``geometry``,
+    ``.utils``). After visiting a module, ``module_types`` holds the types
+    of its own names.
+    """
+
+    def __init__(self, imported_types: dict[str, dict[str, type]] | None = None):
+        self._imported_types = imported_types or {}
+        self.module_types: dict[str, type] = {}
+        # Inferred return types of unannotated functions, kept across passes
+        self._return_types: dict[ast.AST, type] = {}
+        self._return_types_changed = False
+        # Names rebound by functions through global or nonlocal statements
+        self._shared_names: set[str] = set()
+        # Types of the classes of the module, kept across passes
+        self._classes: dict[ast.ClassDef, ClassType] = {}
+        # Types of the values assigned to attributes of receivers of unknown
+        # type, by attribute name, as found by the previous pass
+        self._unknown_attributes: dict[str, type] = {}
+        self._reset()
+
+    def _reset(self):
+        """Reset the state of a pass over the module."""
         # Track variable types by name in current scope
         # Stack of dicts for nested scopes
         self._var_types: list[dict[str, type]] = [{}]
-
-    def _push_scope(self):
+        # Whether each scope is a comprehension (walrus targets skip them)
+        self._comprehension_scopes: list[bool] = [False]
+        # Imported modules by local name: import collections as c
+        self._modules: dict[str, str] = {}
+        # Whether the current point follows a return, raise, break, continue
+        self._unreachable = False
+        # Environments at the break and continue statements of each loop
+        self._loops: list[tuple[list[Env], list[Env]]] = []
+        # Functions being visited, innermost last
+        self._functions: list[_Function] = []
+        # Names declared global or nonlocal in each scope
+        self._declared_shared: list[set[str]] = [set()]
+        # Class whose body is being visited, for the self parameter of methods
+        self._enclosing_class: ClassType | None = None
+        # Types assigned to attributes during this pass, by receiver class
+        # (None for receivers of unknown type) and attribute name
+        self._attribute_stores: dict[ClassType | None, dict[str, type]] = {}
+
+    def visit_Module(self, node: ast.Module):
+        """Visit the module until the inferred return types are stable."""
+        self._shared_names = {
+            name
+            for stmt in walk(node)
+            if isinstance(stmt, (ast.Global, ast.Nonlocal))
+            for name in stmt.names
+        }
+        passes = 0
+        while True:
+            passes += 1
+            self._reset()
+            previous = dict(self._return_types)
+            self._declare_functions(node, node.body)
+            self.visit_list(node.body)
+            attributes_changed = self._update_attribute_types(
+                widen=passes >= MAX_MODULE_PASSES
+            )
+            if self._return_types == previous and not attributes_changed:
+                break
+            if passes >= MAX_MODULE_PASSES:
+                # Widen the return types that keep changing
+                for function, return_type in self._return_types.items():
+                    if previous.get(function) != return_type:
+                        self._return_types[function] = Unknown
+        self.module_types = dict(self._var_types[0])
+
+    def _update_attribute_types(self, widen: bool) -> bool:
+        """Make the attribute types found by a pass visible to the next one.
+
+        Returns whether they changed. With ``widen``, the types that changed
+        become Unknown.
+        """
+        changed = False
+        tables = [(cls, cls.attributes) for cls in self._classes.values()]
+        tables.append((None, self._unknown_attributes))
+        for cls, previous in tables:
+            current = self._attribute_stores.get(cls, {})
+            if current == previous:
+                continue
+            changed = True
+            if widen:
+                current = {
+                    name: attr_type if previous.get(name) == attr_type else Unknown
+                    for name, attr_type in current.items()
+                }
+            if cls is None:
+                self._unknown_attributes = current
+            else:
+                cls.attributes = current
+        return changed
+
+    def _push_scope(self, comprehension: bool = False):
         """Push a new scope for variable tracking."""
         self._var_types.append({})
+        self._comprehension_scopes.append(comprehension)
+        self._declared_shared.append(set())
 
     def _pop_scope(self):
         """Pop the current scope."""
         if len(self._var_types) > 1:
             self._var_types.pop()
+            self._comprehension_scopes.pop()
+            self._declared_shared.pop()
+
+    def _visit_scope(self, visit: Callable[[], None]):
+        """Visit the body of a function, lambda or class in a new scope."""
+        saved = self._unreachable, self._loops
+        self._unreachable, self._loops = False, []
+        self._push_scope()
+        visit()
+        self._pop_scope()
+        self._unreachable, self._loops = saved
+
+    def _declare_functions(self, node: ast.AST, body: list[ast.stmt]):
+        """Register the functions and classes of a scope before visiting its body.
+
+        Calls may come before the definition in the source (from another
+        function, or recursively). Only names bound once are registered.
+        """
+        scope = getattr(node, "_scope", None)
+        if scope is None:
+            return
+        for stmt in _walk_scope(body):
+            if not isinstance(stmt, (ast.FunctionDef, ast.ClassDef)):
+                continue
+            var = scope.vars.get(stmt.name)
+            if var is None or not var.is_const:
+                continue
+            if isinstance(stmt, ast.FunctionDef) and var.type == "function":
+                self._set_var_type(stmt.name, self._function_return_type(stmt))
+            elif isinstance(stmt, ast.ClassDef) and var.type == "class":
+                self._set_var_type(stmt.name, self._class_name_type(stmt))
 
     def _set_var_type(self, name: str, var_type: type):
         """Set the type of a variable in the current scope."""
+        if name in self._shared_names and name not in self._declared_shared[-1]:
+            # Another function may rebind it at any time
+            var_type = Unknown
         self._var_types[-1][name] = var_type
 
     def _get_var_type(self, name: str) -> type:
@@ -155,6 +387,85 @@ class TypeInference(Visitor):
                 return scope[name]
         return Unknown
 
+    def _refine_var_type(self, name: str, var_type: type):
+        """Update the type of a variable in the scope that defines it."""
+        for scope in reversed(self._var_types):
+            if name in scope:
+                scope[name] = var_type
+                return
+
+    # =========================================================================
+    # Control flow
+    # =========================================================================
+
+    def _snapshot(self) -> Env:
+        """Return the variable types of the current scope at this point."""
+        if self._unreachable:
+            return None
+        return dict(self._var_types[-1])
+
+    def _restore(self, env: Env):
+        """Continue from a snapshot of the current scope."""
+        self._unreachable = env is None
+        if env is not None:
+            scope = self._var_types[-1]
+            scope.clear()
+            scope.update(env)
+
+    @staticmethod
+    def _join_envs(*envs: Env) -> Env:
+        """Join the environments of paths meeting at a point."""
+        reachable = [env for env in envs if env is not None]
+        if not reachable:
+            return None
+        result = dict(reachable[0])
+        for env in reachable[1:]:
+            for name, var_type in env.items():
+                # A name missing on one path is unbound there: using it
+                # would raise NameError, so only the bound paths count
+                result[name] = join(result.get(name, Never), var_type)
+        return result
+
+    def _visit_branches(self, branches: list[Callable[[], None]]):
+        """Visit alternative branches from the current point, then join them."""
+        before = self._snapshot()
+        ends = []
+        for branch in branches:
+            self._restore(before)
+            branch()
+            ends.append(self._snapshot())
+        self._restore(self._join_envs(*ends))
+
+    def _visit_loop(self, node: ast.For | ast.While, enter: Callable[[], None]):
+        """Visit a loop until the types at its head reach a fixpoint.
+
+        ``enter`` visits what runs at the start of each iteration: the test
+        of a while loop, the target assignment of a for loop.
+        """
+        head = self._snapshot()
+        passes = 0
+        while True:
+            passes += 1
+            self._restore(head)
+            self._loops.append(([], []))
+            enter()
+            self.visit_list(node.body)
+            breaks, continues = self._loops.pop()
+            new_head = self._join_envs(head, self._snapshot(), *continues)
+            if new_head == head:
+                break
+            if passes >= MAX_LOOP_PASSES and head is not None:
+                # Widen the types that keep changing
+                for name, var_type in new_head.items():
+                    if head.get(name) != var_type:
+                        new_head[name] = Unknown
+            head = new_head
+
+        # The else clause runs when the loop ends without a break
+        self._restore(head)
+        self.visit_list(node.orelse)
+        self._restore(self._join_envs(self._snapshot(), *breaks))
+
     def visit_list(self, nodes):
         for node in nodes:
             self.visit(node)
@@ -162,11 +473,55 @@ class TypeInference(Visitor):
     def _type_from_annotation(self, annotation) -> type:
         """Extract type from an annotation node."""
         match annotation:
+            case ast.Name(id=type_name) if type_name in TYPE_MAP:
+                return TYPE_MAP[type_name]
             case ast.Name(id=type_name):
-                return TYPE_MAP.get(type_name, Unknown)
+                return self._class_from_name(type_name)
+            case ast.Constant(value=None):
+                return Void
+            case ast.Constant(value=str(source)):
+                # Forward reference: xs: "list[int]"
+                try:
+                    module = ast.parse(source)
+                except SyntaxError:
+                    return Unknown
+                match module.body:
+                    case [ast.Expr(value=expr)]:
+                        return self._type_from_annotation(expr)
+                return Unknown
+            case ast.BinOp(left=left, op=ast.BitOr(), right=right):
+                return union_of(
+                    self._type_from_annotation(left),
+                    self._type_from_annotation(right),
+                )
+            case ast.Subscript(
+                value=ast.Name(id=name) | ast.Attribute(attr=name), slice=args
+            ) if name in GENERIC_ANNOTATIONS:
+                args = args.elts if isinstance(args, ast.Tuple) else [args]
+                return self._type_from_generic(GENERIC_ANNOTATIONS[name], args)
             case _:
                 return Unknown
 
+    def _type_from_generic(self, kind: str, args: list[ast.expr]) -> type:
+        """Type of a generic annotation such as list[int] or Optional[str]."""
+        match kind, args:
+            case "tuple", [elem, ast.Constant(value=builtins.Ellipsis)]:
+                return tuple_of(self._type_from_annotation(elem), variadic=True)
+            case "optional", [elem]:
+                return union_of(self._type_from_annotation(elem), Void)
+
+        arg_types = [self._type_from_annotation(arg) for arg in args]
+        match kind, arg_types:
+            case "list", [elem]:
+                return list_of(elem)
+            case "dict", [key, value]:
+                return dict_of(key, value)
+            case "tuple", _:
+                return tuple_of(*arg_types)
+            case "union", _:
+                return union_of(*arg_types)
+        return Unknown
+
     def _type_from_definition(self, node) -> type:
         """Get type from a node's definition, if available."""
         match getattr(node, "_definition", None):
@@ -182,24 +537,183 @@ class TypeInference(Visitor):
     # =========================================================================
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
-        """Infer function return type from annotation."""
-        node._type = self._type_from_annotation(node.returns)
+        """Infer function return type from annotation or body."""
+        node._type = self._function_return_type(node)
         # Register function's return type in current scope so calls can use it
         self._set_var_type(node.name, node._type)
-        self._push_scope()
-        self.visit(node.args)
-        self.visit_list(node.body)
-        self._pop_scope()
+        self._visit_scope(lambda: self._visit_function_body(node))
 
     def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
         """Infer async function return type from annotation."""
         node._type = self._type_from_annotation(node.returns)
         # Register function's return type in current scope so calls can use it
         self._set_var_type(node.name, node._type)
-        self._push_scope()
+        self._visit_scope(lambda: self._visit_function_body(node))
+
+    def _function_return_type(
+        self, node: ast.FunctionDef | ast.AsyncFunctionDef
+    ) -> type:
+        """Return type from the annotation, or as inferred so far."""
+        if node.returns is not None or isinstance(node, ast.AsyncFunctionDef):
+            return self._type_from_annotation(node.returns)
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call):
+                decorator = decorator.func
+            match decorator:
+                case ast.Name(id=name) | ast.Attribute(attr=name) if (
+                    name in TYPE_PRESERVING_DECORATORS
+                ):
+                    pass
+                case _:
+                    return Unknown
+        return self._return_types.get(node, Never)
+
+    def _visit_function_body(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        cls, self._enclosing_class = self._enclosing_class, None
         self.visit(node.args)
+        params = node.args.posonlyargs + node.args.args
+        if cls is not None and params and params[0].annotation is None:
+            if not _has_decorator(node, "staticmethod"):
+                # self, or cls for class methods: the class name has the
+                # instance type too
+                params[0]._type = cls
+                self._set_var_type(params[0].arg, cls)
+        self._functions.append(_Function())
+        self._declare_functions(node, node.body)
         self.visit_list(node.body)
-        self._pop_scope()
+        function = self._functions.pop()
+
+        if node.returns is not None or isinstance(node, ast.AsyncFunctionDef):
+            return
+        if function.is_generator:
+            return_type = Unknown
+        elif self._unreachable:
+            return_type = function.return_type
+        else:
+            # Falls off the end
+            return_type = join(function.return_type, Void)
+        self._return_types[node] = return_type
+
+    def visit_Return(self, node: ast.Return):
+        if node.value:
+            self.visit(node.value)
+        if self._functions and not self._unreachable:
+            value_type = getattr(node.value, "_type", Unknown) if node.value else Void
+            function = self._functions[-1]
+            function.return_type = join(function.return_type, value_type)
+        self._unreachable = True
+
+    def visit_Yield(self, node: ast.Yield):
+        if node.value:
+            self.visit(node.value)
+        if self._functions:
+            self._functions[-1].is_generator = True
+        node._type = Unknown
+
+    def visit_YieldFrom(self, node: ast.YieldFrom):
+        self.visit(node.value)
+        if self._functions:
+            self._functions[-1].is_generator = True
+        node._type = Unknown
+
+    def visit_Global(self, node: ast.Global):
+        """The function may rebind these names at any time."""
+        self._declared_shared[-1].update(node.names)
+
+    def visit_Nonlocal(self, node: ast.Nonlocal):
+        """The function may rebind these names at any time."""
+        self._declared_shared[-1].update(node.names)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        """Class definition - the body has its own scope.
+
+        The methods see ``self`` as an instance of the class. Class variables
+        are attributes of the instances too.
+        """
+        self.visit_list(node.decorator_list)
+        self.visit_list(node.bases)
+        for keyword in node.keywords:
+            self.visit(keyword.value)
+
+        cls = self._class_type(node)
+        cls.base, cls.open = None, False
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id == "object":
+                continue
+            base_cls = Unknown
+            if isinstance(base, ast.Name):
+                base_cls = self._class_from_name(base.id)
+            if isinstance(base_cls, ClassType):
+                cls.base = base_cls
+                if cls not in base_cls.subclasses:
+                    base_cls.subclasses.append(cls)
+            else:
+                # Attributes may be set by the code of an unknown class
+                cls.open = True
+        self._set_var_type(node.name, self._class_name_type(node))
+
+        def visit_body():
+            for stmt in node.body:
+                match stmt:
+                    case ast.AnnAssign(target=ast.Name(id=name), annotation=annotation):
+                        cls.declared[name] = self._type_from_annotation(annotation)
+                    case ast.FunctionDef() | ast.AsyncFunctionDef():
+                        self._enclosing_class = cls
+                self.visit(stmt)
+                self._enclosing_class = None
+            for name, var_type in self._var_types[-1].items():
+                if not (
+                    name == "__slots__"
+                    or name in cls.declared
+                    or name in cls.methods
+                    or name in cls.properties
+                ):
+                    self._store_attribute(cls, name, var_type)
+
+        self._visit_scope(visit_body)
+
+    def _class_type(self, node: ast.ClassDef) -> ClassType:
+        """Return the type of the instances of a class."""
+        cls = self._classes.get(node)
+        if cls is not None:
+            return cls
+        cls = self._classes[node] = ClassType(node.name)
+        for stmt in node.body:
+            match stmt:
+                case ast.FunctionDef() if _has_decorator(stmt, "property"):
+                    cls.properties[stmt.name] = stmt
+                case ast.FunctionDef(name=name) | ast.AsyncFunctionDef(name=name):
+                    # Property setters and deleters are named after the property
+                    if name not in cls.properties:
+                        cls.methods[name] = stmt
+                case (
+                    ast.Assign(targets=[ast.Name(id="__slots__")], value=value)
+                    | ast.AnnAssign(target=ast.Name(id="__slots__"), value=value)
+                ):
+                    cls.slots = _slot_names(value)
+        return cls
+
+    def _class_name_type(self, node: ast.ClassDef) -> type:
+        """Type of the name of a class: calling it gives an instance."""
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call):
+                decorator = decorator.func
+            match decorator:
+                case ast.Name(id=name) | ast.Attribute(attr=name) if (
+                    name in TYPE_PRESERVING_CLASS_DECORATORS
+                ):
+                    pass
+                case _:
+                    # The decorator may return anything
+                    return Unknown
+        return self._class_type(node)
+
+    def _class_from_name(self, name: str) -> type:
+        """Return the instance type of a class given its name, if known."""
+        match self._get_var_type(name):
+            case ClassType() as cls if cls.name == name:
+                return cls
+        return Unknown
 
     def visit_arg(self, node: ast.arg):
         """Infer argument type from annotation."""
@@ -210,10 +724,14 @@ class TypeInference(Visitor):
 
     def visit_Lambda(self, node: ast.Lambda):
         """Lambda expression - type unknown without annotation."""
-        self._push_scope()
-        self.visit(node.args)
-        self.visit(node.body)
-        self._pop_scope()
+
+        def visit_body():
+            self.visit(node.args)
+            self._functions.append(_Function())
+            self.visit(node.body)
+            self._functions.pop()
+
+        self._visit_scope(visit_body)
         node._type = Unknown
 
     # =========================================================================
@@ -225,26 +743,199 @@ class TypeInference(Visitor):
         if node.value:
             self.visit(node.value)
         target_type = self._type_from_annotation(node.annotation)
-        node.target._type = target_type
-        # Register variable type in scope for simple Name targets
-        if isinstance(node.target, ast.Name):
-            self._set_var_type(node.target.id, target_type)
+        self._assign_target(node.target, target_type)
 
     def visit_Assign(self, node: ast.Assign):
         """Assignment - propagate type from value to targets."""
         self.visit(node.value)
         value_type = getattr(node.value, "_type", Unknown)
         for target in node.targets:
-            target._type = value_type
-            # Register variable type in scope for simple Name targets
-            if isinstance(target, ast.Name):
-                self._set_var_type(target.id, value_type)
+            self._assign_target(target, value_type)
+
+    def _assign_target(self, target: ast.expr, value_type: type):
+        """Give an assignment or loop target the type of the assigned value.
+
+        Names are registered in the current scope. Unpacking targets
+        (``a, b = pair``) get the element types of the value.
+        """
+        match target:
+            case ast.Name(id=name):
+                self._set_var_type(name, value_type)
+            case ast.Attribute(value=value, attr=attr):
+                self.visit(value)
+                receiver_type = getattr(value, "_type", Unknown)
+                self._store_attribute(receiver_type, attr, value_type)
+            case ast.Tuple(elts=elts) | ast.List(elts=elts):
+                starred = [isinstance(elt, ast.Starred) for elt in elts]
+                star_index = starred.index(True) if any(starred) else len(elts)
+                for i, elt in enumerate(elts):
+                    if i < star_index:
+                        self._assign_target(elt, item_type(value_type, i))
+                    elif i == star_index:
+                        elem = element_type(value_type)
+                        self._assign_target(elt.value, list_of(elem))
+                    else:
+                        index = i - len(elts)
+                        self._assign_target(elt, item_type(value_type, index))
+            case _:
+                self.visit(target)
+        target._type = value_type
 
     def visit_NamedExpr(self, node: ast.NamedExpr):
         """Walrus operator := - type is the value's type."""
         self.visit(node.value)
-        self.visit(node.target)
         node._type = getattr(node.value, "_type", Unknown)
+        node.target._type = node._type
+        # In a comprehension, the target belongs to the enclosing scope
+        index = len(self._var_types) - 1
+        while index > 0 and self._comprehension_scopes[index]:
+            index -= 1
+        self._var_types[index][node.target.id] = node._type
+
+    # =========================================================================
+    # Statements
+    # =========================================================================
+
+    def visit_If(self, node: ast.If):
+        """If statement - join the types of both branches."""
+        self.visit(node.test)
+        if_true, if_false = self._narrowed_types(node.test)
+
+        def visit_branch(narrowed: dict[str, type], body: list[ast.stmt]):
+            self._narrow(narrowed)
+            self.visit_list(body)
+
+        self._visit_branches(
+            [
+                lambda: visit_branch(if_true, node.body),
+                lambda: visit_branch(if_false, node.orelse),
+            ]
+        )
+
+    def visit_For(self, node: ast.For):
+        """For loop - the target gets the element type of the iterable."""
+        self.visit(node.iter)
+        elem = element_type(getattr(node.iter, "_type", Unknown))
+        self._visit_loop(node, lambda: self._assign_target(node.target, elem))
+
+    def visit_AsyncFor(self, node: ast.AsyncFor):
+        """Async for loop - element types of async iterables aren't tracked."""
+        self.visit(node.iter)
+        self._visit_loop(node, lambda: self._assign_target(node.target, Unknown))
+
+    def visit_While(self, node: ast.While):
+        """While loop - the test runs at the head of each iteration."""
+
+        def enter():
+            self.visit(node.test)
+            self._narrow(self._narrowed_types(node.test)[0])
+
+        self._visit_loop(node, enter)
+
+    def visit_Break(self, node: ast.Break):
+        if self._loops:
+            self._loops[-1][0].append(self._snapshot())
+        self._unreachable = True
+
+    def visit_Continue(self, node: ast.Continue):
+        if self._loops:
+            self._loops[-1][1].append(self._snapshot())
+        self._unreachable = True
+
+    def visit_Assert(self, node: ast.Assert):
+        """Assert statement - the test holds for the code that follows."""
+        self.visit(node.test)
+        if node.msg:
+            self.visit(node.msg)
+        self._narrow(self._narrowed_types(node.test)[0])
+
+    def visit_Raise(self, node: ast.Raise):
+        if node.exc:
+            self.visit(node.exc)
+        if node.cause:
+            self.visit(node.cause)
+        self._unreachable = True
+
+    def visit_Try(self, node: ast.Try):
+        """Try statement - handlers start from any point of the body."""
+        # Types after each statement of the body, for the handlers
+        states = [self._snapshot()]
+        for stmt in node.body:
+            self.visit(stmt)
+            states.append(self._snapshot())
+        handler_entry = self._join_envs(*states)
+
+        def visit_handler(handler: ast.ExceptHandler):
+            self._restore(handler_entry)
+            if handler.type:
+                self.visit(handler.type)
+            if handler.name:
+                self._set_var_type(handler.name, Unknown)
+            self.visit_list(handler.body)
+
+        branches = [lambda: self.visit_list(node.orelse)]
+        branches += [lambda h=handler: visit_handler(h) for handler in node.handlers]
+        # The else clause continues from the end of the body
+        self._restore(states[-1])
+        self._visit_branches(branches)
+        if node.finalbody:
+            # The finally clause also runs when an exception propagates
+            self._restore(self._join_envs(self._snapshot(), handler_entry))
+            self.visit_list(node.finalbody)
+
+    visit_TryStar = visit_Try
+
+    def visit_With(self, node: ast.With):
+        """With statement - `as` targets are of unknown type."""
+        for item in node.items:
+            self.visit(item.context_expr)
+            if item.optional_vars:
+                self._assign_target(item.optional_vars, Unknown)
+        self.visit_list(node.body)
+
+    visit_AsyncWith = visit_With
+
+    def visit_Match(self, node: ast.Match):
+        """Match statement - join the types of all cases."""
+        self.visit(node.subject)
+
+        def visit_case(case: ast.match_case):
+            # Names captured by the pattern are of unknown type
+            for name in _captured_names(case.pattern):
+                self._set_var_type(name, Unknown)
+            if case.guard:
+                self.visit(case.guard)
+            self.visit_list(case.body)
+
+        branches = [lambda c=case: visit_case(c) for case in node.cases]
+        # No case may match
+        branches.append(lambda: None)
+        self._visit_branches(branches)
+
+    # =========================================================================
+    # Imports
+    # =========================================================================
+
+    def visit_Import(self, node: ast.Import):
+        """Track module names, for calls like collections.Counter(...)."""
+        for alias in node.names:
+            name = alias.asname or alias.name.partition(".")[0]
+            self._modules[alias.asname or alias.name] = alias.name
+            self._set_var_type(name, Unknown)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        """Register the types of imported names.
+
+        Stdlib functions have known return types; bundled modules export the
+        types inferred for their names.
+        """
+        module_types = self._imported_types.get("." * node.level + (node.module or ""))
+        for alias in node.names:
+            if module_types is not None:
+                name_type = module_types.get(alias.name, Unknown)
+            else:
+                name_type = STDLIB_RETURN_TYPES.get((node.module, alias.name), Unknown)
+            self._set_var_type(alias.asname or alias.name, name_type)
 
     # =========================================================================
     # Names and Calls
@@ -270,6 +961,18 @@ class TypeInference(Visitor):
 
         # Try to infer type from the call
         node._type = self._infer_call_type(node)
+        self._refine_list_type(node)
+
+        match node:
+            case ast.Call(func=ast.Name(id="setattr"), args=[obj, name, value]):
+                obj_type = getattr(obj, "_type", Unknown)
+                if isinstance(name, ast.Constant) and isinstance(name.value, str):
+                    value_type = getattr(value, "_type", Unknown)
+                    self._store_attribute(obj_type, name.value, value_type)
+                else:
+                    # Any attribute may be set
+                    for attr in self._known_attribute_names():
+                        self._store_attribute(obj_type, attr, Unknown)
 
     def _infer_call_type(self, node: ast.Call) -> type:
         """Infer the return type of a function call."""
@@ -277,27 +980,128 @@ class TypeInference(Visitor):
 
         # Check for builtin function: name(...)
         if isinstance(func, ast.Name):
-            builtin_type = BUILTIN_RETURN_TYPES.get(func.id)
+            builtin_type = self._infer_builtin_type(func.id, node)
             if builtin_type is not None:
                 return builtin_type
 
             # Check for user-defined function with return type annotation
             # The function's type was set from its return annotation in visit_FunctionDef
             func_type = getattr(func, "_type", Unknown)
+            if isinstance(func_type, ClassType) and func_type.name != func.id:
+                # An instance, or the class under another name
+                return Unknown
             if func_type is not Unknown:
                 return func_type
 
+        # Check for stdlib module function: module.name(...)
+        match func:
+            case ast.Attribute(value=ast.Name(id=name), attr=attr) if (
+                name in self._modules
+            ):
+                module = self._modules[name]
+                if module in self._imported_types:
+                    return self._imported_types[module].get(attr, Unknown)
+                return STDLIB_RETURN_TYPES.get((module, attr), Unknown)
+
         # Check for method call: expr.method(...)
         if isinstance(func, ast.Attribute):
             receiver_type = getattr(func.value, "_type", Unknown)
-            method_name = func.attr
-            method_type = METHOD_RETURN_TYPES.get((receiver_type, method_name))
+            method_type = self._infer_method_type(receiver_type, func.attr, node)
             if method_type is not None:
                 return method_type
 
         # Fall back to definition-based inference
         return self._type_from_definition(node)
 
+    def _infer_builtin_type(self, name: str, node: ast.Call) -> type | None:
+        """Return type of a builtin, using the element types of its arguments."""
+        arg_types = [getattr(arg, "_type", Unknown) for arg in node.args]
+        elems = [element_type(arg_type) for arg_type in arg_types]
+        match name, elems:
+            case "list" | "sorted" | "reversed", [elem]:
+                return list_of(elem)
+            case "tuple", [elem]:
+                return tuple_of(elem, variadic=True)
+            case "enumerate", [elem, *_]:
+                return list_of(tuple_of(Int, elem))
+            case "zip", [_, *_]:
+                return list_of(tuple_of(*elems))
+            case "min" | "max", [elem] if not node.keywords:
+                return elem
+            case "min" | "max", [_, _, *_]:
+                result = arg_types[0]
+                for arg_type in arg_types[1:]:
+                    result = join(result, arg_type)
+                return result
+        return BUILTIN_RETURN_TYPES.get(name)
+
+    def _infer_method_type(
+        self, receiver_type: type, method_name: str, node: ast.Call
+    ) -> type | None:
+        """Return type of a method, using the element types of its receiver."""
+        if classes := _instance_classes(receiver_type):
+            result = Never
+            for cls in classes:
+                return_type = self._method_return_type(cls, method_name)
+                if return_type is None:
+                    return None
+                result = join(result, return_type)
+            return result
+        base = base_type(receiver_type)
+        arg_types = [getattr(arg, "_type", Unknown) for arg in node.args]
+        if base is List or base is Dict:
+            key_type = element_type(receiver_type)
+            value_type = item_type(receiver_type)
+            match method_name, arg_types:
+                case "copy", []:
+                    return receiver_type
+                case "pop", _ if base is List:
+                    return value_type
+                case "keys", []:
+                    return list_of(key_type)
+                case "values", []:
+                    return list_of(value_type)
+                case "items", []:
+                    return list_of(tuple_of(key_type, value_type))
+                case "get" | "setdefault", [_]:
+                    return union_of(value_type, Void)
+                case "pop", [_]:
+                    return value_type
+                case "get" | "pop" | "setdefault", [_, default]:
+                    return union_of(value_type, default)
+        return METHOD_RETURN_TYPES.get((base, method_name))
+
+    def _refine_list_type(self, node: ast.Call):
+        """Widen the element type of a list variable grown in place.
+
+        ``xs = []`` is a ``list[Never]``; after ``xs.append(1)`` it is a
+        ``list[int]`` for the code that follows. Lists held in attributes
+        get the added items as another assigned value.
+        """
+        match node:
+            case ast.Call(func=ast.Attribute(value=receiver, attr=attr), args=args) if (
+                attr in ("append", "insert", "extend") and args
+            ):
+                list_type = getattr(receiver, "_type", Unknown)
+                added_type = getattr(args[-1], "_type", Unknown)
+                if attr == "extend":
+                    added_type = element_type(added_type)
+                match receiver:
+                    case ast.Attribute(value=obj, attr=name) if (
+                        list_type is Unknown or base_type(list_type) is List
+                    ):
+                        obj_type = getattr(obj, "_type", Unknown)
+                        self._store_attribute(obj_type, name, list_of(added_type))
+                        return
+                    case ast.Name(id=name):
+                        pass
+                    case _:
+                        return
+                if base_type(list_type) is not List or list_type is List:
+                    return
+                elem = join(element_type(list_type), added_type)
+                self._refine_var_type(name, list_of(elem))
+
     # =========================================================================
     # Literals
     # =========================================================================
@@ -308,14 +1112,17 @@ class TypeInference(Visitor):
         node._type = TYPE_MAP.get(type_name, Unknown)
 
     def visit_List(self, node: ast.List):
-        """List literal."""
+        """List literal - the element type joins the types of the items."""
         self.visit_list(node.elts)
-        node._type = List
+        elem = Never
+        for elt in node.elts:
+            elem = join(elem, getattr(elt, "_type", Unknown))
+        node._type = list_of(elem)
 
     def visit_Tuple(self, node: ast.Tuple):
         """Tuple literal."""
         self.visit_list(node.elts)
-        node._type = Tuple
+        node._type = tuple_of(*(getattr(elt, "_type", Unknown) for elt in node.elts))
 
     def visit_Dict(self, node: ast.Dict):
         """Dict literal."""
@@ -323,7 +1130,15 @@ class TypeInference(Visitor):
             if key is not None:
                 self.visit(key)
         self.visit_list(node.values)
-        node._type = Dict
+        if not node.keys or None in node.keys:
+            # Empty, or merging **other dicts
+            node._type = Dict
+            return
+        key_type = value_type = Never
+        for key, value in zip(node.keys, node.values):
+            key_type = join(key_type, getattr(key, "_type", Unknown))
+            value_type = join(value_type, getattr(value, "_type", Unknown))
+        node._type = dict_of(key_type, value_type)
 
     def visit_Set(self, node: ast.Set):
         """Set literal."""
@@ -341,6 +1156,12 @@ class TypeInference(Visitor):
 
         left_type = getattr(node.left, "_type", Unknown)
         right_type = getattr(node.right, "_type", Unknown)
+        left_base, right_base = base_type(left_type), base_type(right_type)
+
+        if Never in (left_type, right_type):
+            # A call to a function whose return type isn't inferred yet
+            node._type = Never
+            return
 
         match node.op:
             case ast.Add():
@@ -351,17 +1172,22 @@ class TypeInference(Visitor):
                     node._type = Int
                 elif left_type == String and right_type == String:
                     node._type = String
-                elif left_type == List and right_type == List:
-                    node._type = List
+                elif left_base is List and right_base is List:
+                    elem = join(element_type(left_type), element_type(right_type))
+                    node._type = list_of(elem)
+                elif left_base is Dict and right_base is Dict:
+                    node._type = Dict  # Counter addition
                 else:
                     node._type = Unknown
 
             case ast.Sub():
-                # Numeric only
+                # Numeric, or Counter subtraction
                 if left_type == Float or right_type == Float:
                     node._type = Float
                 elif left_type == Int and right_type == Int:
                     node._type = Int
+                elif left_base is Dict and right_base is Dict:
+                    node._type = Dict
                 else:
                     node._type = Unknown
 
@@ -375,10 +1201,10 @@ class TypeInference(Visitor):
                     left_type == Int and right_type == String
                 ):
                     node._type = String
-                elif (left_type == List and right_type == Int) or (
-                    left_type == Int and right_type == List
-                ):
-                    node._type = List
+                elif left_base is List and right_type == Int:
+                    node._type = left_type
+                elif left_type == Int and right_base is List:
+                    node._type = right_type
                 else:
                     node._type = Unknown
 
@@ -419,6 +1245,8 @@ class TypeInference(Visitor):
                     node._type = Int
                 elif left_type == Bool and right_type == Bool:
                     node._type = Bool
+                elif left_base is Dict and right_base is Dict:
+                    node._type = Dict  # dict merge, Counter union/intersection
                 else:
                     node._type = Unknown
 
@@ -437,14 +1265,19 @@ class TypeInference(Visitor):
                 node._type = Unknown
 
     def visit_UnaryOp(self, node: ast.UnaryOp):
-        """Unary operation - same type as operand."""
+        """Unary operation - same type as operand, bool for `not`."""
         self.visit(node.operand)
-        node._type = getattr(node.operand, "_type", Unknown)
+        if isinstance(node.op, ast.Not):
+            node._type = Bool
+        else:
+            node._type = getattr(node.operand, "_type", Unknown)
 
     def visit_BoolOp(self, node: ast.BoolOp):
-        """Boolean operation - always bool."""
+        """Boolean operation - the result is one of the operands."""
         self.visit_list(node.values)
-        node._type = Bool
+        node._type = Never
+        for value in node.values:
+            node._type = join(node._type, getattr(value, "_type", Unknown))
 
     def visit_Compare(self, node: ast.Compare):
         """Comparison - always bool."""
@@ -453,26 +1286,185 @@ class TypeInference(Visitor):
         node._type = Bool
 
     def visit_IfExp(self, node: ast.IfExp):
-        """Ternary expression - type of body branch."""
+        """Ternary expression - join of both branches."""
         self.visit(node.test)
-        self.visit(node.body)
-        self.visit(node.orelse)
-        node._type = getattr(node.body, "_type", Unknown)
+        if_true, if_false = self._narrowed_types(node.test)
+
+        def visit_branch(narrowed: dict[str, type], expr: ast.expr):
+            self._narrow(narrowed)
+            self.visit(expr)
+
+        self._visit_branches(
+            [
+                lambda: visit_branch(if_true, node.body),
+                lambda: visit_branch(if_false, node.orelse),
+            ]
+        )
+        node._type = join(
+            getattr(node.body, "_type", Unknown), getattr(node.orelse, "_type", Unknown)
+        )
+
+    # =========================================================================
+    # Narrowing
+    # =========================================================================
+
+    def _narrowed_types(
+        self, test: ast.expr
+    ) -> tuple[dict[str, type], dict[str, type]]:
+        """Return the types of the variables a condition narrows.
+
+        The first dict holds the types where the condition is true, the
+        second where it is false. Handles ``isinstance(x, C)``, ``x is None``,
+        ``x is not None``, and their combinations with not, and, or.
+        """
+        match test:
+            case ast.Call(
+                func=ast.Name(id="isinstance"), args=[ast.Name(id=name), classinfo]
+            ) if name in self._var_types[-1]:
+                target = self._isinstance_type(classinfo)
+                if target is Unknown:
+                    return {}, {}
+                members = union_members(self._var_types[-1][name])
+                matching = [m for m in members if _is_instance_of(m, target)]
+                others = [m for m in members if m not in matching]
+                if_true = union_of(*matching) if matching else target
+                if_false = union_of(*others) if others else Unknown
+                return {name: if_true}, {name: if_false}
+            case ast.Compare(
+                left=ast.Name(id=name),
+                ops=[ast.Is() | ast.IsNot() as op],
+                comparators=[ast.Constant(value=None)],
+            ) if name in self._var_types[-1]:
+                members = union_members(self._var_types[-1][name])
+                others = [m for m in members if m is not Void]
+                not_none = union_of(*others) if others else Unknown
+                if isinstance(op, ast.Is):
+                    return {name: Void}, {name: not_none}
+                return {name: not_none}, {name: Void}
+            case ast.UnaryOp(op=ast.Not(), operand=operand):
+                if_true, if_false = self._narrowed_types(operand)
+                return if_false, if_true
+            case ast.BoolOp(op=ast.And(), values=values):
+                if_true = {}
+                for value in values:
+                    if_true.update(self._narrowed_types(value)[0])
+                return if_true, {}
+            case ast.BoolOp(op=ast.Or(), values=values):
+                if_false = {}
+                for value in values:
+                    if_false.update(self._narrowed_types(value)[1])
+                return {}, if_false
+        return {}, {}
+
+    def _isinstance_type(self, classinfo: ast.expr) -> type:
+        """Type of the values an isinstance() check accepts."""
+        match classinfo:
+            case ast.Name(id=name) if name in ISINSTANCE_TYPES:
+                return ISINSTANCE_TYPES[name]
+            case ast.Name(id=name):
+                return self._class_from_name(name)
+            case ast.Tuple(elts=elts):
+                return union_of(*(self._isinstance_type(elt) for elt in elts))
+        return Unknown
+
+    def _narrow(self, narrowed: dict[str, type]):
+        """Give variables the types a condition narrows them to."""
+        if self._unreachable:
+            return
+        for name, var_type in narrowed.items():
+            if var_type is not Unknown:
+                self._set_var_type(name, var_type)
 
     # =========================================================================
     # Subscript and Attribute
     # =========================================================================
 
     def visit_Subscript(self, node: ast.Subscript):
-        """Subscript access - would need element type tracking."""
+        """Subscript access - the item type of the container."""
         self.visit(node.value)
         self.visit(node.slice)
-        node._type = Unknown
+        value_type = getattr(node.value, "_type", Unknown)
+        match node.slice:
+            case ast.Slice() if value_type is String or base_type(value_type) is List:
+                node._type = value_type
+            case ast.Slice() if base_type(value_type) is Tuple:
+                node._type = tuple_of(element_type(value_type), variadic=True)
+            case ast.Slice():
+                node._type = Unknown
+            case ast.Constant(value=int(index)) if not isinstance(index, bool):
+                node._type = item_type(value_type, index)
+            case _:
+                node._type = item_type(value_type)
 
     def visit_Attribute(self, node: ast.Attribute):
-        """Attribute access - would need object type tracking."""
+        """Attribute access - the attribute type for instances of known classes."""
         self.visit(node.value)
         node._type = Unknown
+        classes = _instance_classes(getattr(node.value, "_type", Unknown))
+        if classes:
+            node._type = Never
+            for cls in classes:
+                node._type = join(node._type, self._attribute_type(cls, node.attr))
+
+    def _attribute_type(self, cls: ClassType, name: str) -> type:
+        """Return the type of an attribute of the instances of a class.
+
+        Values may be assigned through receivers typed as the class, any of
+        its base classes or subclasses, or through receivers of unknown type.
+        """
+        for c in cls.mro():
+            if name in c.declared:
+                return c.declared[name]
+            if name in c.properties:
+                return self._function_return_type(c.properties[name])
+            if name in c.methods:
+                # Bound method
+                return Unknown
+        if cls.is_open():
+            return Unknown
+        found = [
+            c.attributes[name]
+            for c in cls.mro() + cls.descendants()
+            if name in c.attributes
+        ]
+        if name in self._unknown_attributes and cls.may_have_attribute(name):
+            found.append(self._unknown_attributes[name])
+        if not found:
+            # Not assigned in the code we see
+            return Unknown
+        result = Never
+        for attr_type in found:
+            result = join(result, attr_type)
+        return result
+
+    def _store_attribute(self, receiver_type: type, name: str, value_type: type):
+        """Record the assignment of a value to an attribute."""
+        if receiver_type is Unknown or receiver_type is Never:
+            receivers = [None]
+        else:
+            receivers = _instance_classes(receiver_type)
+        for receiver in receivers:
+            stores = self._attribute_stores.setdefault(receiver, {})
+            stores[name] = join(stores.get(name, Never), value_type)
+
+    def _known_attribute_names(self) -> set[str]:
+        """Return the names of the attributes assigned anywhere."""
+        names = set(self._unknown_attributes)
+        for cls in self._classes.values():
+            names.update(cls.attributes)
+        return names
+
+    def _method_return_type(self, cls: ClassType, name: str) -> type | None:
+        """Return type of a method, joined with the methods overriding it."""
+        method = cls.lookup_method(name)
+        if method is None:
+            return None
+        result = self._function_return_type(method)
+        for subclass in cls.descendants():
+            if name in subclass.methods:
+                override = self._function_return_type(subclass.methods[name])
+                result = join(result, override)
+        return result
 
     def visit_Slice(self, node: ast.Slice):
         """Slice object."""
@@ -493,35 +1485,48 @@ class TypeInference(Visitor):
     # Comprehensions
     # =========================================================================
 
+    # Comprehension variables live in their own scope
+
     def visit_ListComp(self, node: ast.ListComp):
         """List comprehension."""
+        self._push_scope(comprehension=True)
         self.visit_list(node.generators)
         self.visit(node.elt)
-        node._type = List
+        self._pop_scope()
+        node._type = list_of(getattr(node.elt, "_type", Unknown))
 
     def visit_SetComp(self, node: ast.SetComp):
         """Set comprehension."""
+        self._push_scope(comprehension=True)
         self.visit_list(node.generators)
         self.visit(node.elt)
+        self._pop_scope()
         node._type = Unknown
 
     def visit_DictComp(self, node: ast.DictComp):
         """Dict comprehension."""
+        self._push_scope(comprehension=True)
         self.visit_list(node.generators)
         self.visit(node.key)
         self.visit(node.value)
-        node._type = Dict
+        self._pop_scope()
+        node._type = dict_of(
+            getattr(node.key, "_type", Unknown), getattr(node.value, "_type", Unknown)
+        )
 
     def visit_GeneratorExp(self, node: ast.GeneratorExp):
         """Generator expression."""
+        self._push_scope(comprehension=True)
         self.visit_list(node.generators)
         self.visit(node.elt)
+        self._pop_scope()
         node._type = Unknown
 
     def visit_comprehension(self, node: ast.comprehension):
-        """Generator in a comprehension."""
+        """Generator in a comprehension - the target gets the element type."""
         self.visit(node.iter)
-        self.visit(node.target)
+        iter_type = getattr(node.iter, "_type", Unknown)
+        self._assign_target(node.target, element_type(iter_type))
         for if_clause in node.ifs:
             self.visit(if_clause)
 
@@ -540,3 +1545,81 @@ class TypeInference(Visitor):
         """F-string."""
         self.visit_list(node.values)
         node._type = String
+
+
+def _has_decorator(node: ast.FunctionDef | ast.AsyncFunctionDef, name: str) -> bool:
+    """Check whether a function has a decorator such as @property."""
+    return any(
+        isinstance(decorator, ast.Name) and decorator.id == name
+        for decorator in node.decorator_list
+    )
+
+
+def _slot_names(value: ast.expr | None) -> frozenset[str] | None:
+    """Return the names in a __slots__ definition, if they are literals."""
+    match value:
+        case ast.Constant(value=str(name)):
+            return frozenset([name])
+        case ast.List(elts=elts) | ast.Tuple(elts=elts) if all(
+            isinstance(elt, ast.Constant) and isinstance(elt.value, str) for elt in elts
+        ):
+            return frozenset(elt.value for elt in elts)
+    return None
+
+
+def _instance_classes(t) -> list[ClassType]:
+    """Return the classes of the instances a type covers.
+
+    None is allowed in the type, as getting an attribute of None raises.
+    Returns an empty list if the type covers other values.
+    """
+    members = [member for member in union_members(t) if member is not Void]
+    if members and all(isinstance(member, ClassType) for member in members):
+        return members
+    return []
+
+
+def _is_instance_of(member, target) -> bool:
+    """Check whether the values of a type pass an isinstance() check."""
+    for t in union_members(target):
+        if member == t:
+            return True
+        if isinstance(member, ClassType) and isinstance(t, ClassType):
+            if member.is_subclass_of(t):
+                return True
+        if (t is Float and member in (Int, Float)) or (
+            t is List and base_type(member) is List
+        ):
+            return True
+    return False
+
+
+def _captured_names(pattern: ast.pattern) -> list[str]:
+    """Return the names bound by a match pattern."""
+    match pattern:
+        case ast.MatchAs(pattern=sub, name=name):
+            names = _captured_names(sub) if sub else []
+            return [*names, name] if name else names
+        case ast.MatchStar(name=name):
+            return [name] if name else []
+        case ast.MatchMapping(patterns=subs, rest=rest):
+            names = [n for sub in subs for n in _captured_names(sub)]
+            return [*names, rest] if rest else names
+        case ast.MatchClass(patterns=subs, kwd_patterns=kwd_subs):
+            return [n for sub in subs + kwd_subs for n in _captured_names(sub)]
+        case ast.MatchSequence(patterns=subs) | ast.MatchOr(patterns=subs):
+            return [n for sub in subs for n in _captured_names(sub)]
+    return []
+
+
+def _walk_scope(body: list[ast.stmt]):
+    """Yield the statements of a scope, without nested function or class bodies."""
+    for stmt in body:
+        yield stmt
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for child in iter_child_nodes(stmt):
+            if isinstance(child, ast.stmt):
+                yield from _walk_scope([child])
+            elif isinstance(child, (ast.ExceptHandler, ast.match_case)):
+                yield from _walk_scope(child.body)
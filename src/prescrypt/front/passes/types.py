@@ -57,6 +57,18 @@ class Unknown(metaclass=Singleton):
         return True  # Unknown is compatible with anything
 
 
+class Never(metaclass=Singleton):
+    """
+    Never type singleton - the element type of an empty list literal.
+
+    Joined with another type, it gives that type: appending ints to ``[]``
+    makes a ``list[int]``.
+    """
+
+    def compatible_with(self, other):
+        return False
+
+
 class List(metaclass=Singleton):
     """
     List type singleton.
@@ -107,3 +119,248 @@ class JSObject(metaclass=Singleton):
 
 # Alias for user code
 JS = JSObject
+
+
+class Union(metaclass=Singleton):
+    """
+    Union type constructor: int | None, Optional[str], Union[int, float].
+    """
+
+    def compatible_with(self, other):
+        return other == self
+
+
+class ParamType:
+    """
+    A parameterized type: list[int], dict[str, float], tuple[int, str].
+
+    ``base`` is the flat singleton (List, Dict, Tuple or Union) and ``args``
+    the element types. A variadic tuple (``tuple[int, ...]``) has a single
+    arg. Instances are built through ``list_of``, ``dict_of``, ``tuple_of``
+    and ``union_of``, which fall back to the flat singletons when nothing is
+    known about the elements, so ``list_of(Unknown) is List``.
+    """
+
+    __slots__ = ("args", "base", "variadic")
+
+    def __init__(self, base: type, args: tuple, variadic: bool = False):
+        self.base = base
+        self.args = args
+        self.variadic = variadic
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ParamType)
+            and self.base is other.base
+            and self.args == other.args
+            and self.variadic == other.variadic
+        )
+
+    def __hash__(self):
+        return hash((self.base, self.args, self.variadic))
+
+    def __repr__(self):
+        names = [type_name(arg) for arg in self.args]
+        if self.base is Union:
+            return " | ".join(names)
+        if self.variadic:
+            names.append("...")
+        return f"{type_name(self.base)}[{', '.join(names)}]"
+
+    def compatible_with(self, other):
+        return other == self
+
+
+class ClassType:
+    """
+    The type of the instances of a user-defined class.
+
+    Each class statement gets its own ClassType, compared by identity. The
+    class name itself has this type too, as calling it gives an instance
+    (in the same way as function names have their return type).
+
+    ``declared`` holds the annotated attributes (class body annotations,
+    dataclass fields), ``methods`` and ``properties`` the definitions found
+    in the class body, and ``slots`` the names in ``__slots__`` if any.
+    ``attributes`` holds the types of the values assigned to attributes of
+    receivers of this exact type; type inference fills it in.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.base: ClassType | None = None
+        # Whether a base class is not a known class, so that attributes may
+        # be set by code that isn't visible
+        self.open = False
+        self.subclasses: list[ClassType] = []
+        self.declared: dict[str, type] = {}
+        self.methods: dict[str, object] = {}
+        self.properties: dict[str, object] = {}
+        self.slots: frozenset[str] | None = None
+        self.attributes: dict[str, type] = {}
+
+    def __repr__(self):
+        return self.name
+
+    def compatible_with(self, other):
+        return other is self
+
+    def mro(self) -> list[ClassType]:
+        """Return the class followed by its known base classes."""
+        result = [self]
+        while result[-1].base is not None and result[-1].base not in result:
+            result.append(result[-1].base)
+        return result
+
+    def descendants(self) -> list[ClassType]:
+        """Return the known subclasses of the class, recursively."""
+        result = []
+        pending = list(self.subclasses)
+        while pending:
+            cls = pending.pop()
+            if cls not in result:
+                result.append(cls)
+                pending.extend(cls.subclasses)
+        return result
+
+    def is_subclass_of(self, other: ClassType) -> bool:
+        return other in self.mro()
+
+    def is_open(self) -> bool:
+        return any(cls.open for cls in self.mro())
+
+    def lookup_method(self, name: str):
+        """Return the definition of a method, searching the base classes."""
+        for cls in self.mro():
+            if name in cls.methods:
+                return cls.methods[name]
+        return None
+
+    def may_have_attribute(self, name: str) -> bool:
+        """Check whether instances may hold an attribute (see __slots__)."""
+        names = set()
+        for cls in self.mro():
+            if cls.slots is None:
+                return True
+            names |= cls.slots
+        return name in names
+
+
+def type_name(t) -> str:
+    """Python-style name of a type, for debugging and error messages."""
+    if isinstance(t, (ParamType, ClassType)):
+        return repr(t)
+    names = {String: "str", Void: "None", JSObject: "JS"}
+    return names.get(t, t.__name__.lower())
+
+
+def base_type(t):
+    """Return the flat singleton of a type: list[int] -> List."""
+    return t.base if isinstance(t, ParamType) else t
+
+
+def list_of(elem) -> type | ParamType:
+    """Return the type list[elem]."""
+    if elem is Unknown:
+        return List
+    return ParamType(List, (elem,))
+
+
+def dict_of(key, value) -> type | ParamType:
+    """Return the type dict[key, value]."""
+    if key is Unknown and value is Unknown:
+        return Dict
+    return ParamType(Dict, (key, value))
+
+
+def tuple_of(*elems, variadic: bool = False) -> type | ParamType:
+    """Return the type tuple[*elems], or tuple[elem, ...] if variadic."""
+    if not elems or all(elem is Unknown for elem in elems):
+        return Tuple
+    return ParamType(Tuple, elems, variadic)
+
+
+def union_of(*members) -> type | ParamType:
+    """Return the union of some types, flattening nested unions."""
+    flat = []
+    for member in members:
+        if member is Unknown:
+            return Unknown
+        if isinstance(member, ParamType) and member.base is Union:
+            new = member.args
+        else:
+            new = (member,)
+        flat.extend(t for t in new if t not in flat)
+    if len(flat) == 1:
+        return flat[0]
+    return ParamType(Union, tuple(flat))
+
+
+def union_members(t) -> tuple:
+    """Return the members of a union type, or the type itself."""
+    if isinstance(t, ParamType) and t.base is Union:
+        return t.args
+    return (t,)
+
+
+def join(a, b):
+    """Return a type covering values of both types.
+
+    Used where values of several types meet: elements of a literal,
+    ``.append`` calls, control flow merges. ``None`` and unions give a
+    union; otherwise anything but identical types, ints mixed with floats
+    or containers of the same kind degrades to Unknown.
+    """
+    if a == b or b is Never:
+        return a
+    if a is Never:
+        return b
+    if {a, b} == {Int, Float}:
+        return Float
+    if Void in (a, b) or base_type(a) is Union or base_type(b) is Union:
+        return union_of(a, b)
+    base = base_type(a)
+    if base is not base_type(b) or base not in (List, Dict, Tuple):
+        return Unknown
+    if isinstance(a, ParamType) and isinstance(b, ParamType):
+        if base is List:
+            return list_of(join(a.args[0], b.args[0]))
+        if base is Dict:
+            return dict_of(join(a.args[0], b.args[0]), join(a.args[1], b.args[1]))
+    return base
+
+
+def element_type(t):
+    """Return the type of the items obtained by iterating over a value."""
+    if t is String:
+        return String
+    if not isinstance(t, ParamType) or t.base is Union:
+        return Unknown
+    if t.base is Tuple:
+        result = t.args[0]
+        for arg in t.args[1:]:
+            result = join(result, arg)
+        return result
+    if t.base is Dict and t.args[0] is not String:
+        # Keys of JS objects are strings, whatever they were in Python
+        return Unknown
+    # list[T] -> T, dict[str, V] -> str
+    return t.args[0]
+
+
+def item_type(t, index=None):
+    """Return the type of ``value[index]`` for a value of type ``t``.
+
+    ``index`` is the index when known at compile time, for tuples.
+    """
+    if t is String:
+        return String
+    if not isinstance(t, ParamType):
+        return Unknown
+    if t.base is Dict:
+        return t.args[1]
+    if t.base is Tuple and not t.variadic and isinstance(index, int):
+        if -len(t.args) <= index < len(t.args):
+            return t.args[index]
+        return Unknown
+    return element_type(t)
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import argparse
+import gzip
+import json
+import os
 import sys
 import time
 from pathlib import Path
 
-from .bundler import bundle_files
-from .compiler import py2js
+from .bundler import TARGETS, Bundler
+from .codegen.profile import Profile
+from .compiler import Compiler
 from .exceptions import PrescryptError
+from .runtime import SharedRuntime
 from .sourcemap import SourceMapGenerator, get_sourcemap_comment
 
 # Optional watchdog support for efficient file watching
@@ -22,6 +27,15 @@ except ImportError:
     WATCHDOG_AVAILABLE = False
 
 
+class _OutputAction(argparse.Action):
+    """Store ``-o`` as a Path, and whether it names a directory (``dist/``),
+    which the Path doesn't tell: it drops the trailing separator."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, Path(values))
+        namespace.output_is_dir = values.endswith(("/", os.sep))
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser."""
     parser = argparse.ArgumentParser(
@@ -50,10 +64,11 @@ Examples:
     parser.add_argument(
         "-o",
         "--output",
-        type=Path,
+        action=_OutputAction,
         default=None,
         help="Output file or directory (default: same as input with .js extension)",
     )
+    parser.set_defaults(output_is_dir=False)
 
     parser.add_argument(
         "-m",
@@ -84,7 +99,8 @@ Examples:
         "--no-tree-shake",
         action="store_true",
         default=False,
-        help="Include full stdlib instead of only used functions",
+        help="Include full stdlib instead of only used functions (with --bundle, "
+        "also keep the unused definitions of the bundled modules)",
     )
 
     parser.add_argument(
@@ -95,6 +111,69 @@ Examples:
         help="Bundle imported modules into a single output file with combined tree-shaking",
     )
 
+    parser.add_argument(
+        "--keep",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="With --bundle, keep a function, class or method (Class.method) of "
+        "the bundled modules even if unused (can be specified multiple times)",
+    )
+
+    parser.add_argument(
+        "--split",
+        action="store_true",
+        default=False,
+        help="With --bundle, move the modules imported in async functions to "
+        "chunks loaded on demand with import() (outputs ES modules)",
+    )
+
+    parser.add_argument(
+        "--entry",
+        action="append",
+        default=[],
+        type=Path,
+        metavar="FILE",
+        help="With --bundle, bundle another entry file, compiling the modules "
+        "they share once (can be specified multiple times; writes a "
+        "manifest.json)",
+    )
+
+    parser.add_argument(
+        "--shared-chunk",
+        action="store_true",
+        default=False,
+        help="With --entry, move the modules several entry files import to a "
+        "shared.js chunk (outputs ES modules)",
+    )
+
+    parser.add_argument(
+        "--lazy-init",
+        action="store_true",
+        default=False,
+        help="With --bundle, run the top-level code of the imported modules "
+        "the first time their names are used, instead of on load",
+    )
+
+    parser.add_argument(
+        "--target",
+        choices=TARGETS,
+        default=None,
+        help="Output profile: 'edge' bundles an ES module worker exporting the "
+        "entry file's handlers (export default { fetch }), with constant "
+        "tables computed at compile time and the imported modules "
+        "initialized lazily (implies --bundle)",
+    )
+
+    parser.add_argument(
+        "--shared-runtime",
+        action="store_true",
+        default=False,
+        help="Write the stdlib to a prescrypt_runtime.js ES module imported by "
+        "all the compiled modules, instead of including it in each (enables "
+        "module mode)",
+    )
+
     parser.add_argument(
         "--no-optimize",
         action="store_true",
@@ -102,6 +181,49 @@ Examples:
         help="Disable compile-time optimizations (constant folding, etc.)",
     )
 
+    parser.add_argument(
+        "--fast-paths",
+        action="store_true",
+        default=False,
+        help="Inline type-guarded native operators where types are unknown "
+        "(faster, larger output)",
+    )
+
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        default=False,
+        help="Minify the output: remove whitespace and comments, and shorten "
+        "local names and temporaries",
+    )
+
+    parser.add_argument(
+        "-O",
+        "--release",
+        action="store_true",
+        default=False,
+        help="Release build: remove assert statements and 'if __debug__:' "
+        "blocks, and use lean stdlib functions without debugging checks",
+    )
+
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        default=False,
+        help="Record the types seen at generic operator and method sites; the "
+        "program writes them to $PRESCRYPT_PROFILE (default "
+        "prescrypt-profile.json) on exit",
+    )
+
+    parser.add_argument(
+        "--profile-data",
+        type=Path,
+        default=None,
+        metavar="PROFILE",
+        help="Use the types recorded by an --instrument build to speed up "
+        "the sites that only saw one type",
+    )
+
     parser.add_argument(
         "-s",
         "--source-maps",
@@ -153,9 +275,16 @@ def compile_file(
     include_stdlib: bool = True,
     tree_shake: bool = True,
     optimize: bool = True,
+    fast_paths: bool = False,
+    minify: bool = False,
+    release: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
     source_maps: bool = False,
+    runtime: SharedRuntime | None = None,
     verbosity: int = 0,
     quiet: bool = False,
+    source_name: str | None = None,
 ) -> bool:
     """Compile a single Python file to JavaScript.
 
@@ -167,9 +296,17 @@ def compile_file(
         include_stdlib: Whether to include the stdlib preamble
         tree_shake: Whether to only include used stdlib functions
         optimize: Whether to apply compile-time optimizations
+        fast_paths: Whether to inline type-guarded native operators
+        minify: Whether to minify the output
+        release: Whether to strip asserts and debug-only runtime work
+        instrument: Whether to record the types seen at generic sites
+        profile: Types recorded by an instrumented build
         source_maps: Whether to generate source maps
+        runtime: Shared runtime to import the stdlib from (instead of
+            including it), recording the used stdlib functions
         verbosity: Verbosity level (0=normal, 1=stages, 2=AST, 3=debug)
         quiet: Suppress all output except errors
+        source_name: Name of the file in profile site keys (default: file name)
 
     Returns:
         True on success, False on error.
@@ -194,17 +331,25 @@ def compile_file(
         source_map.add_source(str(rel_src), src)
 
     # Compile
+    compiler = Compiler()
     try:
-        dst = py2js(
+        dst = compiler.compile(
             src,
             include_stdlib=include_stdlib,
             tree_shake=tree_shake,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
             module_mode=module_mode,
             source_dir=src_path.parent,
             module_paths=module_paths,
             source_map=source_map,
             verbosity=verbosity,
+            source_name=source_name or src_path.name,
+            runtime_import=runtime.import_path(dst_path) if runtime else None,
         ).strip()
     except PrescryptError as e:
         # Update error location with filename
@@ -216,6 +361,8 @@ def compile_file(
     except Exception as e:
         print(f"Internal error compiling {src_path}: {e}", file=sys.stderr)
         return False
+    if runtime is not None:
+        runtime.add(compiler.used_std_functions, compiler.used_std_methods)
 
     # Ensure output directory exists
     dst_path.parent.mkdir(parents=True, exist_ok=True)
@@ -258,16 +405,48 @@ def bundle_file(
     *,
     module_paths: list[Path] | None = None,
     optimize: bool = True,
+    fast_paths: bool = False,
+    minify: bool = False,
+    release: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
+    tree_shake: bool = True,
+    keep: list[str] | None = None,
+    split: bool = False,
+    entries: list[Path] | None = None,
+    shared: bool = False,
+    lazy_init: bool = False,
+    target: str | None = None,
     verbosity: int = 0,
     quiet: bool = False,
 ) -> bool:
     """Bundle a Python file and all its imports into a single JavaScript file.
 
+    With ``split``, the chunks loaded on demand are written next to it. So
+    are the bundles of the other ``entries``, their shared chunk, and a
+    ``manifest.json`` of the chunks each entry file imports.
+
     Args:
         src_path: Path to the entry Python source file
         dst_path: Path to the output JavaScript file
         module_paths: Additional directories to search for modules
         optimize: Whether to apply compile-time optimizations
+        fast_paths: Whether to inline type-guarded native operators
+        minify: Whether to minify the output
+        release: Whether to strip asserts and debug-only runtime work
+        instrument: Whether to record the types seen at generic sites
+        profile: Types recorded by an instrumented build
+        tree_shake: Whether to only include the used stdlib functions and
+            module definitions
+        keep: Definitions to keep even if unused (``name`` or ``Class.method``)
+        split: Whether to split the imports in async functions into chunks
+        entries: Other entry files to bundle, with the modules compiled once
+        shared: Whether to move the modules several entry files import to a
+            shared chunk
+        lazy_init: Whether to run the top-level code of the imported modules
+            when their names are first used
+        target: Output profile (``"edge"``: an ES module worker, with its
+            estimated parse size reported)
         verbosity: Verbosity level (0=normal, 1=stages, 2=AST, 3=debug)
         quiet: Suppress all output except errors
 
@@ -275,12 +454,25 @@ def bundle_file(
         True on success, False on error.
     """
     try:
-        dst = bundle_files(
-            entry_file=src_path,
+        bundler = Bundler(
+            entry_file=[src_path, *entries] if entries else src_path,
             module_paths=module_paths,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
+            tree_shake=tree_shake,
+            keep=keep,
+            split=split,
+            output_name=dst_path.name,
+            shared=shared,
+            lazy_init=lazy_init,
+            target=target,
             verbosity=verbosity,
-        ).strip()
+        )
+        dst = bundler.bundle().strip()
     except PrescryptError as e:
         print(e.format_with_context(""), file=sys.stderr)
         return False
@@ -296,18 +488,35 @@ def bundle_file(
     dst_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Write output
-    try:
-        dst_path.write_text(dst + "\n")
-    except OSError as e:
-        print(f"Error writing {dst_path}: {e}", file=sys.stderr)
-        return False
+    chunks = {dst_path.parent / name: code for name, code in bundler.chunks.items()}
+    if entries:
+        manifest = json.dumps(bundler.manifest, indent=2)
+        chunks[dst_path.parent / "manifest.json"] = manifest
+    for path, code in [(dst_path, dst), *chunks.items()]:
+        try:
+            path.write_text(code.strip() + "\n")
+        except OSError as e:
+            print(f"Error writing {path}: {e}", file=sys.stderr)
+            return False
 
     if not quiet:
         print(f"Bundled {src_path} -> {dst_path}")
+        for path in chunks:
+            print(f"  -> {path}")
+        if target == "edge":
+            print(_parse_size_report(dst))
 
     return True
 
 
+def _parse_size_report(code: str) -> str:
+    """Report the size of a script, which the engine parses on a cold start
+    (and the size of its download, gzipped)."""
+    size = len(code.encode())
+    compressed = len(gzip.compress(code.encode()))
+    return f"Parse size: {size / 1024:.1f} kB ({compressed / 1024:.1f} kB gzipped)"
+
+
 def compile_directory(
     src_dir: Path,
     dst_dir: Path,
@@ -317,7 +526,13 @@ def compile_directory(
     include_stdlib: bool = True,
     tree_shake: bool = True,
     optimize: bool = True,
+    fast_paths: bool = False,
+    minify: bool = False,
+    release: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
     source_maps: bool = False,
+    runtime: SharedRuntime | None = None,
     verbosity: int = 0,
     quiet: bool = False,
 ) -> tuple[int, int]:
@@ -366,9 +581,16 @@ def compile_directory(
             include_stdlib=include_stdlib,
             tree_shake=tree_shake,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
             source_maps=source_maps,
+            runtime=runtime,
             verbosity=verbosity,
             quiet=quiet,
+            source_name=rel_path.as_posix(),
         )
 
         if success:
@@ -376,9 +598,28 @@ def compile_directory(
         else:
             error_count += 1
 
+    if runtime is not None and not write_runtime(runtime, verbosity):
+        error_count += 1
+
     return success_count, error_count
 
 
+def write_runtime(runtime: SharedRuntime, verbosity: int = 0) -> bool:
+    """Write a shared runtime, with the stdlib used by the compiled modules.
+
+    Returns:
+        True on success, False on error.
+    """
+    try:
+        path = runtime.write()
+    except OSError as e:
+        print(f"Error writing {runtime.path}: {e}", file=sys.stderr)
+        return False
+    if verbosity >= 1:
+        print(f"Wrote runtime {path}")
+    return True
+
+
 def _get_output_path_for_file(
     src_path: Path, src_dir: Path | None, dst_dir: Path | None
 ) -> Path:
@@ -415,7 +656,13 @@ def watch_with_polling(
     include_stdlib: bool = True,
     tree_shake: bool = True,
     optimize: bool = True,
+    fast_paths: bool = False,
+    minify: bool = False,
+    release: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
     source_maps: bool = False,
+    runtime: SharedRuntime | None = None,
     verbosity: int = 0,
     quiet: bool = False,
     poll_interval: float = 1.0,
@@ -458,10 +705,18 @@ def watch_with_polling(
                         include_stdlib=include_stdlib,
                         tree_shake=tree_shake,
                         optimize=optimize,
+                        fast_paths=fast_paths,
+                        minify=minify,
+                        release=release,
+                        instrument=instrument,
+                        profile=profile,
                         source_maps=source_maps,
+                        runtime=runtime,
                         verbosity=verbosity,
                         quiet=quiet,
                     )
+                    if runtime is not None:
+                        write_runtime(runtime, verbosity)
         return changed
 
     # Initial scan to populate mtimes
@@ -493,7 +748,13 @@ def watch_with_watchdog(
     include_stdlib: bool = True,
     tree_shake: bool = True,
     optimize: bool = True,
+    fast_paths: bool = False,
+    minify: bool = False,
+    release: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
     source_maps: bool = False,
+    runtime: SharedRuntime | None = None,
     verbosity: int = 0,
     quiet: bool = False,
 ) -> None:
@@ -544,10 +805,18 @@ def watch_with_watchdog(
                 include_stdlib=include_stdlib,
                 tree_shake=tree_shake,
                 optimize=optimize,
+                fast_paths=fast_paths,
+                minify=minify,
+                release=release,
+                instrument=instrument,
+                profile=profile,
                 source_maps=source_maps,
+                runtime=runtime,
                 verbosity=verbosity,
                 quiet=quiet,
             )
+            if runtime is not None:
+                write_runtime(runtime, verbosity)
 
     handler = RecompileHandler()
     observer = Observer()
@@ -578,7 +847,13 @@ def watch_files(
     include_stdlib: bool = True,
     tree_shake: bool = True,
     optimize: bool = True,
+    fast_paths: bool = False,
+    minify: bool = False,
+    release: bool = False,
+    instrument: bool = False,
+    profile: Profile | None = None,
     source_maps: bool = False,
+    runtime: SharedRuntime | None = None,
     verbosity: int = 0,
     quiet: bool = False,
 ) -> None:
@@ -598,7 +873,13 @@ def watch_files(
             include_stdlib=include_stdlib,
             tree_shake=tree_shake,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
             source_maps=source_maps,
+            runtime=runtime,
             verbosity=verbosity,
             quiet=quiet,
         )
@@ -614,7 +895,13 @@ def watch_files(
             include_stdlib=include_stdlib,
             tree_shake=tree_shake,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
             source_maps=source_maps,
+            runtime=runtime,
             verbosity=verbosity,
             quiet=quiet,
         )
@@ -639,10 +926,41 @@ def main():
     include_stdlib = not args.no_stdlib
     tree_shake = not args.no_tree_shake
     optimize = not args.no_optimize
+    fast_paths = args.fast_paths
+    minify = args.minify
+    release = args.release
+    instrument = args.instrument
+    profile = None
+    if args.profile_data is not None:
+        try:
+            profile = Profile.load(args.profile_data)
+        except PrescryptError as e:
+            print(e.format(), file=sys.stderr)
+            sys.exit(1)
     source_maps = args.source_maps
     watch = args.watch
     quiet = args.quiet
-    bundle = args.bundle
+    bundle = args.bundle or args.target is not None
+    for option, value in [
+        ("--split", args.split),
+        ("--entry", args.entry),
+        ("--shared-chunk", args.shared_chunk),
+        ("--lazy-init", args.lazy_init),
+    ]:
+        if value and not bundle:
+            print(f"Error: {option} requires --bundle", file=sys.stderr)
+            sys.exit(1)
+    runtime = None
+    if args.shared_runtime:
+        if bundle or not include_stdlib:
+            option = "--bundle" if bundle else "--no-stdlib"
+            print(
+                f"Error: --shared-runtime is not supported with {option}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        # The runtime is an ES module
+        module_mode = True
 
     # Determine verbosity level
     # --debug is equivalent to -vvv (level 3)
@@ -654,9 +972,11 @@ def main():
         # Single file compilation
         if output_path is None:
             output_path = input_path.with_suffix(".js")
-        elif output_path.is_dir() or str(output_path).endswith("/"):
-            # Output is a directory
+        elif output_path.is_dir() or args.output_is_dir or args.entry:
+            # Output is a directory (always with several entry files)
             output_path = output_path / input_path.with_suffix(".js").name
+        if args.shared_runtime:
+            runtime = SharedRuntime(output_path.parent, tree_shake, minify, release)
 
         # Initial compilation
         if bundle:
@@ -677,6 +997,18 @@ def main():
                 output_path,
                 module_paths=module_paths,
                 optimize=optimize,
+                fast_paths=fast_paths,
+                minify=minify,
+                release=release,
+                instrument=instrument,
+                profile=profile,
+                tree_shake=tree_shake,
+                keep=args.keep,
+                split=args.split,
+                entries=args.entry,
+                shared=args.shared_chunk,
+                lazy_init=args.lazy_init,
+                target=args.target,
                 verbosity=verbosity,
                 quiet=quiet,
             )
@@ -691,10 +1023,18 @@ def main():
             include_stdlib=include_stdlib,
             tree_shake=tree_shake,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
             source_maps=source_maps,
+            runtime=runtime,
             verbosity=verbosity,
             quiet=quiet,
         )
+        if success and runtime is not None:
+            success = write_runtime(runtime, verbosity)
 
         if watch:
             # Watch mode for single file
@@ -707,7 +1047,13 @@ def main():
                 include_stdlib=include_stdlib,
                 tree_shake=tree_shake,
                 optimize=optimize,
+                fast_paths=fast_paths,
+                minify=minify,
+                release=release,
+                instrument=instrument,
+                profile=profile,
                 source_maps=source_maps,
+                runtime=runtime,
                 verbosity=verbosity,
                 quiet=quiet,
             )
@@ -727,6 +1073,8 @@ def main():
         if not module_mode and not quiet:
             print("Note: Enabling module mode for directory compilation")
             module_mode = True
+        if args.shared_runtime:
+            runtime = SharedRuntime(output_path, tree_shake, minify, release)
 
         # Initial compilation
         success_count, error_count = compile_directory(
@@ -737,7 +1085,13 @@ def main():
             include_stdlib=include_stdlib,
             tree_shake=tree_shake,
             optimize=optimize,
+            fast_paths=fast_paths,
+            minify=minify,
+            release=release,
+            instrument=instrument,
+            profile=profile,
             source_maps=source_maps,
+            runtime=runtime,
             verbosity=verbosity,
             quiet=quiet,
         )
@@ -756,7 +1110,13 @@ def main():
                 include_stdlib=include_stdlib,
                 tree_shake=tree_shake,
                 optimize=optimize,
+                fast_paths=fast_paths,
+                minify=minify,
+                release=release,
+                instrument=instrument,
+                profile=profile,
                 source_maps=source_maps,
+                runtime=runtime,
                 verbosity=verbosity,
                 quiet=quiet,
             )
@@ -0,0 +1,221 @@
+"""Whitespace and comment removal for generated JavaScript.
+
+The minifier works on tokens, so strings, template literals and regular
+expressions are copied as they are. Between two tokens, whitespace and
+comments are removed, except:
+
+- a space is kept where the tokens would otherwise merge (``let x``,
+  ``a - -b``, ``1 .toString()``),
+- a line break is kept where removing it could change how automatic
+  semicolon insertion splits the statements (``return\\nx``), unless the
+  previous token ends a statement or opens a block, or the next one can't
+  start a statement.
+
+Names are shortened before code generation (``front.passes.mangler``). The
+mappings of a source map are moved to the new positions of their tokens.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .sourcemap import SourceMapGenerator
+
+_GAP = re.compile(r"(?:\s|//[^\n]*|/\*[\s\S]*?\*/)+")
+_STRING = re.compile(r"'(?:[^'\\\n]|\\[\s\S])*'|\"(?:[^\"\\\n]|\\[\s\S])*\"")
+_REGEX = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*")
+_WORD = re.compile(r"[\w$\u0080-\uffff]+")
+
+# Keywords after which a `/` starts a regular expression, not a division
+_REGEX_KEYWORDS = {
+    *("return", "typeof", "instanceof", "in", "of", "new", "delete", "void"),
+    *("throw", "case", "do", "else", "yield", "await"),
+}
+
+# A line break is not needed after a token ending with these...
+_ENDS_STATEMENT = set(";{,([")
+# ... or before a token starting with these
+_CONTINUES = set("})],;.")
+
+# Tokens that merge without a space
+_MERGING = {"++", "--", "//", "/*"}
+
+
+def minify_js(code: str, source_map: SourceMapGenerator | None = None) -> str:
+    """Remove the whitespace and comments of JavaScript code.
+
+    Args:
+        code: JavaScript code
+        source_map: Optional source map of ``code``, updated in place to
+            map the minified code
+
+    Returns:
+        The minified code
+    """
+    parts = []
+    # Offsets of the tokens, in the original and minified code
+    old_starts = []
+    old_ends = []
+    new_starts = []
+    size = 0
+    previous = None
+    gap = ""
+    for start, kind, text in _tokens(code):
+        if kind == "gap":
+            gap = text
+            continue
+        if previous is not None and gap:
+            separator = _separator(previous, text, gap)
+            parts.append(separator)
+            size += len(separator)
+        old_starts.append(start)
+        old_ends.append(start + len(text))
+        new_starts.append(size)
+        parts.append(text)
+        size += len(text)
+        previous = text
+        gap = ""
+    result = "".join(parts)
+
+    if source_map is not None:
+        tokens = (old_starts, old_ends, new_starts)
+        _remap(source_map, code, result, tokens)
+    return result
+
+
+def _tokens(code: str) -> Iterator[tuple[int, str, str]]:
+    """Yield the tokens of JavaScript code: (offset, kind, text).
+
+    Operators are yielded one character at a time: the characters of a
+    token are copied together, only the gaps between tokens matter.
+    """
+    i = 0
+    previous = ("", "")
+    while i < len(code):
+        char = code[i]
+        if match := _GAP.match(code, i):
+            kind = "gap"
+        elif char in "'\"":
+            match = _STRING.match(code, i)
+            kind = "string"
+        elif char == "/" and _starts_regex(previous):
+            match = _REGEX.match(code, i)
+            kind = "regex"
+        elif match := _WORD.match(code, i):
+            kind = "word"
+        else:
+            match = None
+            kind = "template" if char == "`" else "punct"
+
+        if match is not None:
+            end = match.end()
+        elif kind == "template":
+            end = _template_end(code, i)
+        else:
+            end = i + 1
+            kind = "punct"
+        text = code[i:end]
+        yield i, kind, text
+        if kind == "punct" and previous[0] == "punct":
+            # The last two characters, for `++` and `--`
+            previous = (kind, previous[1][-1] + text)
+        elif kind != "gap":
+            previous = (kind, text)
+        i = end
+
+
+def _starts_regex(previous: tuple[str, str]) -> bool:
+    """Check whether a `/` after the given token starts a regular expression."""
+    kind, text = previous
+    if kind == "word":
+        return text in _REGEX_KEYWORDS
+    if kind == "punct":
+        return not text.endswith((")", "]", "}")) and text not in ("++", "--")
+    # Start of the code, or after a literal
+    return kind == ""
+
+
+def _template_end(code: str, i: int) -> int:
+    """Return the end offset of the template literal starting at ``i``."""
+    i += 1
+    while i < len(code):
+        char = code[i]
+        if char == "\\":
+            i += 2
+        elif char == "`":
+            return i + 1
+        elif code.startswith("${", i):
+            i = _braces_end(code, i + 1)
+        else:
+            i += 1
+    return i
+
+
+def _braces_end(code: str, i: int) -> int:
+    """Return the offset after the ``}`` matching the ``{`` at ``i``."""
+    depth = 0
+    while i < len(code):
+        char = code[i]
+        if char in "'\"" and (match := _STRING.match(code, i)):
+            i = match.end()
+            continue
+        if char == "`":
+            i = _template_end(code, i)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _separator(previous: str, next: str, gap: str) -> str:
+    """Return what replaces the whitespace and comments between two tokens."""
+    if "\n" in gap and not (previous[-1] in _ENDS_STATEMENT or next[0] in _CONTINUES):
+        return "\n"
+    if _WORD.match(previous[-1]) and _WORD.match(next[0]):
+        return " "
+    if previous[-1] + next[0] in _MERGING:
+        return " "
+    if previous[0].isdigit() and next[0] == ".":
+        return " "
+    return ""
+
+
+def _remap(
+    source_map: SourceMapGenerator,
+    old_code: str,
+    new_code: str,
+    tokens: tuple[list[int], list[int], list[int]],
+) -> None:
+    """Move the mappings of a source map to the minified code.
+
+    A mapping is moved with the token at its position, or the next one if
+    it points at removed whitespace.
+    """
+    old_starts, old_ends, new_starts = tokens
+    old_lines = _line_starts(old_code)
+    new_lines = _line_starts(new_code)
+    for mapping in source_map.mappings:
+        if mapping.gen_line >= len(old_lines):
+            continue
+        offset = old_lines[mapping.gen_line] + mapping.gen_column
+        # The first token ending after the position
+        index = bisect_right(old_ends, offset)
+        if index == len(old_starts):
+            new_offset = len(new_code)
+        else:
+            new_offset = new_starts[index] + max(0, offset - old_starts[index])
+        mapping.gen_line = bisect_right(new_lines, new_offset) - 1
+        mapping.gen_column = new_offset - new_lines[mapping.gen_line]
+
+
+def _line_starts(code: str) -> list[int]:
+    return [0] + [match.end() for match in re.finditer("\n", code)]
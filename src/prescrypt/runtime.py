@@ -0,0 +1,118 @@
+"""The stdlib as a shared ES module, for module-mode builds.
+
+By default, each compiled module includes the stdlib functions it uses, so
+an app of many modules ships (and the browser parses) ``op_equals``,
+``truthy``, ``str``... once per module. With a shared runtime, the modules
+import them from a single ES module instead::
+
+    import { _pyfunc_op_add, _pyfunc_str } from './prescrypt_runtime.js';
+
+The runtime contains the stdlib functions used by any of the modules (and
+their dependencies), or the full stdlib. The full stdlib doesn't depend on
+the modules, so its file name contains a hash of its content: it can be
+cached by browsers for good.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from .compiler import get_stdlib_js, short_prefixes
+from .minify import minify_js
+from .stdlib_js import FUNCTION_PREFIX, METHOD_PREFIX
+
+RUNTIME_NAME = "prescrypt_runtime"
+
+
+class SharedRuntime:
+    """A stdlib module shared by the modules of an output directory."""
+
+    def __init__(
+        self,
+        directory: Path,
+        tree_shake: bool = True,
+        minify: bool = False,
+        release: bool = False,
+    ):
+        """Initialize the runtime.
+
+        Args:
+            directory: The output directory (the runtime is written there)
+            tree_shake: Whether to only include the stdlib functions used by
+                the modules (otherwise the full stdlib, in a hashed file)
+            minify: Whether the modules and the runtime are minified (with
+                short stdlib prefixes)
+            release: Whether to strip the debug-only checks of the stdlib
+                functions (release builds)
+        """
+        self.directory = directory
+        self.tree_shake = tree_shake
+        self.minify = minify
+        self.release = release
+        self.function_prefix = FUNCTION_PREFIX
+        self.method_prefix = METHOD_PREFIX
+        if minify:
+            self.function_prefix, self.method_prefix = short_prefixes(
+                FUNCTION_PREFIX, METHOD_PREFIX
+            )
+
+        # Stdlib functions and methods used by the modules
+        self.functions: set[str] = set()
+        self.methods: set[str] = set()
+
+        self._full_code: str | None = None
+
+    @property
+    def path(self) -> Path:
+        """The path of the runtime module."""
+        if self.tree_shake:
+            return self.directory / f"{RUNTIME_NAME}.js"
+        digest = hashlib.sha256(self.generate().encode()).hexdigest()[:8]
+        return self.directory / f"{RUNTIME_NAME}.{digest}.js"
+
+    def import_path(self, module_path: Path) -> str:
+        """Return the path to import the runtime from, in a module.
+
+        Args:
+            module_path: The path of the compiled module (.js)
+        """
+        path = os.path.relpath(self.path, module_path.parent)
+        path = Path(path).as_posix()
+        return path if path.startswith("../") else "./" + path
+
+    def add(self, functions: set[str], methods: set[str]) -> None:
+        """Record the stdlib functions and methods used by a module."""
+        self.functions |= functions
+        self.methods |= methods
+
+    def generate(self) -> str:
+        """Generate the code of the runtime."""
+        stdlib = get_stdlib_js(self.function_prefix, self.method_prefix, self.release)
+        if self.tree_shake:
+            functions, methods = stdlib.resolve_dependencies(
+                self.functions, self.methods
+            )
+        elif self._full_code is not None:
+            return self._full_code
+        else:
+            functions, methods = set(stdlib.functions), set(stdlib.methods)
+
+        names = [self.function_prefix + name for name in sorted(functions)] + [
+            self.method_prefix + name for name in sorted(methods)
+        ]
+        code = stdlib.get_partial_std_lib(functions, methods)
+        code += f"\nexport {{ {', '.join(names)} }};"
+        if self.minify:
+            code = minify_js(code)
+        if not self.tree_shake:
+            self._full_code = code
+        return code
+
+    def write(self) -> Path:
+        """Write the runtime module, and return its path."""
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.generate() + "\n")
+        return path
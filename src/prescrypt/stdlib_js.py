@@ -5,6 +5,10 @@
 - Methods are written as methods (using this), but declared as functions,
     and then "apply()-ed" to the instance of interest.
     Declaring methods on Object is a bad idea (breaks Bokeh, jquery).
+
+- Release builds leave out the lines between ``// begin debug`` and
+    ``// end debug``: the work only useful while debugging (stack capture,
+    defensive checks whose failure the engine reports anyway).
 """
 
 from __future__ import annotations
@@ -15,6 +19,16 @@ from pathlib import Path
 FUNCTION_PREFIX = "_pyfunc_"
 METHOD_PREFIX = "_pymeth_"
 
+# Prefixes of minified output: `$` can't be in Python names
+SHORT_FUNCTION_PREFIX = "$f"
+SHORT_METHOD_PREFIX = "$m"
+
+# Lines between `// begin debug` and `// end debug`, and the markers alone
+DEBUG_BLOCK = re.compile(
+    r"^[ \t]*// begin debug\n.*?^[ \t]*// end debug\n", re.MULTILINE | re.DOTALL
+)
+DEBUG_MARKER = re.compile(r"^[ \t]*// (?:begin|end) debug\n", re.MULTILINE)
+
 
 # ----- Functions & methods
 class StdlibJs:
@@ -27,9 +41,11 @@ class StdlibJs:
         self,
         function_prefix: str = FUNCTION_PREFIX,
         method_prefix: str = METHOD_PREFIX,
+        release: bool = False,
     ):
         self.function_prefix = function_prefix
         self.method_prefix = method_prefix
+        self.release = release
         self.functions = self.get_functions("functions.js")
         self.methods = self.get_functions("methods.js")
         # Parse dependencies
@@ -51,6 +67,12 @@ class StdlibJs:
             if block.endswith(";"):
                 block = block[:-1]
 
+            # Debug-only work: removed from release builds
+            if self.release:
+                block = DEBUG_BLOCK.sub("", block)
+            else:
+                block = DEBUG_MARKER.sub("", block)
+
             result[name] = block
 
         for key in result:
@@ -102,9 +102,11 @@ export const BaseException = (function() {
     this.message = message;
     // args is always a tuple (array without _is_list) containing all constructor arguments
     this.args = args;
+    // begin debug
     if (Error.captureStackTrace) {
       Error.captureStackTrace(this, BaseException);
     }
+    // end debug
   }
   BaseException.prototype = Object.create(Error.prototype);
   BaseException.prototype.constructor = BaseException;
@@ -306,6 +308,7 @@ export const time = function () {
 // function: op_instantiate
 export const op_instantiate = function (ob, args) {
   // nargs: 2
+  // begin debug
   if (
     typeof ob === "undefined" ||
     (typeof window !== "undefined" && window === ob) ||
@@ -313,13 +316,19 @@ export const op_instantiate = function (ob, args) {
   ) {
     throw "Class constructor is called as a function.";
   }
+  // end debug
   for (let name in ob) {
     if (
       Object[name] === undefined &&
       typeof ob[name] === "function" &&
       !ob[name].nobind
     ) {
-      ob[name] = ob[name].bind(ob);
+      const func = ob[name];
+      ob[name] = func.bind(ob);
+      if (func.__wrapped__ !== undefined) {
+        // Keep decorator attributes (e.g. cache_info() from lru_cache)
+        Object.assign(ob[name], func);
+      }
       ob[name].__name__ = name;
     }
   }
@@ -404,6 +413,20 @@ export const create_dict = function () {
 
 // ---
 
+// function: mark_lists
+export const mark_lists = function (value) {
+  // Mark the arrays of a parsed literal as lists (JSON.parse makes arrays)
+  if (Array.isArray(value)) {
+    value._is_list = true;
+    for (const item of value) FUNCTION_PREFIXmark_lists(item);
+  } else if (value !== null && typeof value === "object") {
+    for (const key of Object.keys(value)) FUNCTION_PREFIXmark_lists(value[key]);
+  }
+  return value;
+};
+
+// ---
+
 // function: merge_dicts
 export const merge_dicts = function () {
   const res = {};
@@ -507,6 +530,11 @@ export const dict = function (x) {
       let t = x[i];
       res[t[0]] = t[1];
     }
+  } else if (FUNCTION_PREFIXis_lazy_iterable(x)) {
+    // Pairs from a generator, a lazy zip()...
+    for (const t of x) {
+      res[t[0]] = t[1];
+    }
   } else {
     const keys = Object.keys(x);
     for (let i = 0; i < keys.length; i++) {
@@ -560,76 +588,6 @@ export const next = function (iterator, defaultValue) {
 
 // ---
 
-// function: zip
-export const zip = function (...iterables) {
-  // nargs: 0+
-  // Zip iterables together, yielding tuples
-  if (iterables.length === 0) {
-    return [];
-  }
-  // Convert all to arrays for simplicity
-  let arrays = iterables.map(it => {
-    if (Array.isArray(it)) return it;
-    if (typeof it[Symbol.iterator] === "function") return [...it];
-    return Array.from(it);
-  });
-  let minLen = Math.min(...arrays.map(a => a.length));
-  let result = [];
-  for (let i = 0; i < minLen; i++) {
-    result.push(arrays.map(a => a[i]));
-  }
-  return result;
-};
-
-// ---
-
-// function: map
-export const map = function (func, ...iterables) {
-  // nargs: 1+
-  // Map function over iterable(s)
-  if (iterables.length === 0) {
-    throw FUNCTION_PREFIXop_error("TypeError", "map() must have at least two arguments");
-  }
-  if (iterables.length === 1) {
-    // Single iterable - simple case
-    let arr = iterables[0];
-    if (!Array.isArray(arr)) {
-      if (typeof arr[Symbol.iterator] === "function") {
-        arr = [...arr];
-      } else {
-        arr = Array.from(arr);
-      }
-    }
-    return arr.map(x => func(x));
-  }
-  // Multiple iterables - zip and apply
-  let zipped = FUNCTION_PREFIXzip(...iterables);
-  return zipped.map(args => func(...args));
-};
-
-// ---
-
-// function: filter
-export const filter = function (func, iterable) {
-  // nargs: 2
-  // Filter iterable by function
-  let arr = iterable;
-  if (!Array.isArray(arr)) {
-    if (typeof arr[Symbol.iterator] === "function") {
-      arr = [...arr];
-    } else {
-      arr = Array.from(arr);
-    }
-  }
-  if (func === null || func === undefined) {
-    // filter(None, iterable) filters out falsy values
-    return arr.filter(x => FUNCTION_PREFIXtruthy(x));
-  }
-  return arr.filter(x => func(x));
-};
-
-// ---
-
 // function: list
 export const list = function (x) {
   let res;
@@ -1054,9 +1012,9 @@ export const int = function (x, base) {
   // Handle strings
   if (typeof x === 'string') {
     x = x.trim();
-    if (x === '') throw new ValueError('invalid literal for int() with base 10');
+    if (x === '') throw new FUNCTION_PREFIXValueError('invalid literal for int() with base 10');
     let result = parseInt(x, 10);
-    if (isNaN(result)) throw new ValueError('invalid literal for int() with base 10: \'' + x + '\'');
+    if (isNaN(result)) throw new FUNCTION_PREFIXValueError('invalid literal for int() with base 10: \'' + x + '\'');
     return result;
   }
   // Handle numbers - truncate toward zero (like Python)
@@ -1551,40 +1509,71 @@ export const any = function (x) {
 };
 
 // ---
+// function: is_lazy_iterable
+export const is_lazy_iterable = function (x) {
+  // nargs: 1
+  // Whether zip(), map(), filter() and enumerate() must consume an iterable
+  // lazily: anything but lists, strings and dicts (generators, sets...)
+  return (
+    typeof x === "object" &&
+    x !== null &&
+    !Array.isArray(x) &&
+    typeof x[Symbol.iterator] === "function"
+  );
+};
 
+// ---
 // function: enumerate
-export const enumerate = function (iter) {
-  // nargs: 1
-  const res = [];
-  // Handle iterators/generators
-  if (!Array.isArray(iter) && typeof iter[Symbol.iterator] === 'function') {
-    let i = 0;
-    for (const item of iter) {
-      res.push([i++, item]);
-    }
-    return res;
+export const enumerate = function (iter, start = 0) {
+  // nargs: 1 2
+  // Lists, strings and dicts give an array of pairs; other iterables
+  // (generators, sets...) a lazy iterator, which may be infinite
+  if (FUNCTION_PREFIXis_lazy_iterable(iter)) {
+    const it = iter[Symbol.iterator]();
+    return (function* () {
+      let i = start;
+      for (let r = it.next(); !r.done; r = it.next()) {
+        yield [i++, r.value];
+      }
+    })();
   }
-  // Handle plain objects
-  if (typeof iter === "object" && !Array.isArray(iter)) {
+  const res = [];
+  if (typeof iter === "string") {
+    iter = [...iter];
+  } else if (typeof iter === "object" && !Array.isArray(iter)) {
     iter = Object.keys(iter);
   }
   for (let i = 0; i < iter.length; i++) {
-    res.push([i, iter[i]]);
+    res.push([start + i, iter[i]]);
   }
   return res;
 };
 
 // ---
-
 // function: zip
-export const zip = function () {
-  // nargs: 2 3 4 5 6 7 8 9
-  let len = 1e20;
+export const zip = function (...iterables) {
+  // nargs: 0+
+  // Lists, strings and dicts are zipped into an array of tuples. With any
+  // other iterable (a generator, a set...), the result is a lazy iterator
+  // that stops at the shortest input, like in Python
+  if (iterables.some(FUNCTION_PREFIXis_lazy_iterable)) {
+    const its = iterables.map((x) => FUNCTION_PREFIXiter(x));
+    return (function* () {
+      while (true) {
+        const tup = [];
+        for (const it of its) {
+          const r = it.next();
+          if (r.done) return;
+          tup.push(r.value);
+        }
+        yield tup;
+      }
+    })();
+  }
+  let len = iterables.length ? 1e20 : 0;
   const args = [],
     res = [];
-
-  for (let i = 0; i < arguments.length; i++) {
-    let arg = arguments[i];
+  for (let arg of iterables) {
     if (typeof arg === "object" && !Array.isArray(arg)) {
       arg = Object.keys(arg);
     }
@@ -1649,7 +1638,6 @@ export const sorted = function (iter, key, reverse) {
 };
 
 // ---
-
 // function: filter
 export const filter = function (func, iter) {
   // nargs: 2
@@ -1658,26 +1646,57 @@ export const filter = function (func, iter) {
       return x;
     };
   }
-  if (typeof iter === "object" && !Array.isArray(iter)) {
+  if (FUNCTION_PREFIXis_lazy_iterable(iter)) {
+    const it = iter[Symbol.iterator]();
+    return (function* () {
+      for (let r = it.next(); !r.done; r = it.next()) {
+        if (func(r.value)) yield r.value;
+      }
+    })();
+  }
+  if (typeof iter === "string") {
+    iter = [...iter];
+  } else if (typeof iter === "object" && !Array.isArray(iter)) {
     iter = Object.keys(iter);
   }
   return iter.filter(func);
 };
 
 // ---
-
 // function: map
-export const map = function (func, iter) {
-  // nargs: 2
+export const map = function (func, ...iterables) {
+  // nargs: 2+
   if (typeof func === "undefined" || func === null) {
     func = function (x) {
       return x;
     };
   }
-  if (typeof iter === "object" && !Array.isArray(iter)) {
+  if (iterables.length > 1) {
+    const zipped = FUNCTION_PREFIXzip(...iterables);
+    if (Array.isArray(zipped)) {
+      return zipped.map((args) => func(...args));
+    }
+    return (function* () {
+      for (let r = zipped.next(); !r.done; r = zipped.next()) {
+        yield func(...r.value);
+      }
+    })();
+  }
+  let iter = iterables[0];
+  if (FUNCTION_PREFIXis_lazy_iterable(iter)) {
+    const it = iter[Symbol.iterator]();
+    return (function* () {
+      for (let r = it.next(); !r.done; r = it.next()) {
+        yield func(r.value);
+      }
+    })();
+  }
+  if (typeof iter === "string") {
+    iter = [...iter];
+  } else if (typeof iter === "object" && !Array.isArray(iter)) {
     iter = Object.keys(iter);
   }
-  return iter.map(func);
+  return iter.map((x) => func(x));
 };
 
 // ---
@@ -1703,9 +1722,11 @@ export const truthy = function (v) {
 export const op_len = function op_len(obj) {
   // nargs: 1
   // Python len() - checks for __len__ method first, then falls back to .length
+  // begin debug
   if (obj == null) {
     throw new TypeError("object of type 'NoneType' has no len()");
   }
+  // end debug
   if (typeof obj.__len__ === 'function') {
     return obj.__len__();
   }
@@ -1876,9 +1897,11 @@ export const callable = function (obj) {
 export const op_getitem = function op_getitem(obj, key) {
   // nargs: 2
   // Python obj[key] - checks for __getitem__ method first
+  // begin debug
   if (obj == null) {
     throw new TypeError("'NoneType' object is not subscriptable");
   }
+  // end debug
   if (typeof obj.__getitem__ === 'function') {
     return obj.__getitem__(key);
   }
@@ -1895,9 +1918,11 @@ export const op_getitem = function op_getitem(obj, key) {
 export const op_setitem = function op_setitem(obj, key, value) {
   // nargs: 3
   // Python obj[key] = value - checks for __setitem__ method first
+  // begin debug
   if (obj == null) {
     throw new TypeError("'NoneType' object does not support item assignment");
   }
+  // end debug
   if (typeof obj.__setitem__ === 'function') {
     obj.__setitem__(key, value);
   } else {
@@ -1907,13 +1932,45 @@ export const op_setitem = function op_setitem(obj, key, value) {
 
 // ---
 
+// function: op_iadd_item
+export const op_iadd_item = function op_iadd_item(obj, key, value) {
+  // nargs: 3
+  // Python obj[key] += value, with obj and key evaluated once
+  if (obj == null) {
+    throw new TypeError("'NoneType' object is not subscriptable");
+  }
+  let cur;
+  if (obj.constructor === Object) {
+    // Dicts: one lookup, one store. Counters and defaultdicts provide
+    // __missing__ for absent keys; plain dicts raise KeyError.
+    cur = obj[key];
+    if (cur === undefined) {
+      if (typeof obj.__missing__ !== 'function') {
+        throw FUNCTION_PREFIXop_error("KeyError", FUNCTION_PREFIXrepr(key));
+      }
+      cur = obj.__missing__(key);
+    }
+    obj[key] = typeof cur === 'number' && typeof value === 'number' ? cur + value : FUNCTION_PREFIXop_add(cur, value);
+    return;
+  }
+  if (typeof key === 'number' && key < 0 && Array.isArray(obj)) {
+    key = obj.length + key;
+  }
+  cur = FUNCTION_PREFIXop_getitem(obj, key);
+  FUNCTION_PREFIXop_setitem(obj, key, FUNCTION_PREFIXop_add(cur, value));
+};
+
+// ---
+
 // function: op_delitem
 export const op_delitem = function op_delitem(obj, key) {
   // nargs: 2
   // Python del obj[key] - checks for __delitem__ method first
+  // begin debug
   if (obj == null) {
     throw new TypeError("'NoneType' object does not support item deletion");
   }
+  // end debug
   if (typeof obj.__delitem__ === 'function') {
     obj.__delitem__(key);
   } else if (Array.isArray(obj)) {
@@ -2075,6 +2132,13 @@ export const op_contains = function op_contains(a, b) {
     return false;
   } else if (b.constructor == String) {
     return b.indexOf(a) >= 0;
+  } else if (typeof b[Symbol.iterator] === "function") {
+    // Iterators are consumed up to the first match, like in Python
+    const it = b[Symbol.iterator]();
+    for (let r = it.next(); !r.done; r = it.next()) {
+      if (FUNCTION_PREFIXop_equals(a, r.value)) return true;
+    }
+    return false;
   }
   let e = Error("Not a container: " + b);
   e.name = "TypeError";
@@ -2173,7 +2237,7 @@ export const min = function min() {
 
   if (items.length === 0) {
     if (hasDefault) return defaultValue;
-    throw new ValueError("min() arg is an empty sequence");
+    throw new FUNCTION_PREFIXValueError("min() arg is an empty sequence");
   }
 
   let result = items[0];
@@ -2243,7 +2307,7 @@ export const max = function max() {
 
   if (items.length === 0) {
     if (hasDefault) return defaultValue;
-    throw new ValueError("max() arg is an empty sequence");
+    throw new FUNCTION_PREFIXValueError("max() arg is an empty sequence");
   }
 
   let result = items[0];
@@ -2276,11 +2340,57 @@ export const op_add = function (a, b) {
     result.set(b, a.length);
     return result;
   }
+  // Objects implementing __add__ (e.g. Counter)
+  if (typeof a === "object" && a !== null && typeof a.__add__ === "function") {
+    return a.__add__(b);
+  }
   return a + b;
 };
 
 // ---
 
+// function: op_sub
+export const op_sub = function (a, b) {
+  // nargs: 2
+  // Only emitted when an operand may be a dict-like object (e.g. Counter)
+  if (typeof a === "object" && a !== null && typeof a.__sub__ === "function") {
+    return a.__sub__(b);
+  }
+  return a - b;
+};
+
+// ---
+
+// function: op_or
+export const op_or = function (a, b) {
+  // nargs: 2
+  // Only emitted when an operand may be a dict-like object
+  if (typeof a === "object" && a !== null) {
+    if (typeof a.__or__ === "function") {
+      return a.__or__(b);
+    }
+    // dict | dict merges into a new dict
+    if (a.constructor === Object && b !== null && typeof b === "object" && b.constructor === Object) {
+      return Object.assign({}, a, b);
+    }
+  }
+  return a | b;
+};
+
+// ---
+
+// function: op_and
+export const op_and = function (a, b) {
+  // nargs: 2
+  // Only emitted when an operand may be a dict-like object (e.g. Counter)
+  if (typeof a === "object" && a !== null && typeof a.__and__ === "function") {
+    return a.__and__(b);
+  }
+  return a & b;
+};
+
+// ---
+
 // function: op_mul
 export const op_mul = function (a, b) {
   // nargs: 2
@@ -2742,3 +2852,1426 @@ export const insort = function (a, x, lo, hi) {
 };
 
 // ---
+
+// function: heapq_siftdown
+export const heapq_siftdown = function (heap, startpos, pos) {
+  // nargs: 3
+  // Move heap[pos] up towards startpos until its parent is not larger
+  // (same as heapq._siftdown). Numbers are compared inline, anything
+  // else (tuples, strings, objects with __lt__) goes through compare().
+  const newitem = heap[pos];
+  const num = typeof newitem === "number";
+  while (pos > startpos) {
+    const parentpos = (pos - 1) >> 1;
+    const parent = heap[parentpos];
+    if (num && typeof parent === "number"
+        ? newitem < parent
+        : FUNCTION_PREFIXcompare(newitem, parent) < 0) {
+      heap[pos] = parent;
+      pos = parentpos;
+      continue;
+    }
+    break;
+  }
+  heap[pos] = newitem;
+};
+
+// ---
+
+// function: heapq_siftup
+export const heapq_siftup = function (heap, pos) {
+  // nargs: 2
+  // Bubble the smaller child up until hitting a leaf, then put heap[pos]
+  // there and sift it back down (same as heapq._siftup).
+  const endpos = heap.length;
+  const startpos = pos;
+  const newitem = heap[pos];
+  let childpos = 2 * pos + 1;
+  while (childpos < endpos) {
+    const rightpos = childpos + 1;
+    if (rightpos < endpos) {
+      const left = heap[childpos], right = heap[rightpos];
+      if (typeof left === "number" && typeof right === "number"
+          ? !(left < right)
+          : !(FUNCTION_PREFIXcompare(left, right) < 0)) {
+        childpos = rightpos;
+      }
+    }
+    heap[pos] = heap[childpos];
+    pos = childpos;
+    childpos = 2 * pos + 1;
+  }
+  heap[pos] = newitem;
+  FUNCTION_PREFIXheapq_siftdown(heap, startpos, pos);
+};
+
+// ---
+
+// function: heapq_heapify
+export const heapq_heapify = function (x) {
+  // nargs: 1
+  // Transform list into a heap, in-place, in O(len(x)) time.
+  for (let i = (x.length >> 1) - 1; i >= 0; i--) {
+    FUNCTION_PREFIXheapq_siftup(x, i);
+  }
+  return null;
+};
+
+// ---
+
+// function: heapq_heappush
+export const heapq_heappush = function (heap, item) {
+  // nargs: 2
+  // Push item onto heap, maintaining the heap invariant.
+  heap.push(item);
+  FUNCTION_PREFIXheapq_siftdown(heap, 0, heap.length - 1);
+  return null;
+};
+
+// ---
+
+// function: heapq_heappop
+export const heapq_heappop = function (heap) {
+  // nargs: 1
+  // Pop the smallest item off the heap, maintaining the heap invariant.
+  if (heap.length === 0) {
+    throw FUNCTION_PREFIXop_error("IndexError", "index out of range");
+  }
+  const lastelt = heap.pop();
+  if (heap.length) {
+    const returnitem = heap[0];
+    heap[0] = lastelt;
+    FUNCTION_PREFIXheapq_siftup(heap, 0);
+    return returnitem;
+  }
+  return lastelt;
+};
+
+// ---
+
+// function: heapq_heapreplace
+export const heapq_heapreplace = function (heap, item) {
+  // nargs: 2
+  // Pop and return the current smallest value, and add the new item.
+  if (heap.length === 0) {
+    throw FUNCTION_PREFIXop_error("IndexError", "index out of range");
+  }
+  const returnitem = heap[0];
+  heap[0] = item;
+  FUNCTION_PREFIXheapq_siftup(heap, 0);
+  return returnitem;
+};
+
+// ---
+
+// function: heapq_heappushpop
+export const heapq_heappushpop = function (heap, item) {
+  // nargs: 2
+  // Fast version of a heappush followed by a heappop.
+  if (heap.length) {
+    const top = heap[0];
+    if (typeof top === "number" && typeof item === "number"
+        ? top < item
+        : FUNCTION_PREFIXcompare(top, item) < 0) {
+      heap[0] = item;
+      item = top;
+      FUNCTION_PREFIXheapq_siftup(heap, 0);
+    }
+  }
+  return item;
+};
+
+// ---
+
+// function: heapq_select
+export const heapq_select = function (n, iterable, key, sign) {
+  // nargs: 4
+  // Shared implementation of nsmallest() (sign 1) and nlargest() (sign -1).
+  // Keeps the n best [key, index, item] entries in a bounded heap whose
+  // root is the worst of them; ties are broken by input order, like CPython.
+  const items = Array.isArray(iterable) ? iterable : FUNCTION_PREFIXlist(iterable);
+  const res = [];
+  res._is_list = true;
+  if (!(n > 0)) return res;
+
+  const cmp = function (a, b) {
+    const ka = a[0], kb = b[0];
+    let c;
+    if (typeof ka === "number" && typeof kb === "number") {
+      c = ka < kb ? -1 : (ka > kb ? 1 : 0);
+    } else {
+      c = FUNCTION_PREFIXcompare(ka, kb);
+    }
+    return sign * c || a[1] - b[1];
+  };
+
+  const heap = [];
+  for (let i = 0; i < items.length; i++) {
+    const item = items[i];
+    const entry = [key ? key(item) : item, i, item];
+    let pos;
+    if (heap.length < n) {
+      // Grow the heap: sift the new entry up towards the root
+      pos = heap.length;
+      heap.push(entry);
+      while (pos > 0) {
+        const parentpos = (pos - 1) >> 1;
+        if (cmp(heap[parentpos], entry) >= 0) break;
+        heap[pos] = heap[parentpos];
+        pos = parentpos;
+      }
+    } else if (cmp(entry, heap[0]) < 0) {
+      // Better than the worst kept entry: replace the root and sift down
+      const endpos = heap.length;
+      pos = 0;
+      let childpos = 1;
+      while (childpos < endpos) {
+        if (childpos + 1 < endpos && cmp(heap[childpos + 1], heap[childpos]) > 0) {
+          childpos += 1;
+        }
+        if (cmp(heap[childpos], entry) <= 0) break;
+        heap[pos] = heap[childpos];
+        pos = childpos;
+        childpos = 2 * pos + 1;
+      }
+    } else {
+      continue;
+    }
+    heap[pos] = entry;
+  }
+
+  heap.sort(cmp);
+  for (let i = 0; i < heap.length; i++) {
+    res.push(heap[i][2]);
+  }
+  return res;
+};
+
+// ---
+
+// function: heapq_nsmallest
+export const heapq_nsmallest = function (n, iterable, key) {
+  // nargs: 2 3
+  // Find the n smallest elements in a dataset.
+  return FUNCTION_PREFIXheapq_select(n, iterable, key, 1);
+};
+
+// ---
+
+// function: heapq_nlargest
+export const heapq_nlargest = function (n, iterable, key) {
+  // nargs: 2 3
+  // Find the n largest elements in a dataset.
+  return FUNCTION_PREFIXheapq_select(n, iterable, key, -1);
+};
+
+// ---
+
+// function: itertools_count
+export const itertools_count = function* (start, step) {
+  // nargs: 0 1 2
+  // Lazy: start, start + step, start + 2 * step, ... (never exhausted)
+  let n = start === undefined ? 0 : start;
+  step = step === undefined ? 1 : step;
+  while (true) {
+    yield n;
+    n += step;
+  }
+};
+
+// ---
+
+// function: itertools_islice
+export const itertools_islice = function* (iterable, start, stop, step) {
+  // nargs: 2 3 4
+  // islice(iterable, stop) / islice(iterable, start, stop[, step]).
+  // A null stop means "until the iterable is exhausted".
+  if (arguments.length === 2) {
+    stop = start;
+    start = 0;
+  }
+  start = start == null ? 0 : start;
+  step = step == null ? 1 : step;
+  if (stop == null) stop = Infinity;
+  if (start < 0 || stop < 0 || step < 1) {
+    throw FUNCTION_PREFIXop_error("ValueError",
+      "Indices for islice() must be None or an integer: 0 <= x <= sys.maxsize.");
+  }
+
+  // Fast path: index arrays (and strings) directly
+  if (Array.isArray(iterable) || typeof iterable === "string") {
+    const end = Math.min(stop, iterable.length);
+    for (let i = start; i < end; i += step) {
+      yield iterable[i];
+    }
+    return;
+  }
+
+  // Pull from the iterator by hand: for-of would close it on early exit,
+  // while Python leaves the rest of the underlying iterator usable.
+  const it = FUNCTION_PREFIXiter(iterable);
+  let nexti = start;
+  for (let i = 0; i < stop; i++) {
+    const r = it.next();
+    if (r.done) return;
+    if (i === nexti) {
+      yield r.value;
+      nexti += step;
+    }
+  }
+};
+
+// ---
+
+// function: itertools_chain
+export const itertools_chain = function* (...iterables) {
+  // nargs: 0+
+  // Lazy concatenation of the given iterables.
+  yield* FUNCTION_PREFIXitertools_chain_from_iterable(iterables);
+};
+
+// ---
+
+// function: itertools_chain_from_iterable
+export const itertools_chain_from_iterable = function* (iterables) {
+  // nargs: 1
+  // Like chain(), but takes the iterables from a (possibly lazy) iterable.
+  const outer = FUNCTION_PREFIXiter(iterables);
+  for (let r = outer.next(); !r.done; r = outer.next()) {
+    const x = r.value;
+    if (Array.isArray(x)) {
+      // Fast path: plain index loop over arrays
+      for (let i = 0; i < x.length; i++) {
+        yield x[i];
+      }
+    } else {
+      const it = FUNCTION_PREFIXiter(x);
+      for (let s = it.next(); !s.done; s = it.next()) {
+        yield s.value;
+      }
+    }
+  }
+};
+
+// ---
+
+// function: itertools_pool
+export const itertools_pool = function (iterable) {
+  // nargs: 1
+  // Materialize an input of product() / permutations() / combinations().
+  // Arrays are used as-is, since these only read from their pools.
+  if (Array.isArray(iterable)) return iterable;
+  if (typeof iterable === "string") return iterable.split("");
+  return [...FUNCTION_PREFIXiter(iterable)];
+};
+
+// ---
+
+// function: itertools_product
+export const itertools_product = function* (repeat, ...iterables) {
+  // nargs: 1+
+  // Cartesian product, yielded lazily in odometer order.
+  // The repeat keyword argument is always passed first by the compiler.
+  repeat = repeat == null ? 1 : repeat;
+  const base = iterables.map(FUNCTION_PREFIXitertools_pool);
+  const pools = [];
+  for (let r = 0; r < repeat; r++) {
+    for (let i = 0; i < base.length; i++) pools.push(base[i]);
+  }
+  const n = pools.length;
+  for (let i = 0; i < n; i++) {
+    if (pools[i].length === 0) return;
+  }
+  const indices = new Array(n).fill(0);
+  while (true) {
+    const result = new Array(n);
+    for (let i = 0; i < n; i++) result[i] = pools[i][indices[i]];
+    yield result;
+    // Advance the rightmost index that can still move
+    let i = n - 1;
+    for (; i >= 0; i--) {
+      indices[i] += 1;
+      if (indices[i] < pools[i].length) break;
+      indices[i] = 0;
+    }
+    if (i < 0) return;
+  }
+};
+
+// ---
+
+// function: itertools_permutations
+export const itertools_permutations = function* (iterable, r) {
+  // nargs: 1 2
+  // r-length permutations, in the same order as CPython.
+  const pool = FUNCTION_PREFIXitertools_pool(iterable);
+  const n = pool.length;
+  r = r == null ? n : r;
+  if (r > n) return;
+  const indices = [];
+  for (let i = 0; i < n; i++) indices.push(i);
+  const cycles = [];
+  for (let i = n; i > n - r; i--) cycles.push(i);
+  yield indices.slice(0, r).map(function (i) { return pool[i]; });
+  while (n) {
+    let i = r - 1;
+    for (; i >= 0; i--) {
+      cycles[i] -= 1;
+      if (cycles[i] === 0) {
+        // Rotate indices[i:] left by one
+        const moved = indices[i];
+        for (let k = i; k < n - 1; k++) indices[k] = indices[k + 1];
+        indices[n - 1] = moved;
+        cycles[i] = n - i;
+      } else {
+        const j = n - cycles[i];
+        const tmp = indices[i];
+        indices[i] = indices[j];
+        indices[j] = tmp;
+        yield indices.slice(0, r).map(function (i) { return pool[i]; });
+        break;
+      }
+    }
+    if (i < 0) return;
+  }
+};
+
+// ---
+
+// function: itertools_combinations
+export const itertools_combinations = function* (iterable, r) {
+  // nargs: 2
+  // r-length combinations in lexicographic (input) order.
+  const pool = FUNCTION_PREFIXitertools_pool(iterable);
+  const n = pool.length;
+  if (r > n) return;
+  const indices = [];
+  for (let i = 0; i < r; i++) indices.push(i);
+  yield indices.map(function (i) { return pool[i]; });
+  while (true) {
+    let i = r - 1;
+    for (; i >= 0; i--) {
+      if (indices[i] !== i + n - r) break;
+    }
+    if (i < 0) return;
+    indices[i] += 1;
+    for (let j = i + 1; j < r; j++) {
+      indices[j] = indices[j - 1] + 1;
+    }
+    yield indices.map(function (i) { return pool[i]; });
+  }
+};
+
+// ---
+
+// function: itertools_accumulate
+export const itertools_accumulate = function* (iterable, func, initial) {
+  // nargs: 1 2 3
+  // Running totals (or running results of a binary function).
+  const it = FUNCTION_PREFIXiter(iterable);
+  let total = initial;
+  if (initial == null) {
+    const r = it.next();
+    if (r.done) return;
+    total = r.value;
+  }
+  yield total;
+  for (let r = it.next(); !r.done; r = it.next()) {
+    if (func) {
+      total = func(total, r.value);
+    } else if (typeof total === "number" && typeof r.value === "number") {
+      total += r.value;
+    } else {
+      total = FUNCTION_PREFIXop_add(total, r.value);
+    }
+    yield total;
+  }
+};
+
+// ---
+
+// function: itertools_groupby
+export const itertools_groupby = function* (iterable, key) {
+  // nargs: 1 2
+  // Yields [key, group] pairs for runs of consecutive equal keys. As in
+  // CPython, groups share the underlying iterator: advancing the groupby
+  // object invalidates the previous group.
+  const it = FUNCTION_PREFIXiter(iterable);
+  const keyfunc = key ? key : function (x) { return x; };
+  const sentinel = {};
+  const state = {tgtkey: sentinel, currkey: sentinel, currvalue: undefined, id: null};
+  const same = function (a, b) {
+    return a === b || (a !== sentinel && b !== sentinel && FUNCTION_PREFIXop_equals(a, b));
+  };
+  const grouper = function* (tgtkey, id) {
+    while (state.id === id && same(state.currkey, tgtkey)) {
+      yield state.currvalue;
+      const r = it.next();
+      if (r.done) return;
+      state.currvalue = r.value;
+      state.currkey = keyfunc(r.value);
+    }
+  };
+  while (true) {
+    const id = {};
+    state.id = id;
+    while (same(state.currkey, state.tgtkey)) {
+      const r = it.next();
+      if (r.done) return;
+      state.currvalue = r.value;
+      state.currkey = keyfunc(r.value);
+    }
+    state.tgtkey = state.currkey;
+    yield [state.currkey, grouper(state.tgtkey, id)];
+  }
+};
+
+// ---
+
+// function: itertools_takewhile
+export const itertools_takewhile = function* (predicate, iterable) {
+  // nargs: 2
+  // Yield items while predicate(item) is true.
+  if (Array.isArray(iterable)) {
+    for (let i = 0; i < iterable.length; i++) {
+      if (!FUNCTION_PREFIXtruthy(predicate(iterable[i]))) return;
+      yield iterable[i];
+    }
+    return;
+  }
+  const it = FUNCTION_PREFIXiter(iterable);
+  for (let r = it.next(); !r.done; r = it.next()) {
+    if (!FUNCTION_PREFIXtruthy(predicate(r.value))) return;
+    yield r.value;
+  }
+};
+
+// ---
+
+// function: functools_cache_key
+export const functools_cache_key = function (self, args) {
+  // nargs: 2
+  // Hashed cache key for memoized calls that don't take the fast path.
+  // Values are encoded with type tags and length prefixes so distinct
+  // argument tuples never collide; objects are keyed by identity.
+  // Keys start with "\u0001", which single-string fast-path keys never do.
+  const part = function (x) {
+    switch (typeof x) {
+      case "number":
+        return "n" + x + ";";
+      case "boolean":
+        return "n" + (x ? 1 : 0) + ";";  // True == 1, as in Python
+      case "string":
+        return "s" + x.length + ":" + x;
+      case "undefined":
+        return "u;";
+      case "function":
+        return "o" + FUNCTION_PREFIXid(x) + ";";
+    }
+    if (x === null) return "N;";
+    if (Array.isArray(x)) {
+      if (x._is_list) {
+        throw FUNCTION_PREFIXop_error("TypeError", "unhashable type: 'list'");
+      }
+      let res = "t" + x.length + "(";
+      for (let i = 0; i < x.length; i++) res += part(x[i]);
+      return res + ")";
+    }
+    if (x.constructor === Object) {
+      throw FUNCTION_PREFIXop_error("TypeError", "unhashable type: 'dict'");
+    }
+    if (x instanceof Set) {
+      throw FUNCTION_PREFIXop_error("TypeError", "unhashable type: 'set'");
+    }
+    return "o" + FUNCTION_PREFIXid(x) + ";";
+  };
+  let key = "\u0001" + (self === undefined ? "" : part(self)) + "|";
+  for (let i = 0; i < args.length; i++) key += part(args[i]);
+  return key;
+};
+
+// ---
+
+// function: functools_memoize
+export const functools_memoize = function (func, maxsize) {
+  // nargs: 2
+  // Wrap func with a Map-based cache (maxsize null = unbounded).
+  // Map iteration order doubles as recency order: a hit on a bounded cache
+  // moves its entry to the end (delete + set) and eviction drops the first
+  // key, both O(1). A single number/string/bool argument is used as the key
+  // directly, without building a hashed key.
+  if (maxsize !== null && maxsize < 0) maxsize = 0;
+  const bounded = maxsize !== null;
+  const cache = new Map();
+  let hits = 0, misses = 0;
+
+  const wrapper = function () {
+    // Methods are keyed on their instance too (like self in Python)
+    const self = (this === undefined || this === null || this === globalThis) ? undefined : this;
+    let key;
+    if (arguments.length === 1 && self === undefined) {
+      key = arguments[0];
+      const t = typeof key;
+      if (t === "boolean") {
+        key = key ? 1 : 0;
+      } else if (!(t === "number" || (t === "string" && key.charCodeAt(0) !== 1))) {
+        key = FUNCTION_PREFIXfunctools_cache_key(self, arguments);
+      }
+    } else {
+      key = FUNCTION_PREFIXfunctools_cache_key(self, arguments);
+    }
+
+    let value = cache.get(key);
+    if (value !== undefined || cache.has(key)) {
+      hits += 1;
+      if (bounded) {
+        cache.delete(key);
+        cache.set(key, value);
+      }
+      return value;
+    }
+    misses += 1;
+    value = func.apply(this, arguments);
+    if (maxsize !== 0) {
+      cache.set(key, value);
+      if (bounded && cache.size > maxsize) {
+        cache.delete(cache.keys().next().value);
+      }
+    }
+    return value;
+  };
+
+  wrapper.cache_info = function () {
+    // CacheInfo(hits, misses, maxsize, currsize) named tuple
+    const info = [hits, misses, maxsize, cache.size];
+    info.hits = info[0];
+    info.misses = info[1];
+    info.maxsize = info[2];
+    info.currsize = info[3];
+    info.__repr__ = info.__str__ = function () {
+      return "CacheInfo(hits=" + info.hits + ", misses=" + info.misses +
+        ", maxsize=" + FUNCTION_PREFIXrepr(info.maxsize) + ", currsize=" + info.currsize + ")";
+    };
+    return info;
+  };
+  wrapper.cache_clear = function () {
+    cache.clear();
+    hits = misses = 0;
+    return null;
+  };
+  wrapper.__wrapped__ = func;
+  if (func.__args__ !== undefined) wrapper.__args__ = func.__args__;
+  return wrapper;
+};
+
+// ---
+
+// function: functools_cache
+export const functools_cache = function (func) {
+  // nargs: 1
+  // @functools.cache: unbounded memoization
+  return FUNCTION_PREFIXfunctools_memoize(func, null);
+};
+
+// ---
+
+// function: functools_lru_cache
+export const functools_lru_cache = function (maxsize, typed) {
+  // nargs: 0 1 2
+  // @lru_cache(maxsize=128) returns a decorator; bare @lru_cache decorates directly.
+  // The typed flag is accepted but ignored (numbers are a single JS type).
+  if (typeof maxsize === "function") {
+    return FUNCTION_PREFIXfunctools_memoize(maxsize, 128);
+  }
+  if (maxsize === undefined) maxsize = 128;
+  return function (func) {
+    return FUNCTION_PREFIXfunctools_memoize(func, maxsize);
+  };
+};
+
+// ---
+
+// function: collections_init
+export const collections_init = function (obj, props, init) {
+  // nargs: 3
+  // Counter, defaultdict and OrderedDict are plain objects, so the dict
+  // methods, len() and iteration work unchanged; their Python behaviour
+  // (__missing__, __getitem__, __repr__, ...) is attached as non-enumerable
+  // properties. init is an optional mapping or iterable of pairs.
+  const names = Object.keys(props);
+  for (let i = 0; i < names.length; i++) {
+    Object.defineProperty(obj, names[i], {value: props[names[i]], writable: true});
+  }
+  if (init === undefined || init === null) return obj;
+  if (init.constructor === Object) {
+    const keys = Object.keys(init);
+    for (let i = 0; i < keys.length; i++) {
+      obj[keys[i]] = init[keys[i]];
+    }
+  } else {
+    for (const [key, value] of init) {
+      obj[key] = value;
+    }
+  }
+  return obj;
+};
+
+// ---
+
+// function: collections_count
+export const collections_count = function (counter, iterable, sign) {
+  // nargs: 3
+  // Add (sign 1) or subtract (sign -1) the counts of an iterable or mapping
+  if (iterable === undefined || iterable === null) return counter;
+  let key, cur;
+  if (Array.isArray(iterable)) {
+    for (let i = 0; i < iterable.length; i++) {
+      key = iterable[i];
+      cur = counter[key];
+      counter[key] = (typeof cur === "number" ? cur : 0) + sign;
+    }
+  } else if (iterable.constructor === Object) {
+    const keys = Object.keys(iterable);
+    for (let i = 0; i < keys.length; i++) {
+      key = keys[i];
+      cur = counter[key];
+      counter[key] = (typeof cur === "number" ? cur : 0) + sign * iterable[key];
+    }
+  } else {
+    for (key of iterable) {
+      cur = counter[key];
+      counter[key] = (typeof cur === "number" ? cur : 0) + sign;
+    }
+  }
+  return counter;
+};
+
+// ---
+
+// function: collections_counter_combine
+export const collections_counter_combine = function (a, b, op, symbol) {
+  // nargs: 4
+  // Counter arithmetic: combine counts key by key (missing counts are 0)
+  // and keep only the positive results, like CPython.
+  if (b === null || typeof b !== "object" || !b._is_counter) {
+    throw FUNCTION_PREFIXop_error("TypeError", "unsupported operand type(s) for " + symbol + ": 'Counter' and " + FUNCTION_PREFIXrepr(b));
+  }
+  const res = FUNCTION_PREFIXcollections_Counter();
+  const keys = Object.keys(a).concat(Object.keys(b).filter((key) => a[key] === undefined));
+  for (let i = 0; i < keys.length; i++) {
+    const key = keys[i];
+    const count = op(a[key] === undefined ? 0 : a[key], b[key] === undefined ? 0 : b[key]);
+    if (count > 0) res[key] = count;
+  }
+  return res;
+};
+
+// ---
+
+// function: collections_counter_props
+export const collections_counter_props = {
+  _is_counter: true,
+  __missing__: function (key) {
+    return 0;
+  },
+  __getitem__: function (key) {
+    const value = this[key];
+    return value === undefined ? 0 : value;
+  },
+  __repr__: function () {
+    const entries = METHOD_PREFIXmost_common(this);
+    if (entries.length === 0) return "Counter()";
+    const parts = entries.map(([key, value]) => FUNCTION_PREFIXrepr(key) + ": " + FUNCTION_PREFIXrepr(value));
+    return "Counter({" + parts.join(", ") + "})";
+  },
+  __str__: function () {
+    return this.__repr__();
+  },
+  __add__: function (other) {
+    return FUNCTION_PREFIXcollections_counter_combine(this, other, (x, y) => x + y, "+");
+  },
+  __sub__: function (other) {
+    return FUNCTION_PREFIXcollections_counter_combine(this, other, (x, y) => x - y, "-");
+  },
+  __or__: function (other) {
+    return FUNCTION_PREFIXcollections_counter_combine(this, other, Math.max, "|");
+  },
+  __and__: function (other) {
+    return FUNCTION_PREFIXcollections_counter_combine(this, other, Math.min, "&");
+  },
+};
+
+// ---
+
+// function: collections_Counter
+export const collections_Counter = function (iterable, kwds) {
+  // nargs: 0 1 2
+  // Counter(iterable_or_mapping, **kwds): a dict of counts; missing keys
+  // count 0. Keyword counts are passed as a mapping.
+  const res = FUNCTION_PREFIXcollections_init({}, FUNCTION_PREFIXcollections_counter_props, null);
+  FUNCTION_PREFIXcollections_count(res, iterable, 1);
+  return FUNCTION_PREFIXcollections_count(res, kwds, 1);
+};
+
+// ---
+
+// function: collections_call_factory
+export const collections_call_factory = function (factory) {
+  // nargs: 1
+  // default_factory(): builtin types compile to JS constructors, which
+  // don't all produce Python values when called as plain functions.
+  switch (factory) {
+    case Array: {
+      const res = [];
+      res._is_list = true;
+      return res;
+    }
+    case Set:
+      return new Set();
+    case Object:
+      return {};
+    default:
+      return factory();
+  }
+};
+
+// ---
+
+// function: collections_defaultdict_props
+export const collections_defaultdict_props = {
+  __missing__: function (key) {
+    if (this.default_factory === null) {
+      throw FUNCTION_PREFIXop_error("KeyError", FUNCTION_PREFIXrepr(key));
+    }
+    const value = FUNCTION_PREFIXcollections_call_factory(this.default_factory);
+    this[key] = value;
+    return value;
+  },
+  __getitem__: function (key) {
+    const value = this[key];
+    return value === undefined ? this.__missing__(key) : value;
+  },
+  __repr__: function () {
+    const factory = this.default_factory;
+    const names = new Map([[Array, "list"], [Number, "int"], [String, "str"], [Boolean, "bool"], [Set, "set"], [Object, "dict"]]);
+    let factory_repr;
+    if (factory === null) {
+      factory_repr = "None";
+    } else if (names.has(factory)) {
+      factory_repr = "<class '" + names.get(factory) + "'>";
+    } else {
+      factory_repr = "<function " + (factory.name || "<lambda>") + ">";
+    }
+    return "defaultdict(" + factory_repr + ", " + FUNCTION_PREFIXrepr(Object.assign({}, this)) + ")";
+  },
+  __str__: function () {
+    return this.__repr__();
+  },
+};
+
+// ---
+
+// function: collections_defaultdict
+export const collections_defaultdict = function (default_factory, init) {
+  // nargs: 0 1 2
+  // defaultdict(default_factory, init): missing keys are created on access
+  const res = {};
+  Object.defineProperty(res, "default_factory", {
+    value: default_factory === undefined ? null : default_factory,
+    writable: true,
+  });
+  return FUNCTION_PREFIXcollections_init(res, FUNCTION_PREFIXcollections_defaultdict_props, init);
+};
+
+// ---
+
+// function: collections_ordereddict_props
+export const collections_ordereddict_props = {
+  __repr__: function () {
+    if (Object.keys(this).length === 0) return "OrderedDict()";
+    return "OrderedDict(" + FUNCTION_PREFIXrepr(Object.assign({}, this)) + ")";
+  },
+  __str__: function () {
+    return this.__repr__();
+  },
+};
+
+// ---
+
+// function: collections_OrderedDict
+export const collections_OrderedDict = function (init) {
+  // nargs: 0 1
+  // Plain dicts already keep insertion order; this adds move_to_end()
+  // (a dict method here) and the OrderedDict repr.
+  return FUNCTION_PREFIXcollections_init({}, FUNCTION_PREFIXcollections_ordereddict_props, init);
+};
+
+// ---
+
+// function: re_translate
+export const re_translate = function (pattern, flags) {
+  // nargs: 2
+  // Translate a Python regular expression to a JS RegExp source and flags.
+  // Handles leading inline flags, (?P<name>...), (?P=name), (?#...),
+  // \A, \Z, Python's "$" (also matches before a trailing newline), {,n}
+  // and re.VERBOSE. Must stay in sync with codegen/stdlib_py/regex.py.
+  const inline = /^\(\?([aiLmsux]+)\)/.exec(pattern);
+  if (inline) {
+    const bits = {a: 256, i: 2, L: 4, m: 8, s: 16, u: 32, x: 64};
+    for (const c of inline[1]) flags |= bits[c];
+    pattern = pattern.slice(inline[0].length);
+  }
+  const verbose = (flags & 64) !== 0;
+  const multiline = (flags & 8) !== 0;
+  const n = pattern.length;
+  let res = "", in_class = false, i = 0;
+  while (i < n) {
+    const c = pattern[i];
+    if (c === "\\") {
+      const next = pattern[i + 1];
+      if (!in_class && next === "A") {
+        res += "(?<![\\s\\S])";
+      } else if (!in_class && next === "Z") {
+        res += "(?![\\s\\S])";
+      } else {
+        res += pattern.slice(i, i + 2);
+      }
+      i += 2;
+    } else if (in_class) {
+      if (c === "]") in_class = false;
+      res += c;
+      i += 1;
+    } else if (c === "[") {
+      in_class = true;
+      res += c;
+      i += 1;
+      if (pattern[i] === "^") {
+        res += "^";
+        i += 1;
+      }
+      if (pattern[i] === "]") {
+        // A leading "]" is a literal in Python, an empty class in JS
+        res += "\\]";
+        i += 1;
+      }
+    } else if (pattern.startsWith("(?P<", i)) {
+      res += "(?<";
+      i += 4;
+    } else if (pattern.startsWith("(?P=", i)) {
+      const j = pattern.indexOf(")", i);
+      res += "\\k<" + pattern.slice(i + 4, j) + ">";
+      i = j + 1;
+    } else if (pattern.startsWith("(?#", i)) {
+      i = pattern.indexOf(")", i) + 1;
+    } else if (c === "$" && !multiline) {
+      res += "(?=\\n?(?![\\s\\S]))";
+      i += 1;
+    } else if (c === "{" && /^\{,\d+\}/.test(pattern.slice(i))) {
+      res += "{0,";
+      i += 2;
+    } else if (verbose && /\s/.test(c)) {
+      i += 1;
+    } else if (verbose && c === "#") {
+      const j = pattern.indexOf("\n", i);
+      i = j < 0 ? n : j + 1;
+    } else {
+      res += c;
+      i += 1;
+    }
+  }
+  if (!(flags & 256)) flags |= 32;  // re.UNICODE is implied for str patterns
+  let js_flags = "g";
+  if (flags & 2) js_flags += "i";
+  if (multiline) js_flags += "m";
+  if (flags & 16) js_flags += "s";
+  return [res, js_flags, flags];
+};
+
+// ---
+
+// function: re_Match
+export const re_Match = (function () {
+  // Python re.Match on top of a RegExp exec() result
+  function Match(re, m, string, pos, endpos) {
+    this.re = re;
+    this.string = string;
+    this.pos = pos;
+    this.endpos = endpos;
+    this._m = m;
+    this._indices = null;
+  }
+  Match.prototype._group = function (g) {
+    let value;
+    if (typeof g === "number") {
+      if (g < 0 || g >= this._m.length) {
+        throw FUNCTION_PREFIXop_error("IndexError", "no such group");
+      }
+      value = this._m[g];
+    } else {
+      if (!this._m.groups || !(g in this._m.groups)) {
+        throw FUNCTION_PREFIXop_error("IndexError", "no such group");
+      }
+      value = this._m.groups[g];
+    }
+    return value === undefined ? null : value;
+  };
+  Match.prototype.group = function (...groups) {
+    if (groups.length === 0) return this._m[0];
+    if (groups.length === 1) return this._group(groups[0]);
+    return groups.map((g) => this._group(g));
+  };
+  Match.prototype.__getitem__ = function (g) {
+    return this._group(g);
+  };
+  Match.prototype.groups = function (dflt) {
+    if (dflt === undefined) dflt = null;
+    return this._m.slice(1).map((value) => (value === undefined ? dflt : value));
+  };
+  Match.prototype.groupdict = function (dflt) {
+    if (dflt === undefined) dflt = null;
+    const res = {};
+    const groups = this._m.groups || {};
+    for (const name of Object.keys(groups)) {
+      res[name] = groups[name] === undefined ? dflt : groups[name];
+    }
+    return res;
+  };
+  Match.prototype.span = function (g) {
+    if (g === undefined || g === 0) {
+      return [this._m.index, this._m.index + this._m[0].length];
+    }
+    this._group(g);  // Validates the group
+    if (this._indices === null) {
+      // Group offsets are only computed on demand: re-run the match with
+      // the "d" flag at the same position.
+      let regex = null;
+      try {
+        regex = this.re._variant("_indices_regex", "", "", "dy");
+      } catch (e) {
+        // Engine without "d" flag support: locate groups inside the match
+      }
+      if (regex !== null) {
+        regex.lastIndex = this._m.index;
+        this._indices = regex.exec(this.string.slice(0, this.endpos)).indices;
+      } else {
+        const m = this._m;
+        const locate = (value) => {
+          if (value === undefined) return undefined;
+          const start = m.index + m[0].indexOf(value);
+          return [start, start + value.length];
+        };
+        this._indices = m.map(locate);
+        this._indices.groups = {};
+        for (const name of Object.keys(m.groups || {})) {
+          this._indices.groups[name] = locate(m.groups[name]);
+        }
+      }
+    }
+    const span = typeof g === "number" ? this._indices[g] : this._indices.groups[g];
+    return span === undefined ? [-1, -1] : [span[0], span[1]];
+  };
+  Match.prototype.start = function (g) {
+    return this.span(g)[0];
+  };
+  Match.prototype.end = function (g) {
+    return this.span(g)[1];
+  };
+  Match.prototype.expand = function (template) {
+    return FUNCTION_PREFIXre_expand(this, template);
+  };
+  Match.prototype.__repr__ = function () {
+    const span = this.span();
+    return "<re.Match object; span=(" + span[0] + ", " + span[1] + "), match=" + FUNCTION_PREFIXrepr(this._m[0]) + ">";
+  };
+  Match.prototype.__str__ = Match.prototype.__repr__;
+  return Match;
+})();
+
+// ---
+
+// function: re_expand
+export const re_expand = function (match, template) {
+  // nargs: 2
+  // Expand a sub() replacement template: \1, \g<1>, \g<name> and escapes
+  if (template.indexOf("\\") < 0) return template;
+  const escapes = {n: "\n", t: "\t", r: "\r", f: "\f", v: "\v", a: "\x07", b: "\b", "\\": "\\"};
+  let res = "", i = 0;
+  while (i < template.length) {
+    const c = template[i];
+    if (c !== "\\") {
+      res += c;
+      i += 1;
+      continue;
+    }
+    const next = template[i + 1];
+    let m;
+    if (next === "g" && (m = /^<([^>]*)>/.exec(template.slice(i + 2)))) {
+      const g = /^\d+$/.test(m[1]) ? Number(m[1]) : m[1];
+      res += match._group(g) || "";
+      i += 2 + m[0].length;
+    } else if ((m = /^\d\d?/.exec(template.slice(i + 1)))) {
+      res += match._group(Number(m[0])) || "";
+      i += 1 + m[0].length;
+    } else if (next in escapes) {
+      res += escapes[next];
+      i += 2;
+    } else {
+      res += c + (next === undefined ? "" : next);
+      i += 2;
+    }
+  }
+  return res;
+};
+
+// ---
+
+// function: re_Pattern
+export const re_Pattern = (function () {
+  // Python re.Pattern. _regex is the translated RegExp with the "g" flag;
+  // the sticky variants used by match() and fullmatch() are derived on
+  // first use.
+  function Pattern(regex, pattern, flags) {
+    this.pattern = pattern;
+    this.flags = flags;
+    this._regex = regex;
+  }
+  Pattern.prototype._variant = function (name, prefix, suffix, extra_flags) {
+    let regex = this[name];
+    if (regex === undefined) {
+      const flags = this._regex.flags.replace("g", "") + extra_flags;
+      regex = this[name] = new RegExp(prefix + this._regex.source + suffix, flags);
+    }
+    return regex;
+  };
+  Pattern.prototype._exec = function (regex, string, pos, endpos) {
+    pos = pos === undefined ? 0 : pos;
+    const target = endpos !== undefined && endpos < string.length ? string.slice(0, endpos) : string;
+    regex.lastIndex = pos;
+    const m = regex.exec(target);
+    return m === null ? null : new FUNCTION_PREFIXre_Match(this, m, string, pos, target.length);
+  };
+  Pattern.prototype.search = function (string, pos, endpos) {
+    return this._exec(this._regex, string, pos, endpos);
+  };
+  Pattern.prototype.match = function (string, pos, endpos) {
+    return this._exec(this._variant("_sticky_regex", "", "", "y"), string, pos, endpos);
+  };
+  Pattern.prototype.fullmatch = function (string, pos, endpos) {
+    const regex = this._variant("_full_regex", "(?:", ")(?![\\s\\S])", "y");
+    return this._exec(regex, string, pos, endpos);
+  };
+  Pattern.prototype.finditer = function* (string, pos, endpos) {
+    if (endpos !== undefined && endpos < string.length) {
+      string = string.slice(0, endpos);
+    }
+    const regex = this._regex;
+    let last = pos === undefined ? 0 : pos;
+    while (last <= string.length) {
+      regex.lastIndex = last;
+      const m = regex.exec(string);
+      if (m === null) break;
+      // Step past empty matches so the scan always advances
+      last = m[0].length === 0 ? regex.lastIndex + 1 : regex.lastIndex;
+      yield new FUNCTION_PREFIXre_Match(this, m, string, pos === undefined ? 0 : pos, string.length);
+    }
+  };
+  Pattern.prototype.findall = function (string, pos, endpos) {
+    if (endpos !== undefined && endpos < string.length) {
+      string = string.slice(0, endpos);
+    }
+    const regex = this._regex;
+    const res = [];
+    res._is_list = true;
+    regex.lastIndex = pos === undefined ? 0 : pos;
+    let m;
+    while ((m = regex.exec(string)) !== null) {
+      if (m[0].length === 0) regex.lastIndex += 1;
+      if (m.length === 1) {
+        res.push(m[0]);
+      } else if (m.length === 2) {
+        res.push(m[1] === undefined ? "" : m[1]);
+      } else {
+        res.push(m.slice(1).map((value) => (value === undefined ? "" : value)));
+      }
+      if (regex.lastIndex > string.length) break;
+    }
+    return res;
+  };
+  Pattern.prototype.subn = function (repl, string, count) {
+    const regex = this._regex;
+    let res = "", last = 0, n = 0, m;
+    regex.lastIndex = 0;
+    while ((!count || n < count) && (m = regex.exec(string)) !== null) {
+      if (m[0].length === 0) regex.lastIndex += 1;
+      const match = new FUNCTION_PREFIXre_Match(this, m, string, 0, string.length);
+      res += string.slice(last, m.index);
+      res += typeof repl === "function" ? repl(match) : FUNCTION_PREFIXre_expand(match, repl);
+      last = m.index + m[0].length;
+      n += 1;
+      if (regex.lastIndex > string.length) break;
+    }
+    return [res + string.slice(last), n];
+  };
+  Pattern.prototype.sub = function (repl, string, count) {
+    return this.subn(repl, string, count)[0];
+  };
+  Pattern.prototype.split = function (string, maxsplit) {
+    const regex = this._regex;
+    const res = [];
+    res._is_list = true;
+    let last = 0, n = 0, m;
+    regex.lastIndex = 0;
+    while ((!maxsplit || n < maxsplit) && (m = regex.exec(string)) !== null) {
+      if (m[0].length === 0) regex.lastIndex += 1;
+      res.push(string.slice(last, m.index));
+      for (let i = 1; i < m.length; i++) {
+        res.push(m[i] === undefined ? null : m[i]);
+      }
+      last = m.index + m[0].length;
+      n += 1;
+      if (regex.lastIndex > string.length) break;
+    }
+    res.push(string.slice(last));
+    return res;
+  };
+  Object.defineProperty(Pattern.prototype, "groups", {
+    get: function () {
+      return new RegExp(this._regex.source + "|").exec("").length - 1;
+    },
+  });
+  Object.defineProperty(Pattern.prototype, "groupindex", {
+    get: function () {
+      // Number the capturing groups of the translated source
+      const source = this._regex.source, res = {};
+      let number = 0, in_class = false;
+      for (let i = 0; i < source.length; i++) {
+        const c = source[i];
+        if (c === "\\") {
+          i += 1;
+        } else if (in_class) {
+          if (c === "]") in_class = false;
+        } else if (c === "[") {
+          in_class = true;
+        } else if (c === "(" && source[i + 1] !== "?") {
+          number += 1;
+        } else if (c === "(" && source[i + 2] === "<" && source[i + 3] !== "=" && source[i + 3] !== "!") {
+          number += 1;
+          res[source.slice(i + 3, source.indexOf(">", i))] = number;
+        }
+      }
+      return res;
+    },
+  });
+  Pattern.prototype.__repr__ = function () {
+    return "re.compile(" + FUNCTION_PREFIXrepr(this.pattern) + ")";
+  };
+  Pattern.prototype.__str__ = Pattern.prototype.__repr__;
+  return Pattern;
+})();
+
+// ---
+
+// function: re_cache
+// Compiled patterns by flags and source, most recently used last
+export const re_cache = new Map();
+
+// ---
+
+// function: re_compile
+export const re_compile = function (pattern, flags) {
+  // nargs: 1 2
+  // Compile through an LRU cache of 512 patterns, like CPython's re module
+  if (pattern instanceof FUNCTION_PREFIXre_Pattern) return pattern;
+  flags = flags === undefined ? 0 : flags;
+  const key = flags + ":" + pattern;
+  const cache = FUNCTION_PREFIXre_cache;
+  let compiled = cache.get(key);
+  if (compiled !== undefined) {
+    cache.delete(key);
+    cache.set(key, compiled);
+    return compiled;
+  }
+  const [source, js_flags, py_flags] = FUNCTION_PREFIXre_translate(pattern, flags);
+  compiled = new FUNCTION_PREFIXre_Pattern(new RegExp(source, js_flags), pattern, py_flags);
+  if (cache.size >= 512) {
+    cache.delete(cache.keys().next().value);
+  }
+  cache.set(key, compiled);
+  return compiled;
+};
+
+// ---
+
+// function: re_search
+export const re_search = function (pattern, string, flags) {
+  // nargs: 2 3
+  return FUNCTION_PREFIXre_compile(pattern, flags).search(string);
+};
+
+// ---
+
+// function: re_match
+export const re_match = function (pattern, string, flags) {
+  // nargs: 2 3
+  return FUNCTION_PREFIXre_compile(pattern, flags).match(string);
+};
+
+// ---
+
+// function: re_fullmatch
+export const re_fullmatch = function (pattern, string, flags) {
+  // nargs: 2 3
+  return FUNCTION_PREFIXre_compile(pattern, flags).fullmatch(string);
+};
+
+// ---
+
+// function: re_findall
+export const re_findall = function (pattern, string, flags) {
+  // nargs: 2 3
+  return FUNCTION_PREFIXre_compile(pattern, flags).findall(string);
+};
+
+// ---
+
+// function: re_finditer
+export const re_finditer = function (pattern, string, flags) {
+  // nargs: 2 3
+  return FUNCTION_PREFIXre_compile(pattern, flags).finditer(string);
+};
+
+// ---
+
+// function: re_sub
+export const re_sub = function (pattern, repl, string, count, flags) {
+  // nargs: 3 4 5
+  return FUNCTION_PREFIXre_compile(pattern, flags).sub(repl, string, count);
+};
+
+// ---
+
+// function: re_subn
+export const re_subn = function (pattern, repl, string, count, flags) {
+  // nargs: 3 4 5
+  return FUNCTION_PREFIXre_compile(pattern, flags).subn(repl, string, count);
+};
+
+// ---
+
+// function: re_split
+export const re_split = function (pattern, string, maxsplit, flags) {
+  // nargs: 2 3 4
+  return FUNCTION_PREFIXre_compile(pattern, flags).split(string, maxsplit);
+};
+
+// ---
+
+// function: re_escape
+export const re_escape = function (pattern) {
+  // nargs: 1
+  // Backslash the characters that are special in patterns, like CPython
+  return pattern.replace(/[()[\]{}?*+\-|^$\\.&~# \t\n\r\v\f]/g, "\\$&");
+};
+
+// ---
+
+// function: re_purge
+export const re_purge = function () {
+  // nargs: 0
+  FUNCTION_PREFIXre_cache.clear();
+  return null;
+};
+
+// ---
+
+// function: re_IGNORECASE
+export const re_IGNORECASE = 2;
+
+// ---
+
+// function: re_MULTILINE
+export const re_MULTILINE = 8;
+
+// ---
+
+// function: re_DOTALL
+export const re_DOTALL = 16;
+
+// ---
+
+// function: re_UNICODE
+export const re_UNICODE = 32;
+
+// ---
+
+// function: re_VERBOSE
+export const re_VERBOSE = 64;
+
+// ---
+
+// function: re_ASCII
+export const re_ASCII = 256;
+
+// ---
+
+// function: pgo_sites
+export const pgo_sites = (function () {
+  // Observed types at the sites of instrumented code (py2js --instrument),
+  // shared by all modules: {site: {"type,type": count}}. Under Node, the
+  // profile is written on exit to $PRESCRYPT_PROFILE (default
+  // prescrypt-profile.json); elsewhere, read globalThis.__prescrypt_profile.
+  let profile = globalThis.__prescrypt_profile;
+  if (profile !== undefined) return profile.sites;
+  profile = globalThis.__prescrypt_profile = {version: 1, sites: {}};
+  if (typeof process !== "undefined" && typeof process.on === "function") {
+    process.on("exit", function () {
+      const fs = process.getBuiltinModule ? process.getBuiltinModule("fs") : require("fs");
+      const path = process.env.PRESCRYPT_PROFILE || "prescrypt-profile.json";
+      fs.writeFileSync(path, JSON.stringify(profile, null, 1) + "\n");
+    });
+  }
+  return profile.sites;
+})();
+
+// ---
+
+// function: pgo_type
+export const pgo_type = function (x) {
+  // nargs: 1
+  // Type tag of a value in profiles: none, list, dict, object or its typeof
+  if (x === null || x === undefined) return "none";
+  if (Array.isArray(x)) return "list";
+  const t = typeof x;
+  if (t === "object") return x.constructor === Object ? "dict" : "object";
+  return t;
+};
+
+// ---
+
+// function: pgo_record
+export const pgo_record = function (site, values) {
+  // nargs: 2
+  const types = values.map(FUNCTION_PREFIXpgo_type).join(",");
+  const counts = FUNCTION_PREFIXpgo_sites[site] || (FUNCTION_PREFIXpgo_sites[site] = {});
+  counts[types] = (counts[types] || 0) + 1;
+};
+
+// ---
+
+// function: pgo_call
+export const pgo_call = function (site, func, a, b) {
+  // nargs: 4
+  // Instrumented operator helper call: func is op_add, op_getitem...
+  FUNCTION_PREFIXpgo_record(site, [a, b]);
+  return func(a, b);
+};
+
+// ---
+
+// function: pgo_method
+export const pgo_method = function (site, method, obj) {
+  // nargs: 3+
+  // Instrumented stdlib method call: method.call(obj, ...args)
+  FUNCTION_PREFIXpgo_record(site, [obj]);
+  return method.apply(obj, Array.prototype.slice.call(arguments, 3));
+};
@@ -312,17 +312,27 @@ export const setdefault = function (key, d) {
 // ---
 
 // method: update
-export const update = function (other) {
-  // nargs: 1
+export const update = function (other, kwds) {
+  // nargs: 1 2
+  // Keyword arguments are passed as a mapping (kwds)
   if (typeof this.KEY === 'function' && this.constructor !== Object) {
     return this.KEY.apply(this, arguments);
   }
+  // Counter.update() adds counts instead of replacing them
+  if (this._is_counter) {
+    FUNCTION_PREFIXcollections_count(this, other, 1);
+    FUNCTION_PREFIXcollections_count(this, kwds, 1);
+    return null;
+  }
   // Python dict-like behavior
-  let key,
-    keys = Object.keys(other);
-  for (let i = 0; i < keys.length; i++) {
-    key = keys[i];
-    this[key] = other[key];
+  for (const mapping of [other, kwds]) {
+    if (mapping === undefined) continue;
+    let key,
+      keys = Object.keys(mapping);
+    for (let i = 0; i < keys.length; i++) {
+      key = keys[i];
+      this[key] = mapping[key];
+    }
   }
   return null;
 };
@@ -348,6 +358,107 @@ export const values = function () {
 
 // ---
 
+// method: most_common
+export const most_common = function (n) {
+  // nargs: 0 1
+  if (typeof this.KEY === 'function' && this.constructor !== Object) {
+    return this.KEY.apply(this, arguments);
+  }
+  // Counter: (elem, count) pairs, highest counts first, ties in insertion
+  // order. most_common(n) keeps a bounded heap of n entries instead of
+  // sorting all of them.
+  const entries = Object.entries(this);
+  if (n === undefined || n === null) {
+    entries.sort((a, b) => b[1] - a[1]);
+    entries._is_list = true;
+    return entries;
+  }
+  return FUNCTION_PREFIXheapq_select(n, entries, (entry) => entry[1], -1);
+};
+
+// ---
+
+// method: elements
+export const elements = function () {
+  // nargs: 0
+  if (typeof this.KEY === 'function' && this.constructor !== Object) {
+    return this.KEY.apply(this, arguments);
+  }
+  // Counter: each element repeated as many times as its count
+  let keys = Object.keys(this),
+    res = [];
+  res._is_list = true;
+  for (let i = 0; i < keys.length; i++) {
+    for (let j = 0; j < this[keys[i]]; j++) {
+      res.push(keys[i]);
+    }
+  }
+  return res;
+};
+
+// ---
+
+// method: subtract
+export const subtract = function (other, kwds) {
+  // nargs: 1 2
+  if (typeof this.KEY === 'function' && this.constructor !== Object) {
+    return this.KEY.apply(this, arguments);
+  }
+  // Counter: counts may go to zero or below
+  FUNCTION_PREFIXcollections_count(this, other, -1);
+  FUNCTION_PREFIXcollections_count(this, kwds, -1);
+  return null;
+};
+
+// ---
+
+// method: total
+export const total = function () {
+  // nargs: 0
+  if (typeof this.KEY === 'function' && this.constructor !== Object) {
+    return this.KEY.apply(this, arguments);
+  }
+  // Counter: sum of the counts
+  let keys = Object.keys(this),
+    res = 0;
+  for (let i = 0; i < keys.length; i++) {
+    res += this[keys[i]];
+  }
+  return res;
+};
+
+// ---
+
+// method: move_to_end
+export const move_to_end = function (key, last) {
+  // nargs: 1 2
+  if (typeof this.KEY === 'function' && this.constructor !== Object) {
+    return this.KEY.apply(this, arguments);
+  }
+  // OrderedDict: re-insert key at the end, or at the front if last is false
+  let value = this[key];
+  if (value === undefined) {
+    throw FUNCTION_PREFIXop_error("KeyError", FUNCTION_PREFIXrepr(key));
+  }
+  delete this[key];
+  if (last === undefined || last) {
+    this[key] = value;
+    return null;
+  }
+  let keys = Object.keys(this),
+    values = keys.map((k) => this[k]);
+  for (let i = 0; i < keys.length; i++) {
+    delete this[keys[i]];
+  }
+  this[key] = value;
+  for (let i = 0; i < keys.length; i++) {
+    this[keys[i]] = values[i];
+  }
+  return null;
+};
+
+// ---
+
 // method: repeat
 export const repeat = function (count) {
   // nargs: 0
@@ -33,7 +33,8 @@ FUNC_CALLS = [
     ("a.b(1, a=2, b=3)", "a.b({flx_args: [1], flx_kwargs: {a: 2, b: 3}})"),
     ("a.b(*t, **kw)", "a.b({flx_args: t, flx_kwargs: kw})"),
     # Calls to builtin methods (JS)
-    ("'a'.lower()", "_pymeth_lower.call('a')"),
+    ("'a'.lower()", "'a'.toLowerCase()"),
+    ("x.lower()", "_pymeth_lower.call(x)"),
     # Calls to builtin methods (PY)
     # FIXME: ("[1,2,3].sort()", "_pymeth_sort.call([1, 2, 3])"),
     # FIXME: ("'{a}'.format(a=1)", "_pymeth_format.call('{a}', {a: 1})"),
@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import pytest
 
+from prescrypt.codegen import CodeGen
+from prescrypt.codegen.utils import flatten
+from prescrypt.front import ast
+from prescrypt.front.passes.desugar import desugar
+
 from .utils import check_gen
 
 CONSTRUCTORS = [
@@ -22,3 +27,45 @@ CONSTRUCTORS = [
 @pytest.mark.parametrize(("code", "expected"), CONSTRUCTORS)
 def test_constructors(code, expected):
     check_gen(code, expected)
+
+
+JSON_LITERALS = [
+    ("(1, 'a')", "JSON.parse('[1,\"a\"]')"),
+    ("[1, None]", "Object.assign(JSON.parse('[1,null]'), {_is_list: true})"),
+    ("{1: True}", "JSON.parse('{\"1\":true}')"),
+    ("{'a': [1]}", "_pyfunc_mark_lists(JSON.parse('{\"a\":[1]}'))"),
+    ("[(1, 2)]", "Object.assign(JSON.parse('[[1,2]]'), {_is_list: true})"),
+    ('["it\'s"]', "Object.assign(JSON.parse('[\"it\\'s\"]'), {_is_list: true})"),
+]
+
+
+def gen_module_expr(code, json_threshold=0):
+    module = desugar(ast.parse(code))
+    codegen = CodeGen(module, json_threshold=json_threshold)
+    return flatten(codegen.gen_expr(module.body[0].value))
+
+
+@pytest.mark.parametrize(("code", "expected"), JSON_LITERALS)
+def test_json_literals(code, expected):
+    assert gen_module_expr(code) == expected
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "[x, 1]",  # Not constant
+        "{(1, 2): 3}",  # Tuple key
+        "{1.5: 2}",  # JS converts float keys differently
+        "[float('inf')]",
+        "([1], (2,))",  # Lists and tuples below the top level
+    ],
+)
+def test_json_literals_kept(code):
+    js_code = gen_module_expr(code)
+    assert not js_code.startswith(("JSON", "Object.assign(JSON", "_pyfunc_mark"))
+
+
+def test_json_threshold():
+    assert "JSON.parse" not in gen_module_expr("[1, 2]", json_threshold=100)
+    assert "JSON.parse" not in gen_module_expr("[1, 2]", json_threshold=None)
+    assert "JSON.parse" in gen_module_expr("[1, 2]", json_threshold=5)
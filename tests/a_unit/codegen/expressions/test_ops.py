@@ -10,8 +10,10 @@ OPS = [
     ("1 - 1", "1 - 1"),
     ("1 * 1", "(1 * 1)"),
     ("1 / 1", "1 / 1"),
-    ("1 // 1", "Math.floor(1/1)"),
+    ("1 // 1", "1 / 1 >>> 0"),
+    ("1 // 0.5", "Math.floor(1/0.5)"),
     ("1 % 1", "1 % 1"),
+    ("1.5 % -1", "_pyfunc_op_mod(1.5, (0 - 1))"),
     ("1 ** 1", "Math.pow(1, 1)"),
     ("1 << 1", "1 << 1"),
     ("1 >> 1", "1 >> 1"),
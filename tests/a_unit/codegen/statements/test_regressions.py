@@ -127,7 +127,7 @@ else:
     result = 'big'
 result
 """
-        js = py2js(code)
+        js = py2js(code, optimize=False)
         # Should NOT contain 'else if (if' - that's the bug pattern
         assert "else if (if" not in js
         # Should contain proper 'else if (' pattern
@@ -151,7 +151,7 @@ else:
     result = 'huge'
 result
 """
-        js = py2js(code)
+        js = py2js(code, optimize=False)
         # Extract just the user code portion (after the stdlib)
         user_code = js[js.find("const x = 50;") :]
         # Count the elif clauses - should have 3 'else if' patterns
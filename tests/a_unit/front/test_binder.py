@@ -105,6 +105,34 @@ def test_class():
     assert l_scope.vars["f"] == Variable(name="f", type="function")
 
 
+def test_global_rebinding():
+    prog = dedent(
+        """
+        DEBUG = False
+        def enable():
+            global DEBUG
+            DEBUG = True
+        """
+    )
+    _tree, binder = parse(prog)
+
+    assert binder.scope.vars["DEBUG"].is_const is False
+
+
+def test_match_capture():
+    prog = dedent(
+        """
+        value = 1
+        match data:
+            case [value]:
+                pass
+        """
+    )
+    _tree, binder = parse(prog)
+
+    assert binder.scope.vars["value"].is_const is False
+
+
 def parse(prog: str):
     tree = ast.parse(prog)
     desugar(tree)
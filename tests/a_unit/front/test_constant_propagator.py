@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.constant_propagator import propagate_constants
+from prescrypt.front.passes.desugar import desugar
+
+
+def propagate(code: str) -> str:
+    tree = desugar(ast.parse(dedent(code)))
+    Binder().visit(tree)
+    propagate_constants(tree)
+    return ast.unparse(tree)
+
+
+class TestPropagated:
+    def test_module_constant(self):
+        code = """
+            N = 64
+            y = N * N
+            """
+        assert propagate(code) == "N = 64\ny = 4096"
+
+    def test_read_in_function(self):
+        code = """
+            def f():
+                return N + 1
+            N = 1
+            """
+        assert "return 2" in propagate(code)
+
+    def test_folded_values(self):
+        code = """
+            N = 8
+            SIZE = N * N
+            y = SIZE + 1
+            """
+        assert propagate(code).endswith("y = 65")
+
+    def test_short_string(self):
+        assert propagate("s = 'abc'\ny = s").endswith("y = 'abc'")
+
+    def test_dead_if(self):
+        code = """
+            DEBUG = False
+            if DEBUG:
+                print('debug')
+            else:
+                print('release')
+            """
+        assert propagate(code) == "DEBUG = False\nprint('release')"
+
+    def test_dead_while(self):
+        code = """
+            DEBUG = False
+            while DEBUG:
+                print('debug')
+            """
+        assert propagate(code) == "DEBUG = False"
+
+    def test_unreachable(self):
+        code = """
+            def f():
+                return 1
+                print('unreachable')
+            """
+        assert propagate(code) == "def f():\n    return 1"
+
+    def test_unused_local(self):
+        code = """
+            def f(x):
+                size = 4
+                return size * x
+            """
+        assert propagate(code) == "def f(x):\n    return 4 * x"
+
+    def test_empty_block_gets_pass(self):
+        code = """
+            def f():
+                for i in range(3):
+                    if False:
+                        print(i)
+            """
+        assert "pass" in propagate(code)
+
+
+class TestNotPropagated:
+    @pytest.mark.parametrize(
+        "code",
+        [
+            # Reassigned
+            "N = 1\nN = 2\ny = N",
+            # Rebound in a function
+            "N = 1\ndef f():\n    global N\n    N = 2\ny = N",
+            # Deleted
+            "N = 1\ndel N\ny = N",
+            # Star import
+            "from m import *\nN = 1\ny = N",
+            # Captured by a match
+            "N = 1\nmatch x:\n    case [N]:\n        pass\ny = N",
+            # Long string
+            "N = 'a long string, not copied'\ny = N",
+            # Not a constant
+            "N = f()\ny = N",
+        ],
+    )
+    def test_not_propagated(self, code):
+        assert propagate(code).endswith("y = N")
+
+    def test_read_before_assignment(self):
+        code = """
+            def f():
+                print(k)
+                k = 1
+            """
+        assert "print(k)" in propagate(code)
+
+    def test_module_variable_kept(self):
+        assert propagate("N = 1") == "N = 1"
+
+    def test_local_with_side_effects_kept(self):
+        code = """
+            def f():
+                x = g()
+            """
+        assert "x = g()" in propagate(code)
+
+    def test_dynamic_access_keeps_locals(self):
+        code = """
+            def f():
+                x = 1
+                return locals()
+            """
+        assert "x = 1" in propagate(code)
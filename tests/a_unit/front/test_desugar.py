@@ -39,3 +39,20 @@ def test_desugar_bool_op():
 def test_expressions(expression: str):
     tree = ast.parse(expression)
     desugar(tree)
+
+
+def test_desugar_assert():
+    tree = desugar(ast.parse("assert x, 'msg'"))
+    assert "raise AssertionError('msg')" in ast.unparse(tree)
+    tree = desugar(ast.parse("assert x, 'msg'"), release=True)
+    assert ast.unparse(tree) == "pass"
+
+
+@pytest.mark.parametrize(
+    ("release", "expected"),
+    [(False, "a()\nx = True"), (True, "b()\nx = False")],
+)
+def test_desugar_debug(release: bool, expected: str):
+    code = "if __debug__:\n    a()\nelse:\n    b()\nx = __debug__"
+    tree = desugar(ast.parse(code), release=release)
+    assert ast.unparse(tree) == expected
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from ast import walk
+
 import pytest
 
 from prescrypt.front import ast
 from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.constant_folder import fold_constants
 from prescrypt.front.passes.desugar import desugar
 from prescrypt.front.passes.type_inference import TypeInference
+from prescrypt.front.passes.types import Float, type_name
 from prescrypt.testing.data import EXPRESSIONS
 
 
@@ -20,3 +24,246 @@ def test_expressions(expression: str):
 
     inferer = TypeInference()
     inferer.visit(tree)
+
+
+def infer_types(code: str) -> dict[str, str]:
+    """Return the inferred type of each assigned name, as a string."""
+    tree = fold_constants(desugar(ast.parse(code)))
+    Binder().visit(tree)
+    TypeInference().visit(tree)
+
+    types = {}
+    for node in walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            types[node.id] = type_name(node._type)
+    return types
+
+
+@pytest.mark.parametrize(
+    ("code", "name", "expected"),
+    [
+        # Annotations
+        ("def f(xs: list[int]): y = xs", "y", "list[int]"),
+        ("def f(d: dict[str, float]): y = d", "y", "dict[str, float]"),
+        ("def f(t: tuple[int, str]): y = t", "y", "tuple[int, str]"),
+        ("def f(t: tuple[int, ...]): y = t[5]", "y", "int"),
+        ("def f(x: int | None): y = x", "y", "int | None"),
+        ("def f(x: Optional[str]): y = x", "y", "str | None"),
+        ("def f(x: 'list[str]'): y = x", "y", "list[str]"),
+        ("def f(x: set[int]): y = x", "y", "unknown"),
+        # Subscripts
+        ("def f(xs: list[int], i: int): y = xs[i]", "y", "int"),
+        ("def f(xs: list[int]): y = xs[1:]", "y", "list[int]"),
+        ("def f(d: dict[str, float]): y = d['a']", "y", "float"),
+        ("def f(t: tuple[int, str]): y = t[1]", "y", "str"),
+        ("def f(t: tuple[int, str]): y = t[-2]", "y", "int"),
+        # Literals
+        ("y = [1, 2, 3]", "y", "list[int]"),
+        ("y = [1, 2.5]", "y", "list[float]"),
+        ("y = [1, 'a']", "y", "list"),
+        ("y = {'a': 1}", "y", "dict[str, int]"),
+        ("y = (1, 'a')", "y", "tuple[int, str]"),
+        # Iteration and unpacking
+        ("for y in [1, 2]: pass", "y", "int"),
+        ("for y in range(3): pass", "y", "int"),
+        ("for y in 'abc': pass", "y", "str"),
+        ("for i, y in enumerate(['a']): pass", "i", "int"),
+        ("for i, y in enumerate(['a']): pass", "y", "str"),
+        ("for k, y in {'a': 1.5}.items(): pass", "k", "str"),
+        ("for k, y in {'a': 1.5}.items(): pass", "y", "float"),
+        ("for k in {1: 'a'}: pass", "k", "unknown"),
+        ("y, z = 1, 'a'", "z", "str"),
+        ("x, *y = [1, 2, 3]", "y", "list[int]"),
+        # Methods
+        ("xs = []\nxs.append(1)\ny = xs", "y", "list[int]"),
+        ("xs = []\nxs.append(1)\nxs.append('a')\ny = xs", "y", "list"),
+        ("xs = [1]\ny = xs.pop()", "y", "int"),
+        ("d = {'a': 1}\ny = d.get('a')", "y", "int | None"),
+        ("d = {'a': 1}\ny = d.get('a', 0)", "y", "int"),
+        ("y = 'a b'.split()", "y", "list[str]"),
+        # Comprehensions
+        ("y = [x * 2 for x in [1, 2]]", "y", "list[int]"),
+        ("y = {x: len(x) for x in ['a']}", "y", "dict[str, int]"),
+        ("y = [c for c, n in [('a', 1)]]", "y", "list[str]"),
+    ],
+)
+def test_parameterized_types(code: str, name: str, expected: str):
+    code = "from typing import Optional\n" + code
+    assert infer_types(code)[name] == expected
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        # Reassignment
+        ("x = 'a'\nx = 1\ny = x", "int"),
+        # Branches are joined
+        ("if c:\n    x = 1\nelse:\n    x = 2.5\ny = x", "float"),
+        ("if c:\n    x = 1\nelse:\n    x = 'a'\ny = x", "unknown"),
+        ("x = None\nif c:\n    x = 1\ny = x", "int | None"),
+        ("x = 1\nif c:\n    x = 'a'\n    x = 2\ny = x", "int"),
+        # Paths that leave the block don't reach the join
+        (
+            "def f(c):\n    x = 1\n    if c:\n        x = 'a'\n        return\n    y = x",
+            "int",
+        ),
+        # Loops widen the types assigned in their body
+        ("x = 0\nfor i in range(3):\n    y = x\n    x = 'a'", "unknown"),
+        ("x = 0\nfor i in range(3):\n    x = x + i\ny = x", "int"),
+        ("x = 0\nwhile c:\n    x = x + 0.5\ny = x", "float"),
+        ("x = []\nfor i in range(3):\n    y = x\n    x.append(i)", "list[int]"),
+        (
+            "x = 1\nfor i in range(3):\n    if c:\n        x = 'a'\n        break\ny = x",
+            "unknown",
+        ),
+        (
+            "x = 1\nfor i in range(3):\n    if c:\n        continue\n    x = 2\ny = x",
+            "int",
+        ),
+        # Handlers may start anywhere in the body
+        ("x = 1\ntry:\n    x = 'a'\n    x = 2\nexcept E:\n    y = x", "unknown"),
+        # Other binding forms
+        ("x = 1\nwith f() as x:\n    y = x", "unknown"),
+        ("x = 1\nmatch v:\n    case [x]:\n        pass\ny = x", "unknown"),
+        ("x = 1\nimport x\ny = x", "unknown"),
+        ("x = 1\ndef f():\n    global x\n    x = 'a'\ny = x", "unknown"),
+        ("x = 1\nys = [(x := 'a') for _ in range(3)]\ny = x", "str"),
+        # Expressions with several possible results
+        ("y = 1 if c else 2.5", "float"),
+        ("y = 1 or 2", "int"),
+    ],
+)
+def test_flow_sensitive_types(code: str, expected: str):
+    assert infer_types(code)["y"] == expected
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        ("def f(a, b):\n    return abs(a - b)\ny = f(1, 2)", "float"),
+        ("def f(n):\n    if n:\n        return 1\n    return 2.5\ny = f(1)", "float"),
+        ("def f(n):\n    if n:\n        return 'a'\ny = f(1)", "str | None"),
+        ("def f():\n    pass\ny = f()", "None"),
+        ("def f():\n    raise E\ny = f()", "never"),
+        # Callers may come before the callee
+        ("def g():\n    return f() + 1\ndef f():\n    return 1\ny = g()", "int"),
+        # Recursion
+        ("def f(n):\n    return 0 if n == 0 else f(n - 1) + 1\ny = f(3)", "int"),
+        # Annotations win
+        ("def f() -> float:\n    return 1\ny = f()", "float"),
+        # Generators, async functions, rebound and decorated functions
+        ("def f():\n    yield 1\n    return 1\ny = f()", "unknown"),
+        ("async def f():\n    return 1\ny = f()", "unknown"),
+        ("def f():\n    return 1\nf = g\ny = f()", "unknown"),
+        ("@deco\ndef f():\n    return 1\ny = f()", "unknown"),
+        ("@cache\ndef f():\n    return 1\ny = f()", "int"),
+        # Nested functions
+        ("def f():\n    def g():\n        return 'a'\n    return g()\ny = f()", "str"),
+        # Globals rebound by functions are unknown
+        ("x = 1\ndef f():\n    global x\n    x = 'a'\nx = 2\ny = x", "unknown"),
+    ],
+)
+def test_return_types(code: str, expected: str):
+    assert infer_types(code)["y"] == expected
+
+
+POINT = """
+class Point:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def norm(self):
+        return abs(self.x) + abs(self.y)
+
+    @property
+    def first(self):
+        return self.x
+
+"""
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        # Attributes assigned in __init__, methods, properties
+        (POINT + "y = Point(1, 2).x", "int"),
+        (POINT + "p = Point(1, 2)\ny = p.norm()", "float"),
+        (POINT + "y = Point(1, 2).first", "int"),
+        (POINT + "y = Point(1, 2).norm", "unknown"),
+        (POINT + "def f(p: Point):\n    return p.y\ny = f(Point(1, 2))", "int"),
+        (POINT + "ps = [Point(1, 2)]\nfor p in ps:\n    y = p.x", "int"),
+        # Assignments anywhere are joined, whatever the receiver
+        (POINT + "p = Point(1, 2)\np.x = 2.5\ny = p.x", "float"),
+        (POINT + "def f(q):\n    q.x = 'a'\ny = Point(1, 2).x", "unknown"),
+        (POINT + "setattr(Point(1, 2), 'y', 'a')\ny = Point(1, 2).y", "unknown"),
+        # Class variables, dataclass fields and annotations
+        ("class C:\n    n = 0\ny = C().n", "int"),
+        ("@dataclass\nclass C:\n    a: str\n    b: float = 0\ny = C('a').b", "float"),
+        (
+            (
+                "class C:\n    def __init__(self):\n        self.xs = []\n"
+                "        self.xs.append(1)\ny = C().xs"
+            ),
+            "list[int]",
+        ),
+        # Methods of subclasses override those of their base
+        (
+            (
+                "class A:\n    def f(self):\n        return 1\n"
+                "class B(A):\n    def f(self):\n        return 'a'\n"
+                "def g(a: A):\n    return a.f()\ny = g(B())"
+            ),
+            "unknown",
+        ),
+        (
+            (
+                "class A:\n    def __init__(self):\n        self.v = 1\n"
+                "class B(A):\n    def __init__(self):\n        self.v = 2.5\n"
+                "y = A().v"
+            ),
+            "float",
+        ),
+        # Unknown bases and decorators
+        (
+            "class C(Base):\n    def __init__(self):\n        self.v = 1\ny = C().v",
+            "unknown",
+        ),
+        ("@deco\nclass C:\n    pass\ny = C()", "unknown"),
+        # Annotated slots
+        (
+            (
+                "class C:\n    __slots__ = ('v',)\n    v: int\n"
+                "    def __init__(self, v):\n        self.v = v\ny = C(1).v"
+            ),
+            "int",
+        ),
+    ],
+)
+def test_class_types(code: str, expected: str):
+    assert infer_types(code)["y"] == expected
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        ("def f(x):\n    if isinstance(x, str):\n        y = x", "str"),
+        ("def f(x):\n    if isinstance(x, (int, float)):\n        y = x", "float"),
+        ("def f(x: int | str):\n    if isinstance(x, int):\n        y = x", "int"),
+        ("def f(x: int | str):\n    if not isinstance(x, int):\n        y = x", "str"),
+        ("def f(x: int | None):\n    if x is not None:\n        y = x", "int"),
+        ("def f(x: int | None):\n    if x is None:\n        return\n    y = x", "int"),
+        ("def f(x):\n    assert isinstance(x, str)\n    y = x", "str"),
+        ("def f(x):\n    y = x if isinstance(x, str) else 'a'", "str"),
+        (POINT + "def f(p):\n    if isinstance(p, Point):\n        y = p.x", "int"),
+    ],
+)
+def test_narrowing(code: str, expected: str):
+    assert infer_types(code)["y"] == expected
+
+
+def test_imported_types():
+    tree = ast.parse("from geometry import dist\ny = dist(1, 2)")
+    inferer = TypeInference({"geometry": {"dist": Float}})
+    inferer.visit(tree)
+    assert inferer.module_types["y"] is Float
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.desugar import desugar
+from prescrypt.front.passes.inliner import Inliner
+from prescrypt.front.passes.type_inference import TypeInference
+
+
+def inline(code: str) -> tuple[str, int]:
+    """Return the last statement after inlining, and the inlined count."""
+    tree = desugar(ast.parse(code))
+    Binder().visit(tree)
+    TypeInference().visit(tree)
+    inliner = Inliner()
+    inliner.visit(tree)
+    return ast.unparse(tree.body[-1]), inliner.inlined_calls
+
+
+class TestInlined:
+    def test_simple(self):
+        code = "def square(x):\n    return x * x\ny = square(n)"
+        assert inline(code) == ("y = n * n", 1)
+
+    def test_docstring(self):
+        code = 'def square(x):\n    """Square."""\n    return x * x\ny = square(3)'
+        assert inline(code) == ("y = 3 * 3", 1)
+
+    def test_complex_args_in_order(self):
+        code = "def sub(a, b):\n    return a - b\ny = sub(f(), g())"
+        assert inline(code) == ("y = f() - g()", 1)
+
+    def test_nested_calls(self):
+        code = (
+            "def inc(x):\n    return x + 1\n"
+            "def add2(x):\n    return inc(inc(x))\n"
+            "y = add2(n)"
+        )
+        assert inline(code) == ("y = n + 1 + 1", 3)
+
+    def test_complex_arg_used_twice_stays_a_call(self):
+        code = (
+            "def double(x):\n    return x + x\n"
+            "def quad(x):\n    return double(double(x))\n"
+            "y = quad(n)"
+        )
+        assert inline(code) == ("y = double(n + n)", 2)
+
+    def test_global_read(self):
+        code = "scale = 2\ndef f(x):\n    return x * scale\ny = f(3)"
+        assert inline(code) == ("y = 3 * scale", 1)
+
+    def test_in_function(self):
+        code = (
+            "def f(n):\n    def sq(x):\n        return x * x\n    return sq(n)\ny = 0"
+        )
+        tree = desugar(ast.parse(code))
+        Binder().visit(tree)
+        TypeInference().visit(tree)
+        Inliner().visit(tree)
+        assert ast.unparse(tree.body[0].body[-1]) == "return n * n"
+
+    def test_call_in_later_function(self):
+        code = "def g():\n    return f(1)\ndef f(x):\n    return x + 1\ny = 0"
+        tree = desugar(ast.parse(code))
+        Binder().visit(tree)
+        TypeInference().visit(tree)
+        Inliner().visit(tree)
+        assert ast.unparse(tree.body[0].body[-1]) == "return 1 + 1"
+
+    def test_matching_annotations(self):
+        code = "def half(x: float) -> float:\n    return x / 2\ny = half(3)"
+        assert inline(code) == ("y = 3 / 2", 1)
+
+
+class TestNotInlined:
+    @pytest.mark.parametrize(
+        "code",
+        [
+            # Not a single expression
+            "def f(x):\n    y = x\n    return y\nz = f(1)",
+            # Recursive
+            "def f(x):\n    return f(x - 1) if x else 0\nz = f(1)",
+            # Generator
+            "def f(x):\n    return (yield x)\nz = f(1)",
+            # Nested scope
+            "def f(x):\n    return [i for i in x]\nz = f(1)",
+            # Default
+            "def f(x=1):\n    return x\nz = f(1)",
+            # *args
+            "def f(*x):\n    return x\nz = f(1)",
+            # Decorated
+            "@d\ndef f(x):\n    return x\nz = f(1)",
+            # Redefined
+            "def f(x):\n    return x\ndef f(x):\n    return -x\nz = f(1)",
+            # Conditional def
+            "if c:\n    def f(x):\n        return x\nz = f(1)",
+            # Method
+            "class A:\n    def f(x):\n        return x\nz = A.f(1)",
+            # Rebound with `global`
+            "def f(x):\n    return x\ndef g():\n    global f\nz = f(1)",
+            # Keyword argument
+            "def f(x):\n    return x\nz = f(x=1)",
+            # Starred argument
+            "def f(x):\n    return x\nz = f(*a)",
+            # Called before the def
+            "z = f(1)\ndef f(x):\n    return x",
+            # Too large
+            "def f(x):\n    return x + x + x + x + x + x + x + x + x + x\nz = f(1)",
+            # Complex argument used twice
+            "def f(x):\n    return x * x\nz = f(g())",
+            # Complex argument used conditionally
+            "def f(x, y):\n    return x and y\nz = f(1, g())",
+            # Complex arguments in the wrong order
+            "def f(x, y):\n    return y - x\nz = f(g(), h())",
+            # Side effect before a complex argument
+            "def f(x):\n    return h() + x\nz = f(g())",
+            # Annotated parameter, argument of another type
+            "def f(x: int):\n    return x + 1\nz = f(s)",
+            # Return annotation not matching the value
+            "def f(x) -> int:\n    return x + 1\nz = f(s)",
+        ],
+    )
+    def test_not_inlined(self, code):
+        assert inline(code)[1] == 0
+
+    def test_shadowed_global(self):
+        code = "k = 1\ndef f(x):\n    return x + k\ndef g(k):\n    return f(k)\ny = 0"
+        tree = desugar(ast.parse(code))
+        Binder().visit(tree)
+        TypeInference().visit(tree)
+        inliner = Inliner()
+        inliner.visit(tree)
+        assert inliner.inlined_calls == 0
+
+    def test_mutable_closure(self):
+        code = (
+            "def outer():\n    k = 1\n    def f(x):\n        return x + k\n"
+            "    k = 2\n    return f(1)\n"
+            "y = 0"
+        )
+        tree = desugar(ast.parse(code))
+        Binder().visit(tree)
+        TypeInference().visit(tree)
+        inliner = Inliner()
+        inliner.visit(tree)
+        assert inliner.inlined_calls == 0
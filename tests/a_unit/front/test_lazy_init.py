@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.desugar import desugar
+from prescrypt.front.passes.lazy_init import add_init_calls, is_side_effect_free
+
+
+def parse(code: str) -> ast.Module:
+    tree = desugar(ast.parse(dedent(code)))
+    Binder().visit(tree)
+    return tree
+
+
+def add_calls(code: str) -> str:
+    tree = parse(code)
+    add_init_calls(tree, {"TABLE": "init$config", "load": "init$config"})
+    return ast.unparse(tree)
+
+
+class TestSideEffectFree:
+    @pytest.mark.parametrize(
+        "code",
+        [
+            '"""Doc."""\nimport utils\nfrom shapes import area',
+            "RATE = 3\nNAMES: list = ['a', 'b']",
+            "def f(x, y=1):\n    print(x)",
+            "@property\ndef f():\n    pass",
+            "class A(Base):\n    size = 2\n    def f(self):\n        pass",
+        ],
+    )
+    def test_definitions(self, code):
+        assert is_side_effect_free(parse(code))
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "print(1)",
+            "TABLE = build()",
+            "def f(x=load()):\n    pass",
+            "@register\ndef f():\n    pass",
+            "class A(make_base()):\n    pass",
+            "class A:\n    size = len(TABLE)",
+            "for i in range(3):\n    pass",
+        ],
+    )
+    def test_side_effects(self, code):
+        assert not is_side_effect_free(parse(code))
+
+
+class TestInitCalls:
+    def test_function(self):
+        code = """
+            def f(key):
+                '''Doc.'''
+                if key:
+                    return TABLE[key]
+            """
+        assert add_calls(code) == dedent(
+            """\
+            def f(key):
+                \"\"\"Doc.\"\"\"
+                init$config()
+                if key:
+                    return TABLE[key]"""
+        )
+
+    def test_module_statements(self):
+        code = """
+            x = 1
+            if x:
+                y = load()
+            """
+        assert add_calls(code) == "x = 1\nif x:\n    init$config()\n    y = load()"
+
+    def test_once_per_function(self):
+        code = """
+            def f():
+                load()
+                def g():
+                    return TABLE
+                return TABLE
+            """
+        result = add_calls(code)
+        assert result.count("init$config()") == 2
+        assert "def g():\n        init$config()" in result
+
+    def test_default_value(self):
+        result = add_calls("def f(x=TABLE):\n    return x")
+        assert result.startswith("init$config()\n\ndef f")
+
+    def test_local_variable(self):
+        code = """
+            def f(TABLE):
+                return TABLE
+            """
+        assert "init$config" not in add_calls(code)
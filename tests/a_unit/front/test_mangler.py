@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.desugar import desugar
+from prescrypt.front.passes.mangler import mangle_locals
+
+
+def mangle(code: str) -> str:
+    tree = desugar(ast.parse(dedent(code)))
+    Binder().visit(tree)
+    mangle_locals(tree)
+    return ast.unparse(tree)
+
+
+class TestRenamed:
+    def test_locals(self):
+        code = """
+            def f(x):
+                total = 0
+                for item in x:
+                    total += item
+                return total
+            """
+        assert mangle(code) == dedent(
+            """\
+            def f(x):
+                a = 0
+                for b in x:
+                    a = a + b
+                return a"""
+        )
+
+    def test_nested_function_parameters(self):
+        code = """
+            def f():
+                def g(value):
+                    return value
+                return g
+            """
+        assert "def g(a):\n        return a" in mangle(code)
+
+    def test_closure(self):
+        code = """
+            def f():
+                count = 0
+                def inc():
+                    nonlocal count
+                    count += 1
+                    return count
+                return inc
+            """
+        result = mangle(code)
+        assert "nonlocal a" in result
+        assert "a = a + 1" in result
+
+    def test_comprehension_in_function(self):
+        assert "[a for a in x]" in mangle("def f(x):\n    return [v for v in x]")
+
+    def test_lambda(self):
+        assert "lambda a: a" in mangle("def f():\n    return lambda v: v")
+
+    def test_except_handler(self):
+        code = """
+            def f():
+                try:
+                    pass
+                except ValueError as error:
+                    print(error)
+            """
+        assert "except ValueError as a:\n        print(a)" in mangle(code)
+
+    def test_names_of_module_avoided(self):
+        code = """
+            a = 1
+            def f(x):
+                value = x
+                return value + a
+            """
+        assert "b = x\n    return b + a" in mangle(code)
+
+    def test_names_of_enclosing_function_avoided(self):
+        code = """
+            def f():
+                x = 1
+                def g():
+                    y = 2
+                    return x + y
+                return g
+            """
+        assert "b = 2\n        return a + b" in mangle(code)
+
+
+class TestKept:
+    @pytest.mark.parametrize(
+        "code",
+        [
+            # Module and class level
+            "value = 1",
+            "class A:\n    value = 1",
+            # Comprehension at module level
+            "x = [value for value in y]",
+            # Parameters of module-level functions (keyword arguments)
+            "def f(value):\n    return value",
+            # Globals
+            "def f():\n    global value\n    value = 1",
+        ],
+    )
+    def test_kept(self, code):
+        assert "value" in mangle(code)
+
+    def test_self(self):
+        code = """
+            class A:
+                def f(self, value):
+                    return self
+            """
+        assert "def f(self, a):" in mangle(code)
+
+    def test_class_in_function(self):
+        code = """
+            def f():
+                class A:
+                    value = 1
+                return A
+            """
+        assert "value = 1" in mangle(code)
+
+    @pytest.mark.parametrize("builtin", ["locals", "vars", "eval", "exec"])
+    def test_dynamic_access(self, builtin):
+        code = f"def f():\n    value = 1\n    return {builtin}()"
+        assert "value = 1" in mangle(code)
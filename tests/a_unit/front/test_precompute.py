@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.precompute import precompute_constants
+
+
+def precompute(code: str) -> str:
+    tree = ast.parse(dedent(code))
+    precompute_constants(tree)
+    return ast.unparse(tree)
+
+
+class TestPrecompute:
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            ("A = [i * i for i in range(4)]", "A = [0, 1, 4, 9]"),
+            ("A = {c: ord(c) for c in 'ab'}", "A = {'a': 97, 'b': 98}"),
+            ("A = ', '.join(str(i) for i in range(3))", "A = '0, 1, 2'"),
+            ("A: tuple = tuple(sorted('cab'))", "A: tuple = ('a', 'b', 'c')"),
+            ("A = 2 ** 10 - 1", "A = 1023"),
+            ("A = f'{2 ** 3!r:>3}'", "A = '  8'"),
+            (
+                "A = [[i * j for j in range(3)] for i in range(2)]",
+                "A = [[0, 0, 0], [0, 1, 2]]",
+            ),
+        ],
+    )
+    def test_tables(self, code, expected):
+        assert precompute(code) == expected
+
+    def test_uses_earlier_values(self):
+        code = """
+            '''Doc.'''
+            SIZE = 3
+            import re
+            def f():
+                pass
+            TABLE = [SIZE * i for i in range(SIZE)]
+            TOTAL = sum(TABLE)
+        """
+        result = precompute(code)
+        assert "TABLE = [0, 3, 6]" in result
+        assert "TOTAL = 9" in result
+
+    def test_count(self):
+        tree = ast.parse("A = 1\nB = A + 1\nC = [B] * 2")
+        assert precompute_constants(tree) == 2
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "A = load()",
+            "A = [open(p) for p in 'ab']",
+            "A = ''.__class__",
+            "A = '{0.__class__}'.format(1)",
+            "A = 10 ** 100000",
+            "A = list(range(10 ** 9))",
+            "A = {1, 2}",
+            "A = float('inf')",
+            "A = 1 / 0",
+        ],
+    )
+    def test_not_computed(self, code):
+        assert precompute(code) == code
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "A = [[i * j for j in range(10000)] for i in range(10000)]",
+            "A = [sum(range(10 ** 6)) for i in range(10 ** 6)]",
+            "A = ((2 ** 1024) ** 1024) ** 1024",
+            "A = 'a' * 10 ** 9",
+            "A = [0] * 10 ** 9",
+            "A = 1 << 10 ** 9",
+            "A = 'x'.ljust(10 ** 9)",
+            "A = f'{1:>1000000000}'",
+        ],
+    )
+    def test_over_budget(self, code):
+        assert precompute(code) == code
+
+    def test_budget_is_per_module(self):
+        code = """
+            A = 'a' * 1000
+            B = ''.join([A] * 1000)
+            C = ''.join([B] * 1000)
+            D = len(A)
+        """
+        result = precompute(code)
+        assert "C = ''.join([B] * 1000)" in result
+        assert result.endswith("D = len(A)")
+
+    def test_mutation_stops_propagation(self):
+        code = """
+            A = [1, 2]
+            A.append(3)
+            B = len(A)
+        """
+        assert precompute(code).endswith("B = len(A)")
+
+    def test_shared_containers(self):
+        code = """
+            A = [1, 2]
+            B = A
+            C = [A, A]
+            D = list(A)
+        """
+        result = precompute(code)
+        assert "B = A\n" in result
+        assert "C = [A, A]" in result
+        assert "D = [1, 2]" in result
+
+    @pytest.mark.parametrize(
+        "code",
+        ["A = [[0] * 3] * 2", "A = ([1, 2],) * 2", "A = {'a': [1]}\nB = (A['a'],) * 2"],
+    )
+    def test_repeated_containers(self, code):
+        assert precompute(code).endswith(code.split("\n")[-1])
+
+    def test_rebinding(self):
+        code = """
+            A = 2
+            from util import A
+            B = A + 1
+        """
+        assert precompute(code).endswith("B = A + 1")
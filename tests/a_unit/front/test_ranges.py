@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from ast import walk
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.constant_folder import fold_constants
+from prescrypt.front.passes.desugar import desugar
+from prescrypt.front.passes.ranges import MAX_LENGTH, UNBOUNDED, Range, RangeAnalysis
+from prescrypt.front.passes.type_inference import TypeInference
+
+
+def ranges(code: str, name: str) -> list[Range | None]:
+    """Return the ranges of the reads of a name, in source order."""
+    tree = fold_constants(desugar(ast.parse(code)))
+    Binder().visit(tree)
+    TypeInference().visit(tree)
+    RangeAnalysis().visit(tree)
+
+    nodes = [
+        node
+        for node in walk(tree)
+        if isinstance(node, ast.Name)
+        and isinstance(node.ctx, ast.Load)
+        and node.id == name
+    ]
+    nodes.sort(key=lambda node: (node.lineno, node.col_offset))
+    return [node._range for node in nodes]
+
+
+class TestSeeds:
+    def test_constant(self):
+        assert ranges("x = 3\ny = x", "x") == [Range(3, 3)]
+
+    def test_range_loop(self):
+        code = "for i in range(10):\n    print(i)"
+        assert ranges(code, "i") == [Range(0, 9)]
+
+    def test_range_loop_with_step(self):
+        code = "for i in range(10, 0, -2):\n    print(i)"
+        assert ranges(code, "i") == [Range(1, 10)]
+
+    def test_range_of_len(self):
+        code = "def f(xs):\n    for i in range(len(xs)):\n        print(i)"
+        assert ranges(code, "i") == [Range(0, MAX_LENGTH - 1)]
+
+    def test_enumerate(self):
+        code = "def f(xs):\n    for i, x in enumerate(xs, 1):\n        print(i)"
+        assert ranges(code, "i") == [Range(1, None)]
+
+    @pytest.mark.parametrize(
+        ("expr", "expected"),
+        [
+            ("abs(n)", Range(0, None)),
+            ("max(0, n)", Range(0, None)),
+            ("min(n, 10)", Range(None, 10)),
+            ("n % 7", Range(0, 7)),
+            ("n % -7", Range(-7, 0)),
+            ("len(s) // 2", Range(0, MAX_LENGTH // 2)),
+            ("len(s) - 1", Range(-1, MAX_LENGTH - 1)),
+        ],
+    )
+    def test_expressions(self, expr, expected):
+        code = f"def f(n, s):\n    x = {expr}\n    return x"
+        assert ranges(code, "x") == [expected]
+
+    def test_parameter(self):
+        assert ranges("def f(n):\n    return n", "n") == [UNBOUNDED]
+
+
+class TestVariables:
+    def test_join_of_assignments(self):
+        code = "def f(c):\n    x = 1\n    if c:\n        x = 5\n    return x"
+        assert ranges(code, "x") == [Range(1, 5)]
+
+    def test_counter_is_widened(self):
+        code = "i = 0\nwhile i < 10:\n    i = i + 1\nprint(i)"
+        assert ranges(code, "i") == [Range(0, None)] * 3
+
+    def test_decrement_is_widened(self):
+        code = "i = 10\nwhile True:\n    i -= 1\nprint(i)"
+        assert ranges(code, "i") == [Range(None, 10)] * 2
+
+    def test_unknown_assignment(self):
+        code = "def f(n):\n    x = 0\n    x = n\n    return x"
+        assert ranges(code, "x") == [UNBOUNDED]
+
+    def test_module_constant_in_function(self):
+        code = "MOD = 10**9 + 7\ndef f(n):\n    return n % MOD"
+        assert ranges(code, "MOD") == [Range(10**9 + 7, 10**9 + 7)]
+
+    def test_global_declaration(self):
+        code = "x = 0\ndef reset():\n    global x\n    x = -1\nprint(x)"
+        assert ranges(code, "x") == [UNBOUNDED]
+
+    def test_nonlocal_declaration(self):
+        code = (
+            "def f():\n    x = 0\n    def g():\n        nonlocal x\n"
+            "        x = -1\n    g()\n    return x"
+        )
+        assert ranges(code, "x") == [UNBOUNDED]
+
+    def test_comprehension_shadows(self):
+        code = "i = 1\nys = [i for i in range(-3, 0)]\nprint(i)"
+        assert ranges(code, "i") == [Range(-3, -1), Range(1, 1)]
+
+
+class TestGuards:
+    def test_if(self):
+        code = (
+            "def f(n: int):\n    if n >= 0:\n        return n\n"
+            "    else:\n        return n"
+        )
+        assert ranges(code, "n") == [UNBOUNDED, Range(0, None), Range(None, -1)]
+
+    def test_strict_comparison_of_unknown_types(self):
+        code = "def f(x):\n    if x < 0:\n        return x"
+        assert ranges(code, "x") == [UNBOUNDED, Range(None, 0)]
+
+    def test_chained_comparison(self):
+        code = "def f(i, xs):\n    if 0 <= i < len(xs):\n        return i"
+        assert ranges(code, "i")[-1].lo == 0
+
+    def test_assigned_in_body(self):
+        code = "def f(n):\n    if n > 0:\n        n = n - 5\n        return n"
+        assert ranges(code, "n")[1:] == [UNBOUNDED, UNBOUNDED]
+
+    def test_and(self):
+        code = "def f(i):\n    return i >= 0 and i"
+        assert ranges(code, "i") == [UNBOUNDED, Range(0, None)]
+
+    def test_conditional_expression(self):
+        code = "def f(i):\n    return i if i > 0 else 0"
+        assert ranges(code, "i") == [Range(0, None), UNBOUNDED]
+
+    def test_comprehension_condition(self):
+        code = "def f(xs):\n    return [x for x in xs if x >= 0]"
+        assert ranges(code, "x") == [Range(0, None), UNBOUNDED]
+
+    def test_not_applied_to_nested_functions(self):
+        code = "def f(n):\n    if n >= 0:\n        return lambda: n"
+        assert ranges(code, "n") == [UNBOUNDED, UNBOUNDED]
+
+
+def test_range_operations():
+    assert Range(0, 5).join(Range(-1, 3)) == Range(-1, 5)
+    assert Range(0, None).join(Range(2, 3)) == Range(0, None)
+    assert Range(0, 5).meet(Range(3, None)) == Range(3, 5)
+    assert Range(0, 1).meet(Range(3, 4)) is None
+    assert Range(0, None).non_negative
+    assert not UNBOUNDED.non_negative
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+from prescrypt.front import ast
+from prescrypt.front.passes.reachability import eliminate_dead_code
+
+UTILS = """
+def used():
+    return helper()
+
+def helper():
+    return 1
+
+def unused():
+    return 2
+
+class Shape:
+    def __init__(self):
+        self.n = 1
+
+    def area(self):
+        return self.n
+
+    def perimeter(self):
+        return 4
+
+    def __repr__(self):
+        return "Shape"
+"""
+
+
+def eliminate(main: str, utils: str = UTILS, keep=()) -> list[str]:
+    trees = {
+        "utils.py": ast.parse(dedent(utils)),
+        "main.py": ast.parse(dedent(main)),
+    }
+    return eliminate_dead_code(trees, "main.py", keep)
+
+
+class TestRemoved:
+    def test_unused_functions(self):
+        removed = eliminate("from utils import used\nused()")
+        assert removed == ["utils.py: unused", "utils.py: Shape"]
+
+    def test_unused_methods(self):
+        removed = eliminate("from utils import Shape\nShape().area()")
+        assert removed == [
+            "utils.py: used",
+            "utils.py: helper",
+            "utils.py: unused",
+            "utils.py: Shape.perimeter",
+        ]
+
+    def test_unused_in_entry(self):
+        removed = eliminate("def f():\n    pass\nx = 1", utils="")
+        assert removed == ["main.py: f"]
+
+    def test_functions_of_unused_functions(self):
+        code = "def f():\n    return g()\ndef g():\n    pass\nx = 1"
+        assert eliminate(code, utils="") == ["main.py: f", "main.py: g"]
+
+    def test_tree_pruned(self):
+        trees = {"main.py": ast.parse("def f():\n    pass\nx = 1")}
+        eliminate_dead_code(trees, "main.py")
+        assert ast.unparse(trees["main.py"]) == "x = 1"
+
+    def test_empty_class_body(self):
+        trees = {"main.py": ast.parse("class A:\n    def f(self):\n        pass\nA()")}
+        assert eliminate_dead_code(trees, "main.py") == ["main.py: A.f"]
+        assert ast.unparse(trees["main.py"].body[0]) == "class A:\n    pass"
+
+
+class TestKept:
+    @pytest.mark.parametrize(
+        "main",
+        [
+            # Called in a function body
+            "def main():\n    unused()\nmain()",
+            # Passed as a value
+            "callbacks = [unused]",
+            # Aliased
+            "from utils import unused as u\nu()",
+            # Module attribute
+            "import utils\nutils.unused()",
+            "import utils\ngetattr(utils, 'unused')()",
+            # Exported
+            "__all__ = ['unused']",
+            # Deleted
+            "del unused",
+        ],
+    )
+    def test_function_kept(self, main):
+        assert "utils.py: unused" not in eliminate(main)
+
+    def test_exported_by_other_entry(self):
+        trees = {
+            "utils.py": ast.parse(dedent(UTILS)),
+            "main.py": ast.parse("from utils import used\nused()"),
+            "page.py": ast.parse("__all__ = ['unused']\nfrom utils import unused"),
+        }
+        removed = eliminate_dead_code(trees, ["main.py", "page.py"])
+        assert removed == ["utils.py: Shape"]
+
+    @pytest.mark.parametrize(
+        "main",
+        [
+            "globals()['unused']()",
+            "eval('unused()')",
+            "import utils\ngetattr(utils, name)()",
+        ],
+    )
+    def test_dynamic_keeps_all(self, main):
+        assert eliminate(main) == []
+
+    @pytest.mark.parametrize(
+        "main",
+        [
+            "Shape().perimeter()",
+            "f = Shape.perimeter",
+            "getattr(Shape(), 'perimeter')()",
+            "getattr(Shape(), name)()",
+            "Shape().__dict__",
+        ],
+    )
+    def test_method_kept(self, main):
+        assert "utils.py: Shape.perimeter" not in eliminate(main)
+
+    def test_method_of_unused_class_removed_with_class(self):
+        removed = eliminate("x.perimeter()")
+        assert "utils.py: Shape" in removed
+        assert "utils.py: Shape.perimeter" not in removed
+
+    def test_dunder_methods_kept(self):
+        removed = eliminate("Shape()")
+        assert "utils.py: Shape.__init__" not in removed
+        assert "utils.py: Shape.__repr__" not in removed
+
+    def test_keep(self):
+        removed = eliminate("x = 1", keep=["unused", "Shape.perimeter"])
+        assert "utils.py: unused" not in removed
+        assert "utils.py: Shape" not in removed
+        assert "utils.py: Shape.perimeter" not in removed
+        assert "utils.py: Shape.area" in removed
+
+    @pytest.mark.parametrize(
+        "utils",
+        [
+            # Decorator with side effects
+            "@register\ndef f():\n    pass",
+            "class A:\n    @register\n    def f(self):\n        pass\nA()",
+            # Metaclass
+            "class A(metaclass=Meta):\n    pass",
+            # Subclass hook
+            (
+                "class A:\n    def __init_subclass__(cls):\n        pass\n"
+                "class B(A):\n    pass"
+            ),
+        ],
+    )
+    def test_side_effects_kept(self, utils):
+        assert eliminate("x = 1", utils=utils) == []
+
+    def test_safe_decorators_removed(self):
+        utils = (
+            "from functools import cache\n"
+            "@cache\ndef f():\n    pass\n"
+            "class A:\n    @property\n    def g(self):\n        pass\nA()"
+        )
+        assert eliminate("x = 1", utils=utils) == ["utils.py: f", "utils.py: A.g"]
+
+    def test_module_body_roots(self):
+        utils = "def f():\n    pass\nif True:\n    f()"
+        assert eliminate("x = 1", utils=utils) == []
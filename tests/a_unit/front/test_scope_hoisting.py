@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+from prescrypt.front import ast
+from prescrypt.front.passes.binder import Binder
+from prescrypt.front.passes.desugar import desugar
+from prescrypt.front.passes.scope_hoisting import Hoister, hoist_names
+
+
+def bind(code: str) -> ast.Module:
+    tree = desugar(ast.parse(dedent(code)))
+    Binder().visit(tree)
+    return tree
+
+
+def hoist(code: str, names=None, modules=None) -> str:
+    tree = bind(code)
+    hoist_names(tree, names or {}, modules or {})
+    return ast.unparse(tree)
+
+
+class TestRenamed:
+    def test_bindings(self):
+        code = """
+            count = 0
+            def f():
+                return count
+            class A:
+                pass
+            """
+        names = {"count": "count$1", "f": "f$1", "A": "A$1"}
+        assert hoist(code, names) == dedent(
+            """\
+            count$1 = 0
+
+            def f$1():
+                return count$1
+
+            class A$1:
+                pass"""
+        )
+
+    def test_global_declaration(self):
+        code = """
+            def f():
+                global count
+                count = 1
+            """
+        result = hoist(code, {"count": "count$1"})
+        assert "global count$1\n    count$1 = 1" in result
+
+    def test_imported_name(self):
+        code = """
+            from utils import helper as h
+            print(h(1))
+            """
+        assert "print(helper(1))" in hoist(code, {"h": "helper"})
+
+    def test_module_attribute(self):
+        code = """
+            import utils
+            print(utils.helper(1), utils.other)
+            """
+        modules = {"utils": {"helper": "helper$1"}}
+        assert "print(helper$1(1), utils.other)" in hoist(code, modules=modules)
+
+    def test_dotted_module(self):
+        code = """
+            import pkg.sub
+            pkg.sub.f()
+            """
+        assert hoist(code, modules={"pkg.sub": {"f": "f"}}).endswith("\nf()")
+
+    def test_local_import(self):
+        code = """
+            def f():
+                import utils
+                from shapes import area as a
+                return utils.helper(a(1))
+            """
+        tree = bind(code)
+        scope = tree.body[0]._scope
+        local = {id(scope): ({"a": "area$1"}, {"utils": {"helper": "helper"}})}
+        hoist_names(tree, {}, {}, local)
+        assert "return helper(area$1(1))" in ast.unparse(tree)
+
+    def test_scope_renamed(self):
+        tree = bind("count = 0")
+        hoist_names(tree, {"count": "count$1"}, {})
+        assert list(tree._scope.vars) == ["count$1"]
+
+
+class TestKept:
+    def test_local_variables(self):
+        code = """
+            def f(count):
+                return count
+            """
+        assert "return count" in hoist(code, {"count": "count$1"})
+
+    def test_module_attribute_assigned(self):
+        code = """
+            import utils
+            utils.value = 1
+            """
+        modules = {"utils": {"value": "value$1"}}
+        assert "utils.value = 1" in hoist(code, modules=modules)
+
+    def test_local_module_name(self):
+        code = """
+            def f(utils):
+                return utils.helper
+            """
+        modules = {"utils": {"helper": "helper$1"}}
+        assert "return utils.helper" in hoist(code, modules=modules)
+
+
+class TestShadowed:
+    def test_parameter(self):
+        code = """
+            import utils
+            from shapes import area as a
+            def f(helper, area):
+                return utils.helper(helper) + a(area)
+            """
+        tree = bind(code)
+        hoister = Hoister(tree, {"a": "area"}, {"utils": {"helper": "helper"}})
+        assert hoister.shadowed() == {"helper", "area"}
+
+    def test_not_shadowed(self):
+        code = """
+            import utils
+            def f(x):
+                return utils.helper(x)
+            """
+        tree = bind(code)
+        hoister = Hoister(tree, {}, {"utils": {"helper": "helper"}})
+        assert hoister.shadowed() == set()
@@ -5,7 +5,9 @@ from __future__ import annotations
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from prescrypt.main import compile_directory, compile_file, create_parser
+import pytest
+
+from prescrypt.main import compile_directory, compile_file, create_parser, main
 
 
 class TestArgumentParser:
@@ -25,6 +27,14 @@ class TestArgumentParser:
         args = parser.parse_args(["input.py", "-o", "output.js"])
         assert args.input == Path("input.py")
         assert args.output == Path("output.js")
+        assert args.output_is_dir is False
+
+    def test_parser_output_directory(self):
+        """A trailing separator makes the output a directory."""
+        parser = create_parser()
+        args = parser.parse_args(["input.py", "-o", "dist/"])
+        assert args.output == Path("dist")
+        assert args.output_is_dir is True
 
     def test_parser_module_mode(self):
         """Parse module mode flag."""
@@ -53,12 +63,91 @@ class TestArgumentParser:
         args = parser.parse_args(["input.py", "--no-tree-shake"])
         assert args.no_tree_shake is True
 
+    def test_parser_keep(self):
+        """Parse keep options."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).keep == []
+        args = parser.parse_args(["input.py", "--keep", "f", "--keep", "A.g"])
+        assert args.keep == ["f", "A.g"]
+
+    def test_parser_split(self):
+        """Parse split flag."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).split is False
+        args = parser.parse_args(["input.py", "--bundle", "--split"])
+        assert args.split is True
+
+    def test_parser_entries(self):
+        """Parse entry and shared-chunk options."""
+        parser = create_parser()
+        args = parser.parse_args(["input.py"])
+        assert args.entry == []
+        assert args.shared_chunk is False
+        args = parser.parse_args(
+            ["a.py", "--bundle", "--entry", "b.py", "--entry", "c.py", "--shared-chunk"]
+        )
+        assert args.entry == [Path("b.py"), Path("c.py")]
+        assert args.shared_chunk is True
+
+    def test_parser_lazy_init(self):
+        """Parse lazy-init flag."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).lazy_init is False
+        args = parser.parse_args(["input.py", "--bundle", "--lazy-init"])
+        assert args.lazy_init is True
+
+    def test_parser_release(self):
+        """Parse release flag."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).release is False
+        assert parser.parse_args(["input.py", "-O"]).release is True
+        assert parser.parse_args(["input.py", "--release"]).release is True
+
+    def test_parser_target(self):
+        """Parse target option."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).target is None
+        args = parser.parse_args(["worker.py", "--target", "edge"])
+        assert args.target == "edge"
+
+    def test_parser_shared_runtime(self):
+        """Parse shared-runtime flag."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).shared_runtime is False
+        args = parser.parse_args(["src/", "-o", "dist/", "--shared-runtime"])
+        assert args.shared_runtime is True
+
+    def test_parser_minify(self):
+        """Parse minify flag."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).minify is False
+        assert parser.parse_args(["input.py", "--minify"]).minify is True
+
     def test_parser_no_optimize(self):
         """Parse no-optimize flag."""
         parser = create_parser()
         args = parser.parse_args(["input.py", "--no-optimize"])
         assert args.no_optimize is True
 
+    def test_parser_fast_paths(self):
+        """Parse fast-paths flag."""
+        parser = create_parser()
+        assert parser.parse_args(["input.py"]).fast_paths is False
+        args = parser.parse_args(["input.py", "--fast-paths"])
+        assert args.fast_paths is True
+
+    def test_parser_profile(self):
+        """Parse instrument and profile-data options."""
+        parser = create_parser()
+        args = parser.parse_args(["input.py"])
+        assert args.instrument is False
+        assert args.profile_data is None
+        args = parser.parse_args(
+            ["input.py", "--instrument", "--profile-data", "profile.json"]
+        )
+        assert args.instrument is True
+        assert args.profile_data == Path("profile.json")
+
     def test_parser_verbose(self):
         """Parse verbose flag."""
         parser = create_parser()
@@ -399,3 +488,46 @@ class TestCompileDirectory:
             # Check utils.js has export (via named export to prevent hoisting)
             utils_js = (dst_dir / "utils.js").read_text()
             assert "export { helper }" in utils_js
+
+
+class TestMain:
+    """Test the py2js command."""
+
+    def run(self, monkeypatch, *argv: str) -> None:
+        monkeypatch.setattr("sys.argv", ["py2js", *argv, "-q"])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+
+    def test_bundle_to_new_directory(self, monkeypatch):
+        """A new output directory named with a trailing separator is created."""
+        with TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            Path("main.py").write_text("x = 1")
+
+            self.run(monkeypatch, "main.py", "-o", "dist/", "--bundle")
+
+            assert Path("dist/main.js").is_file()
+
+    def test_entries_to_new_directory(self, monkeypatch):
+        """With several entry files, the output is always a directory."""
+        with TemporaryDirectory() as tmpdir:
+            monkeypatch.chdir(tmpdir)
+            Path("common.py").write_text("def greet():\n    return 'hi'")
+            Path("home.py").write_text("from common import greet\nprint(greet())")
+            Path("shop.py").write_text("from common import greet\nprint(greet())")
+
+            self.run(
+                monkeypatch,
+                *("home.py", "--entry", "shop.py", "-o", "dist"),
+                *("--bundle", "--shared-chunk"),
+            )
+
+            files = {"home.js", "shop.js", "shared.js", "manifest.json"}
+            assert {path.name for path in Path("dist").iterdir()} == files
+            assert sorted(path.name for path in Path().iterdir()) == [
+                "common.py",
+                "dist",
+                "home.py",
+                "shop.py",
+            ]
@@ -0,0 +1,123 @@
+"""Tests for the minification of generated JavaScript."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt.compiler import py2js
+from prescrypt.minify import minify_js
+from prescrypt.sourcemap import SourceMapGenerator
+
+
+class TestMinifyJs:
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            ("let  x = 1 ;\n\n", "let x=1;"),
+            ("f( a,  b );\n// comment\ng();", "f(a,b);g();"),
+            ("/* block\ncomment */ x = 1;", "x=1;"),
+            ("if (x) {\n    y();\n}\n", "if(x){y();}"),
+        ],
+    )
+    def test_whitespace_and_comments_removed(self, code, expected):
+        assert minify_js(code) == expected
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "s='a  b // c';",
+            's="a \\"  b";',
+            "s=`a  ${ {x: 1}.x }  b`;",
+            "r=/a  b/g;",
+            "r=x.split(/ +/);",
+            "x=[/[/ ]/];",
+        ],
+    )
+    def test_literals_kept(self, code):
+        assert minify_js(code) == code
+
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            ("x = a / b / c;", "x=a/b/c;"),
+            ("x = (a) / 2;", "x=(a)/2;"),
+            ("x = a[0] / 2;", "x=a[0]/2;"),
+            # Regular expression
+            ("return /x/;", "return/x/;"),
+        ],
+    )
+    def test_division(self, code, expected):
+        assert minify_js(code) == expected
+
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            ("return x;", "return x;"),
+            ("x = a - -b;", "x=a- -b;"),
+            ("x = a + +b;", "x=a+ +b;"),
+            ("x = 1 .toString();", "x=1 .toString();"),
+            ("x = a / /b/;", "x=a/ /b/;"),
+        ],
+    )
+    def test_space_kept(self, code, expected):
+        assert minify_js(code) == expected
+
+    @pytest.mark.parametrize(
+        ("code", "expected"),
+        [
+            # Automatic semicolon insertion
+            ("return\nx", "return\nx"),
+            ("a = b\n(c)", "a=b\n(c)"),
+            ("class A {\n}\nA.x = 1;", "class A{}\nA.x=1;"),
+            # Not needed
+            ("a();\nb();", "a();b();"),
+            ("f(a,\n  b)", "f(a,b)"),
+            ("x\n.y()", "x.y()"),
+        ],
+    )
+    def test_line_breaks(self, code, expected):
+        assert minify_js(code) == expected
+
+    def test_source_map_remapped(self):
+        code = "let  x = 1;\n\n// comment\nfoo(  x );"
+        source_map = SourceMapGenerator("test.js")
+        source_map.add_mapping(gen_line=0, gen_column=5, src_line=0, src_column=0)
+        source_map.add_mapping(gen_line=3, gen_column=0, src_line=1, src_column=0)
+        source_map.add_mapping(gen_line=3, gen_column=4, src_line=1, src_column=4)
+        result = minify_js(code, source_map)
+
+        assert result == "let x=1;foo(x);"
+        positions = [(m.gen_line, m.gen_column) for m in source_map.mappings]
+        assert positions == [(0, 4), (0, 8), (0, 12)]
+        assert result[8:11] == "foo"
+        assert result[12] == "x"
+
+
+class TestMinifiedOutput:
+    CODE = (
+        "def total(values):\n"
+        "    result = 0\n"
+        "    for value in values:\n"
+        "        result += value\n"
+        "    return result\n"
+        "print(total([1, 2]))\n"
+    )
+
+    def test_locals_renamed(self):
+        js = py2js(self.CODE, include_stdlib=False, minify=True)
+        assert "result" not in js
+        # Keyword arguments use the parameter names
+        assert '__args__=["values"]' in js
+
+    def test_short_prefixes(self):
+        js = py2js(self.CODE, minify=True)
+        assert "_pyfunc_" not in js
+        assert "$f" in js
+
+    def test_prefixes_kept_without_stdlib(self):
+        js = py2js("print(str(x))", include_stdlib=False, minify=True)
+        assert "_pyfunc_str" in js
+
+    def test_custom_prefixes_kept(self):
+        js = py2js("print(str(x))", function_prefix="py_", minify=True)
+        assert "py_str(" in js
@@ -536,3 +536,59 @@ class TestJsFFI:
         # The subscript uses op_getitem, but .get() should NOT become _pymeth_get
         assert ".get('key')" in result
         assert "_pymeth_get" not in result
+
+
+class TestStdlibModuleImports:
+    """Test imports of stdlib modules implemented in the JS stdlib (heapq, bisect)."""
+
+    def test_from_import_no_es6_import(self):
+        """from heapq import heappush must not import a './heapq.js' module."""
+        code = "from heapq import heappush\nh = []\nheappush(h, 1)"
+        js = py2js(code, include_stdlib=False, module_mode=True)
+        assert "import {" not in js
+        assert "_pyfunc_heapq_heappush(h, 1)" in js
+
+    def test_from_import_alias(self):
+        code = "from heapq import heappop as pop\nx = pop(h)"
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_heapq_heappop(h)" in js
+
+    def test_module_attribute_call(self):
+        """import heapq; heapq.heappush() becomes a direct stdlib call."""
+        code = "import heapq as hq\nhq.heappush(h, 3)"
+        js = py2js(code, include_stdlib=False, module_mode=True)
+        assert "import * as" not in js
+        assert "_pyfunc_heapq_heappush(h, 3)" in js
+
+    def test_module_attribute_reference(self):
+        code = "import bisect\nf = bisect.insort"
+        js = py2js(code, include_stdlib=False)
+        assert "= _pyfunc_insort" in js
+
+    def test_nlargest_key_keyword(self):
+        code = "import heapq\nx = heapq.nlargest(2, xs, key=len)"
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_heapq_nlargest(2, xs, _pyfunc_op_len)" in js
+
+    def test_tree_shaking(self):
+        code = "from heapq import heappop\nx = heappop([3])"
+        js = py2js(code)
+        assert "_pyfunc_heapq_siftup" in js
+        assert "_pyfunc_heapq_heappush" not in js
+        assert "_pyfunc_heapq_nlargest" not in js
+
+    def test_unsupported_name(self):
+        from prescrypt.exceptions import JSError
+
+        with pytest.raises(JSError):
+            py2js("from heapq import merge", include_stdlib=False)
+
+    @pytest.mark.parametrize("name", ["heappush", "heapify", "nlargest"])
+    def test_user_function_same_name(self, name):
+        """A user function named like a heapq function is called, not heapq's."""
+        from prescrypt.testing import js_eval
+
+        code = f"def {name}(h, x):\n    return [x * 10]\n{name}([], 1)"
+        js = py2js(code)
+        assert "_pyfunc_heapq_" not in js
+        assert js_eval(js) == [10]
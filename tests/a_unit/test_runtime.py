@@ -0,0 +1,64 @@
+"""Tests for the shared stdlib runtime of module-mode builds."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from prescrypt.compiler import py2js
+from prescrypt.runtime import SharedRuntime
+
+
+class TestRuntimeImport:
+    def test_imports_used_functions(self):
+        js = py2js("print(str(x))", runtime_import="./prescrypt_runtime.js")
+        assert js.startswith("import { _pyfunc_str } from './prescrypt_runtime.js';\n")
+        assert "var _pyfunc_" not in js
+
+    def test_no_import_without_stdlib(self):
+        assert "import" not in py2js("x = 1", runtime_import="./rt.js")
+
+    def test_minified_prefixes(self):
+        js = py2js("print(str(x))", runtime_import="./rt.js", minify=True)
+        assert js.startswith("import{$fstr}from'./rt.js';")
+
+
+class TestSharedRuntime:
+    def test_exports_used_functions_and_dependencies(self):
+        runtime = SharedRuntime(Path("dist"))
+        runtime.add({"sorted"}, set())
+        runtime.add({"str"}, {"append"})
+        code = runtime.generate()
+        export = code.splitlines()[-1]
+        assert export.startswith("export { ")
+        for name in ["_pyfunc_sorted", "_pyfunc_str", "_pymeth_append"]:
+            assert f"var {name} = " in code
+            assert name in export
+        assert "_pyfunc_op_equals" not in export
+
+    def test_full_runtime_hashed(self):
+        runtime = SharedRuntime(Path("dist"), tree_shake=False)
+        name = runtime.path.name
+        assert name.startswith("prescrypt_runtime.")
+        assert len(name) == len("prescrypt_runtime.12345678.js")
+        runtime.add({"str"}, set())
+        assert runtime.path.name == name
+
+    def test_release(self):
+        runtime = SharedRuntime(Path("dist"), release=True)
+        runtime.add({"BaseException"}, set())
+        assert "captureStackTrace" not in runtime.generate()
+        assert "captureStackTrace" in SharedRuntime(Path("dist"), False).generate()
+
+    def test_import_path(self):
+        runtime = SharedRuntime(Path("dist"))
+        assert runtime.import_path(Path("dist/main.js")) == "./prescrypt_runtime.js"
+        assert (
+            runtime.import_path(Path("dist/a/b/c.js")) == "../../prescrypt_runtime.js"
+        )
+
+    def test_write(self, tmp_path):
+        runtime = SharedRuntime(tmp_path / "dist", minify=True)
+        runtime.add({"str"}, set())
+        path = runtime.write()
+        assert path == tmp_path / "dist" / "prescrypt_runtime.js"
+        assert "export{$fbytes_repr,$frepr,$fstr};" in path.read_text()
@@ -81,7 +81,7 @@ def foo():
     result: int = 0
     return result
 """
-        result = js(code)
+        result = py2js(code, include_stdlib=False, optimize=False)
         assert "const result = 0" in result
 
     def test_function_with_typed_params(self):
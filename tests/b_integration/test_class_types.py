@@ -0,0 +1,165 @@
+"""Tests for the types of class instances, their attributes and methods."""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+POINT = """
+class Point:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def get(self, axis):
+        return self.x if axis == "x" else self.y
+
+    def norm(self):
+        return abs(self.x) + abs(self.y)
+"""
+
+
+class TestAttributeTypes:
+    """Attributes with known types use native operators."""
+
+    def test_attributes_from_init(self):
+        code = POINT + "p = Point(1, 2)\nresult = p.x + p.y"
+        js = py2js(code, include_stdlib=False)
+        assert "(p.x + p.y)" in js
+        assert js_eval(py2js(code) + "\nresult;") == 3
+
+    def test_attributes_in_methods(self):
+        code = POINT + "result = Point(1, -2).norm() * 2"
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_mul" not in js
+        assert js_eval(py2js(code) + "\nresult;") == 6
+
+    def test_dataclass_fields(self):
+        code = """
+@dataclass
+class Item:
+    price: float
+    qty: int = 1
+
+    def cost(self):
+        return self.price * self.qty
+
+result = Item(1.5, 4).cost() + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "(this.price * this.qty)" in js
+        assert "_pyfunc_op_add" not in js
+
+    def test_assignment_through_unknown_receiver(self):
+        code = (
+            POINT
+            + """
+def reset(q):
+    q.x = "a"
+
+p = Point(1, 2)
+reset(p)
+result = p.x + p.y
+"""
+        )
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add(p.x, p.y)" in js
+        assert js_eval(py2js(code) + "\nresult;") == "a2"
+
+    def test_subclass_assignments(self):
+        code = """
+class Base:
+    def __init__(self):
+        self.value = 1
+
+class Derived(Base):
+    def __init__(self):
+        self.value = "one"
+
+def bump(obj: Base):
+    return obj.value + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add(obj.value, 1)" in js
+
+
+class TestMethodCalls:
+    """Methods of known classes are called directly."""
+
+    def test_method_named_like_builtin(self):
+        code = POINT + "p = Point(1, 2)\nresult = p.get('y')"
+        js = py2js(code, include_stdlib=False)
+        assert "p.get('y')" in js
+        assert "_pymeth_get" not in js
+        assert js_eval(py2js(code) + "\nresult;") == 2
+
+    def test_self_method_call(self):
+        code = """
+class Stack:
+    def __init__(self):
+        self.items = []
+
+    def append(self, item):
+        self.items.append(item)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "this.append(item)" in js
+
+    def test_unknown_receiver_uses_dispatch(self):
+        code = POINT + "def f(p):\n    return p.get('y')"
+        js = py2js(code, include_stdlib=False)
+        assert "_pymeth_get.call(p, 'y')" in js
+
+
+class TestNarrowing:
+    """isinstance() and None checks narrow the types of variables."""
+
+    def test_isinstance_class(self):
+        code = (
+            POINT
+            + """
+def total(obj):
+    if isinstance(obj, Point):
+        return obj.x + obj.y
+    return 0
+
+result = total(Point(1, 2)) + total("a")
+"""
+        )
+        js = py2js(code, include_stdlib=False)
+        assert "(obj.x + obj.y)" in js
+        assert js_eval(py2js(code) + "\nresult;") == 3
+
+    def test_isinstance_builtin(self):
+        code = """
+def double(x):
+    if isinstance(x, str):
+        return x + x
+    return x
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "(x + x)" in js
+
+    def test_optional_attribute(self):
+        code = """
+class Node:
+    def __init__(self, value: int, link: "Node | None" = None):
+        self.value = value
+        self.link = link
+
+def total(node: Node | None) -> int:
+    result = 0
+    while node is not None:
+        result = result + node.value
+        node = node.link
+    return result
+
+result = total(Node(1, Node(2)))
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "(result + node.value)" in js
+        assert js_eval(py2js(code) + "\nresult;") == 3
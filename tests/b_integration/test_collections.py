@@ -0,0 +1,92 @@
+"""Tests for collections.Counter, defaultdict and OrderedDict."""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+def js(code: str) -> str:
+    """Compile Python to JavaScript without stdlib."""
+    return py2js(code, include_stdlib=False)
+
+
+class TestItemIncrementCodegen:
+    def test_augmented_item_add_is_single_call(self):
+        result = js("d = {'a': 1}\nd['a'] += 1")
+        assert "_pyfunc_op_iadd_item(d, 'a', 1);" in result
+        assert "op_setitem" not in result
+
+    def test_other_augmented_item_ops_use_getitem(self):
+        result = js("d = {'a': 1}\nd['a'] -= 1")
+        assert "_pyfunc_op_getitem(d, 'a')" in result
+
+    def test_counter_subtraction_uses_helper(self):
+        code = "from collections import Counter\na = Counter('ab')\nb = a - a"
+        assert "_pyfunc_op_sub(a, a)" in js(code)
+
+    def test_numeric_subtraction_stays_native(self):
+        assert "op_sub" not in js("a = 3\nb = a - 1")
+
+
+class TestCollectionsRuntime:
+    def test_counter_increment(self):
+        code = (
+            "from collections import Counter\n"
+            "c = Counter()\n"
+            "for w in ['a', 'b', 'a']:\n"
+            "    c[w] += 1\n"
+            "[c['a'], c['b'], c['z'], len(c)]"
+        )
+        assert js_eval(py2js(code)) == [2, 1, 0, 2]
+
+    def test_most_common(self):
+        code = "from collections import Counter\nCounter('abracadabra').most_common(2)"
+        assert js_eval(py2js(code)) == [["a", 5], ["b", 2]]
+
+    def test_counter_keyword_counts(self):
+        code = (
+            "from collections import Counter\n"
+            "extra = {'d': 4}\n"
+            "c = Counter('aab', b=3, c=1, **extra)\n"
+            "[c['a'], c['b'], c['c'], c['d'], Counter(a=1, b=2) == {'a': 1, 'b': 2}]"
+        )
+        assert js_eval(py2js(code)) == [2, 4, 1, 4, True]
+
+    def test_counter_update_keyword_counts(self):
+        code = (
+            "from collections import Counter\n"
+            "c = Counter(a=1)\n"
+            "c.update('ab', a=2)\n"
+            "c.subtract(b=3)\n"
+            "d = {'a': 1}\n"
+            "d.update(b=2)\n"
+            "[c['a'], c['b'], d]"
+        )
+        assert js_eval(py2js(code)) == [4, -2, {"a": 1, "b": 2}]
+
+    def test_defaultdict_list(self):
+        code = (
+            "from collections import defaultdict\n"
+            "d = defaultdict(list)\n"
+            "d['x'].append(1)\n"
+            "d['x'].append(2)\n"
+            "d['y'].append(3)\n"
+            "[d['x'], d['y'], len(d)]"
+        )
+        assert js_eval(py2js(code)) == [[1, 2], [3], 2]
+
+    def test_plain_dict_missing_key_raises(self):
+        code = (
+            "d = {}\n"
+            "try:\n"
+            "    d['k'] += 1\n"
+            "    r = 'no error'\n"
+            "except KeyError:\n"
+            "    r = 'KeyError'\n"
+            "r"
+        )
+        assert js_eval(py2js(code)) == "KeyError"
+
+    def test_negative_index_increment(self):
+        assert js_eval(py2js("xs = [1, 2, 3]\nxs[-1] += 10\nxs")) == [1, 2, 13]
@@ -43,7 +43,7 @@ n = 42
 s = str(n)
 result = s + "!"
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_add" not in js
         assert "+" in js
 
@@ -64,7 +64,7 @@ s = "42"
 n = int(s)
 result = n + 8
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_add" not in js
         assert "+" in js
 
@@ -20,7 +20,7 @@ x = 10
 y = 20
 result = x == y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "===" in js
 
@@ -51,7 +51,7 @@ x = 10
 y = 20
 result = x != y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "!==" in js
 
@@ -76,7 +76,7 @@ x = "hello"
 y = "world"
 result = x == y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "===" in js
 
@@ -107,7 +107,7 @@ x = "hello"
 y = "world"
 result = x != y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "!==" in js
 
@@ -122,7 +122,7 @@ x = 1.5
 y = 2.5
 result = x == y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "===" in js
 
@@ -143,7 +143,7 @@ x = 10
 y = 10.0
 result = x == y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "===" in js
 
@@ -158,7 +158,7 @@ x = True
 y = False
 result = x == y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "===" in js
 
@@ -270,7 +270,7 @@ if x == 10:
 else:
     result = "no"
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_equals" not in js
         assert "===" in js
 
@@ -0,0 +1,116 @@
+"""Tests for guarded fast paths at operators on values of unknown type."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+def fast_js(code: str) -> str:
+    return py2js(code, include_stdlib=False, fast_paths=True)
+
+
+class TestOperators:
+    """Operators on untyped variables get inline type checks."""
+
+    def test_add(self):
+        js = fast_js("def f(a, b):\n    return a + b")
+        assert (
+            '((typeof a === "number" && typeof b === "number") ? (a + b) '
+            ": _pyfunc_op_add(a, b))"
+        ) in js
+
+    def test_string_hint(self):
+        js = fast_js("def f(name):\n    return 'Hi ' + name")
+        assert "(typeof name === \"string\" ? ('Hi ' + name) :" in js
+
+    def test_number_hint(self):
+        js = fast_js("def f(n):\n    return n < 10")
+        assert '(typeof n === "number" ? n < 10 : _pyfunc_op_lt(n, 10))' in js
+
+    def test_optional_operand(self):
+        js = fast_js("def f(a: int | None, b: int):\n    return a == b")
+        assert '(typeof a === "number" ? (a === b) : _pyfunc_op_equals(a, b))' in js
+
+    def test_not_equal(self):
+        js = fast_js("def f(a, b):\n    return a != b")
+        assert "? (a !== b) : !_pyfunc_op_equals(a, b))" in js
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "def f(a):\n    return g(a) + 1",  # operand evaluated twice
+            "def f(a: list):\n    return a + b",  # never a number
+            "def f(a: str):\n    return a + 1",  # mixed hints
+        ],
+    )
+    def test_no_fast_path(self, code):
+        js = fast_js(code)
+        assert "typeof" not in js
+        assert "_pyfunc_op_add" in js
+
+    def test_disabled_by_default(self):
+        js = py2js("def f(a, b):\n    return a + b", include_stdlib=False)
+        assert "typeof" not in js
+
+
+class TestSubscript:
+    """Subscripts check for arrays and non-negative integer indices."""
+
+    def test_unknown_operands(self):
+        js = fast_js("def f(xs, i):\n    return xs[i]")
+        assert (
+            "((Array.isArray(xs) && (i >>> 0) === i) ? xs[i] "
+            ": _pyfunc_op_getitem(xs, i))"
+        ) in js
+
+    def test_typed_operands(self):
+        js = fast_js("def f(xs: list[int], i: int):\n    return xs[i]")
+        assert "(i >= 0 ? xs[i] : _pyfunc_op_getitem(xs, i))" in js
+
+    def test_constant_index(self):
+        js = fast_js("def f(xs: list[int]):\n    return xs[0]")
+        assert "return xs[0];" in js
+
+    def test_negative_constant_index(self):
+        js = fast_js("def f(xs: list[int]):\n    return xs[-1]")
+        assert "return _pyfunc_op_getitem(xs, -1);" in js
+
+    def test_store_unchanged(self):
+        js = fast_js("def f(xs, i):\n    xs[i] = 1")
+        assert "Array.isArray" not in js
+
+
+@pytest.mark.parametrize(
+    ("expr", "expected"),
+    [
+        ("add(1, 2)", 3),
+        ("add('a', 'b')", "ab"),
+        ("add([1], [2])", [1, 2]),
+        ("same(1, True)", True),
+        ("same([1], [1])", True),
+        ("less('a', 'b')", True),
+        ("first([1, 2, 3], -1)", 3),
+        ("first('abc', 1)", "b"),
+        ("first({'k': 5}, 'k')", 5),
+    ],
+)
+def test_semantics(expr, expected):
+    code = f"""
+def add(a, b):
+    return a + b
+
+def same(a, b):
+    return a == b
+
+def less(a, b):
+    return a < b
+
+def first(xs, i):
+    return xs[i]
+
+result = {expr}
+"""
+    assert js_eval(py2js(code, fast_paths=True) + "\nresult;") == expected
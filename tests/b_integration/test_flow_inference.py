@@ -0,0 +1,133 @@
+"""Tests for flow-sensitive type inference.
+
+Variable types follow reassignments, are joined where branches meet and
+are widened over loop iterations.
+"""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+class TestNumericLoops:
+    """Unannotated numeric loops compile to native operators."""
+
+    def test_range_accumulator(self):
+        code = """
+def f(n):
+    total = 0
+    for i in range(n):
+        total = total + i * 2
+    return total
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+        assert "_pyfunc_op_mul" not in js
+
+    def test_nested_loops(self):
+        code = """
+def f(n):
+    count = 0
+    for i in range(n):
+        for j in range(i):
+            if i == j + 1:
+                count = count + 1
+    return count
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+        assert "_pyfunc_op_equals" not in js
+
+    def test_while_counter(self):
+        code = """
+i = 0
+s = 0.0
+while i < 10:
+    s = s + i / 2
+    i = i + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+        assert "_pyfunc_op_lt" not in js
+
+    def test_result(self):
+        code = """
+def f(n):
+    total = 0
+    for i in range(n):
+        total = total + i * 2
+    return total
+
+result = f(5)
+"""
+        assert js_eval(py2js(code) + "\nresult;") == 20
+
+
+class TestWidening:
+    """Types assigned later in a loop body reach its head."""
+
+    def test_reassigned_in_loop_uses_helper(self):
+        code = """
+def f(items):
+    x = 0
+    for item in items:
+        y = x + 1
+        x = [item]
+    return y
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add(x, 1)" in js
+
+    def test_reassigned_in_loop_result(self):
+        code = """
+def f():
+    x = 0
+    y = None
+    for item in ["a", "b"]:
+        y = x + x
+        x = [item]
+    return y
+
+result = f()
+"""
+        assert js_eval(py2js(code) + "\nresult.join();") == "a,a"
+
+
+class TestBranches:
+    """Types from both branches of an if are joined."""
+
+    def test_same_type_in_both_branches(self):
+        code = """
+def f(c):
+    if c:
+        x = 1
+    else:
+        x = 2
+    return x + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_optional_after_branch_uses_helper(self):
+        code = """
+def f(c):
+    x = None
+    if c:
+        x = 1
+    return x + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" in js
+
+    def test_early_return_branch_is_ignored(self):
+        code = """
+def f(c):
+    x = 1
+    if c:
+        x = "a"
+        return x
+    return x + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
@@ -0,0 +1,95 @@
+"""Tests for functools.cache / functools.lru_cache."""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+def js(code: str) -> str:
+    """Compile Python to JavaScript without stdlib."""
+    return py2js(code, include_stdlib=False)
+
+
+FIB = """
+@{decorator}
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+"""
+
+
+class TestCacheCodegen:
+    def test_cache_decorator(self):
+        code = "from functools import cache\n" + FIB.format(decorator="cache")
+        result = js(code)
+        assert "fib = _pyfunc_functools_cache(fib);" in result
+
+    def test_lru_cache_maxsize_keyword(self):
+        code = "import functools\n" + FIB.format(
+            decorator="functools.lru_cache(maxsize=32)"
+        )
+        result = js(code)
+        assert "fib = _pyfunc_functools_lru_cache(32)(fib);" in result
+
+    def test_decorated_function_is_anonymous(self):
+        """Recursive calls must go through the decorated name."""
+        code = "from functools import cache\n" + FIB.format(decorator="cache")
+        result = js(code)
+        assert "var fib = function(n)" in result
+        assert "function fib(" not in result
+
+    def test_undecorated_function_keeps_name(self):
+        result = js("def f(n):\n    return n")
+        assert "var f = function f(n)" in result
+
+    def test_method_decorator(self):
+        code = (
+            "import functools\n"
+            "class A:\n"
+            "    @functools.cache\n"
+            "    def f(self, x):\n"
+            "        return x\n"
+        )
+        result = js(code)
+        assert "A.prototype.f = _pyfunc_functools_cache(A.prototype.f);" in result
+
+
+class TestCacheRuntime:
+    def test_recursion_is_memoized(self):
+        code = (
+            "from functools import lru_cache\n"
+            + FIB.format(decorator="lru_cache(maxsize=None)")
+            + "fib(30)\n"
+            "info = fib.cache_info()\n"
+            "[fib(30), info.hits, info.misses, info.currsize]"
+        )
+        assert js_eval(py2js(code)) == [832040, 28, 31, 31]
+
+    def test_lru_eviction(self):
+        code = (
+            "from functools import lru_cache\n"
+            "calls = []\n"
+            "@lru_cache(maxsize=2)\n"
+            "def f(x):\n"
+            "    calls.append(x)\n"
+            "    return x\n"
+            "for x in [1, 2, 1, 3, 2, 1]:\n"
+            "    f(x)\n"
+            "calls"
+        )
+        assert js_eval(py2js(code)) == [1, 2, 3, 2, 1]
+
+    def test_multiple_arguments_and_clear(self):
+        code = (
+            "from functools import cache\n"
+            "@cache\n"
+            "def add(a, b):\n"
+            "    return a + b\n"
+            "r = [add(1, 2), add(1, 2), add('1', '2'), add(12, 0)]\n"
+            "hits = add.cache_info().hits\n"
+            "add.cache_clear()\n"
+            "[hits, add.cache_info().currsize]"
+        )
+        assert js_eval(py2js(code)) == [1, 0]
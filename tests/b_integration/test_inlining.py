@@ -0,0 +1,77 @@
+"""Tests for the inlining of small functions."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.compiler import Compiler
+from prescrypt.testing import js_eval
+
+
+def test_inlined_call():
+    code = "def square(x):\n    return x * x\n\ndef f(n: int):\n    return square(n)"
+    js = py2js(code, include_stdlib=False)
+    assert "return (n * n);" in js
+
+
+def test_types_of_inlined_code():
+    # The inlined value has the type of the arguments
+    code = (
+        "def add(a, b):\n    return a + b\n\n"
+        "def f(x: int, y: int):\n    return add(x, y)"
+    )
+    js = py2js(code, include_stdlib=False)
+    assert "return (x + y);" in js
+
+
+def test_not_inlined_without_optimize():
+    code = "def square(x):\n    return x * x\n\ny = square(3)"
+    js = py2js(code, include_stdlib=False, optimize=False)
+    assert "square(3)" in js
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        # Arguments are evaluated once, in order
+        (
+            (
+                "log = []\n"
+                "def g(x):\n    log.append(x)\n    return x\n"
+                "def sub(a, b):\n    return a - b\n"
+                "def square(x):\n    return x * x\n"
+                "result = [sub(g(1), g(2)), square(g(3)), log]"
+            ),
+            [-1, 9, [1, 2, 3]],
+        ),
+        # The names of the function keep their meaning
+        (
+            (
+                "k = 10\n"
+                "def f(x):\n    return x + k\n"
+                "def g(k):\n    return f(k)\n"
+                "result = g(1)"
+            ),
+            11,
+        ),
+        # Recursion is left alone
+        (
+            (
+                "def fact(n):\n    return 1 if n <= 1 else n * fact(n - 1)\n"
+                "result = fact(5)"
+            ),
+            120,
+        ),
+        # Bools are numbers
+        ("def same(a, b):\n    return a == b\nresult = same(1, True)", True),
+    ],
+)
+def test_semantics(code, expected):
+    assert js_eval(py2js(code) + "\nresult;") == expected
+
+
+def test_verbose_count(capsys):
+    code = "def square(x):\n    return x * x\n\ny = square(2) + square(3)"
+    Compiler().compile(code, verbosity=1)
+    assert "Inlined calls: 2" in capsys.readouterr().err
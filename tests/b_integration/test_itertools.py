@@ -0,0 +1,170 @@
+"""Tests for the itertools module (lazy iterators in the JS stdlib)."""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+def js(code: str) -> str:
+    """Compile Python to JavaScript without stdlib."""
+    return py2js(code, include_stdlib=False)
+
+
+class TestItertoolsCodegen:
+    """Calls compile to prefixed stdlib generators."""
+
+    def test_from_import(self):
+        code = "from itertools import islice\nx = islice(xs, 3)"
+        result = js(code)
+        assert "_pyfunc_itertools_islice(xs, 3)" in result
+
+    def test_module_attribute(self):
+        code = "import itertools\nx = itertools.chain(a, b)"
+        result = js(code)
+        assert "_pyfunc_itertools_chain(a, b)" in result
+
+    def test_chain_from_iterable(self):
+        code = "from itertools import chain\nx = chain.from_iterable(xs)"
+        result = js(code)
+        assert "_pyfunc_itertools_chain_from_iterable(xs)" in result
+
+    def test_product_repeat_first(self):
+        code = "from itertools import product\nx = product(a, b, repeat=2)"
+        result = js(code)
+        assert "_pyfunc_itertools_product(2, a, b)" in result
+
+    def test_keyword_arguments_positional(self):
+        code = "from itertools import accumulate\nx = accumulate(xs, initial=0)"
+        result = js(code)
+        assert "_pyfunc_itertools_accumulate(xs, undefined, 0)" in result
+
+    def test_user_function_not_hijacked(self):
+        """A user-defined count() is not replaced without an itertools import."""
+        code = "def count():\n    return 1\nx = count()"
+        result = js(code)
+        assert "_pyfunc_itertools_count" not in result
+
+    def test_tree_shaking(self):
+        code = "from itertools import islice, count\nx = list(islice(count(), 3))"
+        result = py2js(code)
+        assert "_pyfunc_itertools_islice" in result
+        assert "_pyfunc_itertools_count" in result
+        assert "_pyfunc_itertools_product" not in result
+        assert "_pyfunc_itertools_groupby" not in result
+
+
+class TestLazyLoops:
+    """Loops over lazy iterators pull items instead of materializing them."""
+
+    def test_for_loop_uses_next(self):
+        code = "from itertools import count\nfor i in count():\n    break"
+        result = js(code)
+        assert ".next(); !" in result
+        assert "= [..." not in result
+
+    def test_for_loop_over_list_indexed(self):
+        code = "for i in xs:\n    pass"
+        result = js(code)
+        assert "Array.isArray(_pytmp_1_seq) ? null" in result
+        assert ".length" in result
+        assert "[..." not in result
+
+    def test_infinite_iterator_with_break(self):
+        code = (
+            "from itertools import count\n"
+            "res = []\n"
+            "for i in count(5):\n"
+            "    if i > 7:\n"
+            "        break\n"
+            "    res.append(i)\n"
+            "res"
+        )
+        assert js_eval(py2js(code)) == [5, 6, 7]
+
+    def test_list_comprehension_over_groupby(self):
+        code = (
+            "from itertools import groupby\n"
+            "[len(list(g)) for k, g in groupby('aabccc')]"
+        )
+        assert js_eval(py2js(code)) == [2, 1, 3]
+
+    def test_list_comprehension_over_generator_function(self):
+        code = "def gen():\n    yield 1\n    yield 2\n[x * 10 for x in gen()]"
+        assert js_eval(py2js(code)) == [10, 20]
+
+
+class TestStoredIterators:
+    """Iterators stored in a variable are consumed lazily too."""
+
+    def test_infinite_iterator_with_break(self):
+        code = (
+            "from itertools import count\n"
+            "c = count()\n"
+            "res = []\n"
+            "for i in c:\n"
+            "    if i > 2:\n"
+            "        break\n"
+            "    res.append(i)\n"
+            "res.append(next(c))\n"
+            "res"
+        )
+        assert js_eval(py2js(code)) == [0, 1, 2, 4]
+
+    def test_generator_resumes_after_break(self):
+        code = (
+            "def gen():\n"
+            "    yield 1\n"
+            "    yield 2\n"
+            "    yield 3\n"
+            "g = gen()\n"
+            "for x in g:\n"
+            "    break\n"
+            "[x for x in g]"
+        )
+        assert js_eval(py2js(code)) == [2, 3]
+
+    def test_zip_with_infinite_iterator(self):
+        code = "from itertools import count\nc = count()\nlist(zip(c, 'xyz'))"
+        assert js_eval(py2js(code)) == [[0, "x"], [1, "y"], [2, "z"]]
+
+    def test_map_over_islice(self):
+        code = (
+            "from itertools import count, islice\n"
+            "it = islice(count(), 3)\n"
+            "list(map(lambda x: x * 2, it))"
+        )
+        assert js_eval(py2js(code)) == [0, 2, 4]
+
+    def test_map_over_infinite_iterator(self):
+        code = (
+            "from itertools import count\n"
+            "squares = map(lambda x: x * x, count(1))\n"
+            "[next(squares), next(squares), next(squares)]"
+        )
+        assert js_eval(py2js(code)) == [1, 4, 9]
+
+    def test_enumerate_and_filter_infinite_iterator(self):
+        code = (
+            "from itertools import count\n"
+            "odd = filter(lambda x: x % 2, count())\n"
+            "res = []\n"
+            "for i, x in enumerate(odd):\n"
+            "    if i == 3:\n"
+            "        break\n"
+            "    res.append(x)\n"
+            "res"
+        )
+        assert js_eval(py2js(code)) == [1, 3, 5]
+
+    def test_in_consumes_iterator(self):
+        code = (
+            "from itertools import chain\n"
+            "c = chain([1, 2], [3, 4])\n"
+            "[2 in c, next(c), 9 in c]"
+        )
+        assert js_eval(py2js(code)) == [True, 3, False]
+
+    def test_dict_of_lazy_zip(self):
+        code = "from itertools import count\nc = count(1)\ndict(zip('ab', c))"
+        assert js_eval(py2js(code)) == {"a": 1, "b": 2}
@@ -99,25 +99,33 @@ obj.update(data)
 class TestJSTypeVsRegularDict:
     """Compare behavior between JS-typed and regular dict."""
 
-    def test_regular_dict_uses_pymeth(self):
-        """Regular dicts should still use _pymeth_ methods."""
+    def test_regular_dict_uses_python_get(self):
+        """Regular dicts should keep the Python dict methods."""
         code = """
 obj = {"key": "value"}
 value = obj.get("key")
 """
         js = py2js(code, include_stdlib=False)
-        # Regular dict should use _pymeth_get
-        assert "_pymeth_get" in js
+        # Known dicts get the native equivalent of dict.get, not JS .get()
+        assert "(obj['key'] ?? null)" in js
 
-    def test_annotated_dict_still_uses_pymeth(self):
-        """Variables typed as dict should still use _pymeth_."""
+    def test_annotated_dict_still_uses_python_get(self):
+        """Variables typed as dict should keep the Python dict methods."""
         code = """
 obj: dict = {"key": "value"}
 value = obj.get("key")
 """
         js = py2js(code, include_stdlib=False)
-        # dict-typed should still use _pymeth_get for Python compatibility
-        assert "_pymeth_get" in js
+        assert "obj.get(" not in js
+
+    def test_unknown_receiver_uses_pymeth(self):
+        """Receivers of unknown type should use _pymeth_ methods."""
+        code = """
+def lookup(obj):
+    return obj.get("key")
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pymeth_get.call(obj, 'key')" in js
 
 
 class TestJSTypeTypeChecking:
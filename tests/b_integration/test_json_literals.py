@@ -0,0 +1,38 @@
+"""Tests for big constant literals emitted as JSON.parse blobs."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+TABLE = [{"name": f"item{i}", "tags": ["a", "b"], "price": i * 1.5} for i in range(50)]
+PAIRS = {i: (i, str(i)) for i in range(100)}
+
+
+def run(code: str, json_threshold: int | None = 100) -> str:
+    js = py2js(code, json_threshold=json_threshold)
+    return js_eval(js + "\nresult;")
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        f"TABLE = {TABLE!r}\nresult = repr(TABLE[3])",
+        f"T = {tuple(range(100))!r}\nresult = repr(T[:3])",
+        f"D = {PAIRS!r}\nresult = repr(D[7])",
+        f"L = {[(i, 'x') for i in range(100)]!r}\nresult = repr(L[:2])",
+        f"G = {[[i] * 20 for i in range(20)]!r}\nresult = repr(G[1][:3])",
+    ],
+)
+def test_same_values(code):
+    expected = run(code, json_threshold=None)
+    assert run(code) == expected
+    assert "JSON.parse" in py2js(code, json_threshold=100)
+
+
+def test_in_function():
+    code = f"def f():\n    return {TABLE!r}\nresult = f()[0]['name']"
+    assert "JSON.parse" not in py2js(code, json_threshold=100)
+    assert run(code) == "item0"
@@ -0,0 +1,118 @@
+"""Tests for native JS method calls on str, list and dict receivers."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.compiler import Compiler
+from prescrypt.testing import js_eval
+
+
+class TestStringMethods:
+    """Methods of known strings compile to the JS string methods."""
+
+    @pytest.mark.parametrize(
+        ("call", "expected"),
+        [
+            ("s.upper()", "s.toUpperCase()"),
+            ("s.strip()", "s.trim()"),
+            ("s.startswith('a')", "s.startsWith('a')"),
+            ("s.find('a')", "s.indexOf('a')"),
+            ("s.split(',')", "s.split(',')"),
+            ("s.replace('a', 'b')", "s.split('a').join('b')"),
+            ("','.join(parts)", "parts.join(',')"),
+        ],
+    )
+    def test_native_calls(self, call, expected):
+        code = f"def f(s: str, parts: list[str]):\n    return {call}"
+        js = py2js(code, include_stdlib=False)
+        assert expected in js
+        assert "_pymeth_" not in js
+
+    @pytest.mark.parametrize(
+        "call",
+        [
+            "s.split()",  # splits on runs of whitespace
+            "s.split('')",  # raises ValueError
+            "s.replace(old, 'b')",  # old may be empty
+            "s.startswith(prefixes)",  # may be a tuple
+            "s.find('a', 1)",
+        ],
+    )
+    def test_generic_calls(self, call):
+        code = f"def f(s: str, old: str, prefixes):\n    return {call}"
+        js = py2js(code, include_stdlib=False)
+        assert "_pymeth_" in js
+
+    def test_replace_keeps_dollar_signs(self):
+        code = "result = 'a-b'.replace('-', '$&')"
+        assert js_eval(py2js(code) + "\nresult;") == "a$&b"
+
+
+class TestListMethods:
+    """Methods of known lists compile to the JS array methods."""
+
+    def test_append_statement(self):
+        code = "xs = [1]\nxs.append(2)\nresult = len(xs)"
+        js = py2js(code, include_stdlib=False)
+        assert "xs.push(2);" in js
+        assert js_eval(py2js(code) + "\nresult;") == 2
+
+    def test_append_value_uses_dispatch(self):
+        # push() returns the new length, append() returns None
+        code = "xs = [1]\nresult = xs.append(2)"
+        js = py2js(code, include_stdlib=False)
+        assert "_pymeth_append.call(xs, 2)" in js
+        assert js_eval(py2js(code) + "\nresult;") is None
+
+    def test_insert_negative_index(self):
+        code = "xs = [1, 2, 3]\nxs.insert(-1, 9)\nxs.insert(-10, 0)\nresult = xs"
+        js = py2js(code, include_stdlib=False)
+        assert "xs.splice(-1, 0, 9);" in js
+        assert js_eval(py2js(code) + "\nresult;") == [0, 1, 2, 9, 3]
+
+    def test_extend_with_string(self):
+        code = "xs = ['a']\nxs.extend('bc')\nresult = xs"
+        js = py2js(code, include_stdlib=False)
+        assert "xs.push(...'bc');" in js
+        assert js_eval(py2js(code) + "\nresult;") == ["a", "b", "c"]
+
+    def test_unknown_receiver_uses_dispatch(self):
+        code = "def f(xs):\n    xs.append(1)"
+        js = py2js(code, include_stdlib=False)
+        assert "_pymeth_append.call(xs, 1)" in js
+
+
+class TestDictMethods:
+    """Methods of known dicts compile to property lookups."""
+
+    def test_get(self):
+        code = "d = {'a': 1}\nresult = [d.get('a'), d.get('b')]"
+        js = py2js(code, include_stdlib=False)
+        assert "(d['a'] ?? null)" in js
+        assert js_eval(py2js(code) + "\nresult;") == [1, None]
+
+    def test_get_with_default(self):
+        code = "d = {'a': 1}\nresult = d.get('b', 0) + 1"
+        js = py2js(code, include_stdlib=False)
+        assert "(d['b'] ?? 0)" in js
+        assert js_eval(py2js(code) + "\nresult;") == 1
+
+    def test_get_with_default_of_optional_values(self):
+        # `??` would replace None values with the default
+        code = "d = {'a': None, 'b': 2}\nresult = d.get('a', 0)"
+        js = py2js(code, include_stdlib=False)
+        assert "_pymeth_get.call(d, 'a', 0)" in js
+        assert js_eval(py2js(code) + "\nresult;") is None
+
+    def test_items(self):
+        code = "def f(d: dict[str, int]):\n    return d.items()"
+        js = py2js(code, include_stdlib=False)
+        assert "Object.entries(d)" in js
+
+
+def test_verbose_counts(capsys):
+    code = "xs = []\nxs.append(1)\n\ndef f(ys):\n    ys.append(1)"
+    Compiler().compile(code, verbosity=1)
+    assert "Method calls: 1 specialized, 1 generic" in capsys.readouterr().err
@@ -0,0 +1,166 @@
+"""Tests for parameterized types: list[int], dict[str, float], tuple[int, str].
+
+Element types flow through subscripts, loops, unpacking and comprehensions,
+so arithmetic and comparisons on container items use native operators.
+"""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+class TestElementAccess:
+    """Items of typed containers have the element type."""
+
+    def test_list_item_uses_native_add(self):
+        code = """
+def f(xs: list[int], i: int) -> int:
+    return xs[i] + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+        assert "_pyfunc_op_getitem(xs, i) + 1" in js
+
+    def test_dict_value_uses_native_add(self):
+        code = """
+def f(d: dict[str, float], k: str) -> float:
+    return d[k] + 0.5
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_tuple_item_types(self):
+        code = """
+def f(t: tuple[int, str]) -> str:
+    return t[1] + "!"
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_list_literal_item_uses_native_compare(self):
+        code = """
+xs = [1, 2, 3]
+same = xs[0] == xs[1]
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_equals" not in js
+        assert "===" in js
+
+    def test_mixed_list_uses_helper(self):
+        code = """
+xs = [1, "a"]
+y = xs[0] + xs[0]
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" in js
+
+    def test_optional_uses_helper(self):
+        code = """
+def f(x: int | None) -> int:
+    return x + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" in js
+
+    def test_dict_get_without_default_uses_helper(self):
+        code = """
+def f(d: dict[str, int]) -> int:
+    return d.get("a") + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" in js
+
+    def test_dict_get_with_default_uses_native(self):
+        code = """
+def f(d: dict[str, int]) -> int:
+    return d.get("a", 0) + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+
+class TestElementPropagation:
+    """Element types flow through loops, unpacking and comprehensions."""
+
+    def test_for_loop_over_range(self):
+        code = """
+total = 0
+for i in range(10):
+    total = total + i
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_for_loop_over_typed_list(self):
+        code = """
+def f(xs: list[float]) -> float:
+    total = 0.0
+    for x in xs:
+        total = total + x
+    return total
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_items_unpacking(self):
+        code = """
+def f(d: dict[str, int]) -> int:
+    total = 0
+    for k, v in d.items():
+        total = total + v
+    return total
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_int_dict_keys_stay_unknown(self):
+        # Keys of JS objects are strings at runtime
+        code = """
+def f(d: dict[int, int]) -> int:
+    total = 0
+    for k in d:
+        total = total + k
+    return total
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" in js
+
+    def test_append_refines_empty_list(self):
+        code = """
+xs = []
+xs.append(1)
+y = xs[0] + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_comprehension_element(self):
+        code = """
+def f(xs: list[int]) -> list[int]:
+    return [x + 1 for x in xs]
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+
+    def test_comprehension_variable_does_not_leak(self):
+        code = """
+x = "a"
+ys = [x for x in [1, 2]]
+z = x + x
+"""
+        js = py2js(code)
+        assert js_eval(js + "\nz;") == "aa"
+
+
+class TestFStrings:
+    """f-strings with typed items build strings, not numbers."""
+
+    def test_single_int_item(self):
+        assert js_eval(py2js("xs = [1, 2]; f'{xs[1]}'")) == "2"
+
+    def test_adjacent_ints_are_concatenated(self):
+        assert js_eval(py2js("a = 1; b = 2; f'{a}{b}'")) == "12"
+
+    def test_bool_is_capitalized(self):
+        assert js_eval(py2js("flag = True; f'Flag is {flag}'")) == "Flag is True"
@@ -0,0 +1,94 @@
+"""Tests for profile-guided optimization: instrumented builds and profiles."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.codegen.profile import Profile
+from prescrypt.exceptions import PrescryptError
+from prescrypt.testing import js_eval
+
+CODE = """
+def add(a, b):
+    return a + b
+
+def first(xs):
+    return xs[0]
+
+def push(xs, value):
+    xs.append(value)
+
+items = []
+for i in range(3):
+    push(items, add(i, 1))
+result = first(items)
+"""
+
+SITES = {
+    "app.py:3:11:op_add": {"number,number": 3},
+    "app.py:9:4:append": {"list": 3},
+    "app.py:6:11:op_getitem": {"list,number": 1},
+}
+
+
+class TestInstrument:
+    """Instrumented builds record the types seen at generic sites."""
+
+    def test_sites(self):
+        js = py2js(CODE, include_stdlib=False, instrument=True, source_name="app.py")
+        assert "_pyfunc_pgo_call('app.py:3:11:op_add', _pyfunc_op_add, a, b)" in js
+        assert (
+            "_pyfunc_pgo_method('app.py:9:4:append', _pymeth_append, xs, value)" in js
+        )
+
+    def test_recorded_types(self):
+        # Not inlined, so that the calls run the instrumented functions
+        js = py2js(CODE, instrument=True, source_name="app.py", optimize=False)
+        sites = js_eval(js + "\nglobalThis.__prescrypt_profile.sites;")
+        assert sites == SITES
+
+    def test_typed_sites_not_instrumented(self):
+        js = py2js("def f(a: int):\n    return a + 1", instrument=True)
+        assert "pgo_call(" not in js
+
+
+class TestProfile:
+    """Sites that saw one combination of types get guarded native code."""
+
+    def test_monomorphic_sites(self):
+        profile = Profile(SITES)
+        js = py2js(CODE, include_stdlib=False, profile=profile, source_name="app.py")
+        assert (
+            '((typeof a === "number" && typeof b === "number") ? (a + b) : '
+            "_pyfunc_op_add(a, b))"
+        ) in js
+        assert "(Array.isArray(xs) ? xs.push(value) : " in js
+        assert "(Array.isArray(xs) ? xs[0] : _pyfunc_op_getitem(xs, 0))" in js
+        assert js_eval(py2js(CODE, profile=profile) + "\nresult;") == 1
+
+    def test_polymorphic_site(self):
+        profile = Profile({"3:11:op_add": {"number,number": 3, "string,string": 1}})
+        js = py2js(CODE, include_stdlib=False, profile=profile)
+        assert "return _pyfunc_op_add(a, b);" in js
+
+    def test_unsupported_types(self):
+        profile = Profile({"3:11:op_add": {"list,list": 3}})
+        js = py2js(CODE, include_stdlib=False, profile=profile)
+        assert "return _pyfunc_op_add(a, b);" in js
+
+    def test_load(self, tmp_path):
+        path = tmp_path / "profile.json"
+        path.write_text(json.dumps({"version": 1, "sites": SITES}))
+        profile = Profile.load(path)
+        assert profile.observed("app.py:3:11:op_add") == ("number", "number")
+        assert profile.observed("app.py:1:0:op_add") is None
+
+    @pytest.mark.parametrize("content", ["{", '{"sites": {}}'])
+    def test_load_invalid(self, tmp_path, content):
+        path = tmp_path / "profile.json"
+        path.write_text(content)
+        with pytest.raises(PrescryptError):
+            Profile.load(path)
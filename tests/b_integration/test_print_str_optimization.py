@@ -12,8 +12,11 @@ from prescrypt import py2js
 
 
 def js(code: str) -> str:
-    """Compile Python to JavaScript without stdlib."""
-    return py2js(code, include_stdlib=False)
+    """Compile Python to JavaScript without stdlib.
+
+    Without optimizations, so that calls to small functions aren't inlined.
+    """
+    return py2js(code, include_stdlib=False, optimize=False)
 
 
 class TestPrintOptimization:
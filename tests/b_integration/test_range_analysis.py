@@ -0,0 +1,105 @@
+"""Tests for the code generated from integer ranges."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+def run(code: str):
+    """Run code, returning the value of `result`."""
+    return js_eval(py2js(code) + "\nresult;")
+
+
+class TestIndex:
+    """Non-negative int indexes into lists, tuples and strings are native."""
+
+    def test_range_loop(self):
+        code = (
+            "def f(xs: list[int], n: int):\n"
+            "    for i in range(n):\n"
+            "        print(xs[i])"
+        )
+        js = py2js(code, include_stdlib=False)
+        assert "console.log(xs[i])" in js
+        assert "_pyfunc_op_getitem" not in js
+
+    def test_guarded_index(self):
+        code = "def f(s: str, i: int):\n    if i >= 0:\n        return s[i]"
+        js = py2js(code, include_stdlib=False)
+        assert "return s[i];" in js
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "def f(xs: list[int], i: int):\n    return xs[i]",
+            "def f(xs, n: int):\n    for i in range(n):\n        print(xs[i])",
+            "def f(xs: list[int]):\n    return xs[len(xs) - 1]",
+        ],
+    )
+    def test_generic_index(self, code):
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_getitem" in js
+
+    def test_negative_index(self):
+        assert run("xs = [1, 2, 3]\ni = 0\ni -= 1\nresult = xs[i]") == 3
+
+
+class TestModulo:
+    """% keeps the sign of the divisor unless the operands are non-negative."""
+
+    def test_non_negative_operands(self):
+        code = "def f(n: int):\n    for i in range(n):\n        print(i % 3)"
+        js = py2js(code, include_stdlib=False)
+        assert "console.log((i % 3))" in js
+
+    def test_sign_fixup(self):
+        code = "def f(a: int, b: int):\n    return a % b"
+        js = py2js(code, include_stdlib=False)
+        assert "return ((a % b) + b) % b;" in js
+
+    def test_unknown_operands(self):
+        code = "def f(a, b: int):\n    return a % b"
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_mod(a, b)" in js
+
+    @pytest.mark.parametrize(
+        ("a", "b", "expected"),
+        [(7, 3, 1), (-7, 3, 2), (7, -3, -2), (-7, -3, -1), (-7.5, 2, 0.5)],
+    )
+    def test_python_semantics(self, a, b, expected):
+        code = f"def f(a: int, b: int):\n    return a % b\nresult = f({a}, {b})"
+        assert run(code) == expected
+
+    def test_divisor_expression(self):
+        code = "def f(a: int, b: int):\n    return a % (b + 1)\nresult = f(-7, 2)"
+        assert run(code) == 2
+
+
+class TestFloorDivision:
+    """// of a bounded non-negative number truncates instead of flooring."""
+
+    def test_bounded_dividend(self):
+        code = "def f(xs: list[int]):\n    return len(xs) // 2"
+        js = py2js(code, include_stdlib=False)
+        assert ">>> 0" in js
+        assert "Math.floor" not in js
+        assert run(f"{code}\nresult = f([1, 2, 3, 4, 5])") == 2
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "def f(a: int):\n    return a // 2",
+            "def f(xs: list[int]):\n    return (len(xs) - 1) // 2",
+            "def f(xs: list[int], d: float):\n    return len(xs) // d",
+        ],
+    )
+    def test_floor(self, code):
+        js = py2js(code, include_stdlib=False)
+        assert "Math.floor" in js
+
+    def test_negative_dividend(self):
+        code = "def f(xs: list[int]):\n    return (len(xs) - 1) // 2\nresult = f([])"
+        assert run(code) == -1
@@ -0,0 +1,99 @@
+"""Tests for the re module."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.codegen.stdlib_py.regex import regex_literal, translate_pattern
+from prescrypt.exceptions import JSError
+from prescrypt.testing import js_eval
+
+
+def js(code: str) -> str:
+    """Compile Python to JavaScript without stdlib."""
+    return py2js(code, include_stdlib=False)
+
+
+class TestRegexCodegen:
+    def test_module_level_literal_is_precompiled(self):
+        result = js('import re\nP = re.compile(r"\\d+/\\d+", re.I | re.M)')
+        assert "new _pyfunc_re_Pattern(/\\d+\\/\\d+/gim, " in result
+        assert "re_compile" not in result
+
+    def test_literal_in_function_uses_cache(self):
+        result = js('import re\ndef f(s):\n    return re.compile(r"\\d+").match(s)')
+        assert "_pyfunc_re_compile('\\\\d+')" in result
+
+    def test_dynamic_flags_use_cache(self):
+        result = js('import re\ndef f(flags):\n    return re.compile("a", flags)')
+        assert "_pyfunc_re_compile('a', flags)" in result
+
+    def test_invalid_literal_pattern(self):
+        with pytest.raises(JSError, match="Invalid regular expression"):
+            js('import re\nP = re.compile("(a")')
+
+    def test_scoped_flags_are_left_to_runtime(self):
+        assert regex_literal("a(?i:b)") is None
+
+    def test_keyword_arguments(self):
+        result = js('from re import sub\nsub("a", "b", "aaa", count=1)')
+        assert "_pyfunc_re_sub('a', 'b', 'aaa', 1)" in result
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"(?P<year>\d{4})-(?P=year)",
+        r"\A[]a-]+\Z",
+        r"^x{,3}$",
+        r"(?im)^a(?#comment)b",
+        "(?x) a b  # comment\n c",
+        r"[^]\]]\$",
+    ],
+)
+def test_runtime_translation_matches_codegen(pattern):
+    """re_translate (JS) and translate_pattern (Python) must agree."""
+    code = (
+        f"import re\ndef f(p):\n    return re.compile(p)._regex.source\nf({pattern!r})"
+    )
+    assert js_eval(py2js(code)) == translate_pattern(pattern)[0]
+
+
+class TestRegexRuntime:
+    def test_match_groups(self):
+        code = (
+            "import re\n"
+            'm = re.match(r"(?P<k>\\w+)=(?P<v>\\d+)?", "key=")\n'
+            '[m.group("k"), m.group(2), m.span(1), m.end()]'
+        )
+        assert js_eval(py2js(code)) == ["key", None, [0, 3], 4]
+
+    def test_findall_and_sub(self):
+        code = (
+            "import re\n"
+            'WORD = re.compile(r"\\w+")\n'
+            '[WORD.findall("a bc, d"), WORD.sub(r"<\\g<0>>", "a b")]'
+        )
+        assert js_eval(py2js(code)) == [["a", "bc", "d"], "<a> <b>"]
+
+    def test_split_keeps_groups(self):
+        code = 'import re\nre.split(r"(-)|,", "a-b,c")'
+        assert js_eval(py2js(code)) == ["a", "-", "b", None, "c"]
+
+    def test_dollar_matches_before_trailing_newline(self):
+        code = 'import re\n[re.search(r"a$", "a\\n") is not None, re.fullmatch("a", "a\\n")]'
+        assert js_eval(py2js(code)) == [True, None]
+
+    def test_pattern_cache_is_bounded(self):
+        code = (
+            "import re\n"
+            "def compile(i):\n"
+            "    return re.compile(str(i))\n"
+            "first = compile(0)\n"
+            "for i in range(1, 600):\n"
+            "    compile(i)\n"
+            "[compile(599) is compile(599), compile(0) is first]"
+        )
+        # Not inlined, so that the patterns aren't literals
+        assert js_eval(py2js(code, optimize=False)) == [True, False]
@@ -0,0 +1,57 @@
+"""Tests for release builds (``-O``)."""
+
+from __future__ import annotations
+
+import pytest
+
+from prescrypt import py2js
+from prescrypt.stdlib_js import StdlibJs
+from prescrypt.testing import js_eval
+
+
+def run(code: str, release: bool) -> str:
+    return js_eval(py2js(code, release=release) + "\nresult;")
+
+
+def test_asserts_removed():
+    code = "def f(x):\n    assert x > 0, 'positive'\n    return x\nresult = f(-1)"
+    assert "AssertionError" in py2js(code)
+    assert "AssertionError" not in py2js(code, release=True)
+    assert run(code, release=True) == -1
+
+
+def test_debug_blocks():
+    code = "result = 'release'\nif __debug__:\n    result = 'debug'"
+    assert run(code, release=False) == "debug"
+    assert run(code, release=True) == "release"
+    assert "debug'" not in py2js(code, release=True)
+
+
+@pytest.mark.parametrize(
+    ("name", "check"),
+    [
+        ("BaseException", "captureStackTrace"),
+        ("op_instantiate", "window"),
+        ("op_getitem", "'NoneType' object is not subscriptable"),
+        ("op_len", "'NoneType' has no len()"),
+    ],
+)
+def test_debug_checks_stripped(name: str, check: str):
+    assert check in StdlibJs().functions[name]
+    assert check not in StdlibJs(release=True).functions[name]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "class A:\n    def __init__(self, x):\n        self.x = x\nresult = A(2).x",
+        (
+            "result = None\ntry:\n    raise ValueError('v')\nexcept ValueError as e:\n"
+            "    result = str(e)"
+        ),
+        "result = None\ntry:\n    len(None)\nexcept TypeError:\n    result = 'TE'",
+        "result = None\ntry:\n    None[0]\nexcept TypeError:\n    result = 'TE'",
+    ],
+)
+def test_same_results(code: str):
+    assert run(code, release=True) == run(code, release=False)
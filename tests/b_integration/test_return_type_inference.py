@@ -0,0 +1,81 @@
+"""Tests for return types inferred from function bodies."""
+
+from __future__ import annotations
+
+from prescrypt import py2js
+from prescrypt.testing import js_eval
+
+
+class TestInferredReturnTypes:
+    """Calls to unannotated functions use the types they return."""
+
+    def test_unannotated_helper(self):
+        code = """
+def dist(a, b):
+    return abs(a - b)
+
+total = dist(1, 4) + dist(2, 3)
+"""
+        js = py2js(code, include_stdlib=False, optimize=False)
+        assert "(dist(1, 4) + dist(2, 3))" in js
+
+    def test_helper_defined_after_caller(self):
+        code = """
+def area(w, h):
+    return scale(w) * scale(h)
+
+def scale(x):
+    return float(x) * 2
+
+result = area(1, 2) + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+        assert "_pyfunc_op_mul" not in js
+        assert js_eval(py2js(code) + "\nresult;") == 9
+
+    def test_recursive_function(self):
+        code = """
+def depth(n):
+    if n == 0:
+        return 0
+    return depth(n - 1) + 1
+
+result = depth(3) + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add" not in js
+        assert js_eval(py2js(code) + "\nresult;") == 4
+
+    def test_string_helper(self):
+        code = """
+def greet(name):
+    return "Hello, " + str(name)
+
+message = greet("World") + "!"
+"""
+        js = py2js(code, include_stdlib=False, optimize=False)
+        assert "(greet('World') + '!')" in js
+
+    def test_optional_result_uses_helper(self):
+        code = """
+def find(items, x):
+    for i in range(len(items)):
+        if items[i] == x:
+            return i
+
+result = find([1, 2], 2) + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add((find(" in js
+
+    def test_generator_is_unknown(self):
+        code = """
+def numbers():
+    yield 1
+    return 2
+
+result = numbers() + 1
+"""
+        js = py2js(code, include_stdlib=False)
+        assert "_pyfunc_op_add(numbers(), 1)" in js
@@ -135,12 +135,12 @@ class TestSliceStrings:
 
     def test_string_slice(self):
         """String slicing s[1:3]"""
-        code = 's = "hello"; b = s[1:3]'
+        code = "def f(s: str):\n    return s[1:3]"
         result = js(code)
         assert "s.slice(1, 3)" in result
 
     def test_string_slice_reverse_uses_helper(self):
         """String reverse slice s[::-1] uses helper"""
-        code = 's = "hello"; b = s[::-1]'
+        code = "def f(s: str):\n    return s[::-1]"
         result = js(code)
         assert "_pyfunc_slice(s, null, null, -1)" in result
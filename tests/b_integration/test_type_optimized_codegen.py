@@ -43,7 +43,7 @@ class TestAddOptimization:
 x = 10
 y = x + 5
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_add" not in js
         assert "+" in js
 
@@ -53,7 +53,7 @@ y = x + 5
 x = "hello"
 y = x + " world"
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_add" not in js
         assert "+" in js
 
@@ -64,7 +64,7 @@ x = 10
 y = 20
 z = x + y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_add" not in js
         assert "+" in js
 
@@ -75,7 +75,7 @@ x = "hello"
 y = "world"
 z = x + y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_add" not in js
         assert "+" in js
 
@@ -139,7 +139,7 @@ class TestMultOptimization:
 x = 10
 y = x * 5
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_mul" not in js
         assert "*" in js
 
@@ -150,7 +150,7 @@ x = 6
 y = 7
 z = x * y
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_mul" not in js
         assert "*" in js
 
@@ -168,7 +168,7 @@ s = "ab"
 n = 3
 result = s * n
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_mul" not in js
         assert ".repeat(" in js
 
@@ -179,7 +179,7 @@ n = 3
 s = "ab"
 result = n * s
 """
-        js = py2js(code, include_stdlib=False)
+        js = py2js(code, include_stdlib=False, optimize=False)
         assert "_pyfunc_op_mul" not in js
         assert ".repeat(" in js
 
@@ -6,6 +6,8 @@ No database dependency - runs Python at test time to get expected output.
 Tests are split into two categories:
 - internal: Core language feature tests (programs/internal/*.py)
 - tryalgo: Algorithm tests (programs/tryalgo/test_*.py)
+
+Both also run as release builds (``-O``), compared with ``python -O``.
 """
 
 from __future__ import annotations
@@ -107,12 +109,15 @@ def get_known_failures() -> set[str]:
     return set(config.known_failures)
 
 
-def run_python(file_path: Path, timeout: int = 10) -> tuple[str, int]:
-    """Run a Python file and return (output, return_code)."""
+def run_python(
+    file_path: Path, timeout: int = 10, release: bool = False
+) -> tuple[str, int]:
+    """Run a Python file (with ``-O`` for release) and return (output, return_code)."""
     config = get_config()
+    options = ["-O"] if release else []
     try:
         result = subprocess.run(
-            [config.python, str(file_path)],
+            [config.python, *options, str(file_path)],
             capture_output=True,
             text=True,
             timeout=timeout,
@@ -151,11 +156,13 @@ def pytest_generate_tests(metafunc):
             metafunc.parametrize("program_path", [])
 
 
-def _run_program_test(program_path: str, known_failures: set[str]):
+def _run_program_test(
+    program_path: str, known_failures: set[str], release: bool = False
+):
     """Test a single program through the Prescrypt pipeline.
 
     1. Run Python to get expected output
-    2. Compile Python to JavaScript
+    2. Compile Python to JavaScript (a release build with ``release``)
     3. Run JavaScript with Node.js
     4. Compare outputs
     """
@@ -169,14 +176,14 @@ def _run_program_test(program_path: str, known_failures: set[str]):
         pytest.xfail(f"Known failure: {program_path}")
 
     # Run Python to get expected output
-    expected_output, py_returncode = run_python(src_path)
+    expected_output, py_returncode = run_python(src_path, release=release)
     if py_returncode != 0:
         pytest.skip(f"Python execution failed (exit code {py_returncode})")
 
     # Read source and compile to JavaScript
     source = src_path.read_text()
     try:
-        js_code = py2js(source)
+        js_code = py2js(source, release=release)
     except Exception as e:
         pytest.fail(f"Compilation failed: {e}")
 
@@ -230,6 +237,16 @@ def test_tryalgo_program(tryalgo_program: str, known_failures: set[str]):
     _run_program_test(tryalgo_program, known_failures)
 
 
+def test_internal_program_release(internal_program: str, known_failures: set[str]):
+    """Test an internal program built with -O (release)."""
+    _run_program_test(internal_program, known_failures, release=True)
+
+
+def test_tryalgo_program_release(tryalgo_program: str, known_failures: set[str]):
+    """Test a tryalgo program built with -O (release)."""
+    _run_program_test(tryalgo_program, known_failures, release=True)
+
+
 def test_program(program_path: str, known_failures: set[str]):
     """Test a single program (legacy - all programs)."""
     _run_program_test(program_path, known_failures)
@@ -14,6 +14,7 @@ from tempfile import TemporaryDirectory
 import pytest
 
 from prescrypt.main import bundle_file, compile_directory
+from prescrypt.runtime import SharedRuntime
 
 
 def run_node_module(dist_dir: Path, entry_point: str = "main.js") -> str:
@@ -523,6 +524,48 @@ print("main end")
             assert "value is 2" in output
             assert "main end" in output
 
+    @pytest.mark.parametrize("tree_shake", [True, False])
+    def test_shared_runtime(self, tree_shake):
+        """Test modules importing the stdlib from a shared runtime."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            dist_dir = tmppath / "dist"
+            (src_dir / "pkg").mkdir(parents=True)
+
+            (src_dir / "pkg" / "__init__.py").write_text("")
+            (src_dir / "pkg" / "utils.py").write_text(
+                """
+def describe(xs):
+    return "sorted: " + str(sorted(xs))
+"""
+            )
+            (src_dir / "main.py").write_text(
+                """
+from pkg.utils import describe
+
+print(describe([3, 1, 2]))
+print([1, 2] == [1, 2])
+"""
+            )
+
+            runtime = SharedRuntime(dist_dir, tree_shake=tree_shake)
+            success, errors = compile_directory(
+                src_dir, dist_dir, module_mode=True, runtime=runtime, quiet=True
+            )
+            assert success == 3
+            assert errors == 0
+
+            assert runtime.path.exists()
+            if tree_shake:
+                assert runtime.path.name == "prescrypt_runtime.js"
+            utils_js = (dist_dir / "pkg" / "utils.js").read_text()
+            assert f"from '../{runtime.path.name}'" in utils_js
+            assert "var _pyfunc_" not in utils_js
+
+            output = run_node_module(dist_dir)
+            assert output == "sorted: [1, 2, 3]\nTrue"
+
 
 def run_node_script(script_path: Path) -> str:
     """Run a Node.js script (not a module) and return stdout."""
@@ -578,6 +621,96 @@ print(message)
             output = run_node_script(out_file)
             assert output == "Hello, World!"
 
+    def test_bundle_inferred_return_types(self):
+        """Return types inferred in one module are used by its importers."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "geometry.py").write_text(
+                """
+def dist(a, b):
+    return abs(a - b)
+
+def describe(a, b):
+    return "distance " + str(dist(a, b))
+"""
+            )
+
+            (src_dir / "main.py").write_text(
+                """
+from geometry import describe, dist
+
+total = dist(1, 4) + dist(2, 3)
+print(total)
+print(describe(1, 3) + "!")
+"""
+            )
+
+            out_file = tmppath / "out.js"
+
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                quiet=True,
+            )
+            assert success
+
+            js = out_file.read_text()
+            assert "(dist(1, 4) + dist(2, 3))" in js
+            assert "(describe(1, 3) + '!')" in js
+
+            output = run_node_script(out_file)
+            assert output == "4\ndistance 2!"
+
+    def test_bundle_imported_class_types(self):
+        """Attribute and method types of imported classes are known."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "shapes.py").write_text(
+                """
+class Rect:
+    def __init__(self, w: int, h: int):
+        self.w = w
+        self.h = h
+
+    def get(self, name):
+        return self.w if name == "w" else self.h
+"""
+            )
+
+            (src_dir / "main.py").write_text(
+                """
+from shapes import Rect
+
+r = Rect(2, 3)
+print(r.w * r.h)
+print(r.get("h"))
+"""
+            )
+
+            out_file = tmppath / "out.js"
+
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                quiet=True,
+            )
+            assert success
+
+            js = out_file.read_text()
+            assert "(r.w * r.h)" in js
+            assert "r.get('h')" in js
+
+            output = run_node_script(out_file)
+            assert output == "6\n3"
+
     def test_bundle_combined_tree_shake(self):
         """Test that stdlib is tree-shaken based on all bundled modules."""
         with TemporaryDirectory() as tmpdir:
@@ -782,3 +915,601 @@ print(len(builds))
 
             output = run_node_script(out_file)
             assert output == "github\n2"
+
+    def test_bundle_removes_unused_definitions(self):
+        """Functions, classes and methods the program doesn't use are removed."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "utils.py").write_text(
+                """
+def used(x):
+    return helper(x) + 1
+
+def helper(x):
+    return x * 2
+
+def unused_function():
+    return 0
+
+class Shape:
+    def __init__(self, n):
+        self.n = n
+
+    def area(self):
+        return self.n * self.n
+
+    def unused_method(self):
+        return 0
+
+class UnusedClass:
+    pass
+"""
+            )
+
+            (src_dir / "main.py").write_text(
+                """
+from utils import Shape, used
+
+print(used(3))
+print(Shape(2).area())
+"""
+            )
+
+            out_file = tmppath / "out.js"
+
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                keep=["UnusedClass"],
+                quiet=True,
+            )
+            assert success
+
+            js_code = out_file.read_text()
+            assert "unused_function" not in js_code
+            assert "unused_method" not in js_code
+            assert "UnusedClass" in js_code
+
+            output = run_node_script(out_file)
+            assert output == "7\n4"
+
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                tree_shake=False,
+                quiet=True,
+            )
+            assert success
+            assert "unused_method" in out_file.read_text()
+
+    def test_bundle_single_scope(self):
+        """Modules run in a single function scope, with clashing names renamed."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "util.py").write_text(
+                """
+count = 0
+
+class Point:
+    pass
+
+def helper(v):
+    global count
+    count += 1
+    return v * 2
+
+for i in range(2):
+    count += i
+"""
+            )
+
+            (src_dir / "main.py").write_text(
+                """
+import util
+from util import helper as h
+
+count = 10
+
+class Point:
+    pass
+
+def helper():
+    return "main"
+
+for i in range(3):
+    count += i
+
+print(h(2), helper(), util.helper(3), util.count, count)
+print(type(util.Point()).__name__ == type(Point()).__name__)
+"""
+            )
+
+            out_file = tmppath / "out.js"
+
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                quiet=True,
+            )
+            assert success
+
+            js_code = out_file.read_text()
+            assert js_code.startswith("(function () {")
+            assert "var helper$1 = " in js_code
+
+            output = run_node_script(out_file)
+            assert output == "4 main 6 3 13\nTrue"
+
+    def test_bundle_imported_modules(self):
+        """Attributes of imported modules refer to the bindings directly."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            (src_dir / "pkg").mkdir(parents=True)
+
+            (src_dir / "pkg" / "__init__.py").write_text("")
+            (src_dir / "pkg" / "sizes.py").write_text(
+                """
+def width(x):
+    return x * 10
+"""
+            )
+            (src_dir / "shapes.py").write_text(
+                """
+unit = 2
+
+def area(w):
+    return w * unit
+"""
+            )
+
+            (src_dir / "main.py").write_text(
+                """
+__all__ = ["run"]
+
+import shapes as sh
+from pkg import sizes
+from shapes import *
+
+# Parameters with the names of the imported functions
+def run(width, area=3):
+    return sizes.width(width) + sh.area(area)
+
+print(run(1), area(4), unit)
+"""
+            )
+
+            out_file = tmppath / "out.js"
+
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                quiet=True,
+            )
+            assert success
+
+            output = run_node_script(out_file)
+            assert output == "16 8 2"
+
+            # Names in the entry file's `__all__` are global
+            script = f"require({json.dumps(str(out_file))}); console.log(run(2));"
+            result = subprocess.run(
+                ["node", "-e", script], capture_output=True, text=True, check=True
+            )
+            assert result.stdout.strip() == "16 8 2\n26"
+
+    def test_bundle_split(self):
+        """Modules imported in async functions go to chunks loaded on demand."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "util.py").write_text(
+                """
+def fmt(x):
+    return f"<{x}>"
+"""
+            )
+            (src_dir / "shared.py").write_text(
+                """
+count = 10
+
+def scale(xs):
+    return sorted(x * count for x in xs)
+"""
+            )
+            (src_dir / "charts.py").write_text(
+                """
+from shared import scale
+from util import fmt
+
+def draw(n):
+    return fmt("#" * n) + str(scale([n, 1]))
+"""
+            )
+            (src_dir / "table.py").write_text(
+                """
+import shared
+
+def render(rows):
+    return " | ".join(str(r) for r in shared.scale(rows))
+"""
+            )
+            (src_dir / "main.py").write_text(
+                """
+from util import fmt
+
+count = 0
+
+async def show():
+    from charts import draw
+    import table as t
+    print(fmt(draw(3)), t.render([3, 1, 2]))
+
+print(fmt(count))
+show()
+"""
+            )
+
+            dist_dir = tmppath / "dist"
+            success = bundle_file(
+                src_dir / "main.py",
+                dist_dir / "main.js",
+                module_paths=[src_dir],
+                split=True,
+                quiet=True,
+            )
+            assert success
+
+            names = {path.name for path in dist_dir.iterdir()}
+            assert names == {
+                "main.js",
+                "main.common-1.js",
+                "main.charts.js",
+                "main.table.js",
+            }
+
+            entry = (dist_dir / "main.js").read_text()
+            assert 'await import("./main.charts.js")' in entry
+            assert "count$1" not in entry
+            # The stdlib is tree-shaken per chunk
+            assert "_pyfunc_sorted" not in entry
+            common = (dist_dir / "main.common-1.js").read_text()
+            assert "var _pyfunc_sorted = " in common
+            charts = (dist_dir / "main.charts.js").read_text()
+            assert "import { _pyfunc_op_mul, _pymeth_repeat, scale }" in charts
+            assert "export { draw, fmt, scale };" in charts
+
+            output = run_node_module(dist_dir)
+            assert output == "<0>\n<<###>[10, 30]> 10 | 20 | 30"
+
+    def test_bundle_split_loaded(self):
+        """Imports of modules the entry chunk has don't load a chunk."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "util.py").write_text(
+                """
+def helper():
+    return "helper"
+"""
+            )
+            (src_dir / "sync.py").write_text(
+                """
+def run():
+    return "sync"
+"""
+            )
+            (src_dir / "main.py").write_text(
+                """
+import util
+
+def run_sync():
+    from sync import run
+    return run()
+
+async def main():
+    from util import helper as h
+    print(h(), run_sync())
+
+main()
+"""
+            )
+
+            dist_dir = tmppath / "dist"
+            success = bundle_file(
+                src_dir / "main.py",
+                dist_dir / "main.js",
+                module_paths=[src_dir],
+                split=True,
+                quiet=True,
+            )
+            assert success
+
+            assert [path.name for path in dist_dir.iterdir()] == ["main.js"]
+            assert "import(" not in (dist_dir / "main.js").read_text()
+
+            output = run_node_module(dist_dir)
+            assert output == "helper sync"
+
+    @pytest.mark.parametrize("shared", [False, True])
+    def test_bundle_entries(self, shared):
+        """Several entry files are bundled at once, sharing their modules."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "layout.py").write_text(
+                """
+title = "Site"
+
+def header(page):
+    return f"{title} | {page}"
+"""
+            )
+            (src_dir / "cart.py").write_text(
+                """
+items = []
+
+def add(x):
+    items.append(x)
+    return len(items)
+"""
+            )
+            (src_dir / "home.py").write_text(
+                """
+from layout import header
+import cart
+
+print(header("home"), cart.add("a"))
+"""
+            )
+            (src_dir / "shop.py").write_text(
+                """
+from layout import header as h
+from cart import add
+
+title = "Shop"
+print(h(title), add("b"), sorted([3, 1]))
+"""
+            )
+            (src_dir / "about.py").write_text(
+                """
+from layout import header
+
+print(header("about"))
+"""
+            )
+
+            dist_dir = tmppath / "dist"
+            success = bundle_file(
+                src_dir / "home.py",
+                dist_dir / "home.js",
+                module_paths=[src_dir],
+                entries=[src_dir / "shop.py", src_dir / "about.py"],
+                shared=shared,
+                quiet=True,
+            )
+            assert success
+
+            manifest = json.loads((dist_dir / "manifest.json").read_text())
+            imports = ["shared.js"] if shared else []
+            assert manifest == {
+                f"{name}.py": {"file": f"{name}.js", "imports": imports}
+                for name in ["home", "shop", "about"]
+            }
+
+            # Each module is compiled once: the same names in every bundle
+            for name in ["home", "shop", "about"]:
+                code = (dist_dir / f"{name}.js").read_text()
+                assert ("var header = " in code) is not shared
+            assert "const title$1 = 'Shop';" in (dist_dir / "shop.js").read_text()
+
+            expected = {
+                "home": "Site | home 1",
+                "shop": "Site | Shop 1 [1, 3]",
+                "about": "Site | about",
+            }
+            for name, output in expected.items():
+                if shared:
+                    assert run_node_module(dist_dir, f"{name}.js") == output
+                else:
+                    assert run_node_script(dist_dir / f"{name}.js") == output
+
+    def test_bundle_lazy_init(self):
+        """Modules run when their names are first used."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "util.py").write_text(
+                """
+RATE = 2
+
+def double(x):
+    return x * RATE
+"""
+            )
+            (src_dir / "config.py").write_text(
+                """
+from util import double
+
+print("config")
+TABLE = {k: double(k) for k in range(3)}
+count = 0
+
+def bump():
+    global count
+    count += 1
+    return count
+"""
+            )
+            (src_dir / "main.py").write_text(
+                """
+import config
+from util import double
+
+def lookup(k):
+    from config import TABLE
+    return TABLE[k]
+
+print("main", double(1))
+print(lookup(2), config.bump(), config.bump())
+"""
+            )
+
+            out_file = tmppath / "out.js"
+            success = bundle_file(
+                src_dir / "main.py",
+                out_file,
+                module_paths=[src_dir],
+                lazy_init=True,
+                quiet=True,
+            )
+            assert success
+
+            code = out_file.read_text()
+            # util only defines a function and a constant: no init function
+            assert "init$util" not in code
+            assert "var TABLE, count, bump;\nvar init$config = function () {" in code
+
+            output = run_node_script(out_file)
+            assert output == "main 2\nconfig\n4 1 2"
+
+    def test_bundle_edge_target(self):
+        """The edge target exports the handlers of an ES module worker."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            src_dir = tmppath / "src"
+            src_dir.mkdir()
+
+            (src_dir / "routes.py").write_text(
+                """
+ROUTES = {"/" + name: name.upper() for name in ["home", "shop"]}
+print("routes")
+"""
+            )
+            (src_dir / "worker.py").write_text(
+                """
+import re
+import js
+from routes import ROUTES
+
+SQUARES = [i * i for i in range(4)]
+PATH = re.compile(r"https?://[^/]+(/.*)")
+
+def fetch(request, env, ctx):
+    path = PATH.match(request.url).group(1)
+    body = ROUTES.get(path, "missing") + " " + str(SQUARES)
+    return js.fetch(body)
+"""
+            )
+
+            out_file = tmppath / "worker.mjs"
+            assert bundle_file(
+                src_dir / "worker.py",
+                out_file,
+                module_paths=[src_dir],
+                target="edge",
+                quiet=True,
+            )
+
+            code = out_file.read_text()
+            assert "const SQUARES = Object.assign([0, 1, 4, 9]" in code
+            # The handler doesn't shadow the global fetch
+            assert code.endswith("export default { fetch: fetch$1 };\n")
+
+            (tmppath / "run.mjs").write_text(
+                """
+globalThis.fetch = (body) => "origin: " + body;
+console.log("loaded");
+const worker = (await import("./worker.mjs")).default;
+console.log(worker.fetch({ url: "https://example.com/shop" }, {}, {}));
+console.log(worker.fetch({ url: "https://example.com/" }, {}, {}));
+"""
+            )
+            output = run_node_script(tmppath / "run.mjs")
+            # routes runs on the first request, not on load
+            assert output == (
+                "loaded\nroutes\norigin: SHOP [0, 1, 4, 9]\n"
+                "origin: missing [0, 1, 4, 9]"
+            )
+
+    def test_bundle_edge_target_shared_containers(self):
+        """Tables that repeat a list keep sharing it in an edge bundle."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            (tmppath / "tables.py").write_text(
+                """
+N, M = 3, 2
+GRID = [[0] * N] * M
+PAIR = ([1, 2],) * 2
+"""
+            )
+            (tmppath / "worker.py").write_text(
+                """
+import js
+from tables import GRID, PAIR
+
+def fetch(request, env, ctx):
+    GRID[0][0] = 9
+    PAIR[0].append(3)
+    return js.fetch(str(GRID) + " " + str(PAIR[1]))
+"""
+            )
+
+            out_file = tmppath / "worker.mjs"
+            assert bundle_file(
+                tmppath / "worker.py",
+                out_file,
+                module_paths=[tmppath],
+                target="edge",
+                quiet=True,
+            )
+
+            (tmppath / "run.mjs").write_text(
+                """
+globalThis.fetch = (body) => body;
+const worker = (await import("./worker.mjs")).default;
+console.log(worker.fetch({}, {}, {}));
+"""
+            )
+            output = run_node_script(tmppath / "run.mjs")
+            assert output == "[[9, 0, 0], [9, 0, 0]] [1, 2, 3]"
+
+    def test_bundle_edge_target_top_level_code(self, capsys):
+        """The entry file of a worker can't run code at load time."""
+        with TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            (tmppath / "worker.py").write_text(
+                """
+counts = load_counts()
+
+def fetch(request, env, ctx):
+    return counts
+"""
+            )
+
+            assert not bundle_file(
+                tmppath / "worker.py",
+                tmppath / "worker.js",
+                target="edge",
+                quiet=True,
+            )
+            err = capsys.readouterr().err
+            assert "top-level code would run on every cold start" in err